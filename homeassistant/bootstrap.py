@@ -81,6 +81,7 @@ from .helpers import (
     floor_registry,
     issue_registry,
     label_registry,
+    loop_monitor,
     recorder,
     restore_state,
     template,
@@ -96,8 +97,11 @@ from .setup import (
     # by integrations. It is only used for internal tracking of
     # which integrations are being set up.
     _setup_started,
+    async_get_setup_critical_path,
+    async_get_setup_timeline,
     async_get_setup_timings,
     async_notify_setup_error,
+    async_process_deps_reqs,
     async_set_domains_to_be_loaded,
     async_setup_component,
 )
@@ -263,6 +267,7 @@ async def async_setup_hass(
         """Create the hass object and do basic setup."""
         hass = core.HomeAssistant(runtime_config.config_dir)
         loader.async_setup(hass)
+        loop_monitor.async_setup(hass)
 
         await async_enable_logging(
             hass,
@@ -434,6 +439,7 @@ async def async_load_base_functionality(hass: core.HomeAssistant) -> None:
         create_eager_task(label_registry.async_load(hass)),
         hass.async_add_executor_job(_init_blocking_io_modules_in_executor),
         create_eager_task(template.async_load_custom_templates(hass)),
+        create_eager_task(template.async_load_template_bytecode(hass)),
         create_eager_task(restore_state.async_load(hass)),
         create_eager_task(hass.config_entries.async_initialize()),
         create_eager_task(async_get_system_info(hass)),
@@ -801,6 +807,53 @@ async def async_setup_multi_components(
             )
 
 
+async def _async_setup_stage(
+    hass: core.HomeAssistant,
+    name: str,
+    domains: set[str],
+    config: dict[str, Any],
+    timeout: int,
+) -> None:
+    """Set up the domains of a stage, moving forward when it times out."""
+    try:
+        async with hass.timeout.async_timeout(timeout, cool_down=COOLDOWN_TIME):
+            await async_setup_multi_components(hass, domains, config)
+    except TimeoutError:
+        _LOGGER.warning(
+            "Setup timed out for %s waiting on %s - moving forward",
+            name,
+            hass._active_tasks,  # noqa: SLF001
+        )
+
+
+async def _async_process_stage_deps_reqs(
+    hass: core.HomeAssistant,
+    domains: set[str],
+    config: dict[str, Any],
+    integration_cache: dict[str, loader.Integration],
+) -> None:
+    """Wait for the dependencies and requirements of the domains of a stage.
+
+    Errors are logged by the setup of the domains.
+    """
+    try:
+        async with hass.timeout.async_timeout(STAGE_1_TIMEOUT, cool_down=COOLDOWN_TIME):
+            await asyncio.gather(
+                *(
+                    async_process_deps_reqs(hass, config, integration)
+                    for domain in domains
+                    if (integration := integration_cache.get(domain)) is not None
+                ),
+                return_exceptions=True,
+            )
+    except TimeoutError:
+        _LOGGER.warning(
+            "Processing dependencies and requirements timed out for stage 1"
+            " waiting on %s - moving forward",
+            hass._active_tasks,  # noqa: SLF001
+        )
+
+
 async def _async_resolve_domains_to_setup(
     hass: core.HomeAssistant, config: dict[str, Any]
 ) -> tuple[set[str], dict[str, loader.Integration]]:
@@ -1026,34 +1079,40 @@ async def _async_set_up_integrations(
     async_set_domains_to_be_loaded(hass, stage_1_domains)
 
     # Start setup
+    stage_tasks: list[asyncio.Task[None]] = []
     if stage_1_domains:
         _LOGGER.info("Setting up stage 1: %s", stage_1_domains)
-        try:
-            async with hass.timeout.async_timeout(
-                STAGE_1_TIMEOUT, cool_down=COOLDOWN_TIME
-            ):
-                await async_setup_multi_components(hass, stage_1_domains, config)
-        except TimeoutError:
-            _LOGGER.warning(
-                "Setup timed out for stage 1 waiting on %s - moving forward",
-                hass._active_tasks,  # noqa: SLF001
+        stage_tasks.append(
+            create_eager_task(
+                _async_setup_stage(
+                    hass, "stage 1", stage_1_domains, config, STAGE_1_TIMEOUT
+                ),
+                loop=hass.loop,
             )
+        )
+        # Stage 2 does not wait for stage 1 to finish setting up, only for its
+        # dependencies and requirements. This makes sure discovery integrations
+        # update their deps before stage 2 integrations load them, and that
+        # stage 1 integrations do not wait for after dependencies in stage 2.
+        await _async_process_stage_deps_reqs(
+            hass, stage_1_domains, config, integration_cache
+        )
 
     # Add after dependencies when setting up stage 2 domains
     async_set_domains_to_be_loaded(hass, stage_2_domains)
 
     if stage_2_domains:
         _LOGGER.info("Setting up stage 2: %s", stage_2_domains)
-        try:
-            async with hass.timeout.async_timeout(
-                STAGE_2_TIMEOUT, cool_down=COOLDOWN_TIME
-            ):
-                await async_setup_multi_components(hass, stage_2_domains, config)
-        except TimeoutError:
-            _LOGGER.warning(
-                "Setup timed out for stage 2 waiting on %s - moving forward",
-                hass._active_tasks,  # noqa: SLF001
+        stage_tasks.append(
+            create_eager_task(
+                _async_setup_stage(
+                    hass, "stage 2", stage_2_domains, config, STAGE_2_TIMEOUT
+                ),
+                loop=hass.loop,
             )
+        )
+
+    await asyncio.gather(*stage_tasks)
 
     # Wrap up startup
     _LOGGER.debug("Waiting for startup to wrap up")
@@ -1068,6 +1127,27 @@ async def _async_set_up_integrations(
 
     watcher.async_stop()
 
+    if critical_path := async_get_setup_critical_path(hass):
+        timeline = async_get_setup_timeline(hass)
+        _LOGGER.info(
+            "Integrations gating startup: %s",
+            " -> ".join(
+                f"{domain} ({timeline[domain][0]:.2f}s-{timeline[domain][1]:.2f}s)"
+                for domain in critical_path
+            ),
+        )
+
+    bytecode_cache = template.get_bytecode_cache(hass)
+    if bytecode_cache.hits or bytecode_cache.misses:
+        _LOGGER.info(
+            "Compiled %s templates in %.2fs, loaded %s templates from the bytecode"
+            " cache saving %.2fs",
+            bytecode_cache.misses,
+            bytecode_cache.compile_time,
+            bytecode_cache.hits,
+            bytecode_cache.saved_time,
+        )
+
     if _LOGGER.isEnabledFor(logging.DEBUG):
         setup_time = async_get_setup_timings(hass)
         _LOGGER.debug(
@@ -113,6 +113,7 @@ class CommandBinarySensor(ManualTriggerEntity, BinarySensorEntity):
                 self._scan_interval,
                 name=f"Command Line Binary Sensor - {self.name}",
                 cancel_on_shutdown=True,
+                aligned=True,
             ),
         )
 
@@ -107,6 +107,7 @@ class CommandCover(ManualTriggerEntity, CoverEntity):
                     self._scan_interval,
                     name=f"Command Line Cover - {self.name}",
                     cancel_on_shutdown=True,
+                    aligned=True,
                 ),
             )
 
@@ -122,6 +122,7 @@ class CommandSensor(ManualTriggerSensorEntity):
                 self._scan_interval,
                 name=f"Command Line Sensor - {self.name}",
                 cancel_on_shutdown=True,
+                aligned=True,
             ),
         )
 
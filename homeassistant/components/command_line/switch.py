@@ -106,6 +106,7 @@ class CommandSwitch(ManualTriggerEntity, SwitchEntity):
                     self._scan_interval,
                     name=f"Command Line Cover - {self.name}",
                     cancel_on_shutdown=True,
+                    aligned=True,
                 ),
             )
 
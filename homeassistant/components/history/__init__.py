@@ -143,7 +143,7 @@ class HistoryPeriodView(HomeAssistantView):
         no_attributes: bool,
     ) -> web.Response:
         """Fetch significant stats from the database as json."""
-        with session_scope(hass=hass, read_only=True) as session:
+        with session_scope(hass=hass, read_only=True, read_database=True) as session:
             return self.json(
                 list(
                     history.get_significant_states_with_session(
@@ -5,3 +5,11 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+# The maximum number of states in a history/stream_during_period message
+MAX_STREAM_MESSAGE_STATES = 4096
+
+# The time a history/stream_during_period client has to receive a message
+# before the stream is ended, so a stalled client does not keep holding
+# a recorder executor thread and its read session
+STREAM_DRAIN_TIMEOUT = 30
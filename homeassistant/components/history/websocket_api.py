@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Callable, Iterable
+from concurrent.futures import CancelledError
 from dataclasses import dataclass
 from datetime import datetime as dt, timedelta
+from functools import partial
 import logging
 from typing import Any, cast
 
@@ -13,6 +15,7 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.websocket_api import messages
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.const import (
@@ -39,7 +42,12 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import (
+    EVENT_COALESCE_TIME,
+    MAX_PENDING_HISTORY_STATES,
+    MAX_STREAM_MESSAGE_STATES,
+    STREAM_DRAIN_TIMEOUT,
+)
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
 
 _LOGGER = logging.getLogger(__name__)
@@ -49,8 +57,8 @@ _LOGGER = logging.getLogger(__name__)
 class HistoryLiveStream:
     """Track a history live stream."""
 
-    stream_queue: asyncio.Queue[Event]
     subscriptions: list[CALLBACK_TYPE]
+    stream_queue: asyncio.Queue[Event] | None = None
     end_time_unsub: CALLBACK_TYPE | None = None
     task: asyncio.Task | None = None
     wait_sync_task: asyncio.Task | None = None
@@ -61,6 +69,7 @@ def async_setup(hass: HomeAssistant) -> None:
     """Set up the history websocket API."""
     websocket_api.async_register_command(hass, ws_get_history_during_period)
     websocket_api.async_register_command(hass, ws_stream)
+    websocket_api.async_register_command(hass, ws_stream_during_period)
 
 
 def _ws_get_significant_states(
@@ -73,6 +82,7 @@ def _ws_get_significant_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    max_points: int | None = None,
 ) -> bytes:
     """Fetch history significant_states and convert them to json in the executor."""
     return json_bytes(
@@ -89,11 +99,39 @@ def _ws_get_significant_states(
                 minimal_response,
                 no_attributes,
                 True,
+                max_points,
             ),
         )
     )
 
 
+def _ws_get_significant_states_columnar(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> bytes:
+    """Fetch history significant_states as columns and encode them in the executor."""
+    return messages.construct_result_message(
+        msg_id,
+        history.get_significant_states_compressed_json(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        ),
+    )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/history_during_period",
@@ -104,6 +142,8 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("columnar", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=1)),
     }
 )
 @websocket_api.async_response
@@ -156,9 +196,18 @@ async def ws_get_history_during_period(
     significant_changes_only = msg["significant_changes_only"]
     minimal_response = msg["minimal_response"]
 
+    job: Callable[..., bytes]
+    if max_points := msg.get("max_points"):
+        # Downsampled tiers are only read by the row based path
+        job = partial(_ws_get_significant_states, max_points=max_points)
+    elif msg["columnar"]:
+        job = _ws_get_significant_states_columnar
+    else:
+        job = _ws_get_significant_states
+
     connection.send_message(
         await get_instance(hass).async_add_executor_job(
-            _ws_get_significant_states,
+            job,
             hass,
             msg["id"],
             start_time,
@@ -172,6 +221,218 @@ async def ws_get_history_during_period(
     )
 
 
+def _generate_stream_chunk_response(
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    states: dict[str, list[dict[str, Any]]],
+    complete: bool,
+) -> bytes:
+    """Generate a websocket response for a chunk of a history stream."""
+    return json_bytes(
+        messages.event_message(
+            msg_id,
+            {
+                **_generate_stream_message(states, start_time, end_time),
+                "complete": complete,
+            },
+        )
+    )
+
+
+def _stream_historical_states(
+    hass: HomeAssistant,
+    send_chunk: Callable[[bytes, bool], bool],
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> None:
+    """Fetch history significant_states in chunks and send them in the executor.
+
+    send_chunk blocks until the client has received the previous
+    messages and returns False if the stream has been cancelled or
+    ended, it is passed whether the chunk completes the stream.
+    One chunk is held back so the last message can be marked complete.
+    """
+    pending_states: dict[str, list[dict[str, Any]]] = {}
+    with session_scope(hass=hass, read_only=True, read_database=True) as session:
+        for states in history.stream_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            True,
+            MAX_STREAM_MESSAGE_STATES,
+        ):
+            if pending_states and not send_chunk(
+                _generate_stream_chunk_response(
+                    msg_id, start_time, end_time, pending_states, False
+                ),
+                False,
+            ):
+                return
+            pending_states = cast(dict[str, list[dict[str, Any]]], states)
+    send_chunk(
+        _generate_stream_chunk_response(
+            msg_id, start_time, end_time, pending_states, True
+        ),
+        True,
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/stream_during_period",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Required("entity_ids"): [str],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("minimal_response", default=False): bool,
+        vol.Optional("no_attributes", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_stream_during_period(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle history stream during period websocket command.
+
+    The states of history/history_during_period are sent as event
+    messages of at most MAX_STREAM_MESSAGE_STATES states. The next
+    chunk is only sent once the client has received the previous
+    messages, the last message has complete set. The stream ends with
+    a timeout error when the client does not receive a message within
+    STREAM_DRAIN_TIMEOUT.
+    """
+    start_time_str = msg["start_time"]
+    msg_id: int = msg["id"]
+    utc_now = dt_util.utcnow()
+
+    if start_time := dt_util.parse_datetime(start_time_str):
+        start_time = dt_util.as_utc(start_time)
+
+    if not start_time or start_time > utc_now:
+        connection.send_error(msg_id, "invalid_start_time", "Invalid start_time")
+        return
+
+    end_time_str = msg.get("end_time")
+    end_time: dt | None = None
+    if end_time_str:
+        if not (end_time := dt_util.parse_datetime(end_time_str)):
+            connection.send_error(msg_id, "invalid_end_time", "Invalid end_time")
+            return
+        end_time = dt_util.as_utc(end_time)
+        if end_time < start_time:
+            connection.send_error(msg_id, "invalid_end_time", "Invalid end_time")
+            return
+
+    entity_ids: list[str] = msg["entity_ids"]
+    for entity_id in entity_ids:
+        if not hass.states.get(entity_id) and not valid_entity_id(entity_id):
+            connection.send_error(msg_id, "invalid_entity_ids", "Invalid entity_ids")
+            return
+
+    include_start_time_state = msg["include_start_time_state"]
+    no_attributes = msg["no_attributes"]
+    stream_end_time = end_time or utc_now
+
+    live_stream = HistoryLiveStream(subscriptions=[])
+
+    @callback
+    def _unsub() -> None:
+        """Stop waiting to send the next chunk."""
+        if live_stream.wait_sync_task:
+            live_stream.wait_sync_task.cancel()
+
+    connection.subscriptions[msg_id] = _unsub
+    connection.send_result(msg_id)
+
+    if (
+        (end_time and not has_recorder_run_after(hass, end_time))
+        or not include_start_time_state
+        and entity_ids
+        and not entities_may_have_state_changes_after(
+            hass, entity_ids, start_time, no_attributes
+        )
+    ):
+        connection.subscriptions.pop(msg_id, None)
+        connection.send_message(
+            _generate_stream_chunk_response(
+                msg_id, start_time, stream_end_time, {}, True
+            )
+        )
+        return
+
+    async def _async_send_chunk(payload: bytes, complete: bool) -> bool:
+        """Send a chunk once the client has received the previous messages.
+
+        Unsubscribing cancels the wait, which frees the executor.
+        """
+        if msg_id not in connection.subscriptions:
+            return False
+        live_stream.wait_sync_task = create_eager_task(connection.async_wait_drained())
+        try:
+            async with asyncio.timeout(STREAM_DRAIN_TIMEOUT):
+                await live_stream.wait_sync_task
+        except TimeoutError:
+            _LOGGER.debug(
+                "Ending history stream %s, the client did not receive the"
+                " previous messages within %s seconds",
+                msg_id,
+                STREAM_DRAIN_TIMEOUT,
+            )
+            if connection.subscriptions.pop(msg_id, None) is not None:
+                connection.send_error(
+                    msg_id,
+                    websocket_api.ERR_TIMEOUT,
+                    "The client did not receive the history in time",
+                )
+            return False
+        if msg_id not in connection.subscriptions:
+            return False
+        if complete:
+            connection.subscriptions.pop(msg_id)
+        connection.send_message(payload)
+        return True
+
+    def _send_chunk(payload: bytes, complete: bool) -> bool:
+        """Send a chunk from the executor."""
+        try:
+            return asyncio.run_coroutine_threadsafe(
+                _async_send_chunk(payload, complete), hass.loop
+            ).result()
+        except CancelledError:
+            return False
+
+    try:
+        await get_instance(hass).async_add_executor_job(
+            _stream_historical_states,
+            hass,
+            _send_chunk,
+            msg_id,
+            start_time,
+            stream_end_time,
+            entity_ids,
+            include_start_time_state,
+            msg["significant_changes_only"],
+            msg["minimal_response"],
+            no_attributes,
+        )
+    finally:
+        connection.subscriptions.pop(msg_id, None)
+
+
 def _generate_stream_message(
     states: dict[str, list[dict[str, Any]]],
     start_day: dt,
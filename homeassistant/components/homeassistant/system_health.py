@@ -7,6 +7,7 @@ from typing import Any
 from homeassistant.components import system_health
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import system_info
+from homeassistant.helpers.loop_monitor import async_get_loop_monitor
 
 
 @callback
@@ -21,6 +22,14 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     info = await system_info.async_get_system_info(hass)
 
+    loop_info: dict[str, Any] = {}
+    if (monitor := async_get_loop_monitor(hass)) is not None:
+        loop_info = {
+            f"loop_lag_{key}": f"{lag * 1000:.0f} ms"
+            for key, lag in monitor.lag_percentiles().items()
+        }
+        loop_info["slow_callbacks"] = len(monitor.slow_callbacks)
+
     return {
         "version": f"core-{info.get('version')}",
         "installation_type": info.get("installation_type"),
@@ -35,4 +44,5 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
         "arch": info.get("arch"),
         "timezone": info.get("timezone"),
         "config_dir": hass.config.config_dir,
+        **loop_info,
     }
@@ -156,7 +156,9 @@ class EventProcessor:
         end_day: dt,
     ) -> list[dict[str, Any]]:
         """Get events for a period of time."""
-        with session_scope(hass=self.hass, read_only=True) as session:
+        with session_scope(
+            hass=self.hass, read_only=True, read_database=True
+        ) as session:
             metadata_ids: list[int] | None = None
             instance = get_instance(self.hass)
             if self.entity_ids:
@@ -6,6 +6,7 @@ import contextlib
 from contextlib import suppress
 from datetime import timedelta
 from functools import _lru_cache_wrapper
+import json
 import logging
 import reprlib
 import sys
@@ -17,14 +18,19 @@ from typing import Any, cast
 from lru import LRU
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import (
+    async_get_aligned_interval_stats,
+    async_get_template_render_stats,
+    async_track_time_interval,
+)
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util.job_profiler import JobProfiler
 
 from .const import DOMAIN
 
@@ -40,6 +46,7 @@ SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
 SERVICE_SET_ASYNCIO_DEBUG = "set_asyncio_debug"
 SERVICE_LOG_CURRENT_TASKS = "log_current_tasks"
+SERVICE_PROFILE_DISPATCH = "profile_dispatch"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -63,6 +70,7 @@ SERVICES = (
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_LOG_CURRENT_TASKS,
+    SERVICE_PROFILE_DISPATCH,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
@@ -74,6 +82,7 @@ CONF_SECONDS = "seconds"
 CONF_MAX_OBJECTS = "max_objects"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
+DISPATCH_PROFILER = "dispatch_profiler"
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -90,6 +99,9 @@ async def async_setup_entry(  # noqa: C901
         async with lock:
             await _async_generate_profile(hass, call)
 
+    async def _async_run_dispatch_profile(call: ServiceCall) -> None:
+        await _async_generate_dispatch_profile(hass, call)
+
     async def _async_run_memory_profile(call: ServiceCall) -> None:
         async with lock:
             await _async_generate_memory_profile(hass, call)
@@ -382,6 +394,20 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_current_tasks,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_PROFILE_DISPATCH,
+        _async_run_dispatch_profile,
+        schema=vol.Schema(
+            {vol.Optional(CONF_SECONDS, default=60.0): vol.Coerce(float)}
+        ),
+    )
+
+    websocket_api.async_register_command(hass, websocket_profile_dispatch)
+    websocket_api.async_register_command(hass, websocket_template_render_stats)
+    websocket_api.async_register_command(hass, websocket_aligned_interval_stats)
+
     return True
 
 
@@ -391,6 +417,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    if DISPATCH_PROFILER in hass.data[DOMAIN]:
+        hass.async_set_job_profiler(None)
     hass.data.pop(DOMAIN)
     return True
 
@@ -432,6 +460,99 @@ async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     )
 
 
+async def _async_profile_dispatch(
+    hass: HomeAssistant, seconds: float
+) -> list[dict[str, Any]]:
+    """Profile the event listeners and jobs run in the event loop for seconds."""
+    domain_data = hass.data[DOMAIN]
+    if DISPATCH_PROFILER in domain_data:
+        raise HomeAssistantError("Dispatch profiling already running")
+    profiler = domain_data[DISPATCH_PROFILER] = JobProfiler()
+    hass.async_set_job_profiler(profiler)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        if domain_data.pop(DISPATCH_PROFILER, None) is not None:
+            hass.async_set_job_profiler(None)
+    return profiler.report()
+
+
+async def _async_generate_dispatch_profile(hass: HomeAssistant, call: ServiceCall):
+    start_time = int(time.time() * 1000000)
+    persistent_notification.async_create(
+        hass,
+        (
+            "The dispatch profile has started. This notification will be updated"
+            " when it is complete."
+        ),
+        title="Profile Started",
+        notification_id=f"dispatch_profiler_{start_time}",
+    )
+    report = await _async_profile_dispatch(hass, float(call.data[CONF_SECONDS]))
+
+    dispatch_path = hass.config.path(f"dispatch_profile.{start_time}.json")
+    await hass.async_add_executor_job(_write_dispatch_profile, report, dispatch_path)
+    persistent_notification.async_create(
+        hass,
+        f"Wrote the dispatch profile of the event listeners to {dispatch_path}",
+        title="Profile Complete",
+        notification_id=f"dispatch_profiler_{start_time}",
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/profile_dispatch",
+        vol.Optional(CONF_SECONDS, default=10.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=3600)
+        ),
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def websocket_profile_dispatch(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Profile the event listeners and jobs and return the stats."""
+    if DOMAIN not in hass.data:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Profiler is not loaded"
+        )
+        return
+    try:
+        report = await _async_profile_dispatch(hass, msg[CONF_SECONDS])
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_ALLOWED, str(err))
+        return
+    connection.send_result(msg["id"], {"jobs": report})
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): "profiler/template_render_stats"}
+)
+@websocket_api.require_admin
+@callback
+def websocket_template_render_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the render stats of the tracked templates."""
+    connection.send_result(
+        msg["id"], {"templates": async_get_template_render_stats(hass)}
+    )
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): "profiler/aligned_interval_stats"}
+)
+@websocket_api.require_admin
+@callback
+def websocket_aligned_interval_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the load of the ticks of the aligned interval listeners."""
+    connection.send_result(msg["id"], {"ticks": async_get_aligned_interval_stats(hass)})
+
+
 async def _async_generate_memory_profile(hass: HomeAssistant, call: ServiceCall):
     # Imports deferred to avoid loading modules
     # in memory since usually only one part of this
@@ -474,6 +595,11 @@ def _write_profile(profiler, cprofile_path, callgrind_path):
     convert(profiler.getstats(), callgrind_path)
 
 
+def _write_dispatch_profile(report: list[dict[str, Any]], dispatch_path: str) -> None:
+    with open(dispatch_path, "w", encoding="utf8") as dispatch_file:
+        json.dump(report, dispatch_file, indent=2)
+
+
 def _write_memory_profile(heap, heap_path):
     heap.byrcs.dump(heap_path)
 
@@ -31,10 +31,12 @@ from homeassistant.util.event_type import EventType
 from . import entity_registry, websocket_api
 from .const import (  # noqa: F401
     CONF_DB_INTEGRITY_CHECK,
+    DEFAULT_DB_READ_MAX_LAG,
     DOMAIN,
     INTEGRATION_PLATFORM_COMPILE_STATISTICS,
     INTEGRATION_PLATFORM_METHODS,
     SQLITE_URL_PREFIX,
+    PartitionInterval,
     SupportedDialect,
 )
 from .core import Recorder
@@ -55,12 +57,17 @@ DEFAULT_COMMIT_INTERVAL = 5
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
 CONF_DB_URL = "db_url"
+CONF_DB_READ_URL = "db_read_url"
+CONF_DB_READ_MAX_LAG = "db_read_max_lag"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_WRITE = "bulk_write"
+CONF_DOWNSAMPLE_STATES = "downsample_states"
+CONF_PARTITION_INTERVAL = "partition_interval"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -101,9 +108,18 @@ CONFIG_SCHEMA = vol.Schema(
                     ),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): cv.positive_int,
                     vol.Optional(CONF_DB_URL): vol.All(cv.string, validate_db_url),
+                    vol.Optional(CONF_DB_READ_URL): vol.All(cv.string, validate_db_url),
+                    vol.Optional(
+                        CONF_DB_READ_MAX_LAG, default=DEFAULT_DB_READ_MAX_LAG
+                    ): cv.positive_int,
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(CONF_BULK_WRITE, default=False): cv.boolean,
+                    vol.Optional(CONF_DOWNSAMPLE_STATES, default=False): cv.boolean,
+                    vol.Optional(CONF_PARTITION_INTERVAL): vol.Coerce(
+                        PartitionInterval
+                    ),
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -163,6 +179,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        bulk_write=conf[CONF_BULK_WRITE],
+        downsample_states=conf[CONF_DOWNSAMPLE_STATES],
+        partition_interval=conf.get(CONF_PARTITION_INTERVAL),
+        read_uri=conf.get(CONF_DB_READ_URL),
+        read_max_lag=conf[CONF_DB_READ_MAX_LAG],
     )
     get_instance.cache_clear()
     instance.async_initialize()
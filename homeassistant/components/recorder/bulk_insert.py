@@ -0,0 +1,222 @@
+"""Buffer new rows and write them with multi-row INSERTs on commit."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+import logging
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session
+
+from homeassistant.util.collection import chunked_or_all
+
+from .db_schema import Base, EventData, Events, StateAttributes, States
+
+if TYPE_CHECKING:
+    from .core import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _event_data_row(db_event_data: EventData) -> dict[str, Any]:
+    """Return the insert parameters for an EventData row."""
+    return {
+        "hash": db_event_data.hash,
+        "shared_data": db_event_data.shared_data,
+        "ref_count": db_event_data.ref_count,
+    }
+
+
+def _state_attributes_row(db_state_attributes: StateAttributes) -> dict[str, Any]:
+    """Return the insert parameters for a StateAttributes row."""
+    return {
+        "hash": db_state_attributes.hash,
+        "shared_attrs": db_state_attributes.shared_attrs,
+        "ref_count": db_state_attributes.ref_count,
+    }
+
+
+def _events_row(dbevent: Events) -> dict[str, Any]:
+    """Return the insert parameters for an Events row.
+
+    The relationships point to EventTypes and EventData rows that
+    have been assigned ids earlier in the same write.
+    """
+    event_data_rel = dbevent.event_data_rel
+    event_type_rel = dbevent.event_type_rel
+    return {
+        "origin_idx": dbevent.origin_idx,
+        "time_fired_ts": dbevent.time_fired_ts,
+        "context_id_bin": dbevent.context_id_bin,
+        "context_user_id_bin": dbevent.context_user_id_bin,
+        "context_parent_id_bin": dbevent.context_parent_id_bin,
+        "data_id": dbevent.data_id
+        if event_data_rel is None
+        else event_data_rel.data_id,
+        "event_type_id": dbevent.event_type_id
+        if event_type_rel is None
+        else event_type_rel.event_type_id,
+    }
+
+
+def _states_row(dbstate: States) -> dict[str, Any]:
+    """Return the insert parameters for a States row.
+
+    The relationships point to StatesMeta, StateAttributes and older
+    States rows that have been assigned ids earlier in the same write.
+    """
+    old_state = dbstate.old_state
+    state_attributes = dbstate.state_attributes
+    states_meta_rel = dbstate.states_meta_rel
+    return {
+        "entity_id": dbstate.entity_id,
+        "state": dbstate.state,
+        "last_updated_ts": dbstate.last_updated_ts,
+        "last_changed_ts": dbstate.last_changed_ts,
+        "last_reported_ts": dbstate.last_reported_ts,
+        "origin_idx": dbstate.origin_idx,
+        "context_id_bin": dbstate.context_id_bin,
+        "context_user_id_bin": dbstate.context_user_id_bin,
+        "context_parent_id_bin": dbstate.context_parent_id_bin,
+        "old_state_id": dbstate.old_state_id
+        if old_state is None
+        else old_state.state_id,
+        "attributes_id": dbstate.attributes_id
+        if state_attributes is None
+        else state_attributes.attributes_id,
+        "metadata_id": dbstate.metadata_id
+        if states_meta_rel is None
+        else states_meta_rel.metadata_id,
+    }
+
+
+class BulkInsertBuffer:
+    """Buffer new States, StateAttributes, Events and EventData rows.
+
+    Instead of adding every row to the event session and letting the
+    unit of work insert them one at a time, the rows are kept in the
+    buffer until the next commit and written with one multi-row
+    INSERT ... RETURNING per table. The returned primary keys are set
+    on the buffered objects so the table managers can move their
+    pending objects into the id maps exactly as they do after a
+    regular session commit.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the buffer."""
+        self.recorder = recorder
+        self._event_data: list[EventData] = []
+        self._state_attributes: list[StateAttributes] = []
+        self._events: list[Events] = []
+        self._states: list[States] = []
+        self._buffers: dict[type, list[Any]] = {
+            EventData: self._event_data,
+            StateAttributes: self._state_attributes,
+            Events: self._events,
+            States: self._states,
+        }
+
+    def add(self, obj: object) -> bool:
+        """Buffer an object if it is one of the bulk inserted tables.
+
+        Returns False if the object must be added to the session instead.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if (buffer := self._buffers.get(type(obj))) is None:
+            return False
+        buffer.append(obj)
+        return True
+
+    def write(self, session: Session) -> None:
+        """Write all buffered rows to the database.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        # StatesMeta and EventTypes are still added to the session
+        # since they are rarely created, flush them first so their
+        # ids are known when the rows that reference them are built.
+        session.flush()
+        dialect = session.get_bind().dialect
+        if not dialect.insert_executemany_returning_sort_by_parameter_order:
+            # Without RETURNING for executemany we cannot map the new ids
+            # back to the pending objects, let the unit of work do it.
+            for buffer in self._buffers.values():
+                session.add_all(buffer)
+            session.flush()
+            return
+        self._insert(session, EventData, self._event_data, _event_data_row, "data_id")
+        self._insert(
+            session,
+            StateAttributes,
+            self._state_attributes,
+            _state_attributes_row,
+            "attributes_id",
+        )
+        self._insert(session, Events, self._events, _events_row, "event_id")
+        # A state can only be linked to an older state of the same entity
+        # once the older state has been assigned its state_id. Entities that
+        # changed more than once since the last commit are written in waves,
+        # where each wave holds at most one state per entity.
+        waves: list[list[States]] = []
+        wave_by_state: dict[int, int] = {}
+        for dbstate in self._states:
+            wave = 0
+            if (old_state := dbstate.old_state) is not None and (
+                old_wave := wave_by_state.get(id(old_state))
+            ) is not None:
+                wave = old_wave + 1
+            wave_by_state[id(dbstate)] = wave
+            if wave == len(waves):
+                waves.append([])
+            waves[wave].append(dbstate)
+        for wave_states in waves:
+            self._insert(session, States, wave_states, _states_row, "state_id")
+
+    def _insert[_BaseT: Base](
+        self,
+        session: Session,
+        table: type[_BaseT],
+        objs: Sequence[_BaseT],
+        row_factory: Callable[[_BaseT], dict[str, Any]],
+        id_attr: str,
+    ) -> None:
+        """Insert objects and set their primary keys from RETURNING."""
+        if not objs:
+            return
+        stmt = insert(table).returning(
+            getattr(table, id_attr), sort_by_parameter_order=True
+        )
+        rows = [row_factory(obj) for obj in objs]
+        # Keep each statement below the maximum number of bind variables
+        rows_per_insert = max(1, self.recorder.max_bind_vars // len(rows[0]))
+        offset = 0
+        for chunk in chunked_or_all(rows, rows_per_insert):
+            for obj, (id_,) in zip(
+                objs[offset : offset + len(chunk)],
+                session.execute(stmt, chunk),
+                strict=True,
+            ):
+                setattr(obj, id_attr, id_)
+            offset += len(chunk)
+        _LOGGER.debug("Inserted %s rows into %s", len(rows), table.__tablename__)
+
+    def post_commit(self) -> None:
+        """Call after commit to clear the buffered rows.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        for buffer in self._buffers.values():
+            buffer.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self.post_commit()
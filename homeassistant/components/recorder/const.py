@@ -27,9 +27,16 @@ DOMAIN = "recorder"
 
 CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 
+# How many seconds the read database may be behind the
+# committed states before the queries read from db_url
+DEFAULT_DB_READ_MAX_LAG = 10
+
 MAX_QUEUE_BACKLOG_MIN_VALUE = 65000
 MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG = 256 * 1024**2
 
+# The memory the cached results of statistics queries may use
+STATISTICS_RESULT_CACHE_MAX_BYTES = 16 * 1024**2
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
@@ -59,6 +66,7 @@ CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
 LAST_REPORTED_SCHEMA_VERSION = 43
+REF_COUNT_SCHEMA_VERSION = 45
 
 LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 
@@ -79,3 +87,10 @@ class SupportedDialect(StrEnum):
     SQLITE = "sqlite"
     MYSQL = "mysql"
     POSTGRESQL = "postgresql"
+
+
+class PartitionInterval(StrEnum):
+    """Intervals of the partitions of the states and events tables."""
+
+    DAY = "day"
+    WEEK = "week"
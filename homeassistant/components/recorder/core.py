@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Callable, Iterable
-from concurrent.futures import CancelledError
+from concurrent.futures import CancelledError, Future
 import contextlib
 from datetime import datetime, timedelta
-from functools import cached_property
+from functools import cached_property, partial
 import logging
 import queue
 import sqlite3
@@ -22,6 +22,8 @@ from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
@@ -50,6 +52,7 @@ from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
 from . import migration, statistics
+from .bulk_insert import BulkInsertBuffer
 from .const import (
     DB_WORKER_PREFIX,
     DOMAIN,
@@ -61,9 +64,12 @@ from .const import (
     MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    REF_COUNT_SCHEMA_VERSION,
     SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
+    STATISTICS_RESULT_CACHE_MAX_BYTES,
     STATISTICS_ROWS_SCHEMA_VERSION,
+    PartitionInterval,
     SupportedDialect,
 )
 from .db_schema import (
@@ -81,14 +87,24 @@ from .db_schema import (
 from .executor import DBInterruptibleThreadPoolExecutor
 from .migration import (
     EntityIDMigration,
+    EventDataRefCountMigration,
     EventIDPostMigration,
     EventsContextIDMigration,
     EventTypeIDMigration,
+    StateAttributesRefCountMigration,
     StatesContextIDMigration,
+    StatisticsRollupMigration,
 )
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
+from .partition import partitions_supported, rollover_partitions
 from .pool import POOL_SIZE, MutexPool, RecorderPool
-from .queries import get_migration_changes
+from .purge import PurgeProgress
+from .queries import (
+    get_migration_changes,
+    has_short_term_statistics_since,
+    has_states_updated_since,
+)
+from .statistics_cache import StatisticsResultCache
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
@@ -106,6 +122,7 @@ from .tasks import (
     DatabaseLockTask,
     ImportStatisticsTask,
     KeepAliveTask,
+    PartitionTask,
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
@@ -126,6 +143,8 @@ from .util import (
     move_away_broken_database,
     session_scope,
     setup_connection_for_dialect,
+    setup_read_connection_for_dialect,
+    sqlite_read_only_url,
     validate_or_move_away_sqlite_database,
     write_lock_db_sqlite,
 )
@@ -156,6 +175,30 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 # Pool size must accommodate Recorder thread + All db executors
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
 
+# How often to check if the read database has caught up, in seconds
+READ_DATABASE_CHECK_INTERVAL = 10
+
+_MYSQL_URL_PREFIXES = (
+    MARIADB_URL_PREFIX,
+    MARIADB_PYMYSQL_URL_PREFIX,
+    MYSQLDB_URL_PREFIX,
+    MYSQLDB_PYMYSQL_URL_PREFIX,
+)
+
+
+def _mysql_connect_args(db_url: str) -> dict[str, Any]:
+    """Return the connect args for a MySQL database."""
+    connect_args: dict[str, Any] = {"charset": "utf8mb4"}
+    if db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
+        # If they have configured MySQLDB but don't have
+        # the MySQLDB module installed this will throw
+        # an ImportError which we suppress here since
+        # sqlalchemy will give them a better error when
+        # it tried to import it below.
+        with contextlib.suppress(ImportError):
+            connect_args["conv"] = build_mysqldb_conv()
+    return connect_args
+
 
 class Recorder(threading.Thread):
     """A threaded recorder class."""
@@ -174,6 +217,11 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        bulk_write: bool,
+        downsample_states: bool,
+        partition_interval: PartitionInterval | None,
+        read_uri: str | None,
+        read_max_lag: int,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -191,6 +239,11 @@ class Recorder(threading.Thread):
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        # Queries which only read use a separate engine if a read
+        # database is configured, the writes always go to db_url
+        self.db_read_url = read_uri
+        self.db_read_max_lag = read_max_lag
+        self.read_engine: Engine | None = None
         self.database_engine: DatabaseEngine | None = None
         # Database connection is ready, but non-live migration may be in progress
         db_connected: asyncio.Future[bool] = hass.data[DOMAIN].db_connected
@@ -209,6 +262,12 @@ class Recorder(threading.Thread):
         # by is_entity_recorder and the sensor recorder.
         self.entity_filter = entity_filter
         self.exclude_event_types = exclude_event_types
+        # When enabled, numeric states are downsampled into
+        # tiers when the short term statistics are compiled
+        self.downsample_states = downsample_states
+        # When set, the states and events tables are partitioned by
+        # this interval on databases which support partitioning
+        self.partition_interval = partition_interval
 
         self.schema_version = 0
         self._commits_without_expire = 0
@@ -221,14 +280,35 @@ class Recorder(threading.Thread):
         self.states_meta_manager = StatesMetaManager(self)
         self.state_attributes_manager = StateAttributesManager(self)
         self.statistics_meta_manager = StatisticsMetaManager(self)
+        self.statistics_result_cache = StatisticsResultCache(
+            STATISTICS_RESULT_CACHE_MAX_BYTES
+        )
+        # When bulk writes are enabled, new rows are buffered and written
+        # with multi-row INSERTs when the event session is committed
+        self._bulk_insert_buffer = BulkInsertBuffer(self) if bulk_write else None
+        # Progress of the last purge, None until a purge has run
+        self.purge_progress: PurgeProgress | None = None
 
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
+        self._get_read_session: Callable[[], Session] | None = None
+        self._read_database_checked_at = 0.0
+        self._read_database_current = False
+        # The last_updated_ts of the newest state in the event
+        # session and of the newest committed state
+        self._pending_states_ts: float | None = None
+        self._committed_states_ts: float | None = None
+        # The start of the newest committed short term statistics
+        # period and the time.monotonic() it was committed at
+        self._committed_statistics: tuple[float, float] | None = None
         self._completed_first_database_setup: bool | None = None
         self.async_migration_event = asyncio.Event()
         self.migration_in_progress = False
         self.migration_is_live = False
         self.use_legacy_events_index = False
+        # The daily and monthly statistics are read from the rollups once
+        # the existing hourly statistics have been rolled up
+        self.statistics_rollups_ready = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
 
@@ -276,6 +356,58 @@ class Recorder(threading.Thread):
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
 
+    def get_read_session(self) -> Session:
+        """Get a new sqlalchemy session for queries which only read.
+
+        The session reads from the read database if one is configured
+        and it has caught up to within db_read_max_lag seconds of the
+        states and short term statistics committed to the database,
+        otherwise from the database.
+        """
+        if self._get_read_session is None or not self._read_database_is_current():
+            return self.get_session()
+        return self._get_read_session()
+
+    def _read_database_is_current(self) -> bool:
+        """Return if the read database is current enough to read from.
+
+        The result is cached for READ_DATABASE_CHECK_INTERVAL seconds.
+        """
+        now = time.monotonic()
+        if now - self._read_database_checked_at < READ_DATABASE_CHECK_INTERVAL:
+            return self._read_database_current
+        self._read_database_checked_at = now
+        checks: list[StatementLambdaElement] = []
+        if (committed_ts := self._committed_states_ts) is not None:
+            checks.append(has_states_updated_since(committed_ts - self.db_read_max_lag))
+        if (committed_statistics := self._committed_statistics) is not None:
+            start_ts, committed_at = committed_statistics
+            if now - committed_at > self.db_read_max_lag:
+                checks.append(has_short_term_statistics_since(start_ts))
+        if not checks:
+            self._read_database_current = True
+            return True
+        assert self.read_engine is not None
+        try:
+            with self.read_engine.connect() as connection:
+                current = all(
+                    connection.execute(check).first() is not None for check in checks
+                )
+        except SQLAlchemyError:
+            _LOGGER.exception("Error checking the read database, reading from db_url")
+            current = False
+        if current != self._read_database_current:
+            _LOGGER.debug("Read database is current: %s", current)
+        self._read_database_current = current
+        return current
+
+    def statistics_committed(self, start: datetime) -> None:
+        """Record the short term statistics of a period have been committed.
+
+        Must be called in the recorder thread.
+        """
+        self._committed_statistics = (start.timestamp(), time.monotonic())
+
     def queue_task(self, task: RecorderTask | Event) -> None:
         """Add a task to the recorder queue."""
         self._queue.put(task)
@@ -333,9 +465,16 @@ class Recorder(threading.Thread):
             # Unknown what it is.
             queue_put(event)
 
-        self._event_listener = self.hass.bus.async_listen(
+        @callback
+        def _events_listener(events: list[Event]) -> None:
+            """Listen for a batch of new events and put them in the process queue."""
+            for event in events:
+                _event_listener(event)
+
+        self._event_listener = self.hass.bus.async_listen_batch(
             MATCH_ALL,
             _event_listener,
+            _events_listener,
         )
         self._queue_watcher = async_track_time_interval(
             self.hass,
@@ -367,6 +506,11 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    def add_executor_job[_T](self, target: Callable[..., _T], *args: Any) -> Future[_T]:
+        """Add an executor job from the recorder thread."""
+        assert self._db_executor is not None
+        return self._db_executor.submit(target, *args)
+
     def _stop_executor(self) -> None:
         """Stop the executor."""
         if self._db_executor is None:
@@ -533,6 +677,9 @@ class Recorder(threading.Thread):
             # until after the database is vacuumed
             repack = self.auto_repack and is_second_sunday(now)
             purge_before = dt_util.utcnow() - timedelta(days=self.keep_days)
+            if self.partition_interval and partitions_supported(self):
+                # Start the new partitions before the expired ones are dropped
+                self.queue_task(PartitionTask())
             self.queue_task(PurgeTask(purge_before, repack=repack, apply_filter=False))
         else:
             self.queue_task(PerodicCleanupTask())
@@ -703,7 +850,10 @@ class Recorder(threading.Thread):
     def _add_to_session(self, session: Session, obj: object) -> None:
         """Add an object to the session."""
         self._event_session_has_pending_writes = True
-        session.add(obj)
+        if (
+            bulk_insert_buffer := self._bulk_insert_buffer
+        ) is None or not bulk_insert_buffer.add(obj):
+            session.add(obj)
 
     def _notify_migration_failed(self) -> None:
         """Notify the user schema migration failed."""
@@ -820,10 +970,23 @@ class Recorder(threading.Thread):
                 EventTypeIDMigration,
                 EntityIDMigration,
                 EventIDPostMigration,
+                StateAttributesRefCountMigration,
+                EventDataRefCountMigration,
+                StatisticsRollupMigration,
             ):
                 migrator = migrator_cls(schema_status.start_version, migration_changes)
                 migrator.do_migrate(self, session)
 
+        if self.partition_interval:
+            if partitions_supported(self):
+                self.queue_task(PartitionTask())
+            else:
+                _LOGGER.warning(
+                    "Partitioning the states and events tables is not supported "
+                    "with %s, old rows will be purged row by row",
+                    self.dialect_name,
+                )
+
         # We must only set the db ready after we have set the table managers
         # to active if there is no data to migrate.
         #
@@ -1078,15 +1241,21 @@ class Recorder(threading.Thread):
         # Matching attributes found in the pending commit
         if pending_event_data := event_data_manager.get_pending(shared_data):
             dbevent.event_data_rel = pending_event_data
+            if pending_event_data.ref_count is not None:
+                pending_event_data.ref_count += 1
         # Matching attributes id found in the cache
         elif (data_id := event_data_manager.get_from_cache(shared_data)) or (
             (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
             and (data_id := event_data_manager.get(shared_data, hash_, session))
         ):
             dbevent.data_id = data_id
+            if self.schema_version >= REF_COUNT_SCHEMA_VERSION:
+                event_data_manager.add_reference(data_id)
         else:
             # No matching attributes found, save them in the DB
             dbevent_data = EventData(shared_data=shared_data, hash=hash_)
+            if self.schema_version >= REF_COUNT_SCHEMA_VERSION:
+                dbevent_data.ref_count = 1
             event_data_manager.add_pending(dbevent_data)
             self._add_to_session(session, dbevent_data)
             dbevent.event_data_rel = dbevent_data
@@ -1103,6 +1272,7 @@ class Recorder(threading.Thread):
         entity_id = event.data["entity_id"]
 
         dbstate = States.from_event(event)
+        self._pending_states_ts = dbstate.last_updated_ts
         old_state = event.data["old_state"]
 
         assert self.event_session is not None
@@ -1155,6 +1325,8 @@ class Recorder(threading.Thread):
         # Matching attributes found in the pending commit
         if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
             dbstate.state_attributes = pending_event_data
+            if pending_event_data.ref_count is not None:
+                pending_event_data.ref_count += 1
         # Matching attributes id found in the cache
         elif (
             attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
@@ -1167,9 +1339,13 @@ class Recorder(threading.Thread):
             )
         ):
             dbstate.attributes_id = attributes_id
+            if self.schema_version >= REF_COUNT_SCHEMA_VERSION:
+                state_attributes_manager.add_reference(attributes_id)
         else:
             # No matching attributes found, save them in the DB
             dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
+            if self.schema_version >= REF_COUNT_SCHEMA_VERSION:
+                dbstate_attributes.ref_count = 1
             state_attributes_manager.add_pending(dbstate_attributes)
             self._add_to_session(session, dbstate_attributes)
             dbstate.state_attributes = dbstate_attributes
@@ -1222,6 +1398,9 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        if self._bulk_insert_buffer is not None:
+            self._bulk_insert_buffer.write(session)
+
         if (
             pending_last_reported
             := self.states_manager.get_pending_last_reported_timestamp()
@@ -1237,9 +1416,16 @@ class Recorder(threading.Thread):
                         for state_id, last_reported_timestamp in pending_last_reported.items()
                     ],
                 )
+        if self.schema_version >= REF_COUNT_SCHEMA_VERSION:
+            with session.no_autoflush:
+                self.state_attributes_manager.write_pending_references(session)
+                self.event_data_manager.write_pending_references(session)
         session.commit()
 
         self._event_session_has_pending_writes = False
+        if self._pending_states_ts is not None:
+            self._committed_states_ts = self._pending_states_ts
+            self._pending_states_ts = None
         # We just committed the state attributes to the database
         # and we now know the attributes_ids.  We can save
         # many selects for matching attributes by loading them
@@ -1249,6 +1435,8 @@ class Recorder(threading.Thread):
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        if self._bulk_insert_buffer is not None:
+            self._bulk_insert_buffer.post_commit()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1277,6 +1465,8 @@ class Recorder(threading.Thread):
         self.event_type_manager.reset()
         self.states_meta_manager.reset()
         self.statistics_meta_manager.reset()
+        if self._bulk_insert_buffer is not None:
+            self._bulk_insert_buffer.reset()
 
         if not self.event_session:
             return
@@ -1305,6 +1495,16 @@ class Recorder(threading.Thread):
         """Post migrate entity_ids if needed."""
         return migration.post_migrate_entity_ids(self)
 
+    def _maintain_partitions(self) -> bool:
+        """Partition the tables and start new partitions when due.
+
+        Returns False if there is more work to do.
+        """
+        if not migration.partition_tables(self):
+            return False
+        rollover_partitions(self)
+        return True
+
     def _send_keep_alive(self) -> None:
         """Send a keep alive to keep the db connection open."""
         assert self.event_session is not None
@@ -1414,23 +1614,8 @@ class Recorder(threading.Thread):
             kwargs["recorder_and_worker_thread_ids"] = (
                 self.recorder_and_worker_thread_ids
             )
-        elif self.db_url.startswith(
-            (
-                MARIADB_URL_PREFIX,
-                MARIADB_PYMYSQL_URL_PREFIX,
-                MYSQLDB_URL_PREFIX,
-                MYSQLDB_PYMYSQL_URL_PREFIX,
-            )
-        ):
-            kwargs["connect_args"] = {"charset": "utf8mb4"}
-            if self.db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
-                # If they have configured MySQLDB but don't have
-                # the MySQLDB module installed this will throw
-                # an ImportError which we suppress here since
-                # sqlalchemy will give them a better error when
-                # it tried to import it below.
-                with contextlib.suppress(ImportError):
-                    kwargs["connect_args"]["conv"] = build_mysqldb_conv()
+        elif self.db_url.startswith(_MYSQL_URL_PREFIXES):
+            kwargs["connect_args"] = _mysql_connect_args(self.db_url)
 
         # Disable extended logging for non SQLite databases
         if not self.db_url.startswith(SQLITE_URL_PREFIX):
@@ -1449,9 +1634,54 @@ class Recorder(threading.Thread):
         Base.metadata.create_all(self.engine)
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
+        if self.db_read_url:
+            self._setup_read_connection(self.db_read_url)
+
+    def _setup_read_connection(self, read_url: str) -> None:
+        """Set up the engine for the queries which only read."""
+        assert self.engine is not None
+        kwargs: dict[str, Any] = {"echo": False}
+        if read_url.startswith(SQLITE_URL_PREFIX):
+            if read_url == SQLITE_URL_PREFIX or ":memory:" in read_url:
+                _LOGGER.error(
+                    "An in memory database can not be used as db_read_url, "
+                    "reading from db_url"
+                )
+                return
+            # A pool of read-only connections, the WAL journal
+            # allows them to read while the recorder writes
+            read_url = sqlite_read_only_url(read_url)
+            kwargs["connect_args"] = {"check_same_thread": False}
+            kwargs["poolclass"] = QueuePool
+            kwargs["pool_size"] = POOL_SIZE
+        elif read_url.startswith(_MYSQL_URL_PREFIXES):
+            kwargs["connect_args"] = _mysql_connect_args(read_url)
+
+        read_engine = create_engine(read_url, **kwargs, future=True)
+        if read_engine.dialect.name != self.engine.dialect.name:
+            _LOGGER.error(
+                "db_read_url must use the same database engine as db_url, "
+                "reading from db_url"
+            )
+            read_engine.dispose()
+            return
+        sqlalchemy_event.listen(
+            read_engine,
+            "connect",
+            partial(setup_read_connection_for_dialect, read_engine.dialect.name),
+        )
+        self.read_engine = read_engine
+        self._get_read_session = scoped_session(
+            sessionmaker(bind=read_engine, future=True)
+        )
+        _LOGGER.debug("Connected to recorder read database")
 
     def _close_connection(self) -> None:
         """Close the connection."""
+        if self.read_engine:
+            self.read_engine.dispose()
+            self.read_engine = None
+        self._get_read_session = None
         if self.engine:
             self.engine.dispose()
             self.engine = None
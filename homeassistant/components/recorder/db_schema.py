@@ -77,7 +77,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 44
+SCHEMA_VERSION = 45
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -94,6 +94,10 @@ TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 TABLE_MIGRATION_CHANGES = "migration_changes"
+TABLE_STATES_DOWNSAMPLED_1M = "states_downsampled_1m"
+TABLE_STATES_DOWNSAMPLED_15M = "states_downsampled_15m"
+TABLE_STATISTICS_DAY = "statistics_day"
+TABLE_STATISTICS_MONTH = "statistics_month"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
 
@@ -116,6 +120,10 @@ ALL_TABLES = [
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATES_DOWNSAMPLED_1M,
+    TABLE_STATES_DOWNSAMPLED_15M,
+    TABLE_STATISTICS_DAY,
+    TABLE_STATISTICS_MONTH,
 ]
 
 TABLES_TO_CHECK = [
@@ -125,6 +133,13 @@ TABLES_TO_CHECK = [
     TABLE_SCHEMA_CHANGES,
 ]
 
+# The tables that are partitioned when a partition interval is configured,
+# mapped to the id column the partitions are ranges of. The ids increase
+# with the time the rows are written, so each partition holds the rows of
+# one interval. statistics_short_term is not partitioned since its unique
+# (metadata_id, start_ts) index would have to include the id column.
+PARTITIONED_TABLES = {TABLE_STATES: "state_id", TABLE_EVENTS: "event_id"}
+
 LAST_UPDATED_INDEX_TS = "ix_states_last_updated_ts"
 METADATA_ID_LAST_UPDATED_INDEX_TS = "ix_states_metadata_id_last_updated_ts"
 EVENTS_CONTEXT_ID_BIN_INDEX = "ix_events_context_id_bin"
@@ -361,6 +376,8 @@ class EventData(Base):
     shared_data: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
+    # The number of events referencing the row, None if it has not been counted
+    ref_count: Mapped[int | None] = mapped_column(Integer)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -587,6 +604,8 @@ class StateAttributes(Base):
     shared_attrs: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
+    # The number of states referencing the row, None if it has not been counted
+    ref_count: Mapped[int | None] = mapped_column(Integer)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -669,6 +688,61 @@ class StatesMeta(Base):
         )
 
 
+class StatesDownsampledBase:
+    """Downsampled numeric states base class.
+
+    Each row summarizes the numeric states of an entity
+    during a bucket of the duration of the tier.
+    """
+
+    id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
+    metadata_id: Mapped[int] = mapped_column(
+        ID_TYPE,
+        ForeignKey(f"{TABLE_STATES_META}.metadata_id", ondelete="CASCADE"),
+    )
+    start_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE, index=True)
+    min: Mapped[float] = mapped_column(DOUBLE_TYPE)
+    max: Mapped[float] = mapped_column(DOUBLE_TYPE)
+    last: Mapped[float] = mapped_column(DOUBLE_TYPE)
+
+    __tablename__: str
+    duration: timedelta
+
+
+class StatesDownsampled1m(Base, StatesDownsampledBase):
+    """Numeric states downsampled to 1-minute buckets."""
+
+    duration = timedelta(minutes=1)
+
+    __table_args__ = (
+        Index(
+            "ix_states_downsampled_1m_metadata_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATES_DOWNSAMPLED_1M
+
+
+class StatesDownsampled15m(Base, StatesDownsampledBase):
+    """Numeric states downsampled to 15-minute buckets."""
+
+    duration = timedelta(minutes=15)
+
+    __table_args__ = (
+        Index(
+            "ix_states_downsampled_15m_metadata_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATES_DOWNSAMPLED_15M
+
+
 class StatisticsBase:
     """Statistics base class."""
 
@@ -769,6 +843,49 @@ class StatisticsShortTerm(Base, _StatisticsShortTerm):
     )
 
 
+class StatisticsDay(Base, StatisticsBase):
+    """Long term statistics rolled up per local day.
+
+    The rows are compiled from the hourly statistics once a day is complete,
+    the end of a period is found with reduce_day_ts_factory since a day is
+    not always 24 hours long.
+    """
+
+    duration = timedelta(days=1)
+
+    __table_args__ = (
+        Index(
+            "ix_statistics_day_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_DAY
+
+
+class StatisticsMonth(Base, StatisticsBase):
+    """Long term statistics rolled up per local month.
+
+    The rows are compiled from the hourly statistics once a month is complete,
+    the end of a period is found with reduce_month_ts_factory.
+    """
+
+    duration = timedelta(days=31)
+
+    __table_args__ = (
+        Index(
+            "ix_statistics_month_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_MONTH
+
+
 class LegacyStatisticsShortTerm(LegacyBase, _StatisticsShortTerm):
     """Short term statistics with 32-bit index, used for schema migration."""
 
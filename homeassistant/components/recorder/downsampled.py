@@ -0,0 +1,223 @@
+"""Downsampled numeric states for long-range history."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+import logging
+import math
+from typing import Any
+
+from sqlalchemy import func, insert, lambda_stmt, select
+from sqlalchemy.engine.row import Row
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from .db_schema import (
+    States,
+    StatesDownsampled1m,
+    StatesDownsampled15m,
+    StatesDownsampledBase,
+)
+from .util import execute_stmt_lambda_element
+
+_LOGGER = logging.getLogger(__name__)
+
+# The tiers ordered from the finest to the coarsest
+DOWNSAMPLED_TIERS: tuple[type[StatesDownsampledBase], ...] = (
+    StatesDownsampled1m,
+    StatesDownsampled15m,
+)
+
+# The period compiled by each run, it matches the short term statistics
+COMPILE_PERIOD = timedelta(minutes=5)
+
+
+def _numeric_states_stmt(start_ts: float, end_ts: float) -> StatementLambdaElement:
+    """Generate the statement to fetch the states of a period."""
+    return lambda_stmt(
+        lambda: select(States.metadata_id, States.last_updated_ts, States.state)
+        .filter(States.last_updated_ts >= start_ts)
+        .filter(States.last_updated_ts < end_ts)
+        .filter(States.metadata_id.is_not(None))
+        .order_by(States.metadata_id, States.last_updated_ts)
+    )
+
+
+def _tier_buckets_stmt(
+    tier: type[StatesDownsampledBase], start_ts: float, end_ts: float
+) -> StatementLambdaElement:
+    """Generate the statement to fetch the buckets of a tier during a period."""
+    return lambda_stmt(
+        lambda: select(tier.metadata_id, tier.start_ts, tier.min, tier.max, tier.last)
+        .filter(tier.start_ts >= start_ts)
+        .filter(tier.start_ts < end_ts)
+        .order_by(tier.metadata_id, tier.start_ts),
+        track_on=[tier],
+    )
+
+
+def _tier_buckets_for_metadata_ids_stmt(
+    tier: type[StatesDownsampledBase],
+    start_ts: float,
+    end_ts: float,
+    metadata_ids: list[int],
+) -> StatementLambdaElement:
+    """Generate the statement to fetch the buckets of some entities."""
+    return lambda_stmt(
+        lambda: select(tier.metadata_id, tier.start_ts, tier.min, tier.max, tier.last)
+        .filter(tier.metadata_id.in_(metadata_ids))
+        .filter(tier.start_ts >= start_ts)
+        .filter(tier.start_ts < end_ts)
+        .order_by(tier.metadata_id, tier.start_ts),
+        track_on=[tier],
+    )
+
+
+def _numeric_value(state: str | None) -> float | None:
+    """Return the state as a finite float or None if it is not numeric."""
+    if state is None:
+        return None
+    try:
+        value = float(state)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _downsample(
+    rows: Iterable[Sequence[Any]],
+    start_ts: float,
+    duration: float,
+) -> list[dict[str, Any]]:
+    """Summarize rows into buckets.
+
+    The rows are (metadata_id, start_ts, min, max, last) and
+    must be sorted by metadata_id and start_ts.
+    """
+    buckets: list[dict[str, Any]] = []
+    bucket: dict[str, Any] | None = None
+    for metadata_id, row_start_ts, row_min, row_max, row_last in rows:
+        bucket_start_ts = start_ts + (row_start_ts - start_ts) // duration * duration
+        if (
+            bucket is None
+            or bucket["metadata_id"] != metadata_id
+            or bucket["start_ts"] != bucket_start_ts
+        ):
+            bucket = {
+                "metadata_id": metadata_id,
+                "start_ts": bucket_start_ts,
+                "min": row_min,
+                "max": row_max,
+                "last": row_last,
+            }
+            buckets.append(bucket)
+            continue
+        if row_min < bucket["min"]:
+            bucket["min"] = row_min
+        if row_max > bucket["max"]:
+            bucket["max"] = row_max
+        bucket["last"] = row_last
+    return buckets
+
+
+def _insert_buckets(
+    session: Session,
+    tier: type[StatesDownsampledBase],
+    buckets: list[dict[str, Any]],
+) -> None:
+    """Insert the buckets of a tier."""
+    if not buckets:
+        return
+    session.execute(insert(tier), buckets)
+    _LOGGER.debug("Inserted %s rows into %s", len(buckets), tier.__tablename__)
+
+
+def compile_downsampled_states(session: Session, start: datetime) -> None:
+    """Compile the downsampled states for a 5-minute period.
+
+    The 1-minute tier is compiled from the numeric states of the
+    period. Once the last period of a quarter hour has been compiled,
+    the quarter hour is summarized from the 1-minute tier into
+    the 15-minute tier.
+    """
+    start_ts = start.timestamp()
+    end = start + COMPILE_PERIOD
+    end_ts = end.timestamp()
+    _insert_buckets(
+        session,
+        StatesDownsampled1m,
+        _downsample(
+            (
+                (metadata_id, last_updated_ts, value, value, value)
+                for metadata_id, last_updated_ts, state in execute_stmt_lambda_element(
+                    session, _numeric_states_stmt(start_ts, end_ts)
+                )
+                if (value := _numeric_value(state)) is not None
+            ),
+            start_ts,
+            StatesDownsampled1m.duration.total_seconds(),
+        ),
+    )
+    if end.minute % 15:
+        return
+    # The buckets of the 1-minute tier must be visible to the query
+    session.flush()
+    quarter_start_ts = (end - StatesDownsampled15m.duration).timestamp()
+    _insert_buckets(
+        session,
+        StatesDownsampled15m,
+        _downsample(
+            execute_stmt_lambda_element(
+                session,
+                _tier_buckets_stmt(StatesDownsampled1m, quarter_start_ts, end_ts),
+            ),
+            quarter_start_ts,
+            StatesDownsampled15m.duration.total_seconds(),
+        ),
+    )
+
+
+def select_downsampled_tier(
+    session: Session, start_ts: float, end_ts: float, max_points: int
+) -> tuple[type[StatesDownsampledBase], float, float] | None:
+    """Select the tier to draw a period with at most about max_points per entity.
+
+    The coarsest tier that is at least as fine as the requested resolution
+    is selected. Returns the tier and the start and end of the buckets that
+    lie within the period and have been compiled, or None if the raw states
+    should be used instead.
+    """
+    resolution = (end_ts - start_ts) / max_points
+    for tier in reversed(DOWNSAMPLED_TIERS):
+        duration = tier.duration.total_seconds()
+        if duration > resolution:
+            continue
+        oldest_ts, newest_ts = session.execute(
+            select(func.min(tier.start_ts), func.max(tier.start_ts))
+        ).one()
+        if oldest_ts is None or oldest_ts > start_ts:
+            # The tier does not cover the whole period
+            continue
+        first_bucket_ts = math.ceil(start_ts / duration) * duration
+        end_bucket_ts = min(newest_ts + duration, end_ts // duration * duration)
+        if first_bucket_ts >= end_bucket_ts:
+            return None
+        return tier, first_bucket_ts, end_bucket_ts
+    return None
+
+
+def get_downsampled_buckets(
+    session: Session,
+    tier: type[StatesDownsampledBase],
+    start_ts: float,
+    end_ts: float,
+    metadata_ids: list[int],
+) -> list[Row]:
+    """Return the buckets of the entities sorted by metadata_id and start_ts."""
+    return list(
+        execute_stmt_lambda_element(
+            session,
+            _tier_buckets_for_metadata_ids_stmt(tier, start_ts, end_ts, metadata_ids),
+        )
+    )
@@ -2,33 +2,46 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
 from sqlalchemy.orm.session import Session
 
 from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers.json import json_bytes
 
 from ... import recorder
 from ..filters import Filters
+from ..util import DEFAULT_YIELD_STATES_ROWS
+from .columnar import (
+    get_significant_states_compressed_json as _columnar_get_significant_states_compressed_json,
+)
 from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS
 from .modern import (
+    NumericStatesAggregate,
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
     get_last_state_changes as _modern_get_last_state_changes,
+    get_numeric_states_aggregates_with_session as _modern_get_numeric_states_aggregates_with_session,
     get_significant_states as _modern_get_significant_states,
     get_significant_states_with_session as _modern_get_significant_states_with_session,
     state_changes_during_period as _modern_state_changes_during_period,
+    stream_significant_states_with_session as _modern_stream_significant_states_with_session,
 )
 
 # These are the APIs of this package
 __all__ = [
     "NEED_ATTRIBUTE_DOMAINS",
     "SIGNIFICANT_DOMAINS",
+    "NumericStatesAggregate",
     "get_full_significant_states_with_session",
     "get_last_state_changes",
+    "get_numeric_states_aggregates_with_session",
     "get_significant_states",
+    "get_significant_states_compressed_json",
     "get_significant_states_with_session",
     "state_changes_during_period",
+    "stream_significant_states_with_session",
 ]
 
 
@@ -80,6 +93,22 @@ def get_last_state_changes(
     return _target(hass, number_of_states, entity_id)
 
 
+def get_numeric_states_aggregates_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime,
+    entity_ids: list[str],
+) -> dict[str, NumericStatesAggregate]:
+    """Return the aggregates of the numeric states during a period."""
+    if not recorder.get_instance(hass).states_meta_manager.active:
+        # The legacy schema is not aggregated, the states are fetched instead
+        return {}
+    return _modern_get_numeric_states_aggregates_with_session(
+        hass, session, start_time, end_time, entity_ids
+    )
+
+
 def get_significant_states(
     hass: HomeAssistant,
     start_time: datetime,
@@ -91,6 +120,7 @@ def get_significant_states(
     minimal_response: bool = False,
     no_attributes: bool = False,
     compressed_state_format: bool = False,
+    max_points: int | None = None,
 ) -> dict[str, list[State | dict[str, Any]]]:
     """Return a dict of significant states during a time period."""
     if not recorder.get_instance(hass).states_meta_manager.active:
@@ -98,10 +128,20 @@ def get_significant_states(
             get_significant_states as _legacy_get_significant_states,
         )
 
-        _target = _legacy_get_significant_states
-    else:
-        _target = _modern_get_significant_states
-    return _target(
+        # The legacy schema has no downsampled tiers
+        return _legacy_get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+        )
+    return _modern_get_significant_states(
         hass,
         start_time,
         end_time,
@@ -112,6 +152,53 @@ def get_significant_states(
         minimal_response,
         no_attributes,
         compressed_state_format,
+        max_points,
+    )
+
+
+def get_significant_states_compressed_json(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> bytes:
+    """Return the significant states during a time period as compressed JSON.
+
+    Rows are fetched into columns and encoded without building
+    a State or dict per row.
+    """
+    if not recorder.get_instance(hass).states_meta_manager.active:
+        from .legacy import (  # pylint: disable=import-outside-toplevel
+            get_significant_states as _legacy_get_significant_states,
+        )
+
+        return json_bytes(
+            _legacy_get_significant_states(
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                None,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+                True,
+            )
+        )
+    return _columnar_get_significant_states_compressed_json(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
     )
 
 
@@ -127,6 +214,7 @@ def get_significant_states_with_session(
     minimal_response: bool = False,
     no_attributes: bool = False,
     compressed_state_format: bool = False,
+    max_points: int | None = None,
 ) -> dict[str, list[State | dict[str, Any]]]:
     """Return a dict of significant states during a time period."""
     if not recorder.get_instance(hass).states_meta_manager.active:
@@ -134,10 +222,21 @@ def get_significant_states_with_session(
             get_significant_states_with_session as _legacy_get_significant_states_with_session,
         )
 
-        _target = _legacy_get_significant_states_with_session
-    else:
-        _target = _modern_get_significant_states_with_session
-    return _target(
+        # The legacy schema has no downsampled tiers
+        return _legacy_get_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+        )
+    return _modern_get_significant_states_with_session(
         hass,
         session,
         start_time,
@@ -149,6 +248,58 @@ def get_significant_states_with_session(
         minimal_response,
         no_attributes,
         compressed_state_format,
+        max_points,
+    )
+
+
+def stream_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+    states_per_chunk: int = DEFAULT_YIELD_STATES_ROWS,
+) -> Iterator[dict[str, list[State | dict[str, Any]]]]:
+    """Yield the significant states during a time period in chunks."""
+    if not recorder.get_instance(hass).states_meta_manager.active:
+        from .legacy import (  # pylint: disable=import-outside-toplevel
+            get_significant_states_with_session as _legacy_get_significant_states_with_session,
+        )
+
+        # The legacy schema is only used until the migration
+        # has finished, so the result is not worth chunking.
+        if states := _legacy_get_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+        ):
+            yield states
+        return
+    yield from _modern_stream_significant_states_with_session(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        compressed_state_format,
+        states_per_chunk,
     )
 
 
@@ -0,0 +1,365 @@
+"""Columnar significant states for large history responses.
+
+Instead of building a State or dict for every row, the rows of each
+entity are transposed into array backed columns and encoded straight
+to the compressed state JSON format used by the websocket api.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import compress, groupby
+import logging
+from operator import itemgetter, ne
+from typing import Any
+
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from homeassistant.core import HomeAssistant, split_entity_id
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads_object
+
+from ..models.state_attributes import EMPTY_JSON_OBJECT
+from ..util import session_scope
+from .const import NEED_ATTRIBUTE_DOMAINS
+from .modern import _significant_states_query
+
+_LOGGER = logging.getLogger(__name__)
+
+# The number of rows to fetch from the cursor at a time
+FETCH_ROWS_PER_BATCH = 10000
+
+_STATE_IDX = 1
+_LAST_UPDATED_TS_IDX = 2
+_LAST_CHANGED_TS_IDX = 3
+
+_FULL_ROW_WITH_ATTRIBUTES = b'{"s":%s,"a":%s,"lu":%s%s}'
+_FULL_ROW = b'{"s":%s,"lu":%s%s}'
+_MINIMAL_ROW = b'{"s":%s,"lu":%s}'
+_LAST_CHANGED = b',"lc":'
+
+
+@dataclass(slots=True)
+class EntityHistoryColumns:
+    """The significant states of an entity stored as columns.
+
+    States and attributes are interned per entity, the rows only
+    hold an index into the tables. Only the first full_rows rows
+    carry attributes and last_changed, the remaining rows were
+    reduced to state and last_updated by minimal_response.
+    """
+
+    states: list[str]
+    state_idx: array[int]
+    last_updated_ts: array[float]
+    full_rows: int
+    last_changed_ts: array[float] | None = None
+    attributes: list[str] | None = None
+    attributes_idx: array[int] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.state_idx)
+
+
+class _Interner(dict[str, int]):
+    """Map each distinct value to its index in insertion order."""
+
+    def __missing__(self, key: str) -> int:
+        """Add a new value."""
+        self[key] = idx = len(self)
+        return idx
+
+
+def _validated_attributes(source: str | None) -> str:
+    """Return the attributes JSON from a row source or an empty object."""
+    if not source or source == EMPTY_JSON_OBJECT:
+        return EMPTY_JSON_OBJECT
+    try:
+        json_loads_object(source)
+    except ValueError:
+        _LOGGER.exception("Error converting row to state attributes: %s", source)
+        return EMPTY_JSON_OBJECT
+    return source
+
+
+class _EntityColumnsBuilder:
+    """Build the columns of an entity from batches of rows."""
+
+    __slots__ = (
+        "_states",
+        "_state_idx",
+        "_last_updated_ts",
+        "_last_changed_ts",
+        "_attributes",
+        "_attributes_idx",
+        "_minimal_response",
+        "_no_attributes",
+    )
+
+    def __init__(
+        self,
+        minimal_response: bool,
+        include_last_changed: bool,
+        include_attributes: bool,
+        no_attributes: bool,
+    ) -> None:
+        """Initialize the builder."""
+        self._states = _Interner()
+        self._state_idx: array[int] = array("I")
+        self._last_updated_ts: array[float] = array("d")
+        self._last_changed_ts: list[float | None] | None = (
+            [] if include_last_changed else None
+        )
+        self._attributes: _Interner | None = _Interner() if include_attributes else None
+        self._attributes_idx: array[int] = array("I")
+        self._minimal_response = minimal_response
+        self._no_attributes = no_attributes
+
+    def extend(self, rows: Sequence[tuple[Any, ...]]) -> None:
+        """Add a batch of rows."""
+        columns = tuple(zip(*rows, strict=True))
+        # With minimal_response only the first row is complete
+        full_rows = (
+            (0 if self._state_idx else 1) if self._minimal_response else len(rows)
+        )
+        self._state_idx.extend(map(self._states.__getitem__, columns[_STATE_IDX]))
+        self._last_updated_ts.extend(columns[_LAST_UPDATED_TS_IDX])
+        if not full_rows:
+            return
+        if self._last_changed_ts is not None:
+            self._last_changed_ts.extend(columns[_LAST_CHANGED_TS_IDX][:full_rows])
+        if self._attributes is not None and not self._no_attributes:
+            self._attributes_idx.extend(
+                map(self._attributes.__getitem__, columns[-1][:full_rows])
+            )
+
+    def finish(self, start_time_ts: float | None) -> EntityHistoryColumns:
+        """Return the columns of the entity."""
+        state_idx = self._state_idx
+        last_updated_ts = self._last_updated_ts
+        if start_time_ts is not None and not last_updated_ts[0]:
+            # The start time state is selected with a last_updated_ts of 0
+            last_updated_ts[0] = start_time_ts
+        full_rows = len(state_idx)
+        if self._minimal_response:
+            # Only the first row is complete, the following rows
+            # are reduced to the changes of the state
+            full_rows = 1
+            keep = [
+                0,
+                *compress(range(1, len(state_idx)), map(ne, state_idx[1:], state_idx)),
+            ]
+            if len(keep) != len(state_idx):
+                state_idx = array("I", map(state_idx.__getitem__, keep))
+                last_updated_ts = array("d", map(last_updated_ts.__getitem__, keep))
+        columns = EntityHistoryColumns(
+            list(self._states), state_idx, last_updated_ts, full_rows
+        )
+        if self._last_changed_ts is not None:
+            columns.last_changed_ts = array(
+                "d",
+                [last_changed_ts or 0.0 for last_changed_ts in self._last_changed_ts],
+            )
+        if self._attributes is not None:
+            if self._no_attributes:
+                columns.attributes = [EMPTY_JSON_OBJECT]
+                columns.attributes_idx = array("I", [0]) * full_rows
+            else:
+                columns.attributes = [
+                    _validated_attributes(source) for source in self._attributes
+                ]
+                columns.attributes_idx = self._attributes_idx
+        return columns
+
+
+def _fetch_row_batches(
+    session: Session, stmt: StatementLambdaElement
+) -> Iterator[Sequence[tuple[Any, ...]]]:
+    """Fetch the rows in batches of plain tuples.
+
+    The rows are fetched from the DBAPI cursor to avoid creating
+    a Row object for every row since all selected columns
+    are native types.
+    """
+    result = session.connection().execute(stmt)
+    try:
+        cursor = result.cursor
+        while rows := cursor.fetchmany(FETCH_ROWS_PER_BATCH):
+            yield rows
+    finally:
+        result.close()
+
+
+def get_significant_states_columns_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> dict[str, EntityHistoryColumns]:
+    """Return the significant states during a time period as columns.
+
+    The result is the columnar equivalent of get_significant_states_with_session
+    with compressed_state_format.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    if not (
+        query := _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ):
+        return {}
+    stmt, start_time_ts, entity_id_to_metadata_id = query
+    metadata_id_to_entity_id = {
+        metadata_id: entity_id
+        for entity_id, metadata_id in entity_id_to_metadata_id.items()
+        if metadata_id is not None
+    }
+    include_last_changed = not significant_changes_only
+    builders: dict[str, _EntityColumnsBuilder] = {}
+    for rows in _fetch_row_batches(session, stmt):
+        for metadata_id, group in groupby(rows, itemgetter(0)):
+            entity_id = metadata_id_to_entity_id[metadata_id]
+            if (builder := builders.get(entity_id)) is None:
+                entity_minimal_response = (
+                    minimal_response
+                    and split_entity_id(entity_id)[0] not in NEED_ATTRIBUTE_DOMAINS
+                )
+                builders[entity_id] = builder = _EntityColumnsBuilder(
+                    entity_minimal_response,
+                    include_last_changed,
+                    # The reduced first row only has attributes
+                    # when they were selected
+                    not entity_minimal_response or not no_attributes,
+                    no_attributes,
+                )
+            builder.extend(list(group))
+    # Maintain the order of the requested entity_ids
+    return {
+        entity_id: builders[entity_id].finish(start_time_ts)
+        for entity_id in entity_ids
+        if entity_id in builders
+    }
+
+
+def _json_floats(values: array[float]) -> list[bytes]:
+    """Encode floats to JSON with a single call to the encoder."""
+    if not values:
+        return []
+    return json_bytes(values.tolist())[1:-1].split(b",")
+
+
+def _entity_columns_to_json(columns: EntityHistoryColumns) -> bytes:
+    """Encode the columns of an entity to a compressed states JSON array."""
+    state_json = [json_bytes(state) for state in columns.states]
+    states = list(map(state_json.__getitem__, columns.state_idx))
+    last_updated = _json_floats(columns.last_updated_ts)
+    full_rows = columns.full_rows
+    if (last_changed_ts := columns.last_changed_ts) is not None:
+        last_changed = [
+            _LAST_CHANGED + last_changed_json
+            if last_changed and last_changed != last_updated
+            else b""
+            for last_changed_json, last_changed, last_updated in zip(
+                _json_floats(last_changed_ts),
+                last_changed_ts,
+                columns.last_updated_ts,
+                strict=False,
+            )
+        ]
+    else:
+        last_changed = [b""] * full_rows
+    if columns.attributes is not None and columns.attributes_idx is not None:
+        attributes_json = [attributes.encode() for attributes in columns.attributes]
+        rows = list(
+            map(
+                _FULL_ROW_WITH_ATTRIBUTES.__mod__,
+                zip(
+                    states[:full_rows],
+                    map(attributes_json.__getitem__, columns.attributes_idx),
+                    last_updated[:full_rows],
+                    last_changed,
+                    strict=True,
+                ),
+            )
+        )
+    else:
+        rows = list(
+            map(
+                _FULL_ROW.__mod__,
+                zip(
+                    states[:full_rows],
+                    last_updated[:full_rows],
+                    last_changed,
+                    strict=True,
+                ),
+            )
+        )
+    if full_rows < len(states):
+        rows.extend(
+            map(
+                _MINIMAL_ROW.__mod__,
+                zip(states[full_rows:], last_updated[full_rows:], strict=True),
+            )
+        )
+    return b"[" + b",".join(rows) + b"]"
+
+
+def significant_states_columns_to_json(
+    columns_by_entity_id: dict[str, EntityHistoryColumns],
+) -> bytes:
+    """Encode columnar significant states to the compressed state JSON format."""
+    return (
+        b"{"
+        + b",".join(
+            json_bytes(entity_id) + b":" + _entity_columns_to_json(columns)
+            for entity_id, columns in columns_by_entity_id.items()
+        )
+        + b"}"
+    )
+
+
+def get_significant_states_compressed_json(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> bytes:
+    """Return the significant states during a time period as compressed JSON."""
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    with session_scope(hass=hass, read_only=True, read_database=True) as session:
+        return significant_states_columns_to_json(
+            get_significant_states_columns_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            )
+        )
@@ -2,6 +2,8 @@
 
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
+MIN_KEY = "min"
+MAX_KEY = "max"
 
 SIGNIFICANT_DOMAINS = {
     "climate",
@@ -211,7 +211,7 @@ def get_significant_states(
     compressed_state_format: bool = False,
 ) -> dict[str, list[State | dict[str, Any]]]:
     """Wrap get_significant_states_with_session with an sql session."""
-    with session_scope(hass=hass, read_only=True) as session:
+    with session_scope(hass=hass, read_only=True, read_database=True) as session:
         return get_significant_states_with_session(
             hass,
             session,
@@ -459,7 +459,7 @@ def state_changes_during_period(
     if not entity_id:
         raise ValueError("entity_id must be provided")
     entity_ids = [entity_id.lower()]
-    with session_scope(hass=hass, read_only=True) as session:
+    with session_scope(hass=hass, read_only=True, read_database=True) as session:
         stmt = _state_changed_during_period_stmt(
             _schema_version(hass),
             start_time,
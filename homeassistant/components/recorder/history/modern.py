@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Iterable, Iterator
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from itertools import groupby
 from operator import itemgetter
 from typing import Any, cast
 
 from sqlalchemy import (
+    ColumnElement,
     CompoundSelect,
     Select,
     Subquery,
     and_,
+    case,
+    cast as sql_cast,
     func,
     lambda_stmt,
     literal,
@@ -21,14 +25,21 @@ from sqlalchemy import (
 )
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
 from homeassistant.core import HomeAssistant, State, split_entity_id
 import homeassistant.util.dt as dt_util
 
 from ... import recorder
-from ..const import LAST_REPORTED_SCHEMA_VERSION
-from ..db_schema import SHARED_ATTR_OR_LEGACY_ATTRIBUTES, StateAttributes, States
+from ..const import LAST_REPORTED_SCHEMA_VERSION, SupportedDialect
+from ..db_schema import (
+    DOUBLE_TYPE,
+    SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
+    StateAttributes,
+    States,
+)
+from ..downsampled import get_downsampled_buckets, select_downsampled_tier
 from ..filters import Filters
 from ..models import (
     LazyState,
@@ -37,9 +48,12 @@ from ..models import (
     process_timestamp,
     row_to_compressed_state,
 )
-from ..util import execute_stmt_lambda_element, session_scope
+from ..models.state_attributes import decode_attributes_from_source
+from ..util import DEFAULT_YIELD_STATES_ROWS, execute_stmt_lambda_element, session_scope
 from .const import (
     LAST_CHANGED_KEY,
+    MAX_KEY,
+    MIN_KEY,
     NEED_ATTRIBUTE_DOMAINS,
     SIGNIFICANT_DOMAINS,
     STATE_KEY,
@@ -117,9 +131,10 @@ def get_significant_states(
     minimal_response: bool = False,
     no_attributes: bool = False,
     compressed_state_format: bool = False,
+    max_points: int | None = None,
 ) -> dict[str, list[State | dict[str, Any]]]:
     """Wrap get_significant_states_with_session with an sql session."""
-    with session_scope(hass=hass, read_only=True) as session:
+    with session_scope(hass=hass, read_only=True, read_database=True) as session:
         return get_significant_states_with_session(
             hass,
             session,
@@ -132,6 +147,7 @@ def get_significant_states(
             minimal_response,
             no_attributes,
             compressed_state_format,
+            max_points,
         )
 
 
@@ -201,34 +217,23 @@ def _significant_states_stmt(
     ).order_by(unioned_subquery.c.metadata_id, unioned_subquery.c.last_updated_ts)
 
 
-def get_significant_states_with_session(
+def _significant_states_query(
     hass: HomeAssistant,
     session: Session,
     start_time: datetime,
-    end_time: datetime | None = None,
-    entity_ids: list[str] | None = None,
-    filters: Filters | None = None,
-    include_start_time_state: bool = True,
-    significant_changes_only: bool = True,
-    minimal_response: bool = False,
-    no_attributes: bool = False,
-    compressed_state_format: bool = False,
-) -> dict[str, list[State | dict[str, Any]]]:
-    """Return states changes during UTC period start_time - end_time.
-
-    entity_ids is an optional iterable of entities to include in the results.
-
-    filters is an optional SQLAlchemy filter which will be applied to the database
-    queries unless entity_ids is given, in which case its ignored.
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> tuple[StatementLambdaElement, float | None, dict[str, int | None]] | None:
+    """Return the statement to fetch the significant states.
 
-    Significant states are all states where there is a state change,
-    as well as all states from certain domains (for instance
-    thermostat so that we get current temperature in our graphs).
+    Also returns the start time timestamp to use for the start time
+    states (None if they are not included) and the entity_id to
+    metadata_id map. Returns None when none of the entities have
+    been recorded.
     """
-    if filters is not None:
-        raise NotImplementedError("Filters are no longer supported")
-    if not entity_ids:
-        raise ValueError("entity_ids must be provided")
     entity_id_to_metadata_id: dict[str, int | None] | None = None
     metadata_ids_in_significant_domains: list[int] = []
     instance = recorder.get_instance(hass)
@@ -237,7 +242,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return None
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -275,9 +280,79 @@ def get_significant_states_with_session(
             include_start_time_state,
         ],
     )
+    return (
+        stmt,
+        start_time_ts if include_start_time_state else None,
+        entity_id_to_metadata_id,
+    )
+
+
+def get_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+    max_points: int | None = None,
+) -> dict[str, list[State | dict[str, Any]]]:
+    """Return states changes during UTC period start_time - end_time.
+
+    entity_ids is an optional iterable of entities to include in the results.
+
+    filters is an optional SQLAlchemy filter which will be applied to the database
+    queries unless entity_ids is given, in which case its ignored.
+
+    Significant states are all states where there is a state change,
+    as well as all states from certain domains (for instance
+    thermostat so that we get current temperature in our graphs).
+
+    max_points is an optional hint of the number of points per entity
+    the caller will draw. If a downsampled tier is fine enough, numeric
+    entities are read from the tier instead of the states table.
+    """
+    if filters is not None:
+        raise NotImplementedError("Filters are no longer supported")
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    if max_points and (
+        downsampled_states := _get_downsampled_significant_states(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+            max_points,
+        )
+    ):
+        return downsampled_states
+    if not (
+        query := _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ):
+        return {}
+    stmt, start_time_ts, entity_id_to_metadata_id = query
     return _sorted_states_to_dict(
         execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
-        start_time_ts if include_start_time_state else None,
+        start_time_ts,
         entity_ids,
         entity_id_to_metadata_id,
         minimal_response,
@@ -286,6 +361,208 @@ def get_significant_states_with_session(
     )
 
 
+def _format_downsampled_value(value: float) -> str:
+    """Format a downsampled value as a state."""
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+def _downsampled_bucket_to_state(
+    bucket: Row, compressed_state_format: bool
+) -> dict[str, Any]:
+    """Convert a downsampled bucket to a minimal state with its min and max."""
+    _, start_ts, min_value, max_value, last_value = bucket
+    if compressed_state_format:
+        return {
+            COMPRESSED_STATE_STATE: _format_downsampled_value(last_value),
+            COMPRESSED_STATE_LAST_UPDATED: start_ts,
+            MIN_KEY: min_value,
+            MAX_KEY: max_value,
+        }
+    return {
+        STATE_KEY: _format_downsampled_value(last_value),
+        LAST_CHANGED_KEY: dt_util.utc_from_timestamp(start_ts).isoformat(),
+        MIN_KEY: min_value,
+        MAX_KEY: max_value,
+    }
+
+
+def _get_downsampled_significant_states(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    compressed_state_format: bool,
+    max_points: int,
+) -> dict[str, list[State | dict[str, Any]]] | None:
+    """Return the significant states with numeric entities read from a tier.
+
+    Entities with buckets in the tier get their start time state and the
+    states before the first and after the last compiled bucket from the
+    states table and one state per bucket in between. All other entities
+    are read from the states table.
+
+    Returns None if no tier is fine enough for max_points.
+    """
+    start_time_ts = start_time.timestamp()
+    end_time_ts = (end_time or dt_util.utcnow()).timestamp()
+    if not (
+        selected := select_downsampled_tier(
+            session, start_time_ts, end_time_ts, max_points
+        )
+    ):
+        return None
+    tier, first_bucket_ts, end_bucket_ts = selected
+    instance = recorder.get_instance(hass)
+    metadata_id_to_entity_id = {
+        metadata_id: entity_id
+        for entity_id, metadata_id in instance.states_meta_manager.get_many(
+            entity_ids, session, False
+        ).items()
+        if metadata_id is not None
+    }
+    if not metadata_id_to_entity_id:
+        return None
+    buckets_by_entity_id = {
+        metadata_id_to_entity_id[metadata_id]: list(buckets)
+        for metadata_id, buckets in groupby(
+            get_downsampled_buckets(
+                session,
+                tier,
+                first_bucket_ts,
+                end_bucket_ts,
+                list(metadata_id_to_entity_id),
+            ),
+            itemgetter(0),
+        )
+    }
+    if not buckets_by_entity_id:
+        return None
+    downsampled_entity_ids = [
+        entity_id for entity_id in entity_ids if entity_id in buckets_by_entity_id
+    ]
+    raw_entity_ids = [
+        entity_id for entity_id in entity_ids if entity_id not in buckets_by_entity_id
+    ]
+    options = (
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        compressed_state_format,
+    )
+    raw_states = (
+        get_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            raw_entity_ids,
+            None,
+            include_start_time_state,
+            *options,
+        )
+        if raw_entity_ids
+        else {}
+    )
+    head_states = get_significant_states_with_session(
+        hass,
+        session,
+        start_time,
+        dt_util.utc_from_timestamp(first_bucket_ts),
+        downsampled_entity_ids,
+        None,
+        include_start_time_state,
+        *options,
+    )
+    tail_states = get_significant_states_with_session(
+        hass,
+        session,
+        # Subtract one microsecond since the start time is exclusive
+        dt_util.utc_from_timestamp(end_bucket_ts) - timedelta(microseconds=1),
+        end_time,
+        downsampled_entity_ids,
+        None,
+        False,
+        *options,
+    )
+    result: dict[str, list[State | dict[str, Any]]] = {}
+    for entity_id in entity_ids:
+        if entity_id in raw_states:
+            result[entity_id] = raw_states[entity_id]
+            continue
+        if (buckets := buckets_by_entity_id.get(entity_id)) is None:
+            continue
+        entity_states = head_states.get(entity_id, [])
+        entity_states.extend(
+            _downsampled_bucket_to_state(bucket, compressed_state_format)
+            for bucket in buckets
+        )
+        entity_states.extend(tail_states.get(entity_id, ()))
+        result[entity_id] = entity_states
+    return result
+
+
+def stream_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+    states_per_chunk: int = DEFAULT_YIELD_STATES_ROWS,
+) -> Iterator[dict[str, list[State | dict[str, Any]]]]:
+    """Variant of get_significant_states_with_session that yields chunks.
+
+    The rows are fetched with a server side cursor and converted
+    states_per_chunk rows at a time so the memory used does not grow
+    with the length of the time period. The states of an entity may
+    continue in the next chunk.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    if not (
+        query := _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ):
+        return
+    stmt, start_time_ts, entity_id_to_metadata_id = query
+    continued_states: dict[int, str | None] = {}
+    result = session.connection().execute(
+        stmt, execution_options={"yield_per": states_per_chunk}
+    )
+    try:
+        for rows in result.partitions():
+            if chunk := _sorted_states_to_dict(
+                rows,
+                start_time_ts,
+                entity_ids,
+                entity_id_to_metadata_id,
+                minimal_response,
+                compressed_state_format,
+                no_attributes=no_attributes,
+                continued_states=continued_states,
+            ):
+                yield chunk
+    finally:
+        result.close()
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -319,6 +596,204 @@ def get_full_significant_states_with_session(
     )
 
 
+# The states float() parses as a finite number, the other states are left
+# out of the aggregates
+_NUMERIC_STATE_PATTERN = r"^[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?$"
+
+
+@dataclass(slots=True, frozen=True)
+class NumericStatesAggregate:
+    """The aggregates of the numeric states of an entity during a period.
+
+    The attributes are the ones shared by all the numeric states, or None
+    if the states do not share their attributes.
+    """
+
+    min: float
+    max: float
+    mean: float
+    attributes: dict[str, Any] | None
+
+
+def _numeric_states_aggregates_stmt(
+    start_time_ts: float,
+    end_time_ts: float,
+    metadata_ids: list[int],
+    run_start_ts: float | None,
+    cast_by_adding_zero: bool,
+) -> Select:
+    """Return the statement aggregating the numeric states of the entities."""
+    columns = (
+        States.metadata_id,
+        States.state,
+        States.last_updated_ts,
+        States.attributes_id,
+    )
+    states_stmt = select(*columns).filter(
+        States.metadata_id.in_(metadata_ids)
+        & (States.last_updated_ts >= start_time_ts)
+        & (States.last_updated_ts < end_time_ts)
+    )
+    states: Subquery
+    if run_start_ts is None:
+        states = states_stmt.subquery()
+    else:
+        # Add the state each entity had at start_time
+        most_recent_states_for_entities_by_date = (
+            select(
+                States.metadata_id.label("max_metadata_id"),
+                func.max(States.last_updated_ts).label("max_last_updated"),
+            )
+            .filter(
+                (States.last_updated_ts >= run_start_ts)
+                & (States.last_updated_ts < start_time_ts)
+                & States.metadata_id.in_(metadata_ids)
+            )
+            .group_by(States.metadata_id)
+            .subquery()
+        )
+        start_states_stmt = (
+            select(*columns)
+            .join(
+                most_recent_states_for_entities_by_date,
+                and_(
+                    States.metadata_id
+                    == most_recent_states_for_entities_by_date.c.max_metadata_id,
+                    States.last_updated_ts
+                    == most_recent_states_for_entities_by_date.c.max_last_updated,
+                ),
+            )
+            .filter(
+                (States.last_updated_ts >= run_start_ts)
+                & (States.last_updated_ts < start_time_ts)
+                & States.metadata_id.in_(metadata_ids)
+            )
+        )
+        states = union_all(start_states_stmt, states_stmt).subquery()
+    value: ColumnElement[float]
+    if cast_by_adding_zero:
+        # MySQL can't cast to a double, adding zero converts the string
+        value = states.c.state.op("+", return_type=DOUBLE_TYPE)(0)
+    else:
+        value = sql_cast(states.c.state, DOUBLE_TYPE)
+    # The state at start_time counts from start_time on
+    value_start_ts = case(
+        (states.c.last_updated_ts < start_time_ts, start_time_ts),
+        else_=states.c.last_updated_ts,
+    )
+    numeric_states = (
+        select(
+            states.c.metadata_id,
+            states.c.attributes_id,
+            value.label("value"),
+            value_start_ts.label("start_ts"),
+            # Each value lasts until the next numeric state or end_time
+            func.lead(value_start_ts, 1, end_time_ts)
+            .over(
+                partition_by=states.c.metadata_id,
+                order_by=states.c.last_updated_ts,
+            )
+            .label("end_ts"),
+        )
+        .filter(states.c.state.regexp_match(_NUMERIC_STATE_PATTERN))
+        .subquery()
+    )
+    aggregates = (
+        select(
+            numeric_states.c.metadata_id,
+            func.min(numeric_states.c.value).label("min"),
+            func.max(numeric_states.c.value).label("max"),
+            func.sum(
+                numeric_states.c.value
+                * (numeric_states.c.end_ts - numeric_states.c.start_ts)
+            ).label("accumulated"),
+            func.min(numeric_states.c.start_ts).label("start_ts"),
+            func.min(numeric_states.c.attributes_id).label("attributes_id"),
+            func.max(numeric_states.c.attributes_id).label("max_attributes_id"),
+            func.count(numeric_states.c.attributes_id).label("attributes_count"),
+            func.count().label("states_count"),
+        )
+        .group_by(numeric_states.c.metadata_id)
+        .subquery()
+    )
+    return select(
+        aggregates.c.metadata_id,
+        aggregates.c.min,
+        aggregates.c.max,
+        aggregates.c.accumulated,
+        aggregates.c.start_ts,
+        StateAttributes.shared_attrs,
+    ).outerjoin(
+        StateAttributes,
+        (StateAttributes.attributes_id == aggregates.c.attributes_id)
+        & (aggregates.c.max_attributes_id == aggregates.c.attributes_id)
+        & (aggregates.c.attributes_count == aggregates.c.states_count),
+    )
+
+
+def get_numeric_states_aggregates_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime,
+    entity_ids: list[str],
+) -> dict[str, NumericStatesAggregate]:
+    """Return the aggregates of the numeric states during a period.
+
+    The minimum, the maximum and the time weighted mean of the states are
+    computed by the database, the state an entity had at start_time counts
+    from start_time on. Entities without numeric states are left out.
+    """
+    instance = recorder.get_instance(hass)
+    if not (
+        entity_id_to_metadata_id := instance.states_meta_manager.get_many(
+            entity_ids, session, False
+        )
+    ) or not (metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
+        return {}
+    run_start_ts = _get_run_start_ts_for_utc_point_in_time(hass, start_time)
+    start_time_ts = dt_util.utc_to_timestamp(start_time)
+    end_time_ts = dt_util.utc_to_timestamp(end_time)
+    cast_by_adding_zero = instance.dialect_name == SupportedDialect.MYSQL
+    stmt = lambda_stmt(
+        lambda: _numeric_states_aggregates_stmt(
+            start_time_ts,
+            end_time_ts,
+            metadata_ids,
+            run_start_ts,
+            cast_by_adding_zero,
+        ),
+        track_on=[bool(run_start_ts), cast_by_adding_zero],
+    )
+    metadata_id_to_entity_id = {
+        metadata_id: entity_id
+        for entity_id, metadata_id in entity_id_to_metadata_id.items()
+        if metadata_id is not None
+    }
+    attr_cache: dict[str, dict[str, Any]] = {}
+    return {
+        metadata_id_to_entity_id[metadata_id]: NumericStatesAggregate(
+            min_value,
+            max_value,
+            # A state changed at the exact end of the period has no duration
+            accumulated / duration
+            if (duration := end_time_ts - value_start_ts)
+            else 0.0,
+            None
+            if shared_attrs is None
+            else decode_attributes_from_source(shared_attrs, attr_cache),
+        )
+        for (
+            metadata_id,
+            min_value,
+            max_value,
+            accumulated,
+            value_start_ts,
+            shared_attrs,
+        ) in execute_stmt_lambda_element(session, stmt, orm_rows=False)
+    }
+
+
 def _state_changed_during_period_stmt(
     start_time_ts: float,
     end_time_ts: float | None,
@@ -399,7 +874,7 @@ def state_changes_during_period(
         raise ValueError("entity_id must be provided")
     entity_ids = [entity_id.lower()]
 
-    with session_scope(hass=hass, read_only=True) as session:
+    with session_scope(hass=hass, read_only=True, read_database=True) as session:
         instance = recorder.get_instance(hass)
         if not (
             possible_metadata_id := instance.states_meta_manager.get(
@@ -680,6 +1155,7 @@ def _sorted_states_to_dict(
     compressed_state_format: bool = False,
     descending: bool = False,
     no_attributes: bool = False,
+    continued_states: dict[int, str | None] | None = None,
 ) -> dict[str, list[State | dict[str, Any]]]:
     """Convert SQL results into JSON friendly data structure.
 
@@ -691,6 +1167,10 @@ def _sorted_states_to_dict(
     We also need to go back and create a synthetic zero data point for
     each list of states, otherwise our graphs won't start on the Y
     axis correctly.
+
+    When the rows are converted in chunks, continued_states holds the
+    last state of each minimal_response entity seen in the previous
+    chunks so the states of an entity can continue in the next chunk.
     """
     field_map = _FIELD_MAP
     state_class: Callable[
@@ -758,7 +1238,10 @@ def _sorted_states_to_dict(
         # State for the first and last response. All the states
         # in-between only provide the "state" and the
         # "last_changed".
-        if not ent_results:
+        if continued_states is not None and metadata_id in continued_states:
+            # The first state was in a previous chunk
+            prev_state = continued_states[metadata_id]
+        elif not ent_results:
             if (first_state := next(group, None)) is None:
                 continue
             prev_state = first_state[state_idx]
@@ -793,22 +1276,23 @@ def _sorted_states_to_dict(
                     if (state := row[state_idx]) != prev_state
                 ]
             )
-            continue
-
-        # Non-compressed state format returns an ISO formatted string
-        _utc_from_timestamp = dt_util.utc_from_timestamp
-        ent_results.extend(
-            [
-                {
-                    attr_state: (prev_state := state),
-                    attr_time: _utc_from_timestamp(
-                        row[last_updated_ts_idx]
-                    ).isoformat(),
-                }
-                for row in group
-                if (state := row[state_idx]) != prev_state
-            ]
-        )
+        else:
+            # Non-compressed state format returns an ISO formatted string
+            _utc_from_timestamp = dt_util.utc_from_timestamp
+            ent_results.extend(
+                [
+                    {
+                        attr_state: (prev_state := state),
+                        attr_time: _utc_from_timestamp(
+                            row[last_updated_ts_idx]
+                        ).isoformat(),
+                    }
+                    for row in group
+                    if (state := row[state_idx]) != prev_state
+                ]
+            )
+        if continued_states is not None:
+            continued_states[metadata_id] = prev_state
 
     if descending:
         for ent_results in result.values():
@@ -6,7 +6,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable, Iterable
 import contextlib
 from dataclasses import dataclass, replace as dataclass_replace
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 from time import time
 from typing import TYPE_CHECKING, Any, cast, final
@@ -53,6 +53,7 @@ from .const import (
     CONTEXT_ID_AS_BINARY_SCHEMA_VERSION,
     EVENT_TYPE_IDS_SCHEMA_VERSION,
     LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION,
+    REF_COUNT_SCHEMA_VERSION,
     STATES_META_SCHEMA_VERSION,
     SupportedDialect,
 )
@@ -64,15 +65,18 @@ from .db_schema import (
     LEGACY_STATES_EVENT_ID_INDEX,
     MYSQL_COLLATE,
     MYSQL_DEFAULT_CHARSET,
+    PARTITIONED_TABLES,
     SCHEMA_VERSION,
     STATISTICS_TABLES,
     TABLE_STATES,
     Base,
+    EventData,
     Events,
     EventTypes,
     LegacyBase,
     MigrationChanges,
     SchemaChanges,
+    StateAttributes,
     States,
     StatesMeta,
     Statistics,
@@ -82,25 +86,33 @@ from .db_schema import (
 )
 from .models import process_timestamp
 from .models.time import datetime_to_timestamp_or_none
+from .partition import list_partitions, partition_table
 from .queries import (
     batch_cleanup_entity_ids,
+    count_events_referencing_data_ids,
+    count_states_referencing_attributes_ids,
     delete_duplicate_short_term_statistics_row,
     delete_duplicate_statistics_row,
     find_entity_ids_to_migrate,
+    find_event_data_ref_counts_to_migrate,
     find_event_type_to_migrate,
     find_events_context_ids_to_migrate,
+    find_state_attributes_ref_counts_to_migrate,
     find_states_context_ids_to_migrate,
     find_unmigrated_short_term_statistics_rows,
     find_unmigrated_statistics_rows,
     has_entity_ids_to_migrate,
+    has_event_data_ref_counts_to_migrate,
     has_event_type_to_migrate,
     has_events_context_ids_to_migrate,
+    has_state_attributes_ref_counts_to_migrate,
     has_states_context_ids_to_migrate,
+    has_statistics_to_roll_up,
     has_used_states_event_ids,
     migrate_single_short_term_statistics_row_to_timestamp,
     migrate_single_statistics_row_to_timestamp,
 )
-from .statistics import get_start_time
+from .statistics import get_start_time, update_statistics_rollups
 from .tasks import (
     CommitTask,
     EntityIDPostMigrationTask,
@@ -1524,6 +1536,15 @@ class _SchemaVersion44Migrator(_SchemaVersionMigrator, target_version=44):
         )
 
 
+class _SchemaVersion45Migrator(_SchemaVersionMigrator, target_version=45):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # The ref_count columns are filled by the run time
+        # StateAttributesRefCountMigration and EventDataRefCountMigration
+        _add_columns(self.session_maker, "state_attributes", ["ref_count INTEGER"])
+        _add_columns(self.session_maker, "event_data", ["ref_count INTEGER"])
+
+
 def _migrate_statistics_columns_to_timestamp_removing_duplicates(
     hass: HomeAssistant,
     instance: Recorder,
@@ -1971,6 +1992,44 @@ def cleanup_legacy_states_event_ids(instance: Recorder) -> bool:
     return True
 
 
+@retryable_database_job("partition tables")
+def partition_tables(instance: Recorder) -> bool:
+    """Partition the tables which are not partitioned yet.
+
+    One table is partitioned per call, returns False if there
+    are more tables to partition so that we can be called again.
+    """
+    session_maker = instance.get_session
+    engine = instance.engine
+    assert engine is not None, "engine should never be None"
+    for table, id_column in PARTITIONED_TABLES.items():
+        with session_scope(session=session_maker(), read_only=True) as session:
+            if list_partitions(instance, session, table):
+                continue
+        _LOGGER.warning(
+            "Partitioning the %s table. Note: this can take several minutes on "
+            "large databases and slow machines. Please be patient!",
+            table,
+        )
+        # Partitioned tables can not have foreign keys on MySQL
+        columns = {
+            foreign_key["constrained_columns"][0]
+            for foreign_key in sqlalchemy.inspect(engine).get_foreign_keys(table)
+            if len(foreign_key["constrained_columns"]) == 1
+        }
+        for column in columns:
+            fk_remove_ok, _ = _drop_foreign_key_constraints(
+                session_maker, engine, table, column
+            )
+            if not fk_remove_ok:
+                _LOGGER.error("Could not partition the %s table", table)
+                return True
+        with session_scope(session=session_maker()) as session:
+            partition_table(instance, session, table, id_column)
+        return False
+    return True
+
+
 def _initialize_database(session: Session) -> bool:
     """Initialize a new database.
 
@@ -2460,6 +2519,155 @@ class EventIDPostMigration(BaseRunTimeMigration):
         return NeedsMigrateResult(needs_migrate=False, migration_done=True)
 
 
+class BaseRefCountMigration(BaseRunTimeMigrationWithQuery):
+    """Base class for migrations counting the references to shared rows."""
+
+    required_schema_version = REF_COUNT_SCHEMA_VERSION
+    task = CommitBeforeMigrationTask
+    # We have to commit before to make sure the references
+    # of pending rows are counted exactly once
+    table: type[EventData | StateAttributes]
+    id_column: str
+
+    def __init__(self, schema_version: int, migration_changes: dict[str, int]) -> None:
+        """Initialize a new BaseRefCountMigration."""
+        super().__init__(schema_version, migration_changes)
+        # The rows are counted in id order. Rows that have not been
+        # counted have a NULL ref_count which makes the progress
+        # persistent, the id only avoids scanning the counted rows
+        # again while the recorder is running.
+        self.counted_up_to_id = 0
+
+    def migrate_data(self, instance: Recorder) -> bool:  # type: ignore[override]
+        """Count the references to some rows, return True if completed."""
+        return _migrate_ref_counts(instance, self)
+
+    @abstractmethod
+    def find_ids_to_migrate_query(self, max_bind_vars: int) -> StatementLambdaElement:
+        """Return the query to find the next rows to count."""
+
+    @abstractmethod
+    def count_references_query(self, ids: list[int]) -> StatementLambdaElement:
+        """Return the query to count the references to some rows."""
+
+
+@retryable_database_job("count references to shared rows")
+def _migrate_ref_counts(instance: Recorder, migrator: BaseRefCountMigration) -> bool:
+    """Count the references to a batch of rows, return True if completed."""
+    table_name = migrator.table.__tablename__
+    _LOGGER.debug("Counting references to %s", table_name)
+    with session_scope(session=instance.get_session()) as session:
+        if ids := [
+            id_
+            for (id_,) in session.execute(
+                migrator.find_ids_to_migrate_query(instance.max_bind_vars)
+            )
+        ]:
+            ref_counts = dict.fromkeys(ids, 0)
+            ref_counts.update(
+                session.execute(migrator.count_references_query(ids)).tuples().all()
+            )
+            session.execute(
+                update(migrator.table),
+                [
+                    {migrator.id_column: id_, "ref_count": ref_count}
+                    for id_, ref_count in ref_counts.items()
+                ],
+            )
+            migrator.counted_up_to_id = ids[-1]
+        # If there is more work to do return False
+        # so that we can be called again
+        if is_done := not ids:
+            _mark_migration_done(session, type(migrator))
+
+    _LOGGER.debug("Counting references to %s: done=%s", table_name, is_done)
+    return is_done
+
+
+class StateAttributesRefCountMigration(BaseRefCountMigration):
+    """Migration to count the states referencing each state attributes row."""
+
+    migration_id = "state_attributes_ref_count"
+    table = StateAttributes
+    id_column = "attributes_id"
+
+    def find_ids_to_migrate_query(self, max_bind_vars: int) -> StatementLambdaElement:
+        """Return the query to find the next rows to count."""
+        return find_state_attributes_ref_counts_to_migrate(
+            self.counted_up_to_id, max_bind_vars
+        )
+
+    def count_references_query(self, ids: list[int]) -> StatementLambdaElement:
+        """Return the query to count the references to some rows."""
+        return count_states_referencing_attributes_ids(ids)
+
+    def needs_migrate_query(self) -> StatementLambdaElement:
+        """Return the query to check if the migration needs to run."""
+        return has_state_attributes_ref_counts_to_migrate()
+
+
+class EventDataRefCountMigration(BaseRefCountMigration):
+    """Migration to count the events referencing each event data row."""
+
+    migration_id = "event_data_ref_count"
+    table = EventData
+    id_column = "data_id"
+
+    def find_ids_to_migrate_query(self, max_bind_vars: int) -> StatementLambdaElement:
+        """Return the query to find the next rows to count."""
+        return find_event_data_ref_counts_to_migrate(
+            self.counted_up_to_id, max_bind_vars
+        )
+
+    def count_references_query(self, ids: list[int]) -> StatementLambdaElement:
+        """Return the query to count the references to some rows."""
+        return count_events_referencing_data_ids(ids)
+
+    def needs_migrate_query(self) -> StatementLambdaElement:
+        """Return the query to check if the migration needs to run."""
+        return has_event_data_ref_counts_to_migrate()
+
+
+class StatisticsRollupMigration(BaseRunTimeMigrationWithQuery):
+    """Migration to roll up the hourly statistics per day and month."""
+
+    migration_id = "statistics_rollups"
+
+    def __init__(self, schema_version: int, migration_changes: dict[str, int]) -> None:
+        """Initialize a new StatisticsRollupMigration."""
+        super().__init__(schema_version, migration_changes)
+        # The statistics are rolled up one month at a time, starting
+        # with the month of the oldest hourly statistics
+        self.next_month: datetime | None = None
+
+    def migrate_data(self, instance: Recorder) -> bool:  # type: ignore[override]
+        """Roll up a month of statistics, returns True if completed."""
+        return _migrate_statistics_rollups(instance, self)
+
+    def migration_done(self, instance: Recorder, session: Session | None) -> None:
+        """Read the daily and monthly statistics from the rollups."""
+        instance.statistics_rollups_ready = True
+
+    def needs_migrate_query(self) -> StatementLambdaElement:
+        """Return the query to check if the migration needs to run."""
+        return has_statistics_to_roll_up()
+
+
+@retryable_database_job("roll up statistics")
+def _migrate_statistics_rollups(
+    instance: Recorder, migrator: StatisticsRollupMigration
+) -> bool:
+    """Roll up a month of statistics, return True if completed."""
+    _LOGGER.debug("Rolling up statistics from %s", migrator.next_month)
+    migrator.next_month = update_statistics_rollups(instance, migrator.next_month)
+    if is_done := migrator.next_month is None:
+        with session_scope(session=instance.get_session()) as session:
+            _mark_migration_done(session, StatisticsRollupMigration)
+
+    _LOGGER.debug("Rolling up statistics: done=%s", is_done)
+    return is_done
+
+
 def _mark_migration_done(
     session: Session, migration: type[BaseRunTimeMigration]
 ) -> None:
@@ -0,0 +1,357 @@
+"""Partitions of the states and events tables.
+
+The partitioned tables are partitioned by ranges of their id column.
+The last partition is unbounded and receives the new rows. Once per
+partition interval it is split at the next id so that every partition
+holds the rows written during one interval. The name of a partition is
+the time until which its rows were written, which allows the purge to
+drop whole partitions once they are older than the purge cutoff.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import re
+from typing import TYPE_CHECKING
+
+import sqlalchemy
+from sqlalchemy import text
+from sqlalchemy.orm.session import Session
+from sqlalchemy.schema import CreateIndex
+
+from homeassistant.util import dt as dt_util
+
+from .const import PartitionInterval, SupportedDialect
+from .db_schema import PARTITIONED_TABLES, Base
+from .util import session_scope
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+FUTURE_PARTITION = "p_future"
+
+PARTITIONED_DIALECTS = {SupportedDialect.MYSQL, SupportedDialect.POSTGRESQL}
+
+_PARTITION_END_FORMAT = "%Y%m%d%H%M"
+_PARTITION_END_RE = re.compile(r"^p(\d{12})$")
+_POSTGRESQL_BOUND_RE = re.compile(
+    r"FROM \('?(-?\d+|MINVALUE)'?\) TO \('?(-?\d+|MAXVALUE)'?\)"
+)
+
+
+@dataclass(slots=True, frozen=True)
+class Partition:
+    """A partition of a table.
+
+    The partition holds the rows with lower_id <= id < upper_id,
+    a bound is None if the partition is unbounded on that side.
+    """
+
+    name: str
+    lower_id: int | None
+    upper_id: int | None
+
+    @property
+    def end(self) -> datetime | None:
+        """Return the time until which the rows of the partition were written.
+
+        Returns None for the partition new rows are written to.
+        """
+        if match := _PARTITION_END_RE.match(self.name):
+            return datetime.strptime(match.group(1), _PARTITION_END_FORMAT).replace(
+                tzinfo=dt_util.UTC
+            )
+        return None
+
+
+def partitions_supported(instance: Recorder) -> bool:
+    """Return if the database supports partitioned tables."""
+    return instance.dialect_name in PARTITIONED_DIALECTS
+
+
+def partition_name(end: datetime) -> str:
+    """Return the name of the partition with the rows written until end."""
+    return f"p{dt_util.as_utc(end).strftime(_PARTITION_END_FORMAT)}"
+
+
+def _partition_end(now: datetime) -> datetime:
+    """Return the end of a partition split now.
+
+    The names have a resolution of a minute, the end is rounded up
+    so the partition is never dropped before all its rows expired.
+    """
+    return (now + timedelta(minutes=1)).replace(second=0, microsecond=0)
+
+
+def _interval_start(moment: datetime, interval: PartitionInterval) -> datetime:
+    """Return the start of the partition interval of a moment."""
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval is PartitionInterval.WEEK:
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def mysql_partitions(rows: Iterable[tuple[str, str]]) -> list[Partition]:
+    """Return the partitions from the MySQL partition names and descriptions.
+
+    The rows must be ordered by the position of the partitions.
+    """
+    partitions: list[Partition] = []
+    lower_id: int | None = None
+    for name, description in rows:
+        upper_id = None if description == "MAXVALUE" else int(description)
+        partitions.append(Partition(name, lower_id, upper_id))
+        lower_id = upper_id
+    return partitions
+
+
+def postgresql_partitions(
+    table: str, rows: Iterable[tuple[str, str]]
+) -> list[Partition]:
+    """Return the partitions from the PostgreSQL partition tables and bounds."""
+    partitions: list[Partition] = []
+    prefix = f"{table}_"
+    for relname, bound in rows:
+        if not relname.startswith(prefix) or not (
+            match := _POSTGRESQL_BOUND_RE.search(bound)
+        ):
+            _LOGGER.warning("Ignoring unknown partition %s of %s", relname, table)
+            continue
+        lower, upper = match.groups()
+        partitions.append(
+            Partition(
+                relname.removeprefix(prefix),
+                None if lower == "MINVALUE" else int(lower),
+                None if upper == "MAXVALUE" else int(upper),
+            )
+        )
+    partitions.sort(
+        key=lambda partition: (partition.upper_id is None, partition.upper_id)
+    )
+    return partitions
+
+
+def list_partitions(
+    instance: Recorder, session: Session, table: str
+) -> list[Partition]:
+    """Return the partitions of a table ordered by their ids.
+
+    Returns an empty list if the table is not partitioned.
+    """
+    if instance.dialect_name == SupportedDialect.MYSQL:
+        return mysql_partitions(
+            session.execute(
+                text(
+                    "SELECT PARTITION_NAME, PARTITION_DESCRIPTION"
+                    " FROM information_schema.PARTITIONS"
+                    " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+                    " AND PARTITION_NAME IS NOT NULL"
+                    " ORDER BY PARTITION_ORDINAL_POSITION"
+                ),
+                {"table_name": table},
+            ).tuples()
+        )
+    if instance.dialect_name == SupportedDialect.POSTGRESQL:
+        return postgresql_partitions(
+            table,
+            session.execute(
+                text(
+                    "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)"
+                    " FROM pg_inherits"
+                    " JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid"
+                    " WHERE pg_inherits.inhparent = to_regclass(:table_name)"
+                ),
+                {"table_name": table},
+            ).tuples(),
+        )
+    return []
+
+
+def mysql_partition_table_statements(
+    table: str, id_column: str, name: str, next_id: int
+) -> list[str]:
+    """Return the statements to partition a MySQL table.
+
+    The existing rows are moved to the partition name.
+    """
+    return [
+        f"ALTER TABLE {table} PARTITION BY RANGE ({id_column}) ("
+        f"PARTITION {name} VALUES LESS THAN ({next_id}), "
+        f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE)"
+    ]
+
+
+def postgresql_partition_table_statements(
+    table: str,
+    id_column: str,
+    name: str,
+    next_id: int,
+    primary_key: str | None,
+    indexes: Iterable[str],
+) -> list[str]:
+    """Return the statements to partition a PostgreSQL table.
+
+    The existing table is attached as the partition name to a new
+    partitioned table, which avoids copying the rows. The primary key
+    and the indexes of the existing table are renamed so the partitioned
+    table can be created with the names the schema expects.
+    """
+    partition = f"{table}_{name}"
+    sequence = f"{table}_{id_column}_partitioned_seq"
+    return [
+        f"ALTER TABLE {table} RENAME TO {partition}",
+        *(
+            [
+                f"ALTER TABLE {partition} RENAME CONSTRAINT {primary_key} TO {partition}_pkey"
+            ]
+            if primary_key
+            else []
+        ),
+        *(f"ALTER INDEX {index} RENAME TO {partition}_{index}" for index in indexes),
+        f"ALTER TABLE {partition} ALTER COLUMN {id_column} DROP IDENTITY IF EXISTS",
+        f"ALTER TABLE {partition} ALTER COLUMN {id_column} DROP DEFAULT",
+        f"CREATE TABLE {table} (LIKE {partition} INCLUDING DEFAULTS INCLUDING STORAGE)"
+        f" PARTITION BY RANGE ({id_column})",
+        f"CREATE SEQUENCE {sequence} START WITH {next_id} OWNED BY {table}.{id_column}",
+        f"ALTER TABLE {table} ALTER COLUMN {id_column} SET DEFAULT nextval('{sequence}')",
+        f"ALTER TABLE {table} ATTACH PARTITION {partition}"
+        f" FOR VALUES FROM (MINVALUE) TO ({next_id})",
+        f"CREATE TABLE {table}_{FUTURE_PARTITION} PARTITION OF {table}"
+        f" FOR VALUES FROM ({next_id}) TO (MAXVALUE)",
+        f"ALTER TABLE {table} ADD PRIMARY KEY ({id_column})",
+    ]
+
+
+def mysql_split_future_partition_statements(
+    table: str, name: str, next_id: int
+) -> list[str]:
+    """Return the statements to split the future partition of a MySQL table."""
+    return [
+        f"ALTER TABLE {table} REORGANIZE PARTITION {FUTURE_PARTITION} INTO ("
+        f"PARTITION {name} VALUES LESS THAN ({next_id}), "
+        f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE)"
+    ]
+
+
+def postgresql_split_future_partition_statements(
+    table: str, name: str, lower_id: int, next_id: int
+) -> list[str]:
+    """Return the statements to split the future partition of a PostgreSQL table.
+
+    The future partition is renamed instead of copying its rows
+    and a new empty future partition is created.
+    """
+    future = f"{table}_{FUTURE_PARTITION}"
+    partition = f"{table}_{name}"
+    return [
+        f"ALTER TABLE {table} DETACH PARTITION {future}",
+        f"ALTER TABLE {future} RENAME TO {partition}",
+        f"ALTER TABLE {table} ATTACH PARTITION {partition}"
+        f" FOR VALUES FROM ({lower_id}) TO ({next_id})",
+        f"CREATE TABLE {future} PARTITION OF {table}"
+        f" FOR VALUES FROM ({next_id}) TO (MAXVALUE)",
+    ]
+
+
+def drop_partition_statement(
+    dialect_name: SupportedDialect | None, table: str, partition: Partition
+) -> str:
+    """Return the statement to drop a partition."""
+    if dialect_name == SupportedDialect.MYSQL:
+        return f"ALTER TABLE {table} DROP PARTITION {partition.name}"
+    return f"DROP TABLE {table}_{partition.name}"
+
+
+def _next_id(session: Session, table: str, id_column: str) -> int:
+    """Return the id after the highest id of a table."""
+    max_id: int | None = session.execute(
+        text(f"SELECT MAX({id_column}) FROM {table}")  # noqa: S608
+    ).scalar()
+    return (max_id or 0) + 1
+
+
+def partition_table(
+    instance: Recorder, session: Session, table: str, id_column: str
+) -> None:
+    """Partition a table, the existing rows are moved to the first partition."""
+    name = partition_name(_partition_end(dt_util.utcnow()))
+    next_id = _next_id(session, table, id_column)
+    if instance.dialect_name == SupportedDialect.MYSQL:
+        statements = mysql_partition_table_statements(table, id_column, name, next_id)
+    else:
+        # Continue after the last id handed out by the sequence of the
+        # existing table, it may be higher than the highest id
+        if sequence_id := session.execute(
+            text("SELECT nextval(pg_get_serial_sequence(:table_name, :column))"),
+            {"table_name": table, "column": id_column},
+        ).scalar():
+            next_id = max(next_id, sequence_id)
+        inspector = sqlalchemy.inspect(session.connection())
+        statements = postgresql_partition_table_statements(
+            table,
+            id_column,
+            name,
+            next_id,
+            inspector.get_pk_constraint(table).get("name"),
+            [index["name"] for index in inspector.get_indexes(table) if index["name"]],
+        )
+    for statement in statements:
+        session.execute(text(statement))
+    if instance.dialect_name == SupportedDialect.POSTGRESQL:
+        # The indexes are created on the partitioned table, the
+        # matching indexes of the partition are attached to them
+        connection = session.connection()
+        for index in Base.metadata.tables[table].indexes:
+            connection.execute(CreateIndex(index))  # type: ignore[no-untyped-call]
+    _LOGGER.debug("Partitioned %s, the existing rows are in %s", table, name)
+
+
+def rollover_partitions(instance: Recorder) -> None:
+    """Split the future partitions which have been written to for an interval."""
+    interval = instance.partition_interval
+    assert interval is not None
+    now = dt_util.utcnow()
+    for table, id_column in PARTITIONED_TABLES.items():
+        with session_scope(session=instance.get_session()) as session:
+            partitions = list_partitions(instance, session, table)
+            if (
+                len(partitions) < 2
+                or (future := partitions[-1]).name != FUTURE_PARTITION
+                or future.lower_id is None
+                or (last_end := partitions[-2].end) is None
+                or _interval_start(now, interval) <= _interval_start(last_end, interval)
+            ):
+                continue
+            if (next_id := _next_id(session, table, id_column)) <= future.lower_id:
+                # Nothing was written to the future partition
+                continue
+            name = partition_name(_partition_end(now))
+            if instance.dialect_name == SupportedDialect.MYSQL:
+                statements = mysql_split_future_partition_statements(
+                    table, name, next_id
+                )
+            else:
+                statements = postgresql_split_future_partition_statements(
+                    table, name, future.lower_id, next_id
+                )
+            for statement in statements:
+                session.execute(text(statement))
+            _LOGGER.debug("Split %s partition %s", table, name)
+
+
+def find_expired_partitions(
+    partitions: Iterable[Partition], purge_before: datetime
+) -> list[Partition]:
+    """Return the partitions which only hold rows written before purge_before."""
+    return [
+        partition
+        for partition in partitions
+        if partition.upper_id is not None
+        and (end := partition.end) is not None
+        and end <= purge_before
+    ]
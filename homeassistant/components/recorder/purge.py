@@ -2,24 +2,52 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
 from datetime import datetime
 from itertools import zip_longest
 import logging
 import time
 from typing import TYPE_CHECKING
 
+from sqlalchemy import text
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from .const import REF_COUNT_SCHEMA_VERSION
+from .db_schema import (
+    PARTITIONED_TABLES,
+    TABLE_EVENTS,
+    TABLE_STATES,
+    Events,
+    States,
+    StatesDownsampledBase,
+    StatesMeta,
+)
+from .downsampled import DOWNSAMPLED_TIERS
 from .models import DatabaseEngine
+from .partition import (
+    Partition,
+    drop_partition_statement,
+    find_expired_partitions,
+    list_partitions,
+    partitions_supported,
+)
 from .queries import (
+    adjust_event_data_ref_counts,
+    adjust_state_attributes_ref_counts,
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_with_fast_in_distinct,
+    count_events_by_data_id,
+    count_events_by_data_id_in_range,
+    count_states_by_attributes_id,
+    count_states_by_attributes_id_in_range,
     data_ids_exist_in_events,
     data_ids_exist_in_events_with_fast_in_distinct,
+    delete_downsampled_states_rows,
     delete_event_data_rows,
     delete_event_rows,
     delete_event_types_rows,
@@ -30,6 +58,8 @@ from .queries import (
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    disconnect_states_rows_in_range,
+    find_downsampled_states_to_purge,
     find_entity_ids_to_purge,
     find_event_types_to_purge,
     find_events_to_purge,
@@ -37,9 +67,12 @@ from .queries import (
     find_legacy_detached_states_and_attributes_to_purge,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
+    find_oldest_state_last_updated_ts,
     find_short_term_statistics_to_purge,
     find_states_to_purge,
     find_statistics_runs_to_purge,
+    get_event_data_ref_counts,
+    get_state_attributes_ref_counts,
 )
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
@@ -52,6 +85,46 @@ _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
+# The purge task works in slices of this many seconds so it
+# does not block the recorder queue for a long time
+DEFAULT_PURGE_TIME_BUDGET = 1.0
+
+
+@dataclass(slots=True)
+class PurgeProgress:
+    """Progress of purging the rows older than purge_before.
+
+    The rows are purged oldest first so the timestamp of the oldest
+    remaining state is the cursor of how far the purge has come. The
+    progress is only kept in memory, after a restart the purge resumes
+    from the oldest remaining state and the progress starts over from
+    there.
+    """
+
+    purge_before: datetime
+    start_oldest_ts: float | None
+    oldest_ts: float | None
+    rows: int = 0
+    duration: float = 0.0
+    done: bool = False
+
+    @property
+    def rows_per_second(self) -> float | None:
+        """Return the rate at which rows are purged."""
+        if not self.duration:
+            return None
+        return self.rows / self.duration
+
+    @property
+    def fraction(self) -> float | None:
+        """Return the purged fraction of the period to purge."""
+        if self.done:
+            return 1.0
+        if self.start_oldest_ts is None or self.oldest_ts is None:
+            return None
+        if (period := self.purge_before.timestamp() - self.start_oldest_ts) <= 0:
+            return 1.0
+        return min(max((self.oldest_ts - self.start_oldest_ts) / period, 0.0), 1.0)
 
 
 @retryable_database_job("purge")
@@ -62,24 +135,45 @@ def purge_old_data(
     apply_filter: bool = False,
     events_batch_size: int = DEFAULT_EVENTS_BATCHES_PER_PURGE,
     states_batch_size: int = DEFAULT_STATES_BATCHES_PER_PURGE,
+    time_budget: float | None = None,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+
+    If time_budget is set, the states and events are purged in batches
+    until the budget in seconds is used up. At least one batch of states
+    and events is purged.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
+    start = time.monotonic()
+    deadline = start + time_budget if time_budget is not None else None
     with session_scope(session=instance.get_session()) as session:
+        progress = instance.purge_progress
+        if progress is None or progress.purge_before != purge_before:
+            oldest_ts = session.execute(find_oldest_state_last_updated_ts()).scalar()
+            progress = instance.purge_progress = PurgeProgress(
+                purge_before, oldest_ts, oldest_ts
+            )
         # Purge a max of max_bind_vars, based on the oldest states or events record
         has_more_to_purge = False
+        if instance.partition_interval and partitions_supported(instance):
+            # Drop the expired partitions first, the remaining
+            # expired rows are then purged row by row
+            has_more_to_purge |= _purge_expired_partitions(
+                instance, session, purge_before
+            )
         if instance.use_legacy_events_index and _purging_legacy_format(session):
             _LOGGER.debug(
                 "Purge running in legacy format as there are states with event_id"
                 " remaining"
             )
-            has_more_to_purge |= _purge_legacy_format(instance, session, purge_before)
+            has_more_to_purge |= _purge_legacy_format(
+                instance, session, purge_before, progress
+            )
         else:
             _LOGGER.debug(
                 "Purge running in new format as there are NO states with event_id"
@@ -87,10 +181,10 @@ def purge_old_data(
             )
             # Once we are done purging legacy rows, we use the new method
             has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before
+                instance, session, states_batch_size, purge_before, progress, deadline
             )
             has_more_to_purge |= _purge_events_and_data_ids(
-                instance, session, events_batch_size, purge_before
+                instance, session, events_batch_size, purge_before, progress, deadline
             )
 
         statistics_runs = _select_statistics_runs_to_purge(
@@ -105,10 +199,26 @@ def purge_old_data(
         if short_term_statistics:
             _purge_short_term_statistics(session, short_term_statistics)
 
+        for tier in DOWNSAMPLED_TIERS:
+            if downsampled_states := _select_downsampled_states_to_purge(
+                session, tier, purge_before, instance.max_bind_vars
+            ):
+                _purge_downsampled_states(session, tier, downsampled_states)
+                has_more_to_purge = True
+
+        progress.oldest_ts = session.execute(
+            find_oldest_state_last_updated_ts()
+        ).scalar()
+        progress.duration += time.monotonic() - start
         if has_more_to_purge or statistics_runs or short_term_statistics:
             # Return false, as we might not be done yet.
-            _LOGGER.debug("Purging hasn't fully completed yet")
+            _LOGGER.debug(
+                "Purging hasn't fully completed yet, purged %s rows at %.0f rows/s",
+                progress.rows,
+                progress.rows_per_second or 0,
+            )
             return False
+        progress.done = True
 
         if apply_filter and _purge_filtered_data(instance, session) is False:
             _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
@@ -134,7 +244,10 @@ def _purging_legacy_format(session: Session) -> bool:
 
 
 def _purge_legacy_format(
-    instance: Recorder, session: Session, purge_before: datetime
+    instance: Recorder,
+    session: Session,
+    purge_before: datetime,
+    progress: PurgeProgress,
 ) -> bool:
     """Purge rows that are still linked by the event_ids."""
     (
@@ -147,8 +260,9 @@ def _purge_legacy_format(
     )
     _purge_state_ids(instance, session, state_ids)
     _purge_unused_attributes_ids(instance, session, attributes_ids)
-    _purge_event_ids(session, event_ids)
+    _purge_event_ids(instance, session, event_ids)
     _purge_unused_data_ids(instance, session, data_ids)
+    progress.rows += len(state_ids) + len(event_ids)
 
     # The database may still have some rows that have an event_id but are not
     # linked to any event. These rows are not linked to any event because the
@@ -163,6 +277,7 @@ def _purge_legacy_format(
     )
     _purge_state_ids(instance, session, detached_state_ids)
     _purge_unused_attributes_ids(instance, session, detached_attributes_ids)
+    progress.rows += len(detached_state_ids)
     return bool(
         event_ids
         or state_ids
@@ -178,6 +293,8 @@ def _purge_states_and_attributes_ids(
     session: Session,
     states_batch_size: int,
     purge_before: datetime,
+    progress: PurgeProgress,
+    deadline: float | None,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -201,6 +318,9 @@ def _purge_states_and_attributes_ids(
             break
         _purge_state_ids(instance, session, state_ids)
         attributes_ids_batch = attributes_ids_batch | attributes_ids
+        progress.rows += len(state_ids)
+        if deadline is not None and time.monotonic() > deadline:
+            break
 
     _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
     _LOGGER.debug(
@@ -215,6 +335,8 @@ def _purge_events_and_data_ids(
     session: Session,
     events_batch_size: int,
     purge_before: datetime,
+    progress: PurgeProgress,
+    deadline: float | None,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -234,8 +356,11 @@ def _purge_events_and_data_ids(
         if not event_ids:
             has_remaining_event_ids_to_purge = False
             break
-        _purge_event_ids(session, event_ids)
+        _purge_event_ids(instance, session, event_ids)
         data_ids_batch = data_ids_batch | data_ids
+        progress.rows += len(event_ids)
+        if deadline is not None and time.monotonic() > deadline:
+            break
 
     _purge_unused_data_ids(instance, session, data_ids_batch)
     _LOGGER.debug(
@@ -293,6 +418,20 @@ def _select_unused_attributes_ids(
     if not attributes_ids:
         return set()
 
+    unused_ids: set[int] = set()
+    if instance.schema_version >= REF_COUNT_SCHEMA_VERSION:
+        # Only the rows that have not been counted yet need to be
+        # looked up in the states table
+        unused_ids, attributes_ids = _split_by_ref_count(
+            session,
+            attributes_ids,
+            get_state_attributes_ref_counts,
+            instance.max_bind_vars,
+        )
+        if not attributes_ids:
+            _LOGGER.debug("Selected %s shared attributes to remove", len(unused_ids))
+            return unused_ids
+
     seen_ids: set[int] = set()
     if not database_engine.optimizer.slow_range_in_select:
         #
@@ -353,7 +492,7 @@ def _select_unused_attributes_ids(
                 ).all()
                 if attrs_id[0] is not None
             }
-    to_remove = attributes_ids - seen_ids
+    to_remove = unused_ids | (attributes_ids - seen_ids)
     _LOGGER.debug(
         "Selected %s shared attributes to remove",
         len(to_remove),
@@ -361,6 +500,130 @@ def _select_unused_attributes_ids(
     return to_remove
 
 
+def _split_by_ref_count(
+    session: Session,
+    ids: set[int],
+    get_ref_counts: Callable[[Iterable[int]], StatementLambdaElement],
+    max_bind_vars: int,
+) -> tuple[set[int], set[int]]:
+    """Split shared row ids by their ref_count.
+
+    Returns the ids of the rows that are no longer referenced and the ids
+    of the rows that have not been counted yet. Rows that are still
+    referenced or no longer exist are left out.
+    """
+    unused_ids: set[int] = set()
+    uncounted_ids: set[int] = set()
+    for ids_chunk in chunked_or_all(ids, max_bind_vars):
+        for id_, ref_count in session.execute(get_ref_counts(ids_chunk)):
+            if ref_count is None:
+                uncounted_ids.add(id_)
+            elif ref_count <= 0:
+                unused_ids.add(id_)
+    return unused_ids, uncounted_ids
+
+
+def _release_references(
+    session: Session,
+    count_references: StatementLambdaElement,
+    adjust_ref_counts: Callable[[], Update],
+) -> None:
+    """Subtract the references of rows about to be deleted from the ref_counts."""
+    _subtract_references(
+        session, session.execute(count_references).tuples().all(), adjust_ref_counts
+    )
+
+
+def _subtract_references(
+    session: Session,
+    references: Sequence[tuple[int, int]],
+    adjust_ref_counts: Callable[[], Update],
+) -> None:
+    """Subtract counted references from the ref_counts."""
+    if references:
+        session.execute(
+            adjust_ref_counts(),
+            [{"b_id": id_, "b_delta": -count} for id_, count in references],
+        )
+
+
+def _purge_expired_partitions(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> bool:
+    """Drop the oldest expired partition of each partitioned table.
+
+    Returns True if there are more expired partitions to drop.
+    """
+    has_more_to_purge = False
+    for table in PARTITIONED_TABLES:
+        expired = find_expired_partitions(
+            list_partitions(instance, session, table), purge_before
+        )
+        if not expired:
+            continue
+        if table == TABLE_STATES:
+            _purge_states_partition(instance, session, expired[0])
+        else:
+            _purge_events_partition(instance, session, expired[0])
+        has_more_to_purge |= len(expired) > 1
+    return has_more_to_purge
+
+
+def _purge_states_partition(
+    instance: Recorder, session: Session, partition: Partition
+) -> None:
+    """Drop a partition of states and purge the attributes only it used."""
+    assert partition.upper_id is not None
+    lower_id = partition.lower_id or 0
+    references = (
+        session.execute(
+            count_states_by_attributes_id_in_range(lower_id, partition.upper_id)
+        )
+        .tuples()
+        .all()
+    )
+    disconnected_rows = session.execute(
+        disconnect_states_rows_in_range(lower_id, partition.upper_id)
+    )
+    _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+    # Dropping a partition commits the transaction on MySQL,
+    # the ref_counts are adjusted after the drop so they are
+    # never lower than the references still in the database
+    session.execute(
+        text(drop_partition_statement(instance.dialect_name, TABLE_STATES, partition))
+    )
+    _LOGGER.debug("Dropped states partition %s", partition.name)
+    if instance.schema_version >= REF_COUNT_SCHEMA_VERSION:
+        _subtract_references(session, references, adjust_state_attributes_ref_counts)
+    instance.states_manager.evict_purged_state_ids_before(partition.upper_id)
+    _purge_unused_attributes_ids(
+        instance, session, {attributes_id for attributes_id, _ in references}
+    )
+
+
+def _purge_events_partition(
+    instance: Recorder, session: Session, partition: Partition
+) -> None:
+    """Drop a partition of events and purge the event data only it used."""
+    assert partition.upper_id is not None
+    references = (
+        session.execute(
+            count_events_by_data_id_in_range(
+                partition.lower_id or 0, partition.upper_id
+            )
+        )
+        .tuples()
+        .all()
+    )
+    session.execute(
+        text(drop_partition_statement(instance.dialect_name, TABLE_EVENTS, partition))
+    )
+    _LOGGER.debug("Dropped events partition %s", partition.name)
+    if instance.schema_version >= REF_COUNT_SCHEMA_VERSION:
+        _subtract_references(session, references, adjust_event_data_ref_counts)
+    _purge_unused_data_ids(instance, session, {data_id for data_id, _ in references})
+
+
 def _purge_unused_attributes_ids(
     instance: Recorder,
     session: Session,
@@ -385,6 +648,15 @@ def _select_unused_event_data_ids(
     if not data_ids:
         return set()
 
+    unused_ids: set[int] = set()
+    if instance.schema_version >= REF_COUNT_SCHEMA_VERSION:
+        unused_ids, data_ids = _split_by_ref_count(
+            session, data_ids, get_event_data_ref_counts, instance.max_bind_vars
+        )
+        if not data_ids:
+            _LOGGER.debug("Selected %s shared event data to remove", len(unused_ids))
+            return unused_ids
+
     seen_ids: set[int] = set()
     # See _select_unused_attributes_ids for why this function
     # branches for non-sqlite databases.
@@ -406,7 +678,7 @@ def _select_unused_event_data_ids(
                 ).all()
                 if data_id[0] is not None
             }
-    to_remove = data_ids - seen_ids
+    to_remove = unused_ids | (data_ids - seen_ids)
     _LOGGER.debug("Selected %s shared event data to remove", len(to_remove))
     return to_remove
 
@@ -454,6 +726,22 @@ def _select_short_term_statistics_to_purge(
     return [statistic_id for (statistic_id,) in statistics]
 
 
+def _select_downsampled_states_to_purge(
+    session: Session,
+    tier: type[StatesDownsampledBase],
+    purge_before: datetime,
+    max_bind_vars: int,
+) -> list[int]:
+    """Return a list of downsampled states of a tier to purge."""
+    downsampled_states = session.execute(
+        find_downsampled_states_to_purge(tier, purge_before, max_bind_vars)
+    ).all()
+    _LOGGER.debug(
+        "Selected %s %s rows to remove", len(downsampled_states), tier.__tablename__
+    )
+    return [downsampled_state_id for (downsampled_state_id,) in downsampled_states]
+
+
 def _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
     session: Session, purge_before: datetime, max_bind_vars: int
 ) -> tuple[set[int], set[int]]:
@@ -514,6 +802,13 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     if not state_ids:
         return
 
+    if instance.schema_version >= REF_COUNT_SCHEMA_VERSION:
+        _release_references(
+            session,
+            count_states_by_attributes_id(state_ids),
+            adjust_state_attributes_ref_counts,
+        )
+
     # Update old_state_id to NULL before deleting to ensure
     # the delete does not fail due to a foreign key constraint
     # since some databases (MSSQL) cannot do the ON DELETE SET NULL
@@ -570,10 +865,26 @@ def _purge_short_term_statistics(
     _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
 
 
-def _purge_event_ids(session: Session, event_ids: set[int]) -> None:
+def _purge_downsampled_states(
+    session: Session,
+    tier: type[StatesDownsampledBase],
+    downsampled_states: list[int],
+) -> None:
+    """Delete by id."""
+    deleted_rows = session.execute(
+        delete_downsampled_states_rows(tier, downsampled_states)
+    )
+    _LOGGER.debug("Deleted %s %s rows", deleted_rows, tier.__tablename__)
+
+
+def _purge_event_ids(instance: Recorder, session: Session, event_ids: set[int]) -> None:
     """Delete by event id."""
     if not event_ids:
         return
+    if instance.schema_version >= REF_COUNT_SCHEMA_VERSION:
+        _release_references(
+            session, count_events_by_data_id(event_ids), adjust_event_data_ref_counts
+        )
     deleted_rows = session.execute(delete_event_rows(event_ids))
     _LOGGER.debug("Deleted %s events", deleted_rows)
 
@@ -705,7 +1016,7 @@ def _purge_filtered_states(
     # These are legacy events that are linked to a state that are no longer
     # created but since we did not remove them when we stopped adding new ones
     # we will need to purge them here.
-    _purge_event_ids(session, filtered_event_ids)
+    _purge_event_ids(instance, session, filtered_event_ids)
     unused_attribute_ids_set = _select_unused_attributes_ids(
         instance,
         session,
@@ -755,7 +1066,7 @@ def _purge_filtered_events(
         # created but since we did not remove them when we stopped adding new ones
         # we will need to purge them here.
         _purge_state_ids(instance, session, state_ids)
-    _purge_event_ids(session, event_ids_set)
+    _purge_event_ids(instance, session, event_ids_set)
     if unused_data_ids_set := _select_unused_event_data_ids(
         instance, session, set(data_ids), database_engine
     ):
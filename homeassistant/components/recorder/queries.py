@@ -4,8 +4,20 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import datetime
-
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from typing import cast
+
+from sqlalchemy import (
+    Table,
+    bindparam,
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.sql.dml import Update
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
@@ -17,6 +29,7 @@ from .db_schema import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesDownsampledBase,
     StatesMeta,
     Statistics,
     StatisticsRuns,
@@ -540,6 +553,20 @@ def disconnect_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     )
 
 
+def disconnect_states_rows_in_range(
+    lower_state_id: int, upper_state_id: int
+) -> StatementLambdaElement:
+    """Disconnect the newer states rows from a range of state ids."""
+    return lambda_stmt(
+        lambda: update(States)
+        .where(States.old_state_id >= lower_state_id)
+        .where(States.old_state_id < upper_state_id)
+        .where(States.state_id >= upper_state_id)
+        .values(old_state_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     """Delete states rows."""
     return lambda_stmt(
@@ -591,6 +618,19 @@ def delete_statistics_short_term_rows(
     )
 
 
+def delete_downsampled_states_rows(
+    tier: type[StatesDownsampledBase],
+    downsampled_states: Iterable[int],
+) -> StatementLambdaElement:
+    """Delete downsampled states rows of a tier."""
+    return lambda_stmt(
+        lambda: delete(tier)
+        .where(tier.id.in_(downsampled_states))
+        .execution_options(synchronize_session=False),
+        track_on=[tier],
+    )
+
+
 def delete_event_rows(
     event_ids: Iterable[int],
 ) -> StatementLambdaElement:
@@ -625,6 +665,169 @@ def find_events_to_purge(
     )
 
 
+def count_states_by_attributes_id(state_ids: Iterable[int]) -> StatementLambdaElement:
+    """Count the states referencing each attributes id among some states."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id, func.count(States.state_id))
+        .filter(States.state_id.in_(state_ids))
+        .filter(States.attributes_id.is_not(None))
+        .group_by(States.attributes_id)
+    )
+
+
+def count_states_by_attributes_id_in_range(
+    lower_state_id: int, upper_state_id: int
+) -> StatementLambdaElement:
+    """Count the states referencing each attributes id in a range of state ids."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id, func.count(States.state_id))
+        .filter(States.state_id >= lower_state_id)
+        .filter(States.state_id < upper_state_id)
+        .filter(States.attributes_id.is_not(None))
+        .group_by(States.attributes_id)
+    )
+
+
+def count_events_by_data_id(event_ids: Iterable[int]) -> StatementLambdaElement:
+    """Count the events referencing each data id among some events."""
+    return lambda_stmt(
+        lambda: select(Events.data_id, func.count(Events.event_id))
+        .filter(Events.event_id.in_(event_ids))
+        .filter(Events.data_id.is_not(None))
+        .group_by(Events.data_id)
+    )
+
+
+def count_events_by_data_id_in_range(
+    lower_event_id: int, upper_event_id: int
+) -> StatementLambdaElement:
+    """Count the events referencing each data id in a range of event ids."""
+    return lambda_stmt(
+        lambda: select(Events.data_id, func.count(Events.event_id))
+        .filter(Events.event_id >= lower_event_id)
+        .filter(Events.event_id < upper_event_id)
+        .filter(Events.data_id.is_not(None))
+        .group_by(Events.data_id)
+    )
+
+
+def count_states_referencing_attributes_ids(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Count all states referencing each attributes id."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id, func.count(States.state_id))
+        .filter(States.attributes_id.in_(attributes_ids))
+        .group_by(States.attributes_id)
+    )
+
+
+def count_events_referencing_data_ids(
+    data_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Count all events referencing each data id."""
+    return lambda_stmt(
+        lambda: select(Events.data_id, func.count(Events.event_id))
+        .filter(Events.data_id.in_(data_ids))
+        .group_by(Events.data_id)
+    )
+
+
+def get_state_attributes_ref_counts(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Get the ref_count of state attributes."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id, StateAttributes.ref_count).filter(
+            StateAttributes.attributes_id.in_(attributes_ids)
+        )
+    )
+
+
+def get_event_data_ref_counts(data_ids: Iterable[int]) -> StatementLambdaElement:
+    """Get the ref_count of event data."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.ref_count).filter(
+            EventData.data_id.in_(data_ids)
+        )
+    )
+
+
+def adjust_state_attributes_ref_counts() -> Update:
+    """Adjust the ref_count of state attributes by b_delta.
+
+    The statement is meant to be executed with a list of parameters.
+    Rows that have not been counted yet keep a NULL ref_count.
+    """
+    table = cast(Table, StateAttributes.__table__)
+    return (
+        update(table)
+        .where(table.c.attributes_id == bindparam("b_id"))
+        .values(ref_count=table.c.ref_count + bindparam("b_delta"))
+    )
+
+
+def adjust_event_data_ref_counts() -> Update:
+    """Adjust the ref_count of event data by b_delta.
+
+    The statement is meant to be executed with a list of parameters.
+    Rows that have not been counted yet keep a NULL ref_count.
+    """
+    table = cast(Table, EventData.__table__)
+    return (
+        update(table)
+        .where(table.c.data_id == bindparam("b_id"))
+        .values(ref_count=table.c.ref_count + bindparam("b_delta"))
+    )
+
+
+def has_state_attributes_ref_counts_to_migrate() -> StatementLambdaElement:
+    """Check if there are state attributes that have not been counted."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id)
+        .filter(StateAttributes.ref_count.is_(None))
+        .limit(1)
+    )
+
+
+def has_event_data_ref_counts_to_migrate() -> StatementLambdaElement:
+    """Check if there are event data that have not been counted."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id).filter(EventData.ref_count.is_(None)).limit(1)
+    )
+
+
+def find_state_attributes_ref_counts_to_migrate(
+    after_attributes_id: int, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find state attributes that have not been counted after an attributes id."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id)
+        .filter(StateAttributes.attributes_id > after_attributes_id)
+        .filter(StateAttributes.ref_count.is_(None))
+        .order_by(StateAttributes.attributes_id)
+        .limit(max_bind_vars)
+    )
+
+
+def find_event_data_ref_counts_to_migrate(
+    after_data_id: int, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find event data that have not been counted after a data id."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id)
+        .filter(EventData.data_id > after_data_id)
+        .filter(EventData.ref_count.is_(None))
+        .order_by(EventData.data_id)
+        .limit(max_bind_vars)
+    )
+
+
+def find_oldest_state_last_updated_ts() -> StatementLambdaElement:
+    """Find the last_updated_ts of the oldest state."""
+    return lambda_stmt(lambda: select(func.min(States.last_updated_ts)))
+
+
 def find_states_to_purge(
     purge_before: float, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -648,6 +851,19 @@ def find_short_term_statistics_to_purge(
     )
 
 
+def find_downsampled_states_to_purge(
+    tier: type[StatesDownsampledBase], purge_before: datetime, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find downsampled states of a tier that end before purge_before."""
+    purge_before_ts = (purge_before - tier.duration).timestamp()
+    return lambda_stmt(
+        lambda: select(tier.id)
+        .filter(tier.start_ts < purge_before_ts)
+        .limit(max_bind_vars),
+        track_on=[tier],
+    )
+
+
 def find_statistics_runs_to_purge(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -770,6 +986,29 @@ def has_used_states_event_ids() -> StatementLambdaElement:
     )
 
 
+def has_statistics_to_roll_up() -> StatementLambdaElement:
+    """Check if there are hourly statistics to roll up per day and month."""
+    return lambda_stmt(lambda: select(Statistics.id).limit(1))
+
+
+def has_states_updated_since(last_updated_ts: float) -> StatementLambdaElement:
+    """Check if there are states updated at or after a timestamp."""
+    return lambda_stmt(
+        lambda: select(States.state_id)
+        .filter(States.last_updated_ts >= last_updated_ts)
+        .limit(1)
+    )
+
+
+def has_short_term_statistics_since(start_ts: float) -> StatementLambdaElement:
+    """Check if there are short term statistics of periods at or after a timestamp."""
+    return lambda_stmt(
+        lambda: select(StatisticsShortTerm.id)
+        .filter(StatisticsShortTerm.start_ts >= start_ts)
+        .limit(1)
+    )
+
+
 def has_events_context_ids_to_migrate() -> StatementLambdaElement:
     """Check if there are events context ids to migrate."""
     return lambda_stmt(
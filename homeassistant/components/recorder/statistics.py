@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Callable, Iterable, Sequence
+from collections.abc import Callable, Hashable, Iterable, Sequence
 import dataclasses
 from datetime import datetime, timedelta
 from functools import lru_cache, partial
@@ -59,9 +59,12 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDay,
+    StatisticsMonth,
     StatisticsRuns,
     StatisticsShortTerm,
 )
+from .downsampled import compile_downsampled_states
 from .models import (
     StatisticData,
     StatisticDataTimestamp,
@@ -70,6 +73,7 @@ from .models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
 )
+from .statistics_cache import estimate_result_size
 from .util import (
     execute,
     execute_stmt_lambda_element,
@@ -444,6 +448,127 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
         for metadata_id, summary_item in summary.items()
     )
 
+    # Roll up the day and month which end with this hour, or which were
+    # already complete if an hour is compiled out of order
+    compiled_until_ts = _statistics_compiled_until_ts(session) or 0
+    _update_statistics_rollups(
+        session, start_time_ts, end_time_ts, max(end_time_ts, compiled_until_ts)
+    )
+
+
+def _statistics_compiled_until_ts(session: Session) -> float | None:
+    """Return the end of the last hour with compiled statistics."""
+    if not (last_run := session.query(func.max(StatisticsRuns.start)).scalar()):
+        return None
+    compiled_until: datetime = (
+        process_timestamp(last_run) + StatisticsShortTerm.duration
+    )
+    return compiled_until.replace(minute=0, second=0, microsecond=0).timestamp()
+
+
+def _session_reads_from_read_database(hass: HomeAssistant, session: Session) -> bool:
+    """Return if the session reads from the read database."""
+    read_engine = get_instance(hass).read_engine
+    return read_engine is not None and session.get_bind() is read_engine
+
+
+def _update_statistics_rollups(
+    session: Session,
+    start_ts: float,
+    end_ts: float,
+    compiled_until_ts: float,
+    metadata_ids: list[int] | None = None,
+) -> None:
+    """Recompute the day and month rollups overlapping start_ts - end_ts.
+
+    Only the periods which end before compiled_until_ts are rolled up, the
+    rest of the periods are reduced from the hourly statistics when read.
+    The rollups are reduced the same way as _reduce_statistics reduces
+    the hourly statistics.
+    """
+    for table, period_ts_factory in STATISTICS_ROLLUPS:
+        _, period_start_end = period_ts_factory()
+        rollup_start_ts = period_start_end(start_ts)[0]
+        rollup_end_ts = min(
+            period_start_end(end_ts - 1)[1], period_start_end(compiled_until_ts)[0]
+        )
+        if rollup_end_ts <= rollup_start_ts:
+            continue
+
+        delete = session.query(table).filter(
+            table.start_ts >= rollup_start_ts, table.start_ts < rollup_end_ts
+        )
+        stmt = (
+            select(*QUERY_STATISTICS)
+            .filter(Statistics.start_ts >= rollup_start_ts)
+            .filter(Statistics.start_ts < rollup_end_ts)
+        )
+        if metadata_ids is not None:
+            delete = delete.filter(table.metadata_id.in_(metadata_ids))
+            stmt = stmt.filter(Statistics.metadata_id.in_(metadata_ids))
+        delete.delete(synchronize_session=False)
+        stats = session.execute(
+            stmt.order_by(Statistics.metadata_id, Statistics.start_ts)
+        ).all()
+
+        session.add_all(_roll_up_statistics(table, period_start_end, stats))
+
+
+def _roll_up_statistics(
+    table: type[StatisticsDay | StatisticsMonth],
+    period_start_end: Callable[[float], tuple[float, float]],
+    stats: Sequence[Row],
+) -> list[StatisticsDay | StatisticsMonth]:
+    """Reduce hourly statistics sorted by metadata_id and start to rollups."""
+    rollups: list[StatisticsDay | StatisticsMonth] = []
+    for (metadata_id, period_start_ts), group in groupby(
+        stats, lambda row: (row.metadata_id, period_start_end(row.start_ts)[0])
+    ):
+        rows = list(group)
+        last = rows[-1]
+        rollup: StatisticDataTimestamp = {
+            "start_ts": period_start_ts,
+            "last_reset_ts": last.last_reset_ts,
+            "state": last.state,
+            "sum": last.sum,
+        }
+        if means := [row.mean for row in rows if row.mean is not None]:
+            rollup["mean"] = sum(means) / len(means)
+        if mins := [row.min for row in rows if row.min is not None]:
+            rollup["min"] = min(mins)
+        if maxes := [row.max for row in rows if row.max is not None]:
+            rollup["max"] = max(maxes)
+        rollups.append(table.from_stats_ts(metadata_id, rollup))
+    return rollups
+
+
+def update_statistics_rollups(
+    instance: Recorder, start: datetime | None
+) -> datetime | None:
+    """Roll up the hourly statistics of one month.
+
+    The month starting at start is rolled up, or the month of the oldest hourly
+    statistics if start is None. Returns the start of the next month to roll
+    up, or None when all complete periods have been rolled up.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        if (compiled_until_ts := _statistics_compiled_until_ts(session)) is None:
+            return None
+        _, month_start_end = reduce_month_ts_factory()
+        if start is not None:
+            start_ts = start.timestamp()
+        elif (
+            oldest_ts := session.query(func.min(Statistics.start_ts)).scalar()
+        ) is not None:
+            start_ts = month_start_end(oldest_ts)[0]
+        else:
+            return None
+        if start_ts >= month_start_end(compiled_until_ts)[1]:
+            return None
+        end_ts = month_start_end(start_ts)[1]
+        _update_statistics_rollups(session, start_ts, end_ts, compiled_until_ts)
+    return dt_util.utc_from_timestamp(end_ts)
+
 
 @retryable_database_job("compile missing statistics")
 def compile_missing_statistics(instance: Recorder) -> bool:
@@ -506,7 +631,15 @@ def compile_statistics(instance: Recorder, start: datetime, fire_events: bool) -
         ),
     ) as session:
         modified_statistic_ids = _compile_statistics(
-            instance, session, start, fire_events
+            instance, session, start, fire_events, compile_in_executor=True
+        )
+    instance.statistics_committed(start)
+
+    if start.minute == 55:
+        # The compiled hour is after the cached periods,
+        # unless the statistics were compiled out of order
+        instance.statistics_result_cache.invalidate(
+            None, start.replace(minute=0).timestamp()
         )
 
     if modified_statistic_ids:
@@ -525,14 +658,39 @@ def _get_first_id_stmt(start: datetime) -> StatementLambdaElement:
     return lambda_stmt(lambda: select(StatisticsRuns.run_id).filter_by(start=start))
 
 
+def _compile_platform_statistics_in_executor(
+    instance: Recorder,
+    platform_compile_statistics: Callable[
+        [HomeAssistant, Session, datetime, datetime], PlatformCompiledStatistics
+    ],
+    start: datetime,
+    end: datetime,
+) -> PlatformCompiledStatistics:
+    """Compile the statistics of a platform in the executor.
+
+    The primary database is read, the states of the period may not have
+    reached the read database yet.
+    """
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        return platform_compile_statistics(instance.hass, session, start, end)
+
+
 def _compile_statistics(
-    instance: Recorder, session: Session, start: datetime, fire_events: bool
+    instance: Recorder,
+    session: Session,
+    start: datetime,
+    fire_events: bool,
+    compile_in_executor: bool = False,
 ) -> set[str]:
     """Compile 5-minute statistics for all integrations with a recorder platform.
 
     This is a helper function for compile_statistics and compile_missing_statistics
     that does not retry on database errors since both callers already retry.
 
+    If compile_in_executor is set, the platforms compile their statistics in
+    the database executor on their own sessions. This is only safe if the session
+    has no uncommitted statistics the platforms depend on.
+
     returns a set of modified statistic_ids if any were modified.
     """
     assert start.tzinfo == dt_util.UTC, "start must be in UTC"
@@ -549,16 +707,40 @@ def _compile_statistics(
     platform_stats: list[StatisticResult] = []
     current_metadata: dict[str, tuple[int, StatisticMetaData]] = {}
     # Collect statistics from all platforms implementing support
-    for domain, platform in instance.hass.data[DOMAIN].recorder_platforms.items():
-        if not (
+    platforms_compile_statistics = [
+        (domain, platform_compile_statistics)
+        for domain, platform in instance.hass.data[DOMAIN].recorder_platforms.items()
+        if (
             platform_compile_statistics := getattr(
                 platform, INTEGRATION_PLATFORM_COMPILE_STATISTICS, None
             )
-        ):
-            continue
-        compiled: PlatformCompiledStatistics = platform_compile_statistics(
-            instance.hass, session, start, end
         )
+    ]
+    if compile_in_executor:
+        # The platforms only read from the database, they compile in parallel
+        # in the executor and only the compiled rows are inserted here. Nothing
+        # has been written yet, end the transaction to not hold the connection
+        # while waiting for them.
+        session.commit()
+        futures = [
+            instance.add_executor_job(
+                _compile_platform_statistics_in_executor,
+                instance,
+                platform_compile_statistics,
+                start,
+                end,
+            )
+            for _, platform_compile_statistics in platforms_compile_statistics
+        ]
+        platforms_compiled = [future.result() for future in futures]
+    else:
+        platforms_compiled = [
+            platform_compile_statistics(instance.hass, session, start, end)
+            for _, platform_compile_statistics in platforms_compile_statistics
+        ]
+    for (domain, _), compiled in zip(
+        platforms_compile_statistics, platforms_compiled, strict=True
+    ):
         _LOGGER.debug(
             "Statistics for %s during %s-%s: %s",
             domain,
@@ -591,6 +773,9 @@ def _compile_statistics(
         # A full hour is ready, summarize it
         _compile_hourly_statistics(session, start)
 
+    if instance.downsample_states:
+        compile_downsampled_states(session, start)
+
     session.add(StatisticsRuns(start=start))
 
     if fire_events:
@@ -735,7 +920,13 @@ def get_metadata(
 def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
     with session_scope(session=instance.get_session()) as session:
+        metadata = instance.statistics_meta_manager.get_many(
+            session, statistic_ids=set(statistic_ids)
+        )
         instance.statistics_meta_manager.delete(session, statistic_ids)
+    instance.statistics_result_cache.invalidate(
+        metadata_id for metadata_id, _ in metadata.values()
+    )
 
 
 def update_statistics_metadata(
@@ -1102,6 +1293,24 @@ def _reduce_statistics_per_month(
     )
 
 
+STATISTICS_ROLLUPS: tuple[
+    tuple[
+        type[StatisticsDay | StatisticsMonth],
+        Callable[
+            [],
+            tuple[
+                Callable[[float, float], bool],
+                Callable[[float], tuple[float, float]],
+            ],
+        ],
+    ],
+    ...,
+] = (
+    (StatisticsDay, reduce_day_ts_factory),
+    (StatisticsMonth, reduce_month_ts_factory),
+)
+
+
 def _generate_statistics_during_period_stmt(
     start_time: datetime,
     end_time: datetime | None,
@@ -1451,7 +1660,9 @@ def statistic_during_period(
 
     result: dict[str, Any] = {}
 
-    with session_scope(hass=hass, read_only=True) as session:
+    cache = get_instance(hass).statistics_result_cache
+    generation = cache.generation
+    with session_scope(hass=hass, read_only=True, read_database=True) as session:
         # Fetch metadata for the given statistic_id
         if not (
             metadata := get_instance(hass).statistics_meta_manager.get(
@@ -1531,51 +1742,89 @@ def statistic_during_period(
             main_start_time = start_time if head_end_time is None else head_end_time
             main_end_time = end_time if tail_start_time is None else tail_start_time
 
-        if not types.isdisjoint({"max", "mean", "min"}):
-            result = _get_max_mean_min_statistic(
-                session,
-                head_start_time,
-                head_end_time,
-                main_start_time,
-                main_end_time,
-                tail_start_time,
-                tail_end_time,
-                tail_only,
+        cache_key: Hashable | None = None
+        cached_result: dict[str, Any] | None = None
+        if (
+            start_time is not None
+            and end_time is not None
+            and head_start_time is None
+            and tail_start_time is None
+            and (compiled_until_ts := _statistics_compiled_until_ts(session))
+            is not None
+            and end_time.timestamp() <= compiled_until_ts
+        ):
+            # Only compiled hourly statistics are read, they only change
+            # when the cache is invalidated
+            cache_key = (
+                "statistic_during_period",
                 metadata_id,
-                types,
+                start_time.timestamp(),
+                end_time.timestamp(),
+                frozenset(types),
             )
+            cached_result = cache.get(cache_key)
 
-        if "change" in types:
-            oldest_sum: float | None
-            if start_time is None:
-                oldest_sum = 0.0
-            else:
-                oldest_sum = _get_oldest_sum_statistic(
+        if cached_result is not None:
+            result = dict(cached_result)
+        else:
+            if not types.isdisjoint({"max", "mean", "min"}):
+                result = _get_max_mean_min_statistic(
                     session,
                     head_start_time,
+                    head_end_time,
                     main_start_time,
+                    main_end_time,
                     tail_start_time,
-                    oldest_stat,
-                    oldest_5_min_stat,
+                    tail_end_time,
                     tail_only,
                     metadata_id,
+                    types,
+                )
+
+            if "change" in types:
+                oldest_sum: float | None
+                if start_time is None:
+                    oldest_sum = 0.0
+                else:
+                    oldest_sum = _get_oldest_sum_statistic(
+                        session,
+                        head_start_time,
+                        main_start_time,
+                        tail_start_time,
+                        oldest_stat,
+                        oldest_5_min_stat,
+                        tail_only,
+                        metadata_id,
+                    )
+                newest_sum = _get_newest_sum_statistic(
+                    session,
+                    head_start_time,
+                    head_end_time,
+                    main_start_time,
+                    main_end_time,
+                    tail_start_time,
+                    tail_end_time,
+                    tail_only,
+                    metadata_id,
+                )
+                # Calculate the difference between the oldest and newest sum
+                if oldest_sum is not None and newest_sum is not None:
+                    result["change"] = newest_sum - oldest_sum
+                else:
+                    result["change"] = None
+
+            if cache_key is not None and not _session_reads_from_read_database(
+                hass, session
+            ):
+                assert end_time is not None
+                cache.set(
+                    cache_key,
+                    (metadata_id,),
+                    end_time.timestamp(),
+                    dict(result),
+                    estimate_result_size((result,)),
+                    generation,
                 )
-            newest_sum = _get_newest_sum_statistic(
-                session,
-                head_start_time,
-                head_end_time,
-                main_start_time,
-                main_end_time,
-                tail_start_time,
-                tail_end_time,
-                tail_only,
-                metadata_id,
-            )
-            # Calculate the difference between the oldest and newest sum
-            if oldest_sum is not None and newest_sum is not None:
-                result["change"] = newest_sum - oldest_sum
-            else:
-                result["change"] = None
 
     state_unit = unit = metadata[1]["unit_of_measurement"]
     if state := hass.states.get(statistic_id):
@@ -1687,6 +1936,123 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+def _statistics_during_period_from_rollups(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: set[str] | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    metadata_ids: list[int] | None,
+    period: Literal["day", "week", "month"],
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]] | None:
+    """Return daily, weekly or monthly statistics read from the rollups.
+
+    The days or months completely within the requested period which have
+    been compiled are read from the rollups. The hours before the first
+    and after the last of them are reduced from the hourly statistics.
+    Weeks are reduced from the days, except the mean which can't be reduced
+    from the daily means.
+
+    Returns None if the statistics have to be reduced from the hourly
+    statistics instead.
+    """
+    if not get_instance(hass).statistics_rollups_ready or (
+        period == "week" and "mean" in types
+    ):
+        return None
+    if (compiled_until_ts := _statistics_compiled_until_ts(session)) is None:
+        return None
+
+    rollup_table: type[StatisticsDay | StatisticsMonth]
+    if period == "month":
+        rollup_table = StatisticsMonth
+        _, period_start_end = reduce_month_ts_factory()
+        reduce_hours = _reduce_statistics_per_month
+    else:
+        rollup_table = StatisticsDay
+        _, period_start_end = reduce_day_ts_factory()
+        reduce_hours = _reduce_statistics_per_day
+
+    start_ts = start_time.timestamp()
+    end_ts = end_time.timestamp() if end_time is not None else None
+    # The rollups of the periods starting at or after start_time
+    # and ending at or before end_time
+    rollup_start_ts = period_start_end(start_ts)[0]
+    if rollup_start_ts != start_ts:
+        rollup_start_ts = period_start_end(start_ts)[1]
+    rollup_end_ts = period_start_end(compiled_until_ts)[0]
+    if end_ts is not None:
+        rollup_end_ts = min(rollup_end_ts, period_start_end(end_ts)[0])
+
+    def _reduce_hours(
+        from_ts: float, to_ts: float | None
+    ) -> dict[str, list[StatisticsRow]]:
+        """Reduce the hourly statistics from from_ts until to_ts."""
+        if (to_ts is not None and from_ts >= to_ts) or not (
+            stats := cast(
+                Sequence[Row],
+                execute_stmt_lambda_element(
+                    session,
+                    _generate_statistics_during_period_stmt(
+                        dt_util.utc_from_timestamp(from_ts),
+                        dt_util.utc_from_timestamp(to_ts)
+                        if to_ts is not None
+                        else None,
+                        metadata_ids,
+                        Statistics,
+                        types,
+                    ),
+                    orm_rows=False,
+                ),
+            )
+        ):
+            return {}
+        hours = _sorted_statistics_to_dict(
+            hass, stats, statistic_ids, metadata, True, Statistics, units, types
+        )
+        return reduce_hours(hours, types)
+
+    if rollup_start_ts >= rollup_end_ts:
+        # There are no complete compiled periods to read from the rollups
+        result = _reduce_hours(start_ts, end_ts)
+    else:
+        result = _reduce_hours(start_ts, rollup_start_ts)
+        if stats := cast(
+            Sequence[Row],
+            execute_stmt_lambda_element(
+                session,
+                _generate_statistics_during_period_stmt(
+                    dt_util.utc_from_timestamp(rollup_start_ts),
+                    dt_util.utc_from_timestamp(rollup_end_ts),
+                    metadata_ids,
+                    rollup_table,
+                    types,
+                ),
+                orm_rows=False,
+            ),
+        ):
+            # The rollups were compiled in another time zone
+            if any(row.start_ts != period_start_end(row.start_ts)[0] for row in stats):
+                return None
+            rollups = _sorted_statistics_to_dict(
+                hass, stats, statistic_ids, metadata, True, rollup_table, units, types
+            )
+            for statistic_id, rows in rollups.items():
+                for row in rows:
+                    row["end"] = period_start_end(row["start"])[1]
+                result.setdefault(statistic_id, []).extend(rows)
+        for statistic_id, rows in _reduce_hours(rollup_end_ts, end_ts).items():
+            result.setdefault(statistic_id, []).extend(rows)
+
+    if period == "week":
+        result = _reduce_statistics_per_week(result, types)
+
+    return result
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1706,6 +2072,8 @@ def _statistics_during_period_with_session(
         # This is for backwards compatibility to avoid a breaking change
         # for custom integrations that call this method.
         statistic_ids = set(statistic_ids)  # type: ignore[unreachable]
+    cache = get_instance(hass).statistics_result_cache
+    generation = cache.generation
     # Fetch metadata for the given (or all) statistic_ids
     metadata = get_instance(hass).statistics_meta_manager.get_many(
         session, statistic_ids=statistic_ids
@@ -1754,38 +2122,168 @@ def _statistics_during_period_with_session(
         if end_time is not None:
             end_time = _find_month_end_time(dt_util.as_local(end_time))
 
-    table: type[Statistics | StatisticsShortTerm] = (
-        Statistics if period != "5minute" else StatisticsShortTerm
-    )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
-
-    if not stats:
-        return {}
+    cache_key: Hashable | None = None
+    end_time_ts: float | None = None
+    if (
+        period != "5minute"
+        and metadata_ids is not None
+        and end_time is not None
+        and (compiled_until_ts := _statistics_compiled_until_ts(session)) is not None
+        and end_time.timestamp() <= compiled_until_ts
+    ):
+        end_time_ts = end_time.timestamp()
+        # The compiled hours only change when the cache is invalidated
+        cache_key = _statistics_during_period_cache_key(
+            hass, metadata, start_time, end_time_ts, period, units, _types
+        )
+        if (cached_result := cache.get(cache_key)) is not None:
+            return _copy_statistics_result(cached_result)
 
-    result = _sorted_statistics_to_dict(
+    result = _query_statistics_during_period(
         hass,
-        stats,
+        session,
+        start_time,
+        end_time,
         statistic_ids,
         metadata,
-        True,
-        table,
+        metadata_ids,
+        period,
         units,
         types,
+        _types,
     )
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
+    if cache_key is not None and not _session_reads_from_read_database(hass, session):
+        assert metadata_ids is not None and end_time_ts is not None
+        cache.set(
+            cache_key,
+            metadata_ids,
+            end_time_ts,
+            _copy_statistics_result(result),
+            sum(estimate_result_size(rows) for rows in result.values()),
+            generation,
+        )
+    return result
 
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
 
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+def _statistics_during_period_cache_key(
+    hass: HomeAssistant,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    start_time: datetime,
+    end_time_ts: float,
+    period: Literal["5minute", "day", "hour", "week", "month"],
+    units: dict[str, str] | None,
+    types: set[Literal["change", "last_reset", "max", "mean", "min", "state", "sum"]],
+) -> Hashable:
+    """Return the cache key of the result of a statistics query.
+
+    The rows are converted to the units of the states, the units of the
+    states are part of the key together with the metadata of the statistics.
+    """
+    statistics: list[tuple[Any, ...]] = []
+    for statistic_id, (metadata_id, stats_metadata) in metadata.items():
+        state_unit = None
+        if state := hass.states.get(statistic_id):
+            state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        statistics.append(
+            (
+                metadata_id,
+                statistic_id,
+                stats_metadata["unit_of_measurement"],
+                stats_metadata["has_mean"],
+                stats_metadata["has_sum"],
+                state_unit,
+            )
+        )
+    return (
+        "statistics_during_period",
+        period,
+        start_time.timestamp(),
+        end_time_ts,
+        frozenset(types),
+        frozenset(units.items()) if units else None,
+        tuple(sorted(statistics)),
+    )
+
+
+def _copy_statistics_result(
+    result: dict[str, list[StatisticsRow]],
+) -> dict[str, list[StatisticsRow]]:
+    """Copy a result which the caller may modify."""
+    return {
+        statistic_id: [row.copy() for row in rows]
+        for statistic_id, rows in result.items()
+    }
+
+
+def _query_statistics_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: set[str] | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    metadata_ids: list[int] | None,
+    period: Literal["5minute", "day", "hour", "week", "month"],
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+    _types: set[Literal["change", "last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]]:
+    """Query statistic data points during the aligned period."""
+    table: type[Statistics | StatisticsShortTerm] = (
+        Statistics if period != "5minute" else StatisticsShortTerm
+    )
+    if (
+        period in ("day", "week", "month")
+        and (
+            rollup_result := _statistics_during_period_from_rollups(
+                hass,
+                session,
+                start_time,
+                end_time,
+                statistic_ids,
+                metadata,
+                metadata_ids,
+                period,
+                units,
+                types,
+            )
+        )
+        is not None
+    ):
+        if not rollup_result:
+            return {}
+        result = rollup_result
+    else:
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
+
+        if not stats:
+            return {}
+
+        result = _sorted_statistics_to_dict(
+            hass,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            units,
+            types,
+        )
+
+        if period == "day":
+            result = _reduce_statistics_per_day(result, types)
+
+        if period == "week":
+            result = _reduce_statistics_per_week(result, types)
+
+        if period == "month":
+            result = _reduce_statistics_per_month(result, types)
 
     if "change" in _types:
         _augment_result_with_change(
@@ -1810,7 +2308,7 @@ def statistics_during_period(
     If end_time is omitted, returns statistics newer than or equal to start_time.
     If statistic_ids is omitted, returns statistics for all statistics ids.
     """
-    with session_scope(hass=hass, read_only=True) as session:
+    with session_scope(hass=hass, read_only=True, read_database=True) as session:
         return _statistics_during_period_with_session(
             hass,
             session,
@@ -2346,8 +2844,8 @@ def _import_statistics_with_session(
     metadata: StatisticMetaData,
     statistics: Iterable[StatisticData],
     table: type[StatisticsBase],
-) -> bool:
-    """Import statistics to the database."""
+) -> int:
+    """Import statistics to the database, return the metadata_id."""
     statistics_meta_manager = instance.statistics_meta_manager
     old_metadata_dict = statistics_meta_manager.get_many(
         session, statistic_ids={metadata["statistic_id"]}
@@ -2355,14 +2853,28 @@ def _import_statistics_with_session(
     _, metadata_id = statistics_meta_manager.update_or_add(
         session, metadata, old_metadata_dict
     )
+    starts: list[float] = []
     for stat in statistics:
         if stat_id := _statistics_exists(session, table, metadata_id, stat["start"]):
             _update_statistics(session, table, stat_id, stat)
         else:
             _insert_statistics(session, table, metadata_id, stat)
+        starts.append(stat["start"].timestamp())
+
+    if table == Statistics:
+        # Roll up the complete days and months the imported hours belong to
+        if starts and (compiled_until_ts := _statistics_compiled_until_ts(session)):
+            _update_statistics_rollups(
+                session,
+                min(starts),
+                max(starts) + Statistics.duration.total_seconds(),
+                compiled_until_ts,
+                [metadata_id],
+            )
+        return metadata_id
 
     if table != StatisticsShortTerm:
-        return True
+        return metadata_id
 
     # We just inserted new short term statistics, so we need to update the
     # ShortTermStatisticsRunCache with the latest id for the metadata_id
@@ -2371,7 +2883,7 @@ def _import_statistics_with_session(
         run_cache, session, metadata_id
     )
 
-    return True
+    return metadata_id
 
 
 @singleton(DATA_SHORT_TERM_STATISTICS_RUN_CACHE)
@@ -2440,6 +2952,8 @@ def import_statistics(
     table: type[StatisticsBase],
 ) -> bool:
     """Process an import_statistics job."""
+    statistics = list(statistics)
+    metadata_id: int | None = None
 
     with session_scope(
         session=instance.get_session(),
@@ -2447,10 +2961,18 @@ def import_statistics(
             instance, "statistic"
         ),
     ) as session:
-        return _import_statistics_with_session(
+        metadata_id = _import_statistics_with_session(
             instance, session, metadata, statistics, table
         )
 
+    # Invalidate the cached results once the imported rows are committed, so
+    # a query running before the commit can't cache the old rows again
+    if metadata_id is not None and table == Statistics and statistics:
+        instance.statistics_result_cache.invalidate(
+            (metadata_id,), min(stat["start"] for stat in statistics).timestamp()
+        )
+    return True
+
 
 @retryable_database_job("adjust_statistics")
 def adjust_statistics(
@@ -2491,6 +3013,28 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        # The sums of the periods after the adjusted one are shifted like the
+        # hourly sums, the adjusted period is rolled up again
+        start_ts = start_time.replace(minute=0).timestamp()
+        for table, period_ts_factory in STATISTICS_ROLLUPS:
+            _, period_start_end = period_ts_factory()
+            _adjust_sum_statistics(
+                session,
+                table,
+                metadata[statistic_id][0],
+                dt_util.utc_from_timestamp(period_start_end(start_ts)[1]),
+                sum_adjustment,
+            )
+        if compiled_until_ts := _statistics_compiled_until_ts(session):
+            _update_statistics_rollups(
+                session,
+                start_ts,
+                start_ts + Statistics.duration.total_seconds(),
+                compiled_until_ts,
+                [metadata[statistic_id][0]],
+            )
+
+    instance.statistics_result_cache.invalidate((metadata[statistic_id][0],), start_ts)
     return True
 
 
@@ -2551,6 +3095,8 @@ def change_statistics_unit(
         tables: tuple[type[StatisticsBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            StatisticsDay,
+            StatisticsMonth,
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
@@ -2559,6 +3105,8 @@ def change_statistics_unit(
             session, statistic_id, new_unit
         )
 
+    instance.statistics_result_cache.invalidate((metadata_id,))
+
 
 @callback
 def async_change_statistics_unit(
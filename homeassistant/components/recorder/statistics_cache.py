@@ -0,0 +1,136 @@
+"""Cache of the results of the long term statistics queries."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping
+from dataclasses import dataclass
+import sys
+import threading
+from typing import Any
+
+# The size of a float, the values of the statistics are floats or None
+_FLOAT_SIZE = sys.getsizeof(0.0)
+
+
+@dataclass(slots=True)
+class _CachedResult:
+    """A cached result and the statistics it was read from."""
+
+    metadata_ids: frozenset[int]
+    end_ts: float
+    size: int
+    result: Any
+
+
+def estimate_result_size(rows: Iterable[Mapping[str, Any]]) -> int:
+    """Estimate the memory used by a list of statistics rows."""
+    return sum(sys.getsizeof(row) + _FLOAT_SIZE * len(row) for row in rows)
+
+
+class StatisticsResultCache:
+    """LRU cache of the results of statistics queries with a memory cap.
+
+    Only the results of periods which have been compiled are cached. The
+    hourly statistics of those periods only change when statistics are
+    imported, adjusted, converted to another unit or cleared, or when an
+    hour is compiled out of order. Each of those invalidates the results
+    of the statistics which changed, from the changed hour on.
+
+    The cache is read from the executor and invalidated from the recorder
+    thread. A query can read the rows from before a change which is
+    invalidated while the query runs, its result is only cached if none
+    of its statistics were invalidated since the generation taken before
+    the query.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize the cache."""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[Hashable, _CachedResult] = OrderedDict()
+        self._lock = threading.Lock()
+        # The number of invalidations and the last invalidation
+        # of all statistics and of each statistic
+        self._generation = 0
+        self._all_invalidated = 0
+        self._invalidated: dict[int, int] = {}
+
+    @property
+    def generation(self) -> int:
+        """Return the generation to take before reading a result to cache."""
+        return self._generation
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the fraction of the lookups which were hits."""
+        if not (lookups := self.hits + self.misses):
+            return None
+        return self.hits / lookups
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a cached result, or None if it is not cached."""
+        with self._lock:
+            if (cached := self._results.get(key)) is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return cached.result
+
+    def set(
+        self,
+        key: Hashable,
+        metadata_ids: Iterable[int],
+        end_ts: float,
+        result: Any,
+        size: int,
+        generation: int,
+    ) -> None:
+        """Cache the result of a period ending at end_ts.
+
+        The result is not cached if its statistics were invalidated after
+        the generation was taken. The least recently used results are
+        evicted to stay below max_bytes.
+        """
+        if size > self.max_bytes:
+            return
+        metadata_ids = frozenset(metadata_ids)
+        with self._lock:
+            if self._all_invalidated > generation or any(
+                self._invalidated.get(metadata_id, 0) > generation
+                for metadata_id in metadata_ids
+            ):
+                return
+            if (replaced := self._results.pop(key, None)) is not None:
+                self.size -= replaced.size
+            self._results[key] = _CachedResult(metadata_ids, end_ts, size, result)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted = self._results.popitem(last=False)
+                self.size -= evicted.size
+
+    def invalidate(
+        self, metadata_ids: Iterable[int] | None, start_ts: float | None = None
+    ) -> None:
+        """Drop the results of statistics which changed at or after start_ts.
+
+        The results of all statistics are dropped if metadata_ids is None,
+        and the results of all periods if start_ts is None.
+        """
+        ids = None if metadata_ids is None else frozenset(metadata_ids)
+        with self._lock:
+            self._generation = generation = self._generation + 1
+            if ids is None:
+                self._all_invalidated = generation
+            else:
+                for metadata_id in ids:
+                    self._invalidated[metadata_id] = generation
+            for key, cached in list(self._results.items()):
+                if (ids is None or not ids.isdisjoint(cached.metadata_ids)) and (
+                    start_ts is None or cached.end_ts > start_ts
+                ):
+                    del self._results[key]
+                    self.size -= cached.size
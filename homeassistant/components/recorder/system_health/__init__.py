@@ -55,6 +55,31 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_purge_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about the progress of the last purge."""
+    purge_info: dict[str, Any] = {}
+    if (progress := instance.purge_progress) is None:
+        return purge_info
+    if (fraction := progress.fraction) is not None:
+        purge_info["purge_progress"] = f"{fraction:.0%}"
+    if (rows_per_second := progress.rows_per_second) is not None:
+        purge_info["purge_rows_per_second"] = f"{rows_per_second:.0f}"
+    return purge_info
+
+
+@callback
+def _async_get_statistics_cache_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about the cached results of statistics queries."""
+    cache_info: dict[str, Any] = {}
+    cache = instance.statistics_result_cache
+    if (hit_rate := cache.hit_rate) is None:
+        return cache_info
+    cache_info["statistics_cache_hit_rate"] = f"{hit_rate:.0%}"
+    cache_info["statistics_cache_size"] = f"{cache.size/1024/1024:.2f} MiB"
+    return cache_info
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -62,6 +87,8 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     recorder_runs_manager = instance.recorder_runs_manager
     database_name = urlparse(instance.db_url).path.lstrip("/")
     db_engine_info = _async_get_db_engine_info(instance)
+    purge_info = _async_get_purge_info(instance)
+    cache_info = _async_get_statistics_cache_info(instance)
     db_stats: dict[str, Any] = {}
 
     if instance.async_db_ready.done():
@@ -72,4 +99,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | purge_info | cache_info
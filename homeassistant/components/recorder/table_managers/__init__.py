@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
 from lru import LRU
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.dml import Update
 
 from homeassistant.util.event_type import EventType
 
@@ -74,3 +78,65 @@ class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
         lru = self._id_map
         if new_size > lru.get_size():
             lru.set_size(new_size)
+
+
+class BaseRefCountedLRUTableManager[_DataT](BaseLRUTableManager[_DataT]):
+    """Base class for LRU table managers of shared rows with a ref_count."""
+
+    def __init__(
+        self,
+        recorder: Recorder,
+        lru_size: int,
+        adjust_ref_counts: Callable[[], Update],
+    ) -> None:
+        """Initialize the ref counted LRU table manager.
+
+        New rows are inserted with the number of rows referencing them
+        in the same commit. References to rows that were committed
+        earlier are collected and added to their ref_count right
+        before the commit.
+        """
+        super().__init__(recorder, lru_size)
+        self._adjust_ref_counts = adjust_ref_counts
+        self._pending_references: defaultdict[int, int] = defaultdict(int)
+
+    def add_reference(self, id_: int) -> None:
+        """Add a reference to a committed row that will be counted at the next commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_references[id_] += 1
+
+    def write_pending_references(self, session: Session) -> None:
+        """Add the pending references to the ref_count of the rows.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending_references:
+            return
+        session.execute(
+            self._adjust_ref_counts(),
+            [
+                {"b_id": id_, "b_delta": references}
+                for id_, references in self._pending_references.items()
+            ],
+        )
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to clear the pending references.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_references.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        self._pending_references.clear()
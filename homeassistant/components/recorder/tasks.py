@@ -112,7 +112,11 @@ class PurgeTask(RecorderTask):
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
         if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
+            instance,
+            self.purge_before,
+            self.repack,
+            self.apply_filter,
+            time_budget=purge.DEFAULT_PURGE_TIME_BUDGET,
         ):
             with instance.get_session() as session:
                 instance.recorder_runs_manager.load_from_db(session)
@@ -371,6 +375,16 @@ class EntityIDPostMigrationTask(RecorderTask):
             instance.queue_task(EntityIDPostMigrationTask())
 
 
+class PartitionTask(RecorderTask):
+    """An object to insert into the recorder queue to maintain the partitions."""
+
+    def run(self, instance: Recorder) -> None:
+        """Partition the tables and start new partitions when due."""
+        if not instance._maintain_partitions():  # noqa: SLF001
+            # Schedule a new partition task if this one didn't finish
+            instance.queue_task(PartitionTask())
+
+
 @dataclass(slots=True)
 class RefreshEventTypesTask(RecorderTask):
     """An object to insert into the recorder queue to refresh event types."""
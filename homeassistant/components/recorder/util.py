@@ -18,7 +18,7 @@ from awesomeversion import (
     AwesomeVersionStrategy,
 )
 import ciso8601
-from sqlalchemy import inspect, text
+from sqlalchemy import inspect, make_url, text
 from sqlalchemy.engine import Result, Row
 from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import OperationalError, SQLAlchemyError, StatementError
@@ -493,6 +493,35 @@ def async_create_backup_failure_issue(
     )
 
 
+def sqlite_read_only_url(db_url: str) -> str:
+    """Return the url to open a SQLite database file with read-only connections."""
+    url = make_url(db_url)
+    return url.set(
+        database=f"file:{url.database}", query={"mode": "ro", "uri": "true"}
+    ).render_as_string(hide_password=False)
+
+
+def setup_read_connection_for_dialect(
+    dialect_name: str, dbapi_connection: DBAPIConnection, connection_record: Any
+) -> None:
+    """Execute statements needed for a connection which only reads."""
+    if dialect_name == SupportedDialect.SQLITE:
+        execute_on_connection(dbapi_connection, "PRAGMA query_only=ON")
+        # The upper bound on the cache size is approximately 16MiB of memory
+        execute_on_connection(dbapi_connection, "PRAGMA cache_size = -16384")
+    elif dialect_name == SupportedDialect.MYSQL:
+        execute_on_connection(dbapi_connection, "SET session wait_timeout=28800")
+        # Ensure all times are using UTC to avoid issues with daylight savings
+        execute_on_connection(dbapi_connection, "SET time_zone = '+00:00'")
+        execute_on_connection(dbapi_connection, "SET SESSION TRANSACTION READ ONLY")
+    elif dialect_name == SupportedDialect.POSTGRESQL:
+        execute_on_connection(
+            dbapi_connection, "SET SESSION default_transaction_read_only = on"
+        )
+        # The setting would be lost if the transaction was rolled back
+        dbapi_connection.commit()
+
+
 def setup_connection_for_dialect(
     instance: Recorder,
     dialect_name: str,
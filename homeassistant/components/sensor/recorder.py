@@ -388,6 +388,61 @@ def _timestamp_to_isoformat_or_none(timestamp: float | None) -> str | None:
     return dt_util.utc_from_timestamp(timestamp).isoformat()
 
 
+def _compile_aggregated_statistics(
+    hass: HomeAssistant,
+    session: Session,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    sensor_states: list[State],
+    wanted_statistics: dict[str, set[str]],
+) -> tuple[list[StatisticResult], dict[str, tuple[int, StatisticMetaData]]]:
+    """Compile the mean, min and max of sensors from database aggregates.
+
+    Only the sensors whose states kept the same attributes through the period
+    are compiled, and only if their unit is the one of their statistics. The
+    other sensors are compiled from their states.
+    """
+    if not (
+        entity_ids := [
+            state.entity_id
+            for state in sensor_states
+            if "sum" not in wanted_statistics[state.entity_id]
+        ]
+    ):
+        return [], {}
+    aggregates = history.get_numeric_states_aggregates_with_session(
+        hass, session, start, end, entity_ids
+    )
+    old_metadatas = statistics.get_metadata_with_session(
+        get_instance(hass), session, statistic_ids=set(aggregates)
+    )
+    result: list[StatisticResult] = []
+    for entity_id, aggregate in aggregates.items():
+        if aggregate.attributes is None:
+            continue
+        unit = aggregate.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        if (old_metadata := old_metadatas.get(entity_id)) and old_metadata[1][
+            "unit_of_measurement"
+        ] != unit:
+            continue
+        meta: StatisticMetaData = {
+            "has_mean": True,
+            "has_sum": False,
+            "name": None,
+            "source": RECORDER_DOMAIN,
+            "statistic_id": entity_id,
+            "unit_of_measurement": unit,
+        }
+        stat: StatisticData = {
+            "start": start,
+            "mean": aggregate.mean,
+            "min": aggregate.min,
+            "max": aggregate.max,
+        }
+        result.append({"meta": meta, "stat": stat})
+    return result, old_metadatas
+
+
 def compile_statistics(  # noqa: C901
     hass: HomeAssistant,
     session: Session,
@@ -395,10 +450,16 @@ def compile_statistics(  # noqa: C901
     end: datetime.datetime,
 ) -> statistics.PlatformCompiledStatistics:
     """Compile statistics for all entities during start-end."""
-    result: list[StatisticResult] = []
-
     sensor_states = _get_sensor_states(hass)
     wanted_statistics = _wanted_statistics(sensor_states)
+    result, aggregated_metadatas = _compile_aggregated_statistics(
+        hass, session, start, end, sensor_states, wanted_statistics
+    )
+    if result:
+        aggregated = {stat_result["meta"]["statistic_id"] for stat_result in result}
+        sensor_states = [
+            state for state in sensor_states if state.entity_id not in aggregated
+        ]
     # Get history between start and end
     entities_full_history = [
         i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
@@ -626,7 +687,9 @@ def compile_statistics(  # noqa: C901
 
         result.append({"meta": meta, "stat": stat})
 
-    return statistics.PlatformCompiledStatistics(result, old_metadatas)
+    return statistics.PlatformCompiledStatistics(
+        result, {**aggregated_metadatas, **old_metadatas}
+    )
 
 
 def list_statistic_ids(
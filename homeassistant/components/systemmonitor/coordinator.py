@@ -105,6 +105,7 @@ class SystemMonitorCoordinator(TimestampDataUpdateCoordinator[SensorData]):
             ("io_counters", ""): set(),
             ("addresses", ""): set(),
             ("load", ""): set(),
+            ("loop_lag", ""): set(),
             ("cpu_percent", ""): set(),
             ("boot", ""): set(),
             ("processes", ""): set(),
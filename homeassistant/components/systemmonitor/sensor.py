@@ -27,11 +27,13 @@ from homeassistant.const import (
     UnitOfDataRate,
     UnitOfInformation,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.loop_monitor import async_get_loop_monitor
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
@@ -118,6 +120,16 @@ def get_ip_address(
     return None
 
 
+def get_loop_lag(entity: SystemMonitorSensor) -> float | None:
+    """Return a percentile of the event loop lag."""
+    monitor = async_get_loop_monitor(entity.coordinator.hass)
+    if monitor is None or not (percentiles := monitor.lag_percentiles()):
+        return None
+    return round(
+        percentiles[LOOP_LAG_PERCENTILE[entity.entity_description.key]] * 1000, 1
+    )
+
+
 @dataclass(frozen=True, kw_only=True)
 class SysMonitorSensorEntityDescription(SensorEntityDescription):
     """Describes System Monitor sensor entities."""
@@ -221,6 +233,36 @@ SENSOR_TYPES: dict[str, SysMonitorSensorEntityDescription] = {
         value_fn=lambda entity: round(entity.coordinator.data.load[1], 2),
         add_to_update=lambda entity: ("load", ""),
     ),
+    "loop_lag_p50": SysMonitorSensorEntityDescription(
+        key="loop_lag_p50",
+        translation_key="loop_lag_p50",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=get_loop_lag,
+        none_is_unavailable=True,
+        add_to_update=lambda entity: ("loop_lag", ""),
+    ),
+    "loop_lag_p95": SysMonitorSensorEntityDescription(
+        key="loop_lag_p95",
+        translation_key="loop_lag_p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=get_loop_lag,
+        none_is_unavailable=True,
+        add_to_update=lambda entity: ("loop_lag", ""),
+    ),
+    "loop_lag_p99": SysMonitorSensorEntityDescription(
+        key="loop_lag_p99",
+        translation_key="loop_lag_p99",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=get_loop_lag,
+        none_is_unavailable=True,
+        add_to_update=lambda entity: ("loop_lag", ""),
+    ),
     "memory_free": SysMonitorSensorEntityDescription(
         key="memory_free",
         translation_key="memory_free",
@@ -391,6 +433,11 @@ IO_COUNTER = {
     "throughput_network_out": 0,
     "throughput_network_in": 1,
 }
+LOOP_LAG_PERCENTILE = {
+    "loop_lag_p50": "p50",
+    "loop_lag_p95": "p95",
+    "loop_lag_p99": "p99",
+}
 IF_ADDRS_FAMILY = {"ipv4_address": socket.AF_INET, "ipv6_address": socket.AF_INET6}
 
 
@@ -488,6 +535,24 @@ async def async_setup_entry(
             )
             continue
 
+        if _type.startswith("loop_lag_"):
+            if async_get_loop_monitor(hass) is None:
+                # Don't load the event loop lag sensors if the loop is not monitored.
+                continue
+            argument = ""
+            is_enabled = check_legacy_resource(f"{_type}_{argument}", legacy_resources)
+            loaded_resources.add(slugify(f"{_type}_{argument}"))
+            entities.append(
+                SystemMonitorSensor(
+                    coordinator,
+                    sensor_description,
+                    entry.entry_id,
+                    argument,
+                    is_enabled,
+                )
+            )
+            continue
+
         if _type.startswith("memory_"):
             argument = ""
             is_enabled = check_legacy_resource(f"{_type}_{argument}", legacy_resources)
@@ -55,11 +55,17 @@ from homeassistant.loader import (
     async_get_integration_descriptions,
     async_get_integrations,
 )
-from homeassistant.setup import async_get_loaded_integrations, async_get_setup_timings
+from homeassistant.setup import (
+    async_get_loaded_integrations,
+    async_get_setup_critical_path,
+    async_get_setup_timeline,
+    async_get_setup_timings,
+)
 from homeassistant.util.json import format_unserializable_data
 
 from . import const, decorators, messages
 from .connection import ActiveConnection
+from .entity_subscriptions import async_get_entity_subscriptions
 from .messages import construct_result_message
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
@@ -82,6 +88,7 @@ def async_register_commands(
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_manifest_get)
     async_reg(hass, handle_integration_setup_info)
+    async_reg(hass, handle_integration_setup_critical_path)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
@@ -363,59 +370,65 @@ def _send_handle_get_states_response(
     )
 
 
-@callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
-    entity_ids: set[str],
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event[EventStateChangedData],
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if entity_ids and entity_id not in entity_ids:
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
-
-
 @callback
 @decorators.websocket_command(
     {
         vol.Required("type"): "subscribe_entities",
         vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("since"): cv.positive_int,
     }
 )
 def handle_subscribe_entities(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
-    """Handle subscribe entities command."""
+    """Handle subscribe entities command.
+
+    If since is set, the messages include the sequence number of the last
+    change. A client which sends the sequence number of the last change it
+    received only gets the changes after it, unless they are no longer kept.
+    """
     entity_ids = set(msg.get("entity_ids", []))
+    since: int | None = msg.get("since")
+    interval: float | None = None
+    if (
+        update_interval := connection.supported_features.get(
+            const.FEATURE_ENTITY_UPDATE_INTERVAL
+        )
+    ) and update_interval > 0:
+        interval = update_interval / 1000
+    entity_subscriptions = async_get_entity_subscriptions(hass)
+    changes = (
+        None
+        if since is None
+        else entity_subscriptions.async_changes_since(
+            connection.user, entity_ids, since
+        )
+    )
     # We must never await between sending the states and listening for
     # state changed events or we will introduce a race condition
     # where some states are missed
-    states = _async_get_allowed_states(hass, connection)
-    message_id_as_bytes = str(msg["id"]).encode()
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
-            connection.send_message,
-            entity_ids,
-            connection.user,
-            message_id_as_bytes,
-        ),
+    connection.subscriptions[msg["id"]] = entity_subscriptions.async_subscribe(
+        connection.send_message,
+        connection.user,
+        msg["id"],
+        entity_ids,
+        interval,
+        since is not None,
     )
     connection.send_result(msg["id"])
 
+    if changes is not None:
+        connection.send_message(
+            messages.state_diffs_message(
+                msg["id"],
+                messages.state_diffs_event(changes),
+                entity_subscriptions.seq,
+            )
+        )
+        return
+
+    seq = None if since is None else entity_subscriptions.seq
+    states = _async_get_allowed_states(hass, connection)
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
     # to succeed for the UI to show.
@@ -428,7 +441,9 @@ def handle_subscribe_entities(
     except (ValueError, TypeError):
         pass
     else:
-        _send_handle_entities_init_response(connection, msg["id"], serialized_states)
+        _send_handle_entities_init_response(
+            connection, msg["id"], serialized_states, seq
+        )
         return
 
     serialized_states = []
@@ -443,11 +458,14 @@ def handle_subscribe_entities(
                 ),
             )
 
-    _send_handle_entities_init_response(connection, msg["id"], serialized_states)
+    _send_handle_entities_init_response(connection, msg["id"], serialized_states, seq)
 
 
 def _send_handle_entities_init_response(
-    connection: ActiveConnection, msg_id: int, serialized_states: list[bytes]
+    connection: ActiveConnection,
+    msg_id: int,
+    serialized_states: list[bytes],
+    seq: int | None,
 ) -> None:
     """Send handle entities init response."""
     connection.send_message(
@@ -457,7 +475,9 @@ def _send_handle_entities_init_response(
                 str(msg_id).encode(),
                 b',"type":"event","event":{"a":{',
                 b",".join(serialized_states),
-                b"}}}",
+                b"}}",
+                b"" if seq is None else b',"seq":' + str(seq).encode(),
+                b"}",
             )
         )
     )
@@ -538,15 +558,43 @@ def handle_integration_setup_info(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle integrations command."""
+    timeline = async_get_setup_timeline(hass)
     connection.send_result(
         msg["id"],
         [
-            {"domain": integration, "seconds": seconds}
+            _setup_info(integration, seconds, timeline)
             for integration, seconds in async_get_setup_timings(hass).items()
         ],
     )
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "integration/setup_critical_path"})
+def handle_integration_setup_critical_path(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle the integrations gating the startup command."""
+    timeline = async_get_setup_timeline(hass)
+    timings = async_get_setup_timings(hass)
+    connection.send_result(
+        msg["id"],
+        [
+            _setup_info(integration, timings.get(integration, 0), timeline)
+            for integration in async_get_setup_critical_path(hass)
+        ],
+    )
+
+
+def _setup_info(
+    integration: str, seconds: float, timeline: dict[str, tuple[float, float]]
+) -> dict[str, Any]:
+    """Return the setup info of an integration."""
+    info: dict[str, Any] = {"domain": integration, "seconds": seconds}
+    if (integration_timeline := timeline.get(integration)) is not None:
+        info["start"], info["end"] = integration_timeline
+    return info
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Hashable
+from collections.abc import Awaitable, Callable, Hashable
 from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -16,6 +16,7 @@ from homeassistant.helpers.http import current_request
 from homeassistant.util.json import JsonValueType
 
 from . import const, messages
+from .compression import COMPRESSION_DICTIONARIES
 from .util import describe_request
 
 if TYPE_CHECKING:
@@ -42,9 +43,11 @@ class ActiveConnection:
         "subscriptions",
         "last_id",
         "can_coalesce",
+        "compression_dictionary",
         "supported_features",
         "handlers",
         "binary_handlers",
+        "wait_drained",
     )
 
     def __init__(
@@ -64,21 +67,37 @@ class ActiveConnection:
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
         self.last_id = 0
         self.can_coalesce = False
+        self.compression_dictionary: bytes | None = None
         self.supported_features: dict[str, float] = {}
         self.handlers: dict[str, tuple[MessageHandler, vol.Schema | Literal[False]]] = (
             self.hass.data[const.DOMAIN]
         )
         self.binary_handlers: list[BinaryHandler | None] = []
+        # Set by the transport when it can report that the queued
+        # messages have been written to the client.
+        self.wait_drained: Callable[[], Awaitable[None]] | None = None
         current_connection.set(self)
 
     def __repr__(self) -> str:
         """Return the representation."""
         return f"<ActiveConnection {self.get_description(None)}>"
 
+    async def async_wait_drained(self) -> None:
+        """Wait until the queued messages have been written to the client.
+
+        Commands that send a large amount of data in multiple messages
+        can await this between messages to apply back pressure instead
+        of filling the message queue.
+        """
+        if (wait_drained := self.wait_drained) is not None:
+            await wait_drained()
+
     def set_supported_features(self, features: dict[str, float]) -> None:
         """Set supported features."""
         self.supported_features = features
         self.can_coalesce = const.FEATURE_COALESCE_MESSAGES in features
+        if version := features.get(const.FEATURE_COMPRESSED_MESSAGES):
+            self.compression_dictionary = COMPRESSION_DICTIONARIES.get(int(version))
 
     def get_description(self, request: web.Request | None) -> str:
         """Return a description of the connection."""
@@ -30,6 +30,10 @@ PENDING_MSG_PEAK_TIME: Final = 5
 # limit it to a lower number.
 MAX_PENDING_MSG: Final = 4096
 
+# Number of the latest state changes kept for the subscribe_entities
+# subscriptions which resume from the last change the client received.
+MAX_BUFFERED_STATE_CHANGES: Final = 4096
+
 # Maximum number of messages that are pending before we force
 # resolve the ready future.
 PENDING_MSG_MAX_FORCE_READY: Final = 256
@@ -58,3 +62,8 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
 
 FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+# The minimum time in milliseconds between the state change messages
+# of a subscribe_entities subscription
+FEATURE_ENTITY_UPDATE_INTERVAL = "entity_update_interval"
+# The version of the preset dictionary to compress the messages with
+FEATURE_COMPRESSED_MESSAGES = "compressed_messages"
@@ -0,0 +1,450 @@
+"""Shared fan-out of state changes to the subscribe_entities subscriptions."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import time
+from typing import Any, cast
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions import AbstractPermissions
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+from homeassistant.helpers.singleton import singleton
+
+from . import messages
+from .const import MAX_BUFFERED_STATE_CHANGES
+
+DATA_ENTITY_SUBSCRIPTIONS = "websocket_api.entity_subscriptions"
+
+type EntityChange = tuple[str, State | None, State | None]
+
+
+class EntitySubscription:
+    """A subscribe_entities subscription of a connection."""
+
+    __slots__ = ("message_suffix", "send_message", "send_seq", "user")
+
+    coalesced = False
+
+    def __init__(
+        self,
+        send_message: Callable[[bytes | str | dict[str, Any]], None],
+        user: User,
+        msg_id: int,
+        send_seq: bool,
+    ) -> None:
+        """Initialize the subscription."""
+        self.send_message = send_message
+        self.user = user
+        self.send_seq = send_seq
+        self.message_suffix = b"".join((b',"id":', str(msg_id).encode(), b"}"))
+
+
+class CoalescedEntitySubscription(EntitySubscription):
+    """A subscription which receives at most one message per interval.
+
+    The first change is sent right away. The changes during the following
+    interval are merged per entity and sent as one message when the interval
+    ends, so the client always ends up with the latest states.
+    """
+
+    __slots__ = ("_changes", "_hass", "_interval", "_msg_id", "_seq", "_timer")
+
+    coalesced = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send_message: Callable[[bytes | str | dict[str, Any]], None],
+        user: User,
+        msg_id: int,
+        send_seq: bool,
+        interval: float,
+    ) -> None:
+        """Initialize the subscription."""
+        super().__init__(send_message, user, msg_id, send_seq)
+        self._hass = hass
+        self._msg_id = msg_id
+        self._interval = interval
+        # The state of each changed entity before the interval and the latest state
+        self._changes: dict[str, tuple[State | None, State | None]] = {}
+        # The sequence number of the latest change
+        self._seq = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_add(
+        self, event: Event[EventStateChangedData], seq: int, message: bytes
+    ) -> None:
+        """Send a state change, or merge it if a message was sent recently."""
+        self._seq = seq
+        if self._timer is None:
+            self.send_message(message)
+            self._timer = self._hass.loop.call_later(self._interval, self._async_flush)
+            return
+        data = event.data
+        entity_id = data["entity_id"]
+        if (change := self._changes.get(entity_id)) is None:
+            self._changes[entity_id] = (data["old_state"], data["new_state"])
+        else:
+            self._changes[entity_id] = (change[0], data["new_state"])
+
+    @callback
+    def async_add_changes(
+        self, changes: list[EntityChange], seq: int, message: bytes
+    ) -> None:
+        """Send a batch of state changes, or merge it if a message was sent recently."""
+        self._seq = seq
+        if self._timer is None:
+            self.send_message(message)
+            self._timer = self._hass.loop.call_later(self._interval, self._async_flush)
+            return
+        for entity_id, old_state, new_state in changes:
+            if (change := self._changes.get(entity_id)) is None:
+                self._changes[entity_id] = (old_state, new_state)
+            else:
+                self._changes[entity_id] = (change[0], new_state)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Send the changes merged during the interval."""
+        if not self._changes:
+            self._timer = None
+            return
+        event = messages.state_diffs_event(
+            (entity_id, old_state, new_state)
+            for entity_id, (old_state, new_state) in self._changes.items()
+        )
+        self._changes.clear()
+        self._timer = self._hass.loop.call_later(self._interval, self._async_flush)
+        if event:
+            self.send_message(
+                messages.state_diffs_message(
+                    self._msg_id, event, self._seq if self.send_seq else None
+                )
+            )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop sending the merged changes."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._changes.clear()
+
+
+class EntitySubscriptions:
+    """Forward state changes to the subscriptions interested in the entity.
+
+    All subscriptions share a single state_changed listener. The subscriptions
+    are indexed by entity_id, so a state change only costs a lookup for the
+    connections which are not interested in it, and the state diff is
+    serialized once for all recipients.
+
+    Each state change gets a sequence number and the latest state changes are
+    kept, so a client which reconnects can resume from the sequence number of
+    the last change it received instead of loading all states again. The
+    sequence numbers start from the time the subscriptions were created in
+    microseconds, so the sequence numbers of a previous run are older than
+    the kept state changes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the subscriptions."""
+        self.hass = hass
+        self._all_entities: dict[EntitySubscription, None] = {}
+        self._by_entity_id: dict[str, dict[EntitySubscription, None]] = {}
+        # The read permission of each entity, per user. The cache of a user
+        # is dropped when the permissions object of the user is replaced,
+        # which happens when the groups or the owner flag of the user change.
+        # The policies can allow entities by device or area, so the caches
+        # are dropped when the entity or device registry is updated.
+        self._allowed_cache: dict[
+            str, tuple[AbstractPermissions, bool, dict[str, bool]]
+        ] = {}
+        self.seq = time.time_ns() // 1000
+        self._changes: deque[tuple[int, Event[EventStateChangedData]]] = deque(
+            maxlen=MAX_BUFFERED_STATE_CHANGES
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening to the state changes.
+
+        The listener is kept when there are no subscriptions, so the clients
+        can resume after they all reconnected.
+        """
+        self.hass.bus.async_listen_batch(
+            EVENT_STATE_CHANGED,
+            self._async_forward_entity_changes,
+            self._async_forward_entity_changes_batch,
+        )
+        for event_type in (
+            EVENT_ENTITY_REGISTRY_UPDATED,
+            EVENT_DEVICE_REGISTRY_UPDATED,
+        ):
+            self.hass.bus.async_listen(event_type, self._async_registry_updated)
+
+    @callback
+    def _async_registry_updated(self, event: Event[Any]) -> None:
+        """Drop the cached read permissions when an entity or device changes."""
+        self._allowed_cache.clear()
+
+    @callback
+    def async_subscribe(
+        self,
+        send_message: Callable[[bytes | str | dict[str, Any]], None],
+        user: User,
+        msg_id: int,
+        entity_ids: set[str],
+        interval: float | None = None,
+        send_seq: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Subscribe to the state changes of entity_ids, or all entities.
+
+        If interval is set, the changes are sent at most once per interval
+        seconds. If send_seq is set, the messages include the sequence number
+        of the last change.
+        """
+        subscription = (
+            EntitySubscription(send_message, user, msg_id, send_seq)
+            if interval is None
+            else CoalescedEntitySubscription(
+                self.hass, send_message, user, msg_id, send_seq, interval
+            )
+        )
+        if entity_ids:
+            for entity_id in entity_ids:
+                self._by_entity_id.setdefault(entity_id, {})[subscription] = None
+        else:
+            self._all_entities[subscription] = None
+
+        @callback
+        def _async_unsubscribe() -> None:
+            """Remove the subscription."""
+            if isinstance(subscription, CoalescedEntitySubscription):
+                subscription.async_cancel()
+            if entity_ids:
+                for entity_id in entity_ids:
+                    subscriptions = self._by_entity_id[entity_id]
+                    del subscriptions[subscription]
+                    if not subscriptions:
+                        del self._by_entity_id[entity_id]
+            else:
+                del self._all_entities[subscription]
+            if not self._all_entities and not self._by_entity_id:
+                self._allowed_cache.clear()
+
+        return _async_unsubscribe
+
+    @callback
+    def async_changes_since(
+        self, user: User, entity_ids: set[str], seq: int
+    ) -> list[EntityChange] | None:
+        """Return the changes after seq which the user may read.
+
+        The changes of an entity are merged into one change. Returns None if
+        the changes after seq are no longer kept.
+        """
+        if seq > self.seq or (
+            seq < self.seq and (not self._changes or seq < self._changes[0][0] - 1)
+        ):
+            return None
+        changes: dict[str, tuple[State | None, State | None]] = {}
+        # Walk the changes backwards, the first change of an entity
+        # is its latest state
+        for change_seq, event in reversed(self._changes):
+            if change_seq <= seq:
+                break
+            data = event.data
+            entity_id = data["entity_id"]
+            if (entity_ids and entity_id not in entity_ids) or not self._async_allowed(
+                user, entity_id
+            ):
+                continue
+            if (change := changes.get(entity_id)) is None:
+                changes[entity_id] = (data["old_state"], data["new_state"])
+            else:
+                changes[entity_id] = (data["old_state"], change[1])
+        return [
+            (entity_id, old_state, new_state)
+            for entity_id, (old_state, new_state) in changes.items()
+        ]
+
+    @callback
+    def _async_read_permissions(
+        self, user: User
+    ) -> tuple[AbstractPermissions, bool, dict[str, bool]]:
+        """Return the permissions of the user, if it may read all entities and the cache."""
+        # The permissions are looked up from the user on every event
+        # because they might have changed since the subscription was created.
+        permissions = user.permissions
+        cached = self._allowed_cache.get(user.id)
+        if cached is None or cached[0] is not permissions:
+            cached = (
+                permissions,
+                user.is_admin or permissions.access_all_entities(POLICY_READ),
+                {},
+            )
+            self._allowed_cache[user.id] = cached
+        return cached
+
+    @callback
+    def _async_allowed(self, user: User, entity_id: str) -> bool:
+        """Return if the user may read the state of the entity."""
+        permissions, allowed_all, allowed_entities = self._async_read_permissions(user)
+        if allowed_all:
+            return True
+        if (allowed := allowed_entities.get(entity_id)) is None:
+            allowed = allowed_entities[entity_id] = permissions.check_entity(
+                entity_id, POLICY_READ
+            )
+        return allowed
+
+    @callback
+    def _async_forward_entity_changes(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Forward a state changed event to the interested subscriptions."""
+        self.seq += 1
+        seq = self.seq
+        self._changes.append((seq, event))
+        entity_id = event.data["entity_id"]
+        subscriptions = self._by_entity_id.get(entity_id)
+        if not subscriptions and not self._all_entities:
+            return
+        message_prefix: bytes | None = None
+        seq_bytes: bytes | None = None
+        for subscriptions_of_entity in (subscriptions, self._all_entities):
+            if not subscriptions_of_entity:
+                continue
+            for subscription in list(subscriptions_of_entity):
+                if not self._async_allowed(subscription.user, entity_id):
+                    continue
+                if message_prefix is None:
+                    message_prefix = messages.state_diff_message_prefix(event)
+                if subscription.send_seq:
+                    if seq_bytes is None:
+                        seq_bytes = b"".join((b',"seq":', str(seq).encode()))
+                    message = message_prefix + seq_bytes + subscription.message_suffix
+                else:
+                    message = message_prefix + subscription.message_suffix
+                if subscription.coalesced:
+                    cast(CoalescedEntitySubscription, subscription).async_add(
+                        event, seq, message
+                    )
+                    continue
+                subscription.send_message(message)
+
+    @callback
+    def _async_forward_entity_changes_batch(
+        self, events: list[Event[EventStateChangedData]]
+    ) -> None:
+        """Forward a batch of state changed events, one message per subscription.
+
+        The changes of an entity in the batch are merged into one change.
+        """
+        # The index of the first and the last event of each changed entity
+        batch_changes: dict[str, tuple[int, int]] = {}
+        for index, event in enumerate(events):
+            self.seq += 1
+            self._changes.append((self.seq, event))
+            entity_id = event.data["entity_id"]
+            if (change := batch_changes.get(entity_id)) is None:
+                batch_changes[entity_id] = (index, index)
+            else:
+                batch_changes[entity_id] = (change[0], index)
+
+        changes_by_subscription: dict[
+            EntitySubscription, dict[str, tuple[int, int]]
+        ] = {}
+        for subscription in self._all_entities:
+            if self._async_read_permissions(subscription.user)[1]:
+                changes_by_subscription[subscription] = batch_changes
+            elif allowed_changes := {
+                entity_id: change
+                for entity_id, change in batch_changes.items()
+                if self._async_allowed(subscription.user, entity_id)
+            }:
+                changes_by_subscription[subscription] = allowed_changes
+        if by_entity_id := self._by_entity_id:
+            for entity_id, change in batch_changes.items():
+                if not (subscriptions := by_entity_id.get(entity_id)):
+                    continue
+                for subscription in subscriptions:
+                    if self._async_allowed(subscription.user, entity_id):
+                        changes_by_subscription.setdefault(subscription, {})[
+                            entity_id
+                        ] = change
+        if not changes_by_subscription:
+            return
+
+        seq = self.seq
+        seq_bytes = b"".join((b',"seq":', str(seq).encode()))
+        # The subscriptions which get the same changes share the message,
+        # the key of the changes of the whole batch is None
+        message_prefixes: dict[
+            frozenset[tuple[str, tuple[int, int]]] | None, bytes | None
+        ] = {}
+        for subscription, entity_changes in changes_by_subscription.items():
+            key = (
+                None
+                if entity_changes is batch_changes
+                else frozenset(entity_changes.items())
+            )
+            changes: list[EntityChange] | None = None
+            if (message_prefix := message_prefixes.get(key, b"")) == b"":
+                changes = _batch_entity_changes(events, entity_changes)
+                diffs_event = messages.state_diffs_event(changes)
+                message_prefix = message_prefixes[key] = (
+                    messages.state_diffs_message_prefix(diffs_event)
+                    if diffs_event
+                    else None
+                )
+            if message_prefix is None:
+                continue
+            if subscription.send_seq:
+                message = message_prefix + seq_bytes + subscription.message_suffix
+            else:
+                message = message_prefix + subscription.message_suffix
+            if subscription.coalesced:
+                cast(CoalescedEntitySubscription, subscription).async_add_changes(
+                    changes or _batch_entity_changes(events, entity_changes),
+                    seq,
+                    message,
+                )
+                continue
+            subscription.send_message(message)
+
+
+def _batch_entity_changes(
+    events: list[Event[EventStateChangedData]],
+    entity_changes: dict[str, tuple[int, int]],
+) -> list[EntityChange]:
+    """Return the changes of entities from the index of their first and last event."""
+    return [
+        (entity_id, events[first].data["old_state"], events[last].data["new_state"])
+        for entity_id, (first, last) in entity_changes.items()
+    ]
+
+
+@singleton(DATA_ENTITY_SUBSCRIPTIONS)
+@callback
+def async_get_entity_subscriptions(hass: HomeAssistant) -> EntitySubscriptions:
+    """Return the entity subscriptions."""
+    entity_subscriptions = EntitySubscriptions(hass)
+    entity_subscriptions.async_start()
+    return entity_subscriptions
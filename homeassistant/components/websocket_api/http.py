@@ -21,6 +21,7 @@ from homeassistant.util.async_ import create_eager_task
 from homeassistant.util.json import json_loads
 
 from .auth import AUTH_REQUIRED_MESSAGE, AuthPhase
+from .compression import MessageCompressor
 from .const import (
     DATA_CONNECTIONS,
     MAX_PENDING_MSG,
@@ -42,6 +43,15 @@ if TYPE_CHECKING:
 _WS_LOGGER: Final = logging.getLogger(f"{__name__}.connection")
 
 
+async def _send_compressed(
+    send_bytes: Callable[[bytes], Coroutine[Any, Any, None]],
+    compressor: MessageCompressor,
+    message: bytes,
+) -> None:
+    """Send a compressed message in a binary frame."""
+    await send_bytes(compressor.compress(message))
+
+
 class WebsocketAPIView(HomeAssistantView):
     """View to serve a websockets endpoint."""
 
@@ -81,6 +91,7 @@ class WebSocketHandler:
         "_message_queue",
         "_ready_future",
         "_release_ready_queue_size",
+        "_drained_future",
     )
 
     def __init__(self, hass: HomeAssistant, request: web.Request) -> None:
@@ -104,6 +115,7 @@ class WebSocketHandler:
         self._message_queue: deque[bytes] = deque()
         self._ready_future: asyncio.Future[int] | None = None
         self._release_ready_queue_size: int = 0
+        self._drained_future: asyncio.Future[None] | None = None
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -124,9 +136,15 @@ class WebSocketHandler:
         return "finished connection"
 
     async def _writer(
-        self, send_bytes_text: Callable[[bytes], Coroutine[Any, Any, None]]
+        self,
+        send_bytes_text: Callable[[bytes], Coroutine[Any, Any, None]],
+        send_bytes: Callable[[bytes], Coroutine[Any, Any, None]],
     ) -> None:
-        """Write outgoing messages."""
+        """Write outgoing messages.
+
+        The messages are sent as text frames, or compressed in binary frames
+        once the client enabled compression.
+        """
         # Variables are set locally to avoid lookups in the loop
         message_queue = self._message_queue
         logger = self._logger
@@ -135,11 +153,14 @@ class WebSocketHandler:
         is_debug_log_enabled = partial(logger.isEnabledFor, logging.DEBUG)
         debug = logger.debug
         can_coalesce = self._connection and self._connection.can_coalesce
+        compressor: MessageCompressor | None = None
+        send = send_bytes_text
         ready_message_count = len(message_queue)
         # Exceptions if Socket disconnected or cancelled by connection handler
         try:
             while not wsock.closed:
                 if not message_queue:
+                    self._release_drained_future()
                     self._ready_future = loop.create_future()
                     ready_message_count = await self._ready_future
 
@@ -150,18 +171,27 @@ class WebSocketHandler:
                     # coalesce may be enabled later in the connection
                     can_coalesce = self._connection and self._connection.can_coalesce
 
+                if (
+                    compressor is None
+                    and self._connection
+                    and (dictionary := self._connection.compression_dictionary)
+                ):
+                    # compression may be enabled later in the connection
+                    compressor = MessageCompressor(dictionary)
+                    send = partial(_send_compressed, send_bytes, compressor)
+
                 if not can_coalesce or ready_message_count == 1:
                     message = message_queue.popleft()
                     if is_debug_log_enabled():
                         debug("%s: Sending %s", self.description, message)
-                    await send_bytes_text(message)
+                    await send(message)
                     continue
 
                 coalesced_messages = b"".join((b"[", b",".join(message_queue), b"]"))
                 message_queue.clear()
                 if is_debug_log_enabled():
                     debug("%s: Sending %s", self.description, coalesced_messages)
-                await send_bytes_text(coalesced_messages)
+                await send(coalesced_messages)
         except asyncio.CancelledError:
             debug("%s: Writer cancelled", self.description)
             raise
@@ -171,6 +201,29 @@ class WebSocketHandler:
             debug("%s: Writer done", self.description)
             # Clean up the peak checker when we shut down the writer
             self._cancel_peak_checker()
+            self._release_drained_future()
+
+    async def _async_wait_drained(self) -> None:
+        """Wait until the writer has sent all queued messages."""
+        if (
+            not self._message_queue
+            or self._closing
+            or self._writer_task is None
+            or self._writer_task.done()
+        ):
+            return
+        if self._drained_future is None:
+            self._drained_future = self._loop.create_future()
+        # Shield the future since it is shared by all waiters
+        await asyncio.shield(self._drained_future)
+
+    @callback
+    def _release_drained_future(self) -> None:
+        """Release the tasks waiting for the queue to drain."""
+        if (drained_future := self._drained_future) is not None:
+            self._drained_future = None
+            if not drained_future.done():
+                drained_future.set_result(None)
 
     @callback
     def _cancel_peak_checker(self) -> None:
@@ -322,6 +375,7 @@ class WebSocketHandler:
             assert writer is not None
 
         send_bytes_text = partial(writer.send, binary=False)
+        send_bytes = partial(writer.send, binary=True)
         auth = AuthPhase(
             logger, hass, self._send_message, self._cancel, request, send_bytes_text
         )
@@ -360,7 +414,10 @@ class WebSocketHandler:
             # We only start the writer queue after the auth phase is completed
             # since there is no need to queue messages before the auth phase
             self._connection = connection
-            self._writer_task = create_eager_task(self._writer(send_bytes_text))
+            connection.wait_drained = self._async_wait_drained
+            self._writer_task = create_eager_task(
+                self._writer(send_bytes_text, send_bytes)
+            )
             hass.data[DATA_CONNECTIONS] = hass.data.get(DATA_CONNECTIONS, 0) + 1
             async_dispatcher_send(hass, SIGNAL_WEBSOCKET_CONNECTED)
 
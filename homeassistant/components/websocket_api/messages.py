@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from functools import lru_cache
 import logging
 from typing import Any, Final
@@ -15,7 +16,7 @@ from homeassistant.const import (
     COMPRESSED_STATE_LAST_UPDATED,
     COMPRESSED_STATE_STATE,
 )
-from homeassistant.core import CompressedState, Event, EventStateChangedData
+from homeassistant.core import CompressedState, Event, EventStateChangedData, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.json import (
     JSON_DUMP,
@@ -154,7 +155,7 @@ def cached_state_diff_message(
     """
     return b"".join(
         (
-            _partial_cached_state_diff_message(event)[:-1],
+            state_diff_message_prefix(event),
             b',"id":',
             message_id_as_bytes,
             b"}",
@@ -162,6 +163,14 @@ def cached_state_diff_message(
     )
 
 
+def state_diff_message_prefix(event: Event[EventStateChangedData]) -> bytes:
+    """Return an event message without the id and the closing brace.
+
+    The message of a recipient is the prefix followed by its id.
+    """
+    return _partial_cached_state_diff_message(event)[:-1]
+
+
 @lru_cache(maxsize=128)
 def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> bytes:
     """Cache and serialize the event to json.
@@ -199,6 +208,64 @@ def _state_diff_event(
         return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
     if (old_state := event.data["old_state"]) is None:
         return {ENTITY_EVENT_ADD: {new_state.entity_id: new_state.as_compressed_state}}
+    return {
+        ENTITY_EVENT_CHANGE: {new_state.entity_id: _state_diff(old_state, new_state)}
+    }
+
+
+def state_diffs_event(
+    changes: Iterable[tuple[str, State | None, State | None]],
+) -> dict[str, Any]:
+    """Return the event with the changes of several entities.
+
+    Each change is an entity_id with its state before and after the change.
+    Entities which were added and removed again are left out.
+    """
+    added: dict[str, CompressedState] = {}
+    changed: dict[str, dict[str, dict[str, Any]]] = {}
+    removed: list[str] = []
+    for entity_id, old_state, new_state in changes:
+        if new_state is None:
+            if old_state is not None:
+                removed.append(entity_id)
+        elif old_state is None:
+            added[entity_id] = new_state.as_compressed_state
+        else:
+            changed[entity_id] = _state_diff(old_state, new_state)
+    event: dict[str, Any] = {}
+    if added:
+        event[ENTITY_EVENT_ADD] = added
+    if changed:
+        event[ENTITY_EVENT_CHANGE] = changed
+    if removed:
+        event[ENTITY_EVENT_REMOVE] = removed
+    return event
+
+
+def state_diffs_message_prefix(event: dict[str, Any]) -> bytes:
+    """Return an event message of state_diffs_event without the id and the closing brace.
+
+    The message of a recipient is the prefix followed by its id.
+    """
+    return (
+        _message_to_json_bytes_or_none({"type": "event", "event": event})
+        or INVALID_JSON_PARTIAL_MESSAGE
+    )[:-1]
+
+
+def state_diffs_message(iden: int, event: dict[str, Any], seq: int | None) -> bytes:
+    """Return an event message of state_diffs_event.
+
+    The sequence number of the last change is added if seq is set.
+    """
+    message = event_message(iden, event)
+    if seq is not None:
+        message["seq"] = seq
+    return message_to_json_bytes(message)
+
+
+def _state_diff(old_state: State, new_state: State) -> dict[str, dict[str, Any]]:
+    """Return the diff between two states of an entity."""
     additions: dict[str, Any] = {}
     diff: dict[str, dict[str, Any]] = {STATE_DIFF_ADDITIONS: additions}
     new_state_context = new_state.context
@@ -232,7 +299,7 @@ def _state_diff_event(
             # here if there are any values to avoid jumping into the json_encoder_default
             # for every state diff with a removed attribute
             diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: list(removed)}
-    return {ENTITY_EVENT_CHANGE: {new_state.entity_id: diff}}
+    return diff
 
 
 def _message_to_json_bytes_or_none(message: dict[str, Any]) -> bytes | None:
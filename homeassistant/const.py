@@ -239,6 +239,7 @@ CONF_PAYLOAD_ON: Final = "payload_on"
 CONF_PENDING_TIME: Final = "pending_time"
 CONF_PIN: Final = "pin"
 CONF_PLATFORM: Final = "platform"
+CONF_POLLING_SPREAD: Final = "polling_spread"
 CONF_PORT: Final = "port"
 CONF_PREFIX: Final = "prefix"
 CONF_PROFILE_NAME: Final = "profile_name"
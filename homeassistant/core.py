@@ -12,19 +12,23 @@ from collections.abc import (
     Callable,
     Collection,
     Coroutine,
+    Generator,
     Iterable,
+    Iterator,
     KeysView,
     Mapping,
+    Sequence,
     ValuesView,
 )
 import concurrent.futures
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
 import datetime
 import enum
 import functools
 from functools import cached_property
 import inspect
+from itertools import chain
 import logging
 import os
 import pathlib
@@ -108,6 +112,7 @@ from .util.async_ import (
 from .util.event_type import EventType
 from .util.executor import InterruptibleThreadPoolExecutor
 from .util.hass_dict import HassDict
+from .util.job_profiler import JobProfiler
 from .util.json import JsonObjectType
 from .util.read_only_dict import ReadOnlyDict
 from .util.timeout import TimeoutManager
@@ -454,6 +459,7 @@ class HomeAssistant:
         self.loop_thread_id = getattr(
             self.loop, "_thread_ident", getattr(self.loop, "_thread_id")
         )
+        self._job_profiler: JobProfiler | None = None
 
     def verify_event_loop_thread(self, what: str) -> None:
         """Report and raise if we are not running in the event loop thread."""
@@ -941,6 +947,41 @@ class HomeAssistant:
 
         return self._async_add_hass_job(hassjob, *args, background=background)
 
+    @callback
+    def _async_run_hass_job_profiled[_R](
+        self,
+        hassjob: HassJob[..., Coroutine[Any, Any, _R] | _R],
+        *args: Any,
+        background: bool = False,
+    ) -> asyncio.Future[_R] | None:
+        """Run a HassJob from within the event loop and record its run time."""
+        if TYPE_CHECKING:
+            assert self._job_profiler is not None
+        start = time.perf_counter()
+        try:
+            return HomeAssistant.async_run_hass_job(
+                self, hassjob, *args, background=background
+            )
+        finally:
+            self._job_profiler.record_run(hassjob.target, time.perf_counter() - start)
+
+    @callback
+    def async_set_job_profiler(self, profiler: JobProfiler | None) -> None:
+        """Record the run times of the jobs and event listeners with profiler.
+
+        A profiled method replaces async_run_hass_job and the event filters
+        are wrapped while a profiler is set, so profiling costs nothing
+        when it is not enabled. Pass None to stop profiling.
+
+        This method must be run in the event loop.
+        """
+        self._job_profiler = profiler
+        self.bus._async_set_profiler(profiler)  # noqa: SLF001
+        if profiler is None:
+            self.__dict__.pop("async_run_hass_job", None)
+        else:
+            self.async_run_hass_job = self._async_run_hass_job_profiled  # type: ignore[method-assign]
+
     @overload
     @callback
     def async_run_job[_R, *_Ts](
@@ -1443,13 +1484,65 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
         raise MaxLengthExceeded(event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE)
 
 
+class _ProfiledEventFilter:
+    """An event filter which records its run time with a profiler.
+
+    It compares equal to the filter it wraps, so a listener is removed
+    with the filterable job it was added with.
+    """
+
+    __slots__ = ("event_filter", "profiler", "target")
+
+    def __init__(
+        self,
+        event_filter: Callable[[Any], bool],
+        target: Callable[..., Any],
+        profiler: JobProfiler,
+    ) -> None:
+        """Initialize the filter."""
+        self.event_filter = event_filter
+        self.target = target
+        self.profiler = profiler
+
+    def __call__(self, event_data: Any) -> bool:
+        """Run the filter and record its run time."""
+        start = time.perf_counter()
+        try:
+            return self.event_filter(event_data)
+        finally:
+            self.profiler.record_filter(self.target, time.perf_counter() - start)
+
+    def __eq__(self, other: object) -> bool:
+        """Return if other is the wrapped filter."""
+        if isinstance(other, _ProfiledEventFilter):
+            other = other.event_filter
+        return self.event_filter == other
+
+    def __hash__(self) -> int:
+        """Return the hash of the wrapped filter."""
+        return hash(self.event_filter)
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_batch_jobs",
+        "_debug",
+        "_hass",
+        "_listeners",
+        "_match_all_listeners",
+        "_profiler",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
+        self._profiler: JobProfiler | None = None
+        # The jobs of the listeners which handle a batch of events at once
+        self._batch_jobs: dict[
+            HassJob[..., Any],
+            HassJob[[list[Event[Any]]], Coroutine[Any, Any, None] | None],
+        ] = {}
         self._listeners: defaultdict[
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
@@ -1459,6 +1552,32 @@ class EventBus:
         self._async_logging_changed()
         self.async_listen(EVENT_LOGGING_CHANGED, self._async_logging_changed)
 
+    @callback
+    def _async_set_profiler(self, profiler: JobProfiler | None) -> None:
+        """Record the run times of the event filters with profiler.
+
+        The filters of the listeners are wrapped while a profiler is set,
+        so the dispatch is the same with and without profiling. Pass None
+        to stop profiling.
+        """
+        self._profiler = profiler
+        for listeners in self._listeners.values():
+            listeners[:] = [
+                self._profile_filterable_job(filterable_job)
+                for filterable_job in listeners
+            ]
+
+    def _profile_filterable_job(
+        self, filterable_job: _FilterableJobType[_DataT]
+    ) -> _FilterableJobType[_DataT]:
+        """Return the filterable job with its filter profiled if profiling."""
+        job, event_filter = filterable_job
+        if isinstance(event_filter, _ProfiledEventFilter):
+            event_filter = event_filter.event_filter
+        if event_filter is None or self._profiler is None:
+            return (job, event_filter)
+        return (job, _ProfiledEventFilter(event_filter, job.target, self._profiler))
+
     @callback
     def _async_logging_changed(self, event: Event | None = None) -> None:
         """Handle logging change."""
@@ -1565,6 +1684,118 @@ class EventBus:
             except Exception:
                 _LOGGER.exception("Error running job: %s", job)
 
+    @callback
+    def async_fire_batch_internal(
+        self,
+        batch: Sequence[tuple[EventType[Any] | str, Any, Context | None, float | None]],
+        origin: EventOrigin = EventOrigin.local,
+    ) -> None:
+        """Fire a batch of events, for internal use only.
+
+        batch holds the event type, data, context and time fired of each
+        event, in the order they happened.
+
+        The listeners registered with async_listen_batch get the events of
+        their event type which passed their filter in a single call first.
+        The other listeners then get the events one by one in order. As
+        with async_fire_internal, they are looked up for each event, so a
+        listener added or removed by another listener gets or misses the
+        following events of the batch. The events fired by the listeners
+        reach the batch listeners after the events of the batch.
+
+        This method is intended to only be used by core internally
+        and should not be considered a stable API. We will make
+        breaking changes to this function in the future and it
+        should not be used in integrations.
+
+        This method must be run in the event loop.
+        """
+        if self._debug:
+            for event_type, event_data, context, time_fired in batch:
+                self.async_fire_internal(
+                    event_type, event_data, origin, context, time_fired
+                )
+            return
+
+        events = [
+            Event(event_type, event_data, origin, time_fired, context)
+            for event_type, event_data, context, time_fired in batch
+        ]
+        batch_jobs = self._batch_jobs
+        if batch_jobs:
+            self._async_run_batch_listeners(events)
+
+        run_hass_job = self._hass.async_run_hass_job
+        for event in events:
+            event_type = event.event_type
+            if event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL:
+                match_all_listeners = self._match_all_listeners
+            else:
+                match_all_listeners = EMPTY_LIST
+            event_listeners = [
+                filterable_job
+                for filterable_job in self._listeners.get(event_type, EMPTY_LIST)
+                + match_all_listeners
+                if filterable_job[0] not in batch_jobs
+            ]
+            for job, event_filter in event_listeners:
+                if event_filter is not None:
+                    try:
+                        if not event_filter(event.data):
+                            continue
+                    except Exception:
+                        _LOGGER.exception("Error in event filter")
+                        continue
+                try:
+                    run_hass_job(job, event)
+                except Exception:
+                    _LOGGER.exception("Error running job: %s", job)
+
+    @callback
+    def _async_run_batch_listeners(self, events: list[Event[Any]]) -> None:
+        """Run the batch listeners with the events of their event type."""
+        batch_jobs = self._batch_jobs
+        events_by_type: dict[EventType[Any] | str, list[Event[Any]]] = {}
+        for event in events:
+            events_by_type.setdefault(event.event_type, []).append(event)
+        batch_listeners = [
+            (filterable_job, type_events)
+            for event_type, type_events in events_by_type.items()
+            for filterable_job in self._listeners.get(event_type, EMPTY_LIST)
+            if filterable_job[0] in batch_jobs
+        ]
+        if match_all_events := [
+            event
+            for event in events
+            if event.event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL
+        ]:
+            batch_listeners.extend(
+                (filterable_job, match_all_events)
+                for filterable_job in self._match_all_listeners
+                if filterable_job[0] in batch_jobs
+            )
+
+        run_hass_job = self._hass.async_run_hass_job
+        for (job, event_filter), listener_events in batch_listeners:
+            if (batch_job := batch_jobs.get(job)) is None:
+                # Removed by another batch listener
+                continue
+            if event_filter is not None:
+                filtered_events: list[Event[Any]] = []
+                for event in listener_events:
+                    try:
+                        if event_filter(event.data):
+                            filtered_events.append(event)
+                    except Exception:
+                        _LOGGER.exception("Error in event filter")
+                if not filtered_events:
+                    continue
+                listener_events = filtered_events
+            try:
+                run_hass_job(batch_job, listener_events)
+            except Exception:
+                _LOGGER.exception("Error running job: %s", batch_job)
+
     def listen(
         self,
         event_type: EventType[_DataT] | str,
@@ -1628,6 +1859,40 @@ class EventBus:
                 )
         return self._async_listen_filterable_job(event_type, filterable_job)
 
+    @callback
+    def async_listen_batch(
+        self,
+        event_type: EventType[_DataT] | str,
+        listener: Callable[[Event[_DataT]], Coroutine[Any, Any, None] | None],
+        batch_listener: Callable[
+            [list[Event[_DataT]]], Coroutine[Any, Any, None] | None
+        ],
+        event_filter: Callable[[_DataT], bool] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for events, and for batches of events with batch_listener.
+
+        The listener gets the events fired one at a time, batch_listener
+        gets the events fired together in a batch, such as the state
+        changes written in StateMachine.async_batch_set, in one call.
+
+        This method must be run in the event loop.
+        """
+        if event_filter is not None and not is_callback_check_partial(event_filter):
+            raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+        job = HassJob(listener, f"listen {event_type}")
+        self._batch_jobs[job] = HassJob(batch_listener, f"listen batch {event_type}")
+        remove_listener = self._async_listen_filterable_job(
+            event_type, (job, event_filter)
+        )
+
+        @callback
+        def _async_remove_batch_listener() -> None:
+            """Remove the listener and the batch listener."""
+            remove_listener()
+            self._batch_jobs.pop(job, None)
+
+        return _async_remove_batch_listener
+
     @callback
     def _async_listen_filterable_job(
         self,
@@ -1635,7 +1900,12 @@ class EventBus:
         filterable_job: _FilterableJobType[_DataT],
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type."""
-        self._listeners[event_type].append(filterable_job)
+        if self._profiler is not None:
+            self._listeners[event_type].append(
+                self._profile_filterable_job(filterable_job)
+            )
+        else:
+            self._listeners[event_type].append(filterable_job)
         return functools.partial(
             self._async_remove_listener, event_type, filterable_job
         )
@@ -1753,6 +2023,24 @@ class State:
     object_id: Object id of this state.
     """
 
+    # The instance dict only holds the cached properties, so the states
+    # which were never serialized or whose serializations were released
+    # stay small.
+    __slots__ = (
+        "__dict__",
+        "attributes",
+        "context",
+        "domain",
+        "entity_id",
+        "last_changed",
+        "last_reported",
+        "last_updated",
+        "last_updated_timestamp",
+        "object_id",
+        "state",
+        "state_info",
+    )
+
     def __init__(
         self,
         entity_id: str,
@@ -1982,6 +2270,18 @@ class State:
             self.context.user_id, self.context.parent_id, self.context.id
         )
 
+    def _release_serializations(self) -> None:
+        """Drop the cached serializations of the state.
+
+        The serializations are only needed while the state is current, once
+        the state was replaced and the change was dispatched they would only
+        keep the memory of old states which are still referenced, such as
+        by the history streams, alive. They are created again if needed.
+        """
+        cached = self.__dict__
+        for key in _STATE_SERIALIZATIONS:
+            cached.pop(key, None)
+
     def __repr__(self) -> str:
         """Return the representation of the states."""
         attrs = f"; {util.repr_helper(self.attributes)}" if self.attributes else ""
@@ -1992,6 +2292,17 @@ class State:
         )
 
 
+# The cached properties of State which hold serializations
+_STATE_SERIALIZATIONS: Final = (
+    "_as_dict",
+    "_as_read_only_dict",
+    "as_dict_json",
+    "json_fragment",
+    "as_compressed_state",
+    "as_compressed_state_json",
+)
+
+
 class States(UserDict[str, State]):
     """Container for states, maps entity_id -> State.
 
@@ -2003,6 +2314,11 @@ class States(UserDict[str, State]):
         """Initialize the container."""
         super().__init__()
         self._domain_index: defaultdict[str, dict[str, State]] = defaultdict(dict)
+        # The number of writes to each domain, a domain is only added after
+        # it was added to the index
+        self._domain_versions: defaultdict[str, int] = defaultdict(int)
+        # The number of writes to all domains
+        self.version = 0
 
     def values(self) -> ValuesView[State]:
         """Return the underlying values to avoid __iter__ overhead."""
@@ -2012,12 +2328,16 @@ class States(UserDict[str, State]):
         """Add an item."""
         self.data[key] = entry
         self._domain_index[entry.domain][entry.entity_id] = entry
+        self._domain_versions[entry.domain] += 1
+        self.version += 1
 
     def __delitem__(self, key: str) -> None:
         """Remove an item."""
         entry = self[key]
         del self._domain_index[entry.domain][entry.entity_id]
         super().__delitem__(key)
+        self._domain_versions[entry.domain] += 1
+        self.version += 1
 
     def domain_entity_ids(self, key: str) -> KeysView[str] | tuple[()]:
         """Get all entity_ids for a domain."""
@@ -2034,10 +2354,100 @@ class States(UserDict[str, State]):
         return self._domain_index[key].values()
 
 
+class StatesSnapshot:
+    """An immutable view of the states at one version of the state machine.
+
+    The states of the domains which did not change between two snapshots
+    are shared by the snapshots.
+    """
+
+    __slots__ = ("_domains", "version")
+
+    def __init__(self, version: int, domains: dict[str, dict[str, State]]) -> None:
+        """Initialize the snapshot."""
+        self.version = version
+        self._domains = domains
+
+    def __len__(self) -> int:
+        """Return the number of states."""
+        return sum(len(states) for states in self._domains.values())
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the entity_ids."""
+        for states in self._domains.values():
+            yield from states
+
+    def __contains__(self, entity_id: str) -> bool:
+        """Return if the snapshot holds the state of entity_id."""
+        return self.get(entity_id) is not None
+
+    def get(self, entity_id: str) -> State | None:
+        """Retrieve the state of entity_id or None if not found."""
+        domain = entity_id.partition(".")[0]
+        if (states := self._domains.get(domain)) is not None and (
+            state := states.get(entity_id)
+        ) is not None:
+            return state
+        entity_id = entity_id.lower()
+        if (states := self._domains.get(domain.lower())) is not None:
+            return states.get(entity_id)
+        return None
+
+    def entity_ids(self, domain_filter: str | Iterable[str] | None = None) -> list[str]:
+        """Return the entity_ids of the states matching the filter."""
+        return list(chain.from_iterable(self._domain_states(domain_filter)))
+
+    def all(self, domain_filter: str | Iterable[str] | None = None) -> list[State]:
+        """Return the states matching the filter."""
+        return list(
+            chain.from_iterable(
+                states.values() for states in self._domain_states(domain_filter)
+            )
+        )
+
+    def _domain_states(
+        self, domain_filter: str | Iterable[str] | None
+    ) -> list[dict[str, State]]:
+        """Return the states of the domains matching the filter."""
+        if domain_filter is None:
+            return list(self._domains.values())
+        if isinstance(domain_filter, str):
+            domain_filter = (domain_filter.lower(),)
+        return [
+            states
+            for domain in domain_filter
+            if (states := self._domains.get(domain)) is not None
+        ]
+
+
+# The attempts to take a snapshot of the states outside of the event loop
+# while the states are written before taking it in the event loop
+_SNAPSHOT_ATTEMPTS: Final = 3
+
+
+type _StateWrite = tuple[
+    str,  # entity_id
+    str,  # new_state
+    Mapping[str, Any] | None,  # attributes
+    bool,  # force_update
+    Context | None,  # context
+    StateInfo | None,  # state_info
+    float,  # timestamp
+]
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_states", "_states_data", "_reservations", "_bus", "_loop")
+    __slots__ = (
+        "_states",
+        "_states_data",
+        "_reservations",
+        "_bus",
+        "_loop",
+        "_batch",
+        "_domain_snapshots",
+    )
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
@@ -2048,13 +2458,54 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        # The state writes deferred by async_batch_set
+        self._batch: list[_StateWrite] | None = None
+        # The copy of the states of each domain taken for the snapshots,
+        # with the version of the domain it was taken at
+        self._domain_snapshots: dict[str, tuple[int, dict[str, State]]] = {}
+
+    @property
+    def version(self) -> int:
+        """Return the number of writes to the states.
+
+        The states did not change as long as the version does not change.
+        """
+        return self._states.version
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
-        future = run_callback_threadsafe(
-            self._loop, self.async_entity_ids, domain_filter
-        )
-        return future.result()
+        return self.snapshot().entity_ids(domain_filter)
+
+    def snapshot(self) -> StatesSnapshot:
+        """Return an immutable snapshot of the states.
+
+        The snapshot copies the states of the domains which changed since
+        the previous snapshot and shares the others, so it is cheap to take
+        repeatedly and does not slow down writing states.
+
+        Thread safe. A snapshot taken outside of the event loop is taken
+        again if the states were written while it was taken, so it always
+        holds the states of a single version of the state machine.
+        """
+        states = self._states
+        domain_index = states._domain_index  # noqa: SLF001
+        domain_versions = states._domain_versions  # noqa: SLF001
+        domain_snapshots = self._domain_snapshots
+        for _ in range(_SNAPSHOT_ATTEMPTS):
+            # Copying a dict is atomic
+            versions = domain_versions.copy()
+            domains: dict[str, dict[str, State]] = {}
+            for domain, version in versions.items():
+                domain_snapshot = domain_snapshots.get(domain)
+                if domain_snapshot is None or domain_snapshot[0] != version:
+                    domain_snapshot = domain_snapshots[domain] = (
+                        version,
+                        domain_index[domain].copy(),
+                    )
+                domains[domain] = domain_snapshot[1]
+            if versions == domain_versions:
+                return StatesSnapshot(sum(versions.values()), domains)
+        return run_callback_threadsafe(self._loop, self.snapshot).result()
 
     @callback
     def async_entity_ids(
@@ -2095,9 +2546,7 @@ class StateMachine:
 
     def all(self, domain_filter: str | Iterable[str] | None = None) -> list[State]:
         """Create a list of all states."""
-        return run_callback_threadsafe(
-            self._loop, self.async_all, domain_filter
-        ).result()
+        return self.snapshot().all(domain_filter)
 
     @callback
     def async_all(
@@ -2153,6 +2602,10 @@ class StateMachine:
         This method must be run in the event loop.
         """
         entity_id = entity_id.lower()
+        if self._batch:
+            # Apply the writes before the removal to keep them in order
+            self._async_set_batch(self._batch)
+            self._batch.clear()
         old_state = self._states.pop(entity_id, None)
         self._reservations.discard(entity_id)
 
@@ -2170,6 +2623,7 @@ class StateMachine:
             state_changed_data,
             context=context,
         )
+        old_state._release_serializations()  # noqa: SLF001
         return True
 
     def set(
@@ -2253,6 +2707,68 @@ class StateMachine:
             timestamp or time.time(),
         )
 
+    @contextmanager
+    def async_batch_set(self) -> Generator[None]:
+        """Defer the state writes in the context and apply them in one pass.
+
+        The writes are validated when they are written, and applied in
+        order when the context exits. The resulting state_changed and
+        state_reported events are fired in order as one batch, so the
+        listeners registered with EventBus.async_listen_batch handle all
+        the changes at once, before the other listeners. Until then,
+        reading a state returns the state before the batch. Nested
+        contexts are applied by the outermost one.
+
+        This method must be run in the event loop.
+        """
+        if self._batch is not None:
+            yield
+            return
+        batch = self._batch = []
+        try:
+            yield
+        finally:
+            self._batch = None
+            if batch:
+                self._async_set_batch(batch)
+
+    @callback
+    def _async_set_batch(self, batch: list[_StateWrite]) -> None:
+        """Apply a batch of state writes and fire their events as a batch."""
+        events: list[
+            tuple[
+                EventType[EventStateChangedData] | EventType[EventStateReportedData],
+                EventStateChangedData | EventStateReportedData,
+                Context | None,
+                float | None,
+            ]
+        ] = []
+        for (
+            entity_id,
+            new_state,
+            attributes,
+            force_update,
+            context,
+            state_info,
+            timestamp,
+        ) in batch:
+            event_type, event_data, context = self._async_apply_state(
+                entity_id,
+                new_state,
+                attributes,
+                force_update,
+                context,
+                state_info,
+                timestamp,
+            )
+            events.append((event_type, event_data, context, timestamp))
+        self._bus.async_fire_batch_internal(events)
+        for event_type, event_data, _, _ in events:
+            if event_type is EVENT_STATE_CHANGED and (
+                old_state := event_data["old_state"]  # type: ignore[typeddict-item]
+            ):
+                old_state._release_serializations()  # noqa: SLF001
+
     @callback
     def async_set_internal(
         self,
@@ -2273,6 +2789,62 @@ class StateMachine:
 
         This method must be run in the event loop.
         """
+        if self._batch is not None:
+            # Raise here as the write would, not when the batch is applied
+            if entity_id not in self._states_data and not valid_entity_id(entity_id):
+                raise InvalidEntityFormatError(
+                    f"Invalid entity id encountered: {entity_id}. "
+                    "Format should be <domain>.<object_id>"
+                )
+            validate_state(new_state)
+            self._batch.append(
+                (
+                    entity_id,
+                    new_state,
+                    attributes,
+                    force_update,
+                    context,
+                    state_info,
+                    timestamp,
+                )
+            )
+            return
+        event_type, event_data, context = self._async_apply_state(
+            entity_id,
+            new_state,
+            attributes,
+            force_update,
+            context,
+            state_info,
+            timestamp,
+        )
+        self._bus.async_fire_internal(  # type: ignore[misc]
+            event_type,
+            event_data,
+            context=context,
+            time_fired=timestamp,
+        )
+        if event_type is EVENT_STATE_CHANGED and (
+            old_state := event_data["old_state"]  # type: ignore[typeddict-item]
+        ):
+            old_state._release_serializations()  # noqa: SLF001
+
+    @callback
+    def _async_apply_state(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Mapping[str, Any] | None,
+        force_update: bool,
+        context: Context | None,
+        state_info: StateInfo | None,
+        timestamp: float,
+    ) -> tuple[
+        EventType[EventStateChangedData] | EventType[EventStateReportedData],
+        EventStateChangedData | EventStateReportedData,
+        Context,
+    ]:
+        """Set the state of an entity and return the event to fire."""
         # Most cases the key will be in the dict
         # so we optimize for the happy path as
         # python 3.11+ has near zero overhead for
@@ -2286,7 +2858,12 @@ class StateMachine:
             same_attr = False
             last_changed = None
         else:
-            same_state = old_state.state == new_state and not force_update
+            if old_state.state == new_state:
+                # Share the string with the previous state
+                new_state = old_state.state
+                same_state = not force_update
+            else:
+                same_state = False
             same_attr = old_state.attributes == attributes
             last_changed = old_state.last_changed if same_state else None
 
@@ -2312,17 +2889,15 @@ class StateMachine:
             old_state.last_reported = now  # type: ignore[union-attr]
             old_state.last_reported_timestamp = timestamp  # type: ignore[union-attr]
             # Avoid creating an EventStateReportedData
-            self._bus.async_fire_internal(  # type: ignore[misc]
+            return (
                 EVENT_STATE_REPORTED,
                 {
                     "entity_id": entity_id,
                     "old_last_reported": old_last_reported,
                     "new_state": old_state,
                 },
-                context=context,
-                time_fired=timestamp,
+                context,
             )
-            return
 
         if same_attr:
             if TYPE_CHECKING:
@@ -2351,12 +2926,7 @@ class StateMachine:
             "old_state": old_state,
             "new_state": state,
         }
-        self._bus.async_fire_internal(
-            EVENT_STATE_CHANGED,
-            state_changed_data,
-            context=context,
-            time_fired=timestamp,
-        )
+        return EVENT_STATE_CHANGED, state_changed_data, context
 
 
 class SupportsResponse(enum.StrEnum):
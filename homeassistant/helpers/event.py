@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+from bisect import bisect_left
 from collections import defaultdict
-from collections.abc import Callable, Coroutine, Iterable, Mapping, Sequence
+from collections.abc import Callable, Coroutine, Hashable, Iterable, Mapping, Sequence
 import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -72,6 +73,13 @@ _TRACK_STATE_REMOVED_DOMAIN_DATA: HassKey[_KeyedEventData[EventStateChangedData]
 _TRACK_ENTITY_REGISTRY_UPDATED_DATA: HassKey[
     _KeyedEventData[EventEntityRegistryUpdatedData]
 ] = HassKey("track_entity_registry_updated_data")
+_TEMPLATE_RENDERER: HassKey[_TemplateRenderer] = HassKey("template_renderer")
+_TIME_PATTERN_SCHEDULER: HassKey[_TimePatternScheduler] = HassKey(
+    "time_pattern_scheduler"
+)
+_ALIGNED_INTERVAL_SCHEDULER: HassKey[_AlignedIntervalScheduler] = HassKey(
+    "aligned_interval_scheduler"
+)
 _TRACK_DEVICE_REGISTRY_UPDATED_DATA: HassKey[
     _KeyedEventData[EventDeviceRegistryUpdatedData]
 ] = HassKey("track_device_registry_updated_data")
@@ -88,6 +96,9 @@ _LOGGER = logging.getLogger(__name__)
 # in PR https://github.com/home-assistant/core/pull/82233
 RANDOM_MICROSECOND_MIN = 50000
 RANDOM_MICROSECOND_MAX = 500000
+# The listeners of a time pattern are spread over this many groups, each with
+# its own random microsecond, so they do not all fire in a single callback
+_TIME_PATTERN_GROUPS = 4
 
 _TypedDictT = TypeVar("_TypedDictT", bound=Mapping[str, Any])
 _StateEventDataT = TypeVar("_StateEventDataT", bound=EventStateEventData)
@@ -962,6 +973,100 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class _TemplateRenderStats:
+    """The renders of the tracked templates with the same template string."""
+
+    __slots__ = ("renders", "shared_renders", "total_time")
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self.renders = 0
+        self.shared_renders = 0
+        self.total_time = 0.0
+
+
+class _TemplateRenderer:
+    """Render the templates of all template trackers.
+
+    The trackers re-rendering the same template string with the same
+    referenced variables for a state change share a single render, as long
+    as the states did not change in between. The cost of the renders is
+    recorded per template string.
+    """
+
+    __slots__ = ("_hass", "_event", "_states_version", "_renders", "stats")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the renderer."""
+        self._hass = hass
+        self._event: Event[EventStateChangedData] | None = None
+        self._states_version = 0
+        self._renders: dict[Hashable, RenderInfo] = {}
+        self.stats: defaultdict[str, _TemplateRenderStats] = defaultdict(
+            _TemplateRenderStats
+        )
+
+    @callback
+    def async_render_to_info(
+        self,
+        template: Template,
+        variables: TemplateVarsType,
+        event: Event[EventStateChangedData] | None = None,
+        strict: bool = False,
+        log_fn: Callable[[int, str], None] | None = None,
+    ) -> RenderInfo:
+        """Render a template, sharing the render for the event if possible."""
+        stats = self.stats[template.template]
+        key: Hashable | None = None
+        if (
+            event is not None
+            and (key := template.async_render_key(variables)) is not None
+        ):
+            states_version = self._hass.states.version
+            if event is not self._event or states_version != self._states_version:
+                self._event = event
+                self._states_version = states_version
+                self._renders.clear()
+            elif (info := self._renders.get(key)) is not None:
+                stats.shared_renders += 1
+                return info
+        start = time.perf_counter()
+        info = template.async_render_to_info(variables, strict=strict, log_fn=log_fn)
+        stats.total_time += time.perf_counter() - start
+        stats.renders += 1
+        if key is not None:
+            self._renders[key] = info
+        return info
+
+
+@callback
+def _async_get_template_renderer(hass: HomeAssistant) -> _TemplateRenderer:
+    """Return the renderer of the template trackers."""
+    if (renderer := hass.data.get(_TEMPLATE_RENDERER)) is None:
+        renderer = hass.data[_TEMPLATE_RENDERER] = _TemplateRenderer(hass)
+    return renderer
+
+
+@callback
+def async_get_template_render_stats(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Return the render stats of the tracked templates, the most expensive first.
+
+    Renders shared with another tracker of the same template are counted
+    as shared renders and did not cost any render time.
+    """
+    report: list[dict[str, Any]] = [
+        {
+            "template": template,
+            "renders": stats.renders,
+            "shared_renders": stats.shared_renders,
+            "total_time": stats.total_time,
+        }
+        for template, stats in _async_get_template_renderer(hass).stats.items()
+    ]
+    report.sort(key=lambda item: item["total_time"], reverse=True)
+    return report
+
+
 class TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -984,6 +1089,7 @@ class TrackTemplateResultInfo:
         self._last_result: dict[Template, bool | str | TemplateError] = {}
 
         self._rate_limit = KeyedRateLimit(hass)
+        self._renderer = _async_get_template_renderer(hass)
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
@@ -1005,8 +1111,8 @@ class TrackTemplateResultInfo:
         if super_template is not None:
             template = super_template.template
             variables = super_template.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict, log_fn=log_fn
+            self._info[template] = info = self._renderer.async_render_to_info(
+                template, variables, strict=strict, log_fn=log_fn
             )
 
             # If the super template did not render to True, don't update other templates
@@ -1026,8 +1132,8 @@ class TrackTemplateResultInfo:
                 continue
             template = track_template_.template
             variables = track_template_.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict, log_fn=log_fn
+            self._info[template] = info = self._renderer.async_render_to_info(
+                template, variables, strict=strict, log_fn=log_fn
             )
 
             if info.exception:
@@ -1112,9 +1218,13 @@ class TrackTemplateResultInfo:
         track_template_: TrackTemplate,
         now: float,
         event: Event[EventStateChangedData] | None,
+        replayed: bool | None = False,
     ) -> bool | TrackTemplateResult:
         """Re-render the template if conditions match.
 
+        The render is shared with the other trackers of the same template
+        for the event, unless the event is replayed after the rate limit.
+
         Returns False if the template was not re-rendered.
 
         Returns True if the template re-rendered and did not
@@ -1151,8 +1261,8 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
+        self._info[template] = info = self._renderer.async_render_to_info(
+            template, track_template_.variables, None if replayed else event
         )
 
         try:
@@ -1227,7 +1337,9 @@ class TrackTemplateResultInfo:
 
         # Update the super template first
         if super_template is not None:
-            update = self._render_template_if_ready(super_template, now, event)
+            update = self._render_template_if_ready(
+                super_template, now, event, replayed
+            )
             info_changed |= self._apply_update(updates, update, super_template.template)
 
             if isinstance(update, TrackTemplateResult):
@@ -1258,7 +1370,9 @@ class TrackTemplateResultInfo:
                 if track_template_ == super_template:
                     continue
 
-                update = self._render_template_if_ready(track_template_, now, event)
+                update = self._render_template_if_ready(
+                    track_template_, now, event, replayed
+                )
                 info_changed |= self._apply_update(
                     updates, update, track_template_.template
                 )
@@ -1656,20 +1770,199 @@ def async_track_time_interval(
     *,
     name: str | None = None,
     cancel_on_shutdown: bool | None = None,
+    aligned: bool = False,
 ) -> CALLBACK_TYPE:
     """Add a listener that fires repetitively at every timedelta interval.
 
     The listener is passed the time it fires in UTC time.
+
+    Aligned listeners share the ticks of the listeners with the same interval
+    instead of firing at their own phase, the first run happens within one
+    interval.
     """
     seconds = interval.total_seconds()
     job_name = f"track time interval {seconds} {action}"
     if name:
         job_name = f"{name}: {job_name}"
+    if aligned:
+        return _async_get_aligned_interval_scheduler(hass).async_add_listener(
+            seconds,
+            HassJob(action, job_name, cancel_on_shutdown=cancel_on_shutdown),
+        )
     track = _TrackTimeInterval(hass, seconds, job_name, action, cancel_on_shutdown)
     track.async_attach()
     return track.async_cancel
 
 
+class _AlignedIntervalTick:
+    """A tick shared by the aligned listeners of an interval."""
+
+    __slots__ = (
+        "seconds",
+        "offset",
+        "jobs",
+        "timer_handle",
+        "ticks",
+        "total_time",
+        "max_time",
+    )
+
+    def __init__(self, seconds: float, offset: float) -> None:
+        """Initialize the tick."""
+        self.seconds = seconds
+        self.offset = offset
+        self.jobs: dict[
+            HassJob[[datetime], Coroutine[Any, Any, None] | None], None
+        ] = {}
+        self.timer_handle: asyncio.TimerHandle | None = None
+        self.ticks = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def calculate_next(self, now: float) -> float:
+        """Return the loop time of the next tick after now."""
+        seconds = self.seconds
+        return ((now - self.offset) // seconds + 1) * seconds + self.offset
+
+
+class _AlignedIntervalScheduler:
+    """Fire the aligned interval listeners on ticks shared per interval.
+
+    The ticks of an interval are aligned on multiples of the interval of the
+    loop time, so the loop wakes up once per tick instead of once per
+    listener. The listeners are spread over ticks one second apart within
+    the spread of each interval, a new listener joins the tick with the
+    fewest listeners.
+    """
+
+    __slots__ = ("_hass", "_ticks", "spread")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._ticks: dict[float, list[_AlignedIntervalTick]] = {}
+        self.spread = 0.0
+
+    @callback
+    def async_add_listener(
+        self,
+        seconds: float,
+        job: HassJob[[datetime], Coroutine[Any, Any, None] | None],
+    ) -> CALLBACK_TYPE:
+        """Add a listener to the least loaded tick of its interval."""
+        ticks = self._ticks.setdefault(seconds, [])
+        tick_count = max(1, min(int(self.spread) + 1, int(seconds)))
+        if len(ticks) < tick_count:
+            used_offsets = {tick.offset for tick in ticks}
+            offset = next(
+                float(offset)
+                for offset in range(tick_count)
+                if offset not in used_offsets
+            )
+            tick = _AlignedIntervalTick(seconds, offset)
+            ticks.append(tick)
+            self._async_schedule(tick, self._hass.loop.time())
+        else:
+            tick = min(ticks, key=lambda tick: len(tick.jobs))
+        tick.jobs[job] = None
+        return partial(self._async_remove_listener, tick, job)
+
+    @callback
+    def _async_remove_listener(
+        self,
+        tick: _AlignedIntervalTick,
+        job: HassJob[[datetime], Coroutine[Any, Any, None] | None],
+    ) -> None:
+        """Remove a listener, and the tick once it has no listeners."""
+        if tick.jobs.pop(job, False) is False or tick.jobs:
+            return
+        if TYPE_CHECKING:
+            assert tick.timer_handle is not None
+        tick.timer_handle.cancel()
+        ticks = self._ticks[tick.seconds]
+        ticks.remove(tick)
+        if not ticks:
+            del self._ticks[tick.seconds]
+
+    @callback
+    def _async_schedule(self, tick: _AlignedIntervalTick, now: float) -> None:
+        """Schedule the next tick after now."""
+        tick.timer_handle = self._hass.loop.call_at(
+            tick.calculate_next(now), self._async_fire, tick
+        )
+
+    @callback
+    def _async_fire(self, tick: _AlignedIntervalTick) -> None:
+        """Run the listeners of a tick."""
+        if TYPE_CHECKING:
+            assert tick.timer_handle is not None
+        # The loop runs timers slightly early, schedule after the
+        # time the timer was due to not fire the same tick again
+        self._async_schedule(
+            tick, max(self._hass.loop.time(), tick.timer_handle.when())
+        )
+        hass = self._hass
+        utc_now = dt_util.utcnow()
+        start = time.perf_counter()
+        for job in list(tick.jobs):
+            hass.async_run_hass_job(job, utc_now, background=True)
+        run_time = time.perf_counter() - start
+        tick.ticks += 1
+        tick.total_time += run_time
+        tick.max_time = max(tick.max_time, run_time)
+
+    @callback
+    def async_stats(self) -> list[dict[str, Any]]:
+        """Return the load of the ticks."""
+        return [
+            {
+                "interval": tick.seconds,
+                "offset": tick.offset,
+                "listeners": len(tick.jobs),
+                "ticks": tick.ticks,
+                "total_time": tick.total_time,
+                "max_time": tick.max_time,
+            }
+            for interval in sorted(self._ticks)
+            for tick in sorted(self._ticks[interval], key=lambda tick: tick.offset)
+        ]
+
+
+@callback
+def _async_get_aligned_interval_scheduler(
+    hass: HomeAssistant,
+) -> _AlignedIntervalScheduler:
+    """Return the scheduler of the aligned interval listeners."""
+    if (scheduler := hass.data.get(_ALIGNED_INTERVAL_SCHEDULER)) is None:
+        scheduler = hass.data[_ALIGNED_INTERVAL_SCHEDULER] = _AlignedIntervalScheduler(
+            hass
+        )
+    return scheduler
+
+
+@callback
+def async_set_aligned_interval_spread(hass: HomeAssistant, spread: timedelta) -> None:
+    """Set how far the ticks of the aligned listeners of an interval spread.
+
+    The listeners of an interval are spread over one tick per second of the
+    spread, at most one per second of the interval. A spread of zero fires
+    all listeners of an interval on a single tick. Only the listeners added
+    afterwards are spread over the new ticks. It is set from the
+    polling_spread option of the core configuration.
+    """
+    _async_get_aligned_interval_scheduler(hass).spread = spread.total_seconds()
+
+
+@callback
+def async_get_aligned_interval_stats(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Return the load of the ticks of the aligned interval listeners.
+
+    The time of a tick is the time spent running its listeners in the event
+    loop, coroutine listeners continue in background tasks.
+    """
+    return _async_get_aligned_interval_scheduler(hass).async_stats()
+
+
 track_time_interval = threaded_listener_factory(async_track_time_interval)
 
 
@@ -1769,60 +2062,191 @@ time_tracker_utcnow = dt_util.utcnow
 time_tracker_timestamp = time.time
 
 
-@dataclass(slots=True)
-class _TrackUTCTimeChange:
-    hass: HomeAssistant
-    time_match_expression: tuple[list[int], list[int], list[int]]
-    microsecond: int
-    local: bool
-    job: HassJob[[datetime], Coroutine[Any, Any, None] | None]
-    listener_job_name: str
-    _pattern_time_change_listener_job: HassJob[[datetime], None] | None = None
-    _cancel_callback: CALLBACK_TYPE | None = None
+type _TimeMatchExpression = tuple[list[int], list[int], list[int]]
 
-    def async_attach(self) -> None:
-        """Initialize track job."""
-        self._pattern_time_change_listener_job = HassJob(
-            self._pattern_time_change_listener,
-            self.listener_job_name,
-            job_type=HassJobType.Callback,
-        )
-        self._cancel_callback = async_track_point_in_utc_time(
-            self.hass,
-            self._pattern_time_change_listener_job,
-            self._calculate_next(dt_util.utcnow()),
-        )
 
-    def _calculate_next(self, utc_now: datetime) -> datetime:
-        """Calculate and set the next time the trigger should fire."""
+class _TimePatternGroup:
+    """The listeners of a time pattern, fired together."""
+
+    __slots__ = (
+        "key",
+        "name",
+        "time_match_expression",
+        "local",
+        "microsecond",
+        "jobs",
+        "next_fire",
+        "_seconds_of_hour",
+    )
+
+    def __init__(
+        self,
+        key: tuple[Any, ...],
+        name: str,
+        time_match_expression: _TimeMatchExpression,
+        local: bool,
+    ) -> None:
+        """Initialize the group."""
+        self.key = key
+        self.name = name
+        self.time_match_expression = time_match_expression
+        self.local = local
+        # Avoid aligning all time patterns to the same fraction of a second
+        # since it can create a thundering herd problem
+        # https://github.com/home-assistant/core/issues/82231
+        # The listeners of a group share it, the scheduler spreads the
+        # listeners of a pattern over several groups
+        self.microsecond = randint(RANDOM_MICROSECOND_MIN, RANDOM_MICROSECOND_MAX)
+        self.jobs: dict[
+            HassJob[[datetime], Coroutine[Any, Any, None] | None], None
+        ] = {}
+        self.next_fire = 0.0
+        seconds, minutes, hours = time_match_expression
+        # The seconds past the hour the pattern matches at when it matches
+        # every hour, which is the case of the common patterns
+        self._seconds_of_hour: list[int] | None = None
+        if set(hours) == set(range(24)):
+            self._seconds_of_hour = sorted(
+                {minute * 60 + second for minute in minutes for second in seconds}
+            )
+
+    def calculate_next(self, utc_now: datetime) -> datetime:
+        """Return the next time the pattern matches from utc_now on."""
+        if (seconds_of_hour := self._seconds_of_hour) is not None and (
+            not self.local or _is_whole_hour_offset(utc_now)
+        ):
+            index = bisect_left(seconds_of_hour, utc_now.minute * 60 + utc_now.second)
+            hour = utc_now.replace(minute=0, second=0, microsecond=self.microsecond)
+            if index == len(seconds_of_hour):
+                index = 0
+                hour += timedelta(hours=1)
+            next_fire = hour + timedelta(seconds=seconds_of_hour[index])
+            # The minutes and seconds of the local time are the ones of the
+            # UTC time as long as the UTC offset is a whole number of hours
+            if not self.local or _is_whole_hour_offset(next_fire):
+                return next_fire
         localized_now = dt_util.as_local(utc_now) if self.local else utc_now
         return dt_util.find_next_time_expression_time(
             localized_now, *self.time_match_expression
         ).replace(microsecond=self.microsecond)
 
+
+def _is_whole_hour_offset(utc_time: datetime) -> bool:
+    """Return if the local UTC offset at a time is a whole number of hours."""
+    offset = dt_util.as_local(utc_time).utcoffset()
+    return offset is not None and not offset.total_seconds() % 3600
+
+
+class _TimePatternScheduler:
+    """Fire the listeners of the time patterns.
+
+    The listeners are grouped by time pattern and the groups firing at the
+    same time share a single timer, so there is one timer per distinct
+    time the patterns fire at instead of one per listener. The listeners
+    of a pattern are spread over up to _TIME_PATTERN_GROUPS groups, each
+    firing at its own fraction of a second.
+    """
+
+    __slots__ = ("_hass", "_groups", "_timers")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._groups: dict[tuple[Any, ...], _TimePatternGroup] = {}
+        # The timer of each fire timestamp, with the groups it fires
+        self._timers: dict[float, tuple[CALLBACK_TYPE, list[_TimePatternGroup]]] = {}
+
+    @property
+    def timer_count(self) -> int:
+        """Return the number of timers scheduled."""
+        return len(self._timers)
+
     @callback
-    def _pattern_time_change_listener(self, _: datetime) -> None:
-        """Listen for matching time_changed events."""
-        hass = self.hass
+    def async_add_listener(
+        self,
+        time_match_expression: _TimeMatchExpression,
+        local: bool,
+        job: HassJob[[datetime], Coroutine[Any, Any, None] | None],
+    ) -> CALLBACK_TYPE:
+        """Add a listener of a time pattern."""
+        pattern = (*(tuple(values) for values in time_match_expression), local)
+        group: _TimePatternGroup | None = None
+        # Add the listener to the group of the pattern with the fewest
+        # listeners, or to a new group while the pattern has room for one
+        for index in range(_TIME_PATTERN_GROUPS):
+            key = (*pattern, index)
+            if (pattern_group := self._groups.get(key)) is None:
+                group = self._groups[key] = _TimePatternGroup(
+                    key,
+                    job.name or "time pattern listener",
+                    time_match_expression,
+                    local,
+                )
+                self._async_schedule(group, dt_util.utcnow())
+                break
+            if group is None or len(pattern_group.jobs) < len(group.jobs):
+                group = pattern_group
+        assert group is not None
+        group.jobs[job] = None
+        return partial(self._async_remove_listener, group, job)
+
+    @callback
+    def _async_remove_listener(
+        self,
+        group: _TimePatternGroup,
+        job: HassJob[[datetime], Coroutine[Any, Any, None] | None],
+    ) -> None:
+        """Remove a listener, and the group once it has no listeners."""
+        if group.jobs.pop(job, False) is False or group.jobs:
+            return
+        del self._groups[group.key]
+        cancel, groups = self._timers[group.next_fire]
+        groups.remove(group)
+        if not groups:
+            del self._timers[group.next_fire]
+            cancel()
+
+    @callback
+    def _async_schedule(self, group: _TimePatternGroup, utc_now: datetime) -> None:
+        """Schedule the next time a group fires."""
+        next_fire = group.calculate_next(utc_now)
+        group.next_fire = timestamp = next_fire.timestamp()
+        if (timer := self._timers.get(timestamp)) is not None:
+            timer[1].append(group)
+            return
+        cancel = async_track_point_in_utc_time(
+            self._hass,
+            HassJob(
+                partial(self._async_fire, timestamp),
+                group.name,
+                job_type=HassJobType.Callback,
+            ),
+            next_fire,
+        )
+        self._timers[timestamp] = (cancel, [group])
+
+    @callback
+    def _async_fire(self, timestamp: float, _: datetime) -> None:
+        """Fire the listeners of the groups firing at a timestamp."""
+        hass = self._hass
+        groups = self._timers.pop(timestamp)[1]
         # Fetch time again because we want the actual time, not the
         # time when the timer was scheduled
         utc_now = time_tracker_utcnow()
-        localized_now = dt_util.as_local(utc_now) if self.local else utc_now
-        if TYPE_CHECKING:
-            assert self._pattern_time_change_listener_job is not None
-        self._cancel_callback = async_track_point_in_utc_time(
-            hass,
-            self._pattern_time_change_listener_job,
-            self._calculate_next(utc_now + timedelta(seconds=1)),
-        )
-        hass.async_run_hass_job(self.job, localized_now, background=True)
+        for group in groups:
+            self._async_schedule(group, utc_now + timedelta(seconds=1))
+        for group in groups:
+            localized_now = dt_util.as_local(utc_now) if group.local else utc_now
+            for job in list(group.jobs):
+                hass.async_run_hass_job(job, localized_now, background=True)
 
-    @callback
-    def async_cancel(self) -> None:
-        """Cancel the call_at."""
-        if TYPE_CHECKING:
-            assert self._cancel_callback is not None
-        self._cancel_callback()
+
+@callback
+def _async_get_time_pattern_scheduler(hass: HomeAssistant) -> _TimePatternScheduler:
+    """Return the scheduler of the time pattern listeners."""
+    if (scheduler := hass.data.get(_TIME_PATTERN_SCHEDULER)) is None:
+        scheduler = hass.data[_TIME_PATTERN_SCHEDULER] = _TimePatternScheduler(hass)
+    return scheduler
 
 
 @callback
@@ -1853,21 +2277,9 @@ def async_track_utc_time_change(
     matching_seconds = dt_util.parse_time_expression(second, 0, 59)
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
-    # Avoid aligning all time trackers to the same fraction of a second
-    # since it can create a thundering herd problem
-    # https://github.com/home-assistant/core/issues/82231
-    microsecond = randint(RANDOM_MICROSECOND_MIN, RANDOM_MICROSECOND_MAX)
-    listener_job_name = f"time change listener {hour}:{minute}:{second} {action}"
-    track = _TrackUTCTimeChange(
-        hass,
-        (matching_seconds, matching_minutes, matching_hours),
-        microsecond,
-        local,
-        job,
-        listener_job_name,
+    return _async_get_time_pattern_scheduler(hass).async_add_listener(
+        (matching_seconds, matching_minutes, matching_hours), local, job
     )
-    track.async_attach()
-    return track.async_cancel
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
@@ -0,0 +1,213 @@
+"""Monitor the lag of the event loop and the callbacks blocking it."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import logging
+import math
+import sys
+import threading
+import traceback
+from types import FrameType
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .frame import MissingIntegrationFrame, get_integration_frame
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LOOP_MONITOR: HassKey[LoopMonitor] = HassKey("loop_monitor")
+
+# The interval the lag of the event loop is sampled at
+SAMPLE_INTERVAL = 0.25
+# The lag samples of the last 10 minutes are kept for the percentiles
+MAX_LAG_SAMPLES = 2400
+# A callback blocking the event loop for longer is reported
+SLOW_CALLBACK_THRESHOLD = 0.25
+# The interval the watchdog thread checks the event loop at
+WATCHDOG_INTERVAL = 0.05
+# The number of most recent slow callbacks kept
+MAX_SLOW_CALLBACKS = 50
+
+LAG_PERCENTILES = (50, 95, 99)
+
+
+@dataclass(slots=True, kw_only=True)
+class SlowCallback:
+    """A callback which blocked the event loop."""
+
+    integration: str | None
+    filename: str
+    line_number: int
+    stack: list[str]
+    # The time the event loop was blocked for, known once it runs again
+    duration: float = 0.0
+
+
+def _slow_callback_from_frame(frame: FrameType) -> SlowCallback:
+    """Return the slow callback running the frame, blamed on its integration."""
+    try:
+        integration_frame = get_integration_frame(frame=frame)
+    except MissingIntegrationFrame:
+        integration = None
+        blamed_frame = frame
+    else:
+        integration = integration_frame.integration
+        blamed_frame = integration_frame.frame
+    return SlowCallback(
+        integration=integration,
+        filename=blamed_frame.f_code.co_filename,
+        line_number=blamed_frame.f_lineno,
+        stack=traceback.format_stack(frame),
+    )
+
+
+class LoopMonitor:
+    """Sample the lag of the event loop and catch the callbacks blocking it.
+
+    A timer in the event loop samples how late it runs. A watchdog thread
+    captures the stack of the event loop thread when the timer is late by
+    more than the slow callback threshold, the stack is blamed on the
+    innermost integration in it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        sample_interval: float = SAMPLE_INTERVAL,
+        slow_callback_threshold: float = SLOW_CALLBACK_THRESHOLD,
+    ) -> None:
+        """Initialize the monitor."""
+        self._hass = hass
+        self._loop = hass.loop
+        self._sample_interval = sample_interval
+        self._slow_callback_threshold = slow_callback_threshold
+        self.lags: deque[float] = deque(maxlen=MAX_LAG_SAMPLES)
+        self.slow_callbacks: deque[SlowCallback] = deque(maxlen=MAX_SLOW_CALLBACKS)
+        self._loop_thread_id = 0
+        self._next_sample = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        # The slow callback caught by the watchdog with the sample it delayed
+        self._stall: tuple[float, SlowCallback] | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+        self._reported: set[tuple[str, int]] = set()
+
+    @callback
+    def async_start(self) -> None:
+        """Start monitoring the event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._async_schedule_sample(self._loop.time())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop_monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    async def async_stop(self) -> None:
+        """Stop monitoring the event loop."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._stop.set()
+        if self._watchdog is not None:
+            await self._hass.async_add_executor_job(self._watchdog.join)
+            self._watchdog = None
+
+    @callback
+    def _async_schedule_sample(self, now: float) -> None:
+        """Schedule the next sample of the lag."""
+        self._next_sample = now + self._sample_interval
+        self._timer = self._loop.call_at(self._next_sample, self._async_sample)
+
+    @callback
+    def _async_sample(self) -> None:
+        """Sample how late the event loop ran the timer."""
+        now = self._loop.time()
+        lag = max(now - self._next_sample, 0.0)
+        self.lags.append(lag)
+        if (stall := self._stall) is not None:
+            self._stall = None
+            delayed_sample, slow_callback = stall
+            if delayed_sample == self._next_sample:
+                slow_callback.duration = lag
+                self.slow_callbacks.append(slow_callback)
+                self._async_report(slow_callback)
+        self._async_schedule_sample(now)
+
+    @callback
+    def _async_report(self, slow_callback: SlowCallback) -> None:
+        """Log a slow callback, with its stack the first time it is seen."""
+        key = (slow_callback.filename, slow_callback.line_number)
+        if key in self._reported:
+            _LOGGER.debug(
+                "Detected a callback blocking the event loop for %.3f seconds"
+                " in %s, line %s",
+                slow_callback.duration,
+                slow_callback.filename,
+                slow_callback.line_number,
+            )
+            return
+        self._reported.add(key)
+        _LOGGER.warning(
+            "Detected a callback blocking the event loop for %.3f seconds"
+            " in %s, line %s from %s:\n%s",
+            slow_callback.duration,
+            slow_callback.filename,
+            slow_callback.line_number,
+            f"integration {slow_callback.integration}"
+            if slow_callback.integration
+            else "Home Assistant core",
+            "".join(slow_callback.stack),
+        )
+
+    def _watch(self) -> None:
+        """Capture the stack of the event loop thread while it is blocked.
+
+        Runs in the watchdog thread.
+        """
+        caught_sample = 0.0
+        while not self._stop.wait(WATCHDOG_INTERVAL):
+            next_sample = self._next_sample
+            if (
+                next_sample == caught_sample
+                or self._loop.time() - next_sample < self._slow_callback_threshold
+            ):
+                continue
+            caught_sample = next_sample
+            frame = sys._current_frames().get(self._loop_thread_id)  # noqa: SLF001
+            if frame is not None:
+                self._stall = (next_sample, _slow_callback_from_frame(frame))
+
+    def lag_percentiles(self) -> dict[str, float]:
+        """Return the percentiles and the maximum of the lag in seconds."""
+        if not (lags := sorted(self.lags)):
+            return {}
+        percentiles = {
+            f"p{percentile}": lags[math.ceil(len(lags) * percentile / 100) - 1]
+            for percentile in LAG_PERCENTILES
+        }
+        percentiles["max"] = lags[-1]
+        return percentiles
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Start monitoring the event loop until Home Assistant closes."""
+    monitor = hass.data[DATA_LOOP_MONITOR] = LoopMonitor(hass)
+    monitor.async_start()
+
+    async def _async_stop(event: Event) -> None:
+        """Stop the monitor."""
+        await monitor.async_stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_stop)
+
+
+@callback
+def async_get_loop_monitor(hass: HomeAssistant) -> LoopMonitor | None:
+    """Return the event loop monitor if it is running."""
+    return hass.data.get(DATA_LOOP_MONITOR)
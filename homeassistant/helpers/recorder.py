@@ -83,15 +83,25 @@ def session_scope(
     session: Session | None = None,
     exception_filter: Callable[[Exception], bool] | None = None,
     read_only: bool = False,
+    read_database: bool = False,
 ) -> Generator[Session]:
     """Provide a transactional scope around a series of operations.
 
     read_only is used to indicate that the session is only used for reading
     data and that no commit is required. It does not prevent the session
     from writing and is not a security measure.
+
+    read_database is used by the read only history, logbook and statistics
+    queries which tolerate the lag of the read database, sessions created
+    from hass then read from the read database if one is configured.
     """
     if session is None and hass is not None:
-        session = get_instance(hass).get_session()
+        instance = get_instance(hass)
+        session = (
+            instance.get_read_session()
+            if read_only and read_database
+            else instance.get_session()
+        )
 
     if session is None:
         raise RuntimeError("Session required")
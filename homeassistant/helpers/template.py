@@ -6,21 +6,25 @@ from ast import literal_eval
 import asyncio
 import base64
 import collections.abc
-from collections.abc import Callable, Generator, Iterable
+from collections.abc import Callable, Generator, Hashable, Iterable
 from contextlib import AbstractContextManager
 from contextvars import ContextVar
 from datetime import date, datetime, time, timedelta
 from functools import cache, cached_property, lru_cache, partial, wraps
 import json
 import logging
+import marshal
 import math
+import operator
 from operator import contains
+import os
 import pathlib
 import random
 import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+from time import perf_counter
 from types import CodeType, TracebackType
 from typing import Any, Concatenate, Literal, NoReturn, Self, cast, overload
 from urllib.parse import urlencode as urllib_urlencode
@@ -28,7 +32,9 @@ import weakref
 
 from awesomeversion import AwesomeVersion
 import jinja2
-from jinja2 import pass_context, pass_environment, pass_eval_context
+from jinja2 import nodes, pass_context, pass_environment, pass_eval_context
+from jinja2.bccache import Bucket, BytecodeCache
+from jinja2.meta import find_undeclared_variables
 from jinja2.runtime import AsyncLoopContext, LoopContext
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
@@ -42,14 +48,18 @@ from homeassistant.const import (
     ATTR_LONGITUDE,
     ATTR_PERSONS,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__,
 )
 from homeassistant.core import (
     Context,
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -66,6 +76,7 @@ from homeassistant.util import (
     slugify as slugify_util,
 )
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.file import WriteError, write_utf8_file
 from homeassistant.util.hass_dict import HassKey
 from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
 from homeassistant.util.read_only_dict import ReadOnlyDict
@@ -81,8 +92,9 @@ from . import (
     location as loc_helper,
 )
 from .singleton import singleton
+from .storage import STORAGE_DIR
 from .translation import async_translate_state
-from .typing import TemplateVarsType
+from .typing import UNDEFINED, TemplateVarsType, UndefinedType
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
@@ -98,6 +110,11 @@ _ENVIRONMENT_STRICT: HassKey[TemplateEnvironment] = HassKey(
     "template.environment_strict"
 )
 _HASS_LOADER = "template.hass_loader"
+_BYTECODE_CACHE = "template.bytecode_cache"
+
+TEMPLATE_BYTECODE_CACHE_FILE = "core.template_bytecode"
+# The maximum number of templates kept in the bytecode cache
+MAX_TEMPLATE_BYTECODE_CACHE_SIZE = 10000
 
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -476,6 +493,266 @@ class RenderInfo:
             self.filter = _false
 
 
+type _FastEvaluator = Callable[[HomeAssistant], Any]
+
+_FAST_PATH_BINARY_OPERATORS: dict[type[nodes.BinExpr], Callable[[Any, Any], Any]] = {
+    nodes.Add: operator.add,
+    nodes.Sub: operator.sub,
+    nodes.Mul: operator.mul,
+    nodes.Div: operator.truediv,
+    nodes.FloorDiv: operator.floordiv,
+    nodes.Mod: operator.mod,
+}
+_FAST_PATH_UNARY_OPERATORS: dict[type[nodes.UnaryExpr], Callable[[Any], Any]] = {
+    nodes.Neg: operator.neg,
+    nodes.Pos: operator.pos,
+    nodes.Not: operator.not_,
+}
+_FAST_PATH_COMPARE_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gteq": operator.ge,
+    "lt": operator.lt,
+    "lteq": operator.le,
+}
+
+
+def _fast_path_hass(hass: HomeAssistant) -> HomeAssistant:
+    """Evaluate to hass, the first argument of the state functions."""
+    return hass
+
+
+class _FastPath:
+    """A template evaluated without Jinja.
+
+    The fast path is limited to the output of expressions made of constants,
+    lists, the state functions, arithmetic, comparisons, boolean operators
+    and the float, int, round and abs filters. It calls the same functions as the
+    Jinja environment, so the result and the collected render info are the
+    same as rendering the template with Jinja.
+    """
+
+    __slots__ = ("evaluators", "names")
+
+    def __init__(self, evaluators: list[_FastEvaluator], names: set[str]) -> None:
+        """Initialize the fast path."""
+        self.evaluators = evaluators
+        # The names of the functions called, a variable with the same name
+        # shadows the function
+        self.names = frozenset(names)
+
+    @staticmethod
+    def _functions() -> dict[str, Callable[..., Any]]:
+        """Return the functions of the environment the fast path calls."""
+        return {
+            "states": states,
+            "state_attr": state_attr,
+            "is_state": is_state,
+            "is_state_attr": is_state_attr,
+            "has_value": has_value,
+        }
+
+    @staticmethod
+    def _filters() -> dict[str, Callable[..., Any]]:
+        """Return the filters of the environment the fast path calls."""
+        return {
+            "float": forgiving_float_filter,
+            "int": forgiving_int_filter,
+            "round": forgiving_round,
+            "abs": abs,
+        }
+
+    @classmethod
+    def compile(cls, node: nodes.Node, names: set[str]) -> _FastEvaluator | None:
+        """Compile an expression, returns None if it is not supported."""
+        if isinstance(node, nodes.Const):
+            if not isinstance(node.value, (str, int, float, type(None))):
+                return None
+            value = node.value
+            return lambda hass: value
+
+        if isinstance(node, nodes.TemplateData):
+            data = node.data
+            return lambda hass: data
+
+        if isinstance(node, nodes.List):
+            items: list[_FastEvaluator] = []
+            for item in node.items:
+                if (evaluator := cls.compile(item, names)) is None:
+                    return None
+                items.append(evaluator)
+            return lambda hass: [item(hass) for item in items]
+
+        # And and Or are binary expressions as well
+        if isinstance(node, (nodes.And, nodes.Or)):
+            if (first := cls.compile(node.left, names)) is None or (
+                second := cls.compile(node.right, names)
+            ) is None:
+                return None
+            if isinstance(node, nodes.And):
+                return lambda hass: first(hass) and second(hass)
+            return lambda hass: first(hass) or second(hass)
+
+        if isinstance(node, nodes.BinExpr):
+            if (
+                (binary_operator := _FAST_PATH_BINARY_OPERATORS.get(type(node))) is None
+                or (left := cls.compile(node.left, names)) is None
+                or (right := cls.compile(node.right, names)) is None
+            ):
+                return None
+            return lambda hass: binary_operator(left(hass), right(hass))
+
+        if isinstance(node, nodes.UnaryExpr):
+            if (
+                unary_operator := _FAST_PATH_UNARY_OPERATORS.get(type(node))
+            ) is None or (operand := cls.compile(node.node, names)) is None:
+                return None
+            return lambda hass: unary_operator(operand(hass))
+
+        if isinstance(node, nodes.Compare):
+            return cls._compile_compare(node, names)
+
+        if isinstance(node, nodes.Call):
+            if (
+                not isinstance(node.node, nodes.Name)
+                or (function := cls._functions().get(node.node.name)) is None
+                or (arguments := cls._compile_arguments(node, names)) is None
+            ):
+                return None
+            names.add(node.node.name)
+            return cls._compile_call(function, None, *arguments)
+
+        if isinstance(node, nodes.Filter):
+            if (
+                node.node is None
+                or (filter_ := cls._filters().get(node.name)) is None
+                or (filtered := cls.compile(node.node, names)) is None
+                or (arguments := cls._compile_arguments(node, names)) is None
+            ):
+                return None
+            return cls._compile_call(filter_, filtered, *arguments)
+
+        return None
+
+    @staticmethod
+    def _compile_call(
+        function: Callable[..., Any],
+        value: _FastEvaluator | None,
+        args: list[_FastEvaluator],
+        kwargs: dict[str, _FastEvaluator],
+    ) -> _FastEvaluator:
+        """Compile calling a function with the value, hass if None, and arguments.
+
+        The calls with up to two positional arguments are unrolled.
+        """
+        if value is None:
+            value = _fast_path_hass
+        if not kwargs:
+            if not args:
+                return lambda hass: function(value(hass))
+            if len(args) == 1:
+                arg = args[0]
+                return lambda hass: function(value(hass), arg(hass))
+            if len(args) == 2:
+                first, second = args
+                return lambda hass: function(value(hass), first(hass), second(hass))
+        return lambda hass: function(
+            value(hass),
+            *[arg(hass) for arg in args],
+            **{key: kwarg(hass) for key, kwarg in kwargs.items()},
+        )
+
+    @classmethod
+    def _compile_compare(
+        cls, node: nodes.Compare, names: set[str]
+    ) -> _FastEvaluator | None:
+        """Compile a chain of comparisons."""
+        if (first := cls.compile(node.expr, names)) is None:
+            return None
+        operands: list[tuple[Callable[[Any, Any], Any], _FastEvaluator]] = []
+        for operand in node.ops:
+            if (
+                compare_operator := _FAST_PATH_COMPARE_OPERATORS.get(operand.op)
+            ) is None or (expr := cls.compile(operand.expr, names)) is None:
+                return None
+            operands.append((compare_operator, expr))
+
+        def _compare(hass: HomeAssistant) -> Any:
+            left = first(hass)
+            result: Any = True
+            for compare_operator, expr in operands:
+                right = expr(hass)
+                if not (result := compare_operator(left, right)):
+                    return result
+                left = right
+            return result
+
+        return _compare
+
+    @classmethod
+    def _compile_arguments(
+        cls, node: nodes.Call | nodes.Filter, names: set[str]
+    ) -> tuple[list[_FastEvaluator], dict[str, _FastEvaluator]] | None:
+        """Compile the arguments of a call or a filter."""
+        if node.dyn_args is not None or node.dyn_kwargs is not None:
+            return None
+        args: list[_FastEvaluator] = []
+        for arg in node.args:
+            if (evaluator := cls.compile(arg, names)) is None:
+                return None
+            args.append(evaluator)
+        kwargs: dict[str, _FastEvaluator] = {}
+        for keyword in node.kwargs:
+            if (evaluator := cls.compile(keyword.value, names)) is None:
+                return None
+            kwargs[cast(str, keyword.key)] = evaluator
+        return args, kwargs
+
+    def render(self, hass: HomeAssistant, parse_result: bool) -> Any:
+        """Evaluate the template, the result is parsed like a Jinja render."""
+        if len(self.evaluators) == 1:
+            value = self.evaluators[0](hass)
+            if parse_result:
+                # Avoid formatting and parsing the results which parse
+                # to themselves
+                value_type = type(value)
+                if value_type is int or value_type is bool or value is None:
+                    return value
+                if value_type is float and _IS_NUMERIC.match(str(value)):
+                    return value
+            render_result = str(value)
+        else:
+            render_result = "".join(
+                [str(evaluator(hass)) for evaluator in self.evaluators]
+            )
+        render_result = render_result.strip()
+        if not parse_result:
+            return render_result
+        try:
+            return _cached_parse_result(render_result)
+        except (ValueError, TypeError, SyntaxError, MemoryError):
+            return render_result
+
+
+@lru_cache(maxsize=EVAL_CACHE_SIZE)
+def _compile_fast_path(template_str: str) -> _FastPath | None:
+    """Return the fast path of a template, None if Jinja must render it."""
+    try:
+        parsed = _NO_HASS_ENV.parse(template_str)
+    except jinja2.TemplateError:
+        return None
+    if len(parsed.body) != 1 or not isinstance(output := parsed.body[0], nodes.Output):
+        return None
+    names: set[str] = set()
+    evaluators: list[_FastEvaluator] = []
+    for node in output.nodes:
+        if (evaluator := _FastPath.compile(node, names)) is None:
+            return None
+        evaluators.append(evaluator)
+    return _FastPath(evaluators, names)
+
+
 class Template:
     """Class to hold a template and manage caching and rendering."""
 
@@ -492,6 +769,8 @@ class Template:
         "_log_fn",
         "_hash_cache",
         "_renders",
+        "_referenced_variables",
+        "_fast_path",
     )
 
     def __init__(self, template: str, hass: HomeAssistant | None = None) -> None:
@@ -510,6 +789,8 @@ class Template:
         self._log_fn: Callable[[int, str], None] | None = None
         self._hash_cache: int = hash(self.template)
         self._renders: int = 0
+        self._referenced_variables: frozenset[str] | UndefinedType | None = UNDEFINED
+        self._fast_path: _FastPath | UndefinedType | None = UNDEFINED
 
     @property
     def _env(self) -> TemplateEnvironment:
@@ -599,6 +880,25 @@ class Template:
         if variables is not None:
             kwargs.update(variables)
 
+        if (fast_path := self._fast_path) is UNDEFINED:
+            # The functions of the limited environment are not available
+            fast_path = self._fast_path = (
+                None if self._limited else _compile_fast_path(self.template)
+            )
+        if (
+            fast_path is not None
+            and (hass := self.hass) is not None
+            and (not kwargs or fast_path.names.isdisjoint(kwargs))
+        ):
+            with _template_context_manager as cm:
+                cm.set_template(self.template, "rendering")
+                try:
+                    return fast_path.render(
+                        hass, parse_result and not hass.config.legacy_templates
+                    )
+                except Exception as err:
+                    raise TemplateError(err) from err
+
         try:
             render_result = _render_with_context(self.template, compiled, **kwargs)
         except Exception as err:
@@ -723,6 +1023,54 @@ class Template:
         render_info._freeze()  # noqa: SLF001
         return render_info
 
+    @callback
+    def async_render_key(self, variables: TemplateVarsType = None) -> Hashable | None:
+        """Return a key identifying a render of the template with variables.
+
+        Templates with the same key render the same result as long as the
+        states do not change, only the variables referenced by the template
+        are part of the key. Returns None if the render can't be shared.
+        """
+        if self.is_static or self.hass is None or self._log_fn is not None:
+            return None
+        if (referenced := self._referenced_variables) is UNDEFINED:
+            referenced = self._referenced_variables = self._find_referenced_variables()
+        if referenced is None:
+            return None
+        shared_variables: tuple[tuple[str, type, Any], ...] = ()
+        if variables and (names := referenced.intersection(variables)):
+            # The type is part of the key as 1, 1.0 and True are equal
+            shared_variables = tuple(
+                (name, type(value := variables[name]), value) for name in sorted(names)
+            )
+            try:
+                hash(shared_variables)
+            except TypeError:
+                return None
+        return (
+            self.template,
+            bool(self._limited),
+            bool(self._strict),
+            shared_variables,
+        )
+
+    def _find_referenced_variables(self) -> frozenset[str] | None:
+        """Return the variables referenced by the template.
+
+        Returns None if the template does not parse, renders differently
+        each time or includes or imports templates, which can reference
+        variables not found here.
+        """
+        try:
+            parsed = self._env.parse(self.template)
+        except jinja2.TemplateError:
+            return None
+        if any(node.name == "random" for node in parsed.find_all(nodes.Filter)):
+            return None
+        if next(parsed.find_all((nodes.Include, nodes.Import, nodes.FromImport)), None):
+            return None
+        return frozenset(find_undeclared_variables(parsed))
+
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
         """Render template with value exposed.
 
@@ -899,14 +1247,7 @@ class AllStates:
         with_unit: bool = False,
     ) -> str:
         """Return the states."""
-        state = _get_state(self._hass, entity_id)
-        if state is None:
-            return STATE_UNKNOWN
-        if rounded is _SENTINEL:
-            rounded = with_unit
-        if rounded or with_unit:
-            return state.format_state(rounded, with_unit)  # type: ignore[arg-type]
-        return state.state
+        return states(self._hass, entity_id, rounded, with_unit)
 
     def __repr__(self) -> str:
         """Representation of All States."""
@@ -1819,6 +2160,23 @@ def is_hidden_entity(hass: HomeAssistant, entity_id: str) -> bool:
     return entry is not None and entry.hidden
 
 
+def states(
+    hass: HomeAssistant,
+    entity_id: str,
+    rounded: bool | object = _SENTINEL,
+    with_unit: bool = False,
+) -> str:
+    """Return the state of an entity."""
+    state = _get_state(hass, entity_id)
+    if state is None:
+        return STATE_UNKNOWN
+    if rounded is _SENTINEL:
+        rounded = with_unit
+    if rounded or with_unit:
+        return state.format_state(rounded, with_unit)  # type: ignore[arg-type]
+    return state.state
+
+
 def is_state(hass: HomeAssistant, entity_id: str, state: str | list[str]) -> bool:
     """Test if a state is a specific value."""
     state_obj = _get_state(hass, entity_id)
@@ -2716,6 +3074,141 @@ def _get_hass_loader(hass: HomeAssistant) -> HassLoader:
     return HassLoader({})
 
 
+async def async_load_template_bytecode(hass: HomeAssistant) -> None:
+    """Load the bytecode of the templates compiled before the last restart."""
+    await get_bytecode_cache(hass).async_load()
+
+
+@singleton(_BYTECODE_CACHE)
+def get_bytecode_cache(hass: HomeAssistant) -> TemplateBytecodeCache:
+    """Return the bytecode cache of the compiled templates."""
+    return TemplateBytecodeCache(hass)
+
+
+class TemplateBytecodeCache(BytecodeCache):
+    """A bytecode cache of the compiled templates persisted across restarts.
+
+    The templates compiled from a string are keyed by the flavor of the
+    environment and their source, the templates loaded by the HassLoader by
+    their name. The cache is written with the bytecode of the templates
+    compiled or loaded since the start, so the templates which are no
+    longer used are dropped, and is discarded when the version of Home
+    Assistant or Jinja changes. It is only used once it is loaded.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._loaded = False
+        # The bytecode and compile time of the templates read from disk
+        self._stored: dict[str, tuple[bytes, float]] = {}
+        # The bytecode and compile time of the templates used since the start
+        self._used: dict[str, tuple[bytes, float]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.compile_time = 0.0
+        self.saved_time = 0.0
+
+    @property
+    def _path(self) -> str:
+        """Return the path of the cache file."""
+        return self._hass.config.path(STORAGE_DIR, TEMPLATE_BYTECODE_CACHE_FILE)
+
+    @staticmethod
+    def _version() -> tuple[str, str]:
+        """Return the versions the bytecode is valid for."""
+        return (__version__, jinja2.__version__)
+
+    async def async_load(self) -> None:
+        """Load the cache and write it back once started and on shutdown."""
+        self._loaded = True
+        self._stored = await self._hass.async_add_executor_job(self._load)
+
+        async def _async_save(event: Event) -> None:
+            """Write the cache."""
+            await self.async_save()
+
+        self._hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_save)
+        self._hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _async_save)
+
+    def _load(self) -> dict[str, tuple[bytes, float]]:
+        """Read the cache file."""
+        try:
+            with open(self._path, "rb") as file:
+                version, templates = marshal.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, EOFError, ValueError, TypeError) as err:
+            _LOGGER.warning("Discarding the template bytecode cache: %s", err)
+            return {}
+        if version != self._version():
+            return {}
+        return cast(dict[str, tuple[bytes, float]], templates)
+
+    async def async_save(self) -> None:
+        """Write the cache if the used templates changed."""
+        if not self._dirty and len(self._used) == len(self._stored):
+            return
+        self._dirty = False
+        self._stored = dict(self._used)
+        data = marshal.dumps((self._version(), self._stored))
+        try:
+            await self._hass.async_add_executor_job(self._save, data)
+        except (OSError, WriteError) as err:
+            _LOGGER.warning("Could not write the template bytecode cache: %s", err)
+            self._dirty = True
+
+    def _save(self, data: bytes) -> None:
+        """Write the cache file."""
+        path = self._path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_utf8_file(path, data, private=True, mode="wb")
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load the bytecode of a template from the cache."""
+        if not self._loaded:
+            return
+        key = bucket.key
+        if (entry := self._used.get(key) or self._stored.get(key)) is None:
+            return
+        bucket.bytecode_from_string(entry[0])
+        if bucket.code is not None:
+            self.hits += 1
+            self.saved_time += entry[1]
+            self._used[key] = entry
+
+    def dump_bytecode(self, bucket: Bucket, compile_time: float = 0.0) -> None:
+        """Add the bytecode of a compiled template to the cache."""
+        if not self._loaded or len(self._used) >= MAX_TEMPLATE_BYTECODE_CACHE_SIZE:
+            return
+        self._used[bucket.key] = (bucket.bytecode_to_string(), compile_time)
+        self._dirty = True
+
+    def compile(
+        self,
+        environment: TemplateEnvironment,
+        source: str,
+        compile_source: Callable[[str], CodeType],
+    ) -> CodeType:
+        """Return the code of a template, compiled if not cached."""
+        if not self._loaded:
+            return compile_source(source)
+        bucket = Bucket(
+            environment, self.get_cache_key(f"{environment.flavor}|{source}"), ""
+        )
+        self.load_bytecode(bucket)
+        if bucket.code is not None:
+            return bucket.code
+        start = perf_counter()
+        bucket.code = compile_source(source)
+        compile_time = perf_counter() - start
+        self.misses += 1
+        self.compile_time += compile_time
+        self.dump_bytecode(bucket, compile_time)
+        return bucket.code
+
+
 class HassLoader(jinja2.BaseLoader):
     """An in-memory jinja loader that keeps track of templates that need to be reloaded."""
 
@@ -2757,6 +3250,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__(undefined=make_logging_undefined(strict, log_fn))
         self.hass = hass
+        self.flavor = "limited" if limited else "strict" if strict else "default"
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | None
         ] = weakref.WeakValueDictionary()
@@ -2859,6 +3353,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
         # This environment has access to hass, attach its loader to enable imports.
         self.loader = _get_hass_loader(hass)
+        self.bytecode_cache = get_bytecode_cache(hass)
 
         # We mark these as a context functions to ensure they get
         # evaluated fresh with every execution, rather than executed
@@ -3110,7 +3605,12 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
-        compiled = super().compile(source)
+        if isinstance(source, str) and isinstance(
+            self.bytecode_cache, TemplateBytecodeCache
+        ):
+            compiled = self.bytecode_cache.compile(self, source, super().compile)
+        else:
+            compiled = super().compile(source)
         self.template_cache[source] = compiled
         return compiled
 
@@ -6,17 +6,30 @@ import argparse
 import asyncio
 from collections.abc import Callable
 from contextlib import suppress
+from datetime import timedelta
 import logging
+import os
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
+import tracemalloc
+from typing import TYPE_CHECKING
 
-from homeassistant import core
+from sqlalchemy import insert
+
+from homeassistant import config_entries, core, loader
 from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.helpers import recorder as recorder_helper
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
     async_track_state_change,
     async_track_state_change_event,
 )
 from homeassistant.helpers.json import JSON_DUMP
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from homeassistant.components.recorder import Recorder
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -308,3 +321,759 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+async def _async_start_recorder(
+    config_dir: str, db_name: str, recorder_config: dict
+) -> core.HomeAssistant:
+    """Start a Home Assistant instance with the recorder."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import get_instance
+
+    hass = core.HomeAssistant(config_dir)
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    recorder_helper.async_initialize_recorder(hass)
+    db_url = f"sqlite:///{os.path.join(config_dir, db_name)}"
+    assert await async_setup_component(
+        hass, "recorder", {"recorder": {"db_url": db_url, **recorder_config}}
+    )
+    await hass.async_start()
+    await get_instance(hass).async_block_till_done()
+    return hass
+
+
+async def _record_state_changes(
+    config_dir: str, bulk_write: bool, entities: int, changes: int
+) -> float:
+    """Record state changes with the recorder and return the runtime."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import get_instance
+
+    hass = await _async_start_recorder(
+        config_dir, f"bulk_write_{bulk_write}.db", {"bulk_write": bulk_write}
+    )
+    instance = get_instance(hass)
+
+    attributes = {"friendly_name": "Power", "unit_of_measurement": "W"}
+    start = timer()
+    for change in range(changes):
+        hass.states.async_set(
+            f"sensor.power_{change % entities}", str(change), attributes
+        )
+        if change % 1000 == 0:
+            # Let the recorder thread commit as events arrive
+            await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    await instance.async_block_till_done()
+    runtime = timer() - start
+    await hass.async_stop()
+    return runtime
+
+
+@benchmark
+async def recorder_bulk_write(hass):
+    """Record 100k state changes of 1000 entities with and without bulk writes."""
+    entities = 1000
+    changes = 10**5
+    with TemporaryDirectory() as config_dir:
+        runtime_orm = await _record_state_changes(config_dir, False, entities, changes)
+        runtime_bulk = await _record_state_changes(config_dir, True, entities, changes)
+    print(f"ORM writes: {changes / runtime_orm:.0f} events/sec")
+    print(f"Bulk writes: {changes / runtime_bulk:.0f} events/sec")
+    return runtime_bulk
+
+
+def _insert_history_rows(
+    instance: Recorder, entity_ids: list[str], start_ts: float, rows_per_entity: int
+) -> None:
+    """Insert rows for the history benchmarks directly into the database."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.db_schema import (
+        StateAttributes,
+        States,
+        StatesMeta,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.util import session_scope
+
+    with session_scope(session=instance.get_session()) as session:
+        attributes = StateAttributes(
+            shared_attrs='{"friendly_name":"Power","unit_of_measurement":"W"}',
+            hash=1,
+        )
+        states_meta = [StatesMeta(entity_id=entity_id) for entity_id in entity_ids]
+        session.add(attributes)
+        session.add_all(states_meta)
+        session.flush()
+        for meta in states_meta:
+            session.execute(
+                insert(States),
+                [
+                    {
+                        "metadata_id": meta.metadata_id,
+                        "state": str(row % 200),
+                        "last_updated_ts": start_ts + row,
+                        "attributes_id": attributes.attributes_id,
+                    }
+                    for row in range(rows_per_entity)
+                ],
+            )
+
+
+@benchmark
+async def history_columnar(hass):
+    """Fetch and encode a million history rows with and without columns."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import get_instance, history
+
+    entity_ids = [f"sensor.power_{idx}" for idx in range(50)]
+    rows_per_entity = 20000
+    with TemporaryDirectory() as config_dir:
+        rec_hass = await _async_start_recorder(config_dir, "history.db", {})
+        instance = get_instance(rec_hass)
+        start_time = dt_util.utcnow() - timedelta(days=1)
+        await instance.async_add_executor_job(
+            _insert_history_rows,
+            instance,
+            entity_ids,
+            start_time.timestamp(),
+            rows_per_entity,
+        )
+
+        def _compressed_states() -> bytes:
+            return JSON_DUMP(
+                history.get_significant_states(
+                    rec_hass,
+                    start_time,
+                    None,
+                    entity_ids,
+                    significant_changes_only=False,
+                    minimal_response=True,
+                    no_attributes=True,
+                    compressed_state_format=True,
+                )
+            ).encode()
+
+        def _columnar() -> bytes:
+            return history.get_significant_states_compressed_json(
+                rec_hass,
+                start_time,
+                None,
+                entity_ids,
+                significant_changes_only=False,
+                minimal_response=True,
+                no_attributes=True,
+            )
+
+        for name, fetch in (
+            ("Compressed states", _compressed_states),
+            ("Columnar", _columnar),
+        ):
+            start = timer()
+            payload = await instance.async_add_executor_job(fetch)
+            runtime = timer() - start
+            tracemalloc.start()
+            await instance.async_add_executor_job(fetch)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{name}: {runtime:.2f}s, peak memory {peak / 1024**2:.0f} MiB,"
+                f" {len(payload)} bytes"
+            )
+        await rec_hass.async_stop()
+    return runtime
+
+
+@benchmark
+async def subscribe_entities_fan_out(hass):
+    """Fan out 50k state changes of 5k entities to 100 websocket subscriptions."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.auth.models import User
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.entity_subscriptions import (
+        async_get_entity_subscriptions,
+    )
+
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(5000)]
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "0")
+    subscriptions = async_get_entity_subscriptions(hass)
+    user = User(name="Benchmark", perm_lookup=None, is_owner=True, is_active=True)
+    sent = 0
+
+    @core.callback
+    def send_message(message):
+        """Count the sent messages."""
+        nonlocal sent
+        sent += 1
+
+    # Dashboards subscribe to a few entities each, some panels to all entities
+    for idx in range(100):
+        if idx % 20 == 0:
+            subscribed = set()
+        else:
+            subscribed = set(entity_ids[idx * 50 : idx * 50 + 50])
+        subscriptions.async_subscribe(send_message, user, idx, subscribed)
+
+    start = timer()
+    for value in range(1, 11):
+        for entity_id in entity_ids:
+            hass.states.async_set(entity_id, str(value))
+    await hass.async_block_till_done()
+    runtime = timer() - start
+    print(f"Sent {sent} messages")
+    return runtime
+
+
+@benchmark
+async def websocket_compression(hass):
+    """Compress the initial snapshot and 10k diffs of 6k entities."""
+    # pylint: disable-next=import-outside-toplevel
+    import zlib
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.compression import (
+        COMPRESSION_DICTIONARIES,
+        MessageCompressor,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.messages import (
+        cached_state_diff_message,
+    )
+
+    diffs = []
+
+    @core.callback
+    def capture_diff(event):
+        """Serialize the state diff."""
+        diffs.append(cached_state_diff_message(b"2", event))
+
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(6000)]
+    for idx, entity_id in enumerate(entity_ids):
+        hass.states.async_set(
+            entity_id,
+            str(idx),
+            {
+                "unit_of_measurement": "W",
+                "device_class": "power",
+                "state_class": "measurement",
+                "friendly_name": f"Benchmark power {idx}",
+            },
+        )
+    snapshot = b"".join(
+        (
+            b'{"id":2,"type":"event","event":{"a":{',
+            b",".join(
+                state.as_compressed_state_json for state in hass.states.async_all()
+            ),
+            b"}}}",
+        )
+    )
+    hass.bus.async_listen(EVENT_STATE_CHANGED, capture_diff)
+    for value in range(10000):
+        hass.states.async_set(
+            entity_ids[value % 6000],
+            str(value + 0.5),
+            {
+                "unit_of_measurement": "W",
+                "device_class": "power",
+                "state_class": "measurement",
+                "friendly_name": f"Benchmark power {value % 6000}",
+            },
+        )
+    await hass.async_block_till_done()
+
+    def _per_message_deflate(message):
+        compressobj = zlib.compressobj(1, zlib.DEFLATED, -zlib.MAX_WBITS)
+        return compressobj.compress(message) + compressobj.flush(zlib.Z_SYNC_FLUSH)
+
+    runtime = 0.0
+    for name, compress_message in (
+        ("Uncompressed", lambda message: message),
+        ("Deflate per message", _per_message_deflate),
+        (
+            "Deflate with shared dictionary and context",
+            MessageCompressor(COMPRESSION_DICTIONARIES[1]).compress,
+        ),
+    ):
+        start = timer()
+        snapshot_size = len(compress_message(snapshot))
+        snapshot_runtime = timer() - start
+        start = timer()
+        diffs_size = sum(len(compress_message(diff)) for diff in diffs)
+        diffs_runtime = timer() - start
+        runtime += snapshot_runtime + diffs_runtime
+        print(
+            f"{name}: snapshot {snapshot_size} bytes in {snapshot_runtime:.3f}s,"
+            f" {len(diffs)} diffs {diffs_size} bytes in {diffs_runtime:.3f}s"
+        )
+    return runtime
+
+
+@benchmark
+async def coordinator_refresh(hass):
+    """Refresh a coordinator with 1000 entities a hundred times."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.auth.models import User
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.entity_subscriptions import (
+        async_get_entity_subscriptions,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers.update_coordinator import (
+        CoordinatorEntity,
+        DataUpdateCoordinator,
+    )
+
+    class BenchmarkEntity(CoordinatorEntity):
+        """An entity with the value of the coordinator at its index."""
+
+        def __init__(self, coordinator, idx):
+            """Initialize the entity."""
+            super().__init__(coordinator)
+            self.entity_id = f"sensor.benchmark_{idx}"
+            self._idx = idx
+
+        @property
+        def state(self):
+            """Return the value of the entity."""
+            return self.coordinator.data[self._idx]
+
+    coordinator = DataUpdateCoordinator(
+        hass, logging.getLogger(__name__), name="benchmark", batch_state_writes=True
+    )
+    coordinator.data = [0] * 1000
+    for idx in range(1000):
+        entity = BenchmarkEntity(coordinator, idx)
+        entity.hass = hass
+        # The entities are not added by an entity platform
+        entity._no_platform_reported = True  # noqa: SLF001
+        await entity.async_added_to_hass()
+        entity.async_write_ha_state()
+
+    # The frontend of a few users and an automation on each entity
+    subscriptions = async_get_entity_subscriptions(hass)
+    user = User(name="Benchmark", perm_lookup=None, is_owner=True, is_active=True)
+    sent = 0
+
+    @core.callback
+    def send_message(message):
+        """Count the sent messages."""
+        nonlocal sent
+        sent += 1
+
+    for idx in range(5):
+        subscriptions.async_subscribe(send_message, user, idx, set())
+
+    @core.callback
+    def listener(event):
+        """Handle a state change."""
+
+    async_track_state_change_event(
+        hass, [f"sensor.benchmark_{idx}" for idx in range(1000)], listener
+    )
+
+    def _update_listeners_one_by_one():
+        for update_callback, _ in list(coordinator._listeners.values()):  # noqa: SLF001
+            update_callback()
+
+    runtime = 0.0
+    for name, update_listeners in (
+        ("One by one", _update_listeners_one_by_one),
+        ("Batched", coordinator.async_update_listeners),
+    ):
+        sent = 0
+        start = timer()
+        for value in range(1, 101):
+            coordinator.data = [value] * 1000
+            update_listeners()
+        await hass.async_block_till_done()
+        runtime = timer() - start
+        print(f"{name}: {runtime / 100 * 1000:.2f}ms per refresh, sent {sent} messages")
+    return runtime
+
+
+@benchmark
+async def state_churn_memory(hass):
+    """Measure the memory of the old states of 10k entities updated 5 times."""
+    # pylint: disable-next=import-outside-toplevel
+    import gc
+
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(10000)]
+    old_states = []
+
+    def _attributes(idx, value):
+        """Return the attributes, half of the entities report a changing value."""
+        return {
+            "unit_of_measurement": "W",
+            "device_class": "power",
+            "state_class": "measurement",
+            "friendly_name": f"Benchmark power {idx}",
+            "last_reading": value if idx % 2 else 0,
+        }
+
+    @core.callback
+    def listener(event):
+        """Keep the old states alive and serialize the new state like the frontend."""
+        old_states.append(event.data["old_state"])
+        new_state = event.data["new_state"]
+        new_state.as_compressed_state_json  # noqa: B018
+        new_state.as_dict_json  # noqa: B018
+
+    for idx, entity_id in enumerate(entity_ids):
+        hass.states.async_set(entity_id, "0", _attributes(idx, 0))
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+
+    gc.collect()
+    tracemalloc.start()
+    start = timer()
+    for value in range(1, 6):
+        for idx, entity_id in enumerate(entity_ids):
+            hass.states.async_set(entity_id, str(value), _attributes(idx, value))
+    await hass.async_block_till_done()
+    runtime = timer() - start
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"{len(old_states)} old states: {memory / 1024**2:.0f} MiB,"
+        f" {memory / len(old_states):.0f} bytes per state"
+    )
+    return runtime
+
+
+@benchmark
+async def states_snapshot(hass):
+    """Read 8k states from an executor thread while a domain is written."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.util.async_ import run_callback_threadsafe
+
+    domains = [f"domain_{idx}" for idx in range(40)]
+    for idx in range(8000):
+        hass.states.async_set(f"{domains[idx % 40]}.entity_{idx}", "0")
+    loop_time = 0.0
+
+    def async_all():
+        """Copy the states in the event loop and time it."""
+        nonlocal loop_time
+        start = timer()
+        states = hass.states.async_all()
+        loop_time += timer() - start
+        return states
+
+    def read_copy():
+        """Copy the states in the event loop like before snapshots."""
+        return run_callback_threadsafe(hass.loop, async_all).result()
+
+    def read_snapshot():
+        """Read the states of a snapshot."""
+        return hass.states.snapshot().all()
+
+    async def read_states(read):
+        """Write one state and read all of them 1000 times."""
+        start = timer()
+        for value in range(1000):
+            hass.states.async_set("domain_0.entity_0", str(value))
+            assert len(await hass.async_add_executor_job(read)) == 8000
+        return timer() - start
+
+    copy_time = await read_states(read_copy)
+    runtime = await read_states(read_snapshot)
+    print(
+        f"Copied in the event loop: {copy_time:.3f}s"
+        f" ({loop_time:.3f}s blocking the event loop), snapshots: {runtime:.3f}s"
+    )
+    return runtime
+
+
+@benchmark
+async def template_trackers(hass):
+    """Update 5k entities tracked by 1000 template sensors of 100 templates."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers.event import (
+        TrackTemplate,
+        async_get_template_render_stats,
+        async_track_template_result,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers.template import Template
+
+    for idx in range(5000):
+        hass.states.async_set(f"sensor.entity_{idx}", "0")
+
+    def template_str(idx, unique):
+        """Return the template of a sensor, 10 sensors share each template."""
+        entity_idx = idx % 100
+        return (
+            f"{{{{ states('sensor.entity_{entity_idx}') | float(0)"
+            f" + states('sensor.entity_{entity_idx + 1}') | float(0) }}}}"
+            + (f"{{# sensor {idx} #}}" if unique else "")
+        )
+
+    async def update_states(unique):
+        """Track the templates and update the tracked entities 10 times."""
+        infos = [
+            async_track_template_result(
+                hass,
+                [
+                    TrackTemplate(
+                        Template(template_str(idx, unique), hass), {"this": idx}
+                    )
+                ],
+                lambda event, updates: None,
+            )
+            for idx in range(1000)
+        ]
+        start = timer()
+        for value in range(1, 11):
+            for idx in range(101):
+                hass.states.async_set(f"sensor.entity_{idx}", str(value))
+        await hass.async_block_till_done()
+        runtime = timer() - start
+        for info in infos:
+            info.async_remove()
+        return runtime
+
+    unique_time = await update_states(True)
+    runtime = await update_states(False)
+    renders = shared_renders = 0
+    for stats in async_get_template_render_stats(hass):
+        renders += stats["renders"]
+        shared_renders += stats["shared_renders"]
+    print(
+        f"Unique templates: {unique_time:.3f}s, shared templates: {runtime:.3f}s,"
+        f" {renders} renders, {shared_renders} shared"
+    )
+    return runtime
+
+
+@benchmark
+async def template_bytecode_cache(hass):
+    """Compile 3000 templates with and without the bytecode cache."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import template
+
+    sources = [
+        f"{{% if is_state('sensor.entity_{idx}', 'on') %}}"
+        f"{{{{ states('sensor.entity_{idx}') | float(0) * {idx} | round(2) }}}}"
+        f"{{% else %}}{{{{ state_attr('sensor.entity_{idx}', 'value') }}}}{{% endif %}}"
+        for idx in range(3000)
+    ]
+
+    async def compile_templates(cache):
+        """Load the cache and compile the templates."""
+        await cache.async_load()
+        env = template.TemplateEnvironment(hass)
+        env.bytecode_cache = cache
+        start = timer()
+        for source in sources:
+            env.compile(source)
+        return timer() - start
+
+    with TemporaryDirectory() as tmpdir:
+        hass.config.config_dir = tmpdir
+        cache = template.TemplateBytecodeCache(hass)
+        compile_time = await compile_templates(cache)
+        await cache.async_save()
+        restarted = template.TemplateBytecodeCache(hass)
+        runtime = await compile_templates(restarted)
+        assert restarted.hits == len(sources)
+    print(f"Compiled: {compile_time:.3f}s, loaded from the cache: {runtime:.3f}s")
+    return runtime
+
+
+@benchmark
+async def template_fast_path(hass):
+    """Render simple templates 100k times with and without the fast path."""
+    # pylint: disable-next=import-outside-toplevel
+    from unittest.mock import patch
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import template
+
+    hass.states.async_set("sensor.power", "12.34")
+    hass.states.async_set("climate.living_room", "heat", {"temperature": 21.5})
+    hass.states.async_set("light.kitchen", "on")
+    sources = [
+        "{{ states('sensor.power') | float(0) * 2 }}",
+        "{{ state_attr('climate.living_room', 'temperature') }}",
+        "{{ is_state('light.kitchen', 'on') and states('sensor.power') | float(0) > 2 }}",
+    ]
+
+    def render_templates():
+        """Render each template 100k times."""
+        templates = [template.Template(source, hass) for source in sources]
+        start = timer()
+        for _ in range(100000):
+            for tpl in templates:
+                tpl.async_render_to_info()
+        return timer() - start
+
+    with patch.object(template, "_compile_fast_path", return_value=None):
+        jinja_time = render_templates()
+    runtime = render_templates()
+    print(f"Jinja: {jinja_time:.3f}s, fast path: {runtime:.3f}s")
+    return runtime
+
+
+@benchmark
+async def time_pattern_listeners(hass):
+    """Fire 2000 time pattern listeners for a simulated hour."""
+    # pylint: disable-next=import-outside-toplevel
+    import time
+    from unittest.mock import patch
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers.event import async_track_utc_time_change
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.util.async_ import get_scheduled_timer_handles
+
+    loop = hass.loop
+    count = 0
+
+    @core.callback
+    def listener(now):
+        """Count the listener runs."""
+        nonlocal count
+        count += 1
+
+    def active_timers():
+        """Return the timers scheduled in the event loop."""
+        return [
+            handle
+            for handle in get_scheduled_timer_handles(loop)
+            if not handle.cancelled()
+        ]
+
+    timers = len(active_timers())
+    common_patterns = (
+        {"second": 0},
+        {"minute": "/5", "second": 0},
+        {"minute": 0, "second": 0},
+        {"second": "/30"},
+    )
+    unsubs = [
+        async_track_utc_time_change(hass, listener, **common_patterns[idx % 4])
+        for idx in range(1000)
+    ]
+    unsubs.extend(
+        async_track_utc_time_change(hass, listener, second=idx % 60, minute="/1")
+        for idx in range(1000)
+    )
+    timers = len(active_timers()) - timers
+
+    utc_now = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    utc_now += timedelta(hours=1)
+    start = time.process_time()
+    for _ in range(3600):
+        utc_now += timedelta(seconds=1)
+        timestamp = utc_now.timestamp() + 0.999999
+        seconds_into_future = timestamp - time.time()
+        with (
+            patch(
+                "homeassistant.helpers.event.time_tracker_utcnow",
+                return_value=dt_util.utc_from_timestamp(timestamp),
+            ),
+            patch(
+                "homeassistant.helpers.event.time_tracker_timestamp",
+                return_value=timestamp,
+            ),
+        ):
+            for handle in active_timers():
+                if seconds_into_future >= handle.when() - loop.time():
+                    handle._run()  # noqa: SLF001
+                    handle.cancel()
+        await asyncio.sleep(0)
+    runtime = time.process_time() - start
+
+    for unsub in unsubs:
+        unsub()
+    print(f"{timers} timers, {count} listener runs")
+    return runtime
+
+
+@benchmark
+async def aligned_interval_polling(hass):
+    """Poll 2000 interval listeners for a simulated hour."""
+    # pylint: disable-next=import-outside-toplevel
+    import heapq
+    import random
+    import time
+    from unittest.mock import patch
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers.event import (
+        async_get_aligned_interval_stats,
+        async_set_aligned_interval_spread,
+        async_track_time_interval,
+    )
+
+    loop = hass.loop
+    scheduled = loop._scheduled  # noqa: SLF001
+    intervals = (10, 15, 30, 60, 300)
+    count = 0
+
+    @core.callback
+    def listener(now):
+        """Count the listener runs."""
+        nonlocal count
+        count += 1
+
+    def poll(aligned):
+        """Run the timers of the listeners for a simulated hour."""
+        nonlocal count
+        count = wakeups = 0
+        rand = random.Random(42)
+        now = loop.time()
+        with patch.object(loop, "time", lambda: now):
+            unsubs = []
+            for idx in range(2000):
+                # The listeners are added at random phases
+                now += rand.random() / 10
+                unsubs.append(
+                    async_track_time_interval(
+                        hass,
+                        listener,
+                        timedelta(seconds=intervals[idx % len(intervals)]),
+                        aligned=aligned,
+                    )
+                )
+            end = now + 3600
+            start = time.process_time()
+            while scheduled:
+                if scheduled[0].cancelled():
+                    heapq.heappop(scheduled)._scheduled = False  # noqa: SLF001
+                    continue
+                if (now := scheduled[0].when()) > end:
+                    break
+                wakeups += 1
+                while scheduled and scheduled[0].when() <= now:
+                    handle = heapq.heappop(scheduled)
+                    handle._scheduled = False  # noqa: SLF001
+                    if not handle.cancelled():
+                        handle._run()  # noqa: SLF001
+            runtime = time.process_time() - start
+            ticks = async_get_aligned_interval_stats(hass)
+            for unsub in unsubs:
+                unsub()
+        max_listeners = max((tick["listeners"] for tick in ticks), default=1)
+        print(
+            f"{'Aligned' if aligned else 'Unaligned'}: {wakeups} wakeups,"
+            f" {count} listener runs, {runtime:.3f}s,"
+            f" at most {max_listeners} listeners per tick"
+        )
+        return runtime
+
+    poll(False)
+    runtime = poll(True)
+    async_set_aligned_interval_spread(hass, timedelta(seconds=4))
+    poll(True)
+    return runtime
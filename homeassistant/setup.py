@@ -72,6 +72,10 @@ DATA_SETUP_TIME: HassKey[
     defaultdict[str, defaultdict[str | None, defaultdict[SetupPhases, float]]]
 ] = HassKey("setup_time")
 
+# DATA_SETUP_TIMELINE is a dict, indicating when the setup of a component
+# started and finished while Home Assistant was starting.
+DATA_SETUP_TIMELINE: HassKey[dict[str, tuple[float, float]]] = HassKey("setup_timeline")
+
 DATA_DEPS_REQS: HassKey[set[str]] = HassKey("deps_reqs_processed")
 
 DATA_PERSISTENT_ERRORS: HassKey[dict[str, str | None]] = HassKey(
@@ -160,9 +164,12 @@ async def async_setup_component(
 
     setup_future = hass.loop.create_future()
     setup_futures[domain] = setup_future
+    started = time.monotonic()
 
     try:
         result = await _async_setup_component(hass, domain, config)
+        if not hass.is_stopping and hass.state is not core.CoreState.running:
+            _setup_timeline(hass)[domain] = (started, time.monotonic())
         setup_future.set_result(result)
         if setup_done_future := setup_done_futures.pop(domain, None):
             setup_done_future.set_result(result)
@@ -822,3 +829,60 @@ def async_get_domain_setup_times(
 ) -> Mapping[str | None, dict[SetupPhases, float]]:
     """Return timing data for each integration."""
     return _setup_times(hass).get(domain, {})
+
+
+@singleton.singleton(DATA_SETUP_TIMELINE)
+def _setup_timeline(hass: core.HomeAssistant) -> dict[str, tuple[float, float]]:
+    """Return the setup timeline dict."""
+    return {}
+
+
+@callback
+def async_get_setup_timeline(
+    hass: core.HomeAssistant,
+) -> dict[str, tuple[float, float]]:
+    """Return when the setup of each integration started and finished.
+
+    The times are in seconds since the first setup started.
+    """
+    if not (timeline := _setup_timeline(hass)):
+        return {}
+    first_start = min(start for start, _ in timeline.values())
+    return {
+        domain: (start - first_start, end - first_start)
+        for domain, (start, end) in timeline.items()
+    }
+
+
+@callback
+def async_get_setup_critical_path(hass: core.HomeAssistant) -> list[str]:
+    """Return the chain of setups which gated the end of the startup.
+
+    The chain ends with the integration which finished setting up last.
+    Each integration in the chain is preceded by the dependency or after
+    dependency it waited for the longest, the one which finished last after
+    it started setting up.
+    """
+    timeline = _setup_timeline(hass)
+    if not timeline:
+        return []
+    domain: str | None = max(timeline, key=lambda domain: timeline[domain][1])
+    critical_path: list[str] = []
+    while domain is not None:
+        critical_path.append(domain)
+        start, end = timeline[domain]
+        try:
+            integration = loader.async_get_loaded_integration(hass, domain)
+        except loader.IntegrationNotLoaded:
+            break
+        domain = None
+        for dep in (*integration.dependencies, *integration.after_dependencies):
+            if (
+                (dep_timeline := timeline.get(dep)) is not None
+                and start < dep_timeline[1] <= end
+                and dep not in critical_path
+                and (domain is None or dep_timeline[1] > timeline[domain][1])
+            ):
+                domain = dep
+    critical_path.reverse()
+    return critical_path
@@ -0,0 +1,123 @@
+"""Profiling of the jobs run by the event loop."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+import functools
+import math
+from typing import Any, Final
+
+# The number of most recent run times of each job kept to compute the p99
+MAX_RUN_TIMES: Final = 1000
+
+
+class _JobStats:
+    """The run times of the jobs with the same target."""
+
+    __slots__ = (
+        "calls",
+        "filter_calls",
+        "filter_time",
+        "integration",
+        "run_times",
+        "total_time",
+    )
+
+    def __init__(self, integration: str) -> None:
+        """Initialize the stats."""
+        self.integration = integration
+        self.calls = 0
+        self.total_time = 0.0
+        self.filter_calls = 0
+        self.filter_time = 0.0
+        self.run_times: deque[float] = deque(maxlen=MAX_RUN_TIMES)
+
+
+def _unwrap_target(target: Callable[..., Any]) -> Callable[..., Any]:
+    """Return the function called by a job target."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    return target
+
+
+def job_target_name(target: Callable[..., Any]) -> str:
+    """Return the qualified name of a job target."""
+    target = _unwrap_target(target)
+    if (name := getattr(target, "__qualname__", None)) is None:
+        name = type(target).__qualname__
+    return f"{getattr(target, '__module__', None) or type(target).__module__}.{name}"
+
+
+def job_target_integration(target: Callable[..., Any]) -> str:
+    """Return the integration which owns a job target.
+
+    Targets outside of an integration are owned by homeassistant.
+    """
+    target = _unwrap_target(target)
+    module = getattr(target, "__module__", None) or type(target).__module__
+    parts = module.split(".")
+    if parts[:2] == ["homeassistant", "components"] and len(parts) > 2:
+        return parts[2]
+    if parts[0] == "custom_components" and len(parts) > 1:
+        return parts[1]
+    return "homeassistant"
+
+
+class JobProfiler:
+    """Record the time spent running jobs, per job target.
+
+    The jobs are grouped by the qualified name of their target, so the
+    listeners created by the same function are reported together. The time
+    of a coroutine job is the time to run it until it first suspends.
+    """
+
+    __slots__ = ("_stats",)
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self._stats: dict[str, _JobStats] = {}
+
+    def _get_stats(self, target: Callable[..., Any]) -> _JobStats:
+        """Return the stats of a job target."""
+        name = job_target_name(target)
+        if (stats := self._stats.get(name)) is None:
+            stats = self._stats[name] = _JobStats(job_target_integration(target))
+        return stats
+
+    def record_run(self, target: Callable[..., Any], run_time: float) -> None:
+        """Record the time a job took to run."""
+        stats = self._get_stats(target)
+        stats.calls += 1
+        stats.total_time += run_time
+        stats.run_times.append(run_time)
+
+    def record_filter(self, target: Callable[..., Any], filter_time: float) -> None:
+        """Record the time the event filter of a listener took."""
+        stats = self._get_stats(target)
+        stats.filter_calls += 1
+        stats.filter_time += filter_time
+
+    def report(self) -> list[dict[str, Any]]:
+        """Return the stats of the jobs, the most expensive first."""
+        report: list[dict[str, Any]] = []
+        for name, stats in self._stats.items():
+            if run_times := sorted(stats.run_times):
+                p99_time = run_times[math.ceil(len(run_times) * 0.99) - 1]
+            else:
+                p99_time = 0.0
+            report.append(
+                {
+                    "target": name,
+                    "integration": stats.integration,
+                    "calls": stats.calls,
+                    "total_time": stats.total_time,
+                    "p99_time": p99_time,
+                    "filter_calls": stats.filter_calls,
+                    "filter_time": stats.filter_time,
+                }
+            )
+        report.sort(
+            key=lambda item: item["total_time"] + item["filter_time"], reverse=True
+        )
+        return report
@@ -251,9 +251,9 @@ async def test_updating_to_often(
 
     # Simulate update takes too long
     wait_till_event.clear()
-    async_fire_time_changed(hass, dt_util.now() + timedelta(seconds=10))
+    async_fire_time_changed(hass, dt_util.now() + timedelta(seconds=20))
     await asyncio.sleep(0)
-    async_fire_time_changed(hass, dt_util.now() + timedelta(seconds=10))
+    async_fire_time_changed(hass, dt_util.now() + timedelta(seconds=30))
     wait_till_event.set()
     await asyncio.sleep(0)
 
@@ -30,6 +30,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_get_aligned_interval_stats
 import homeassistant.util.dt as dt_util
 
 from . import mock_asyncio_subprocess_run
@@ -658,9 +659,9 @@ async def test_updating_to_often(
 
     # Simulate update takes too long
     wait_till_event.clear()
-    async_fire_time_changed(hass, dt_util.now() + timedelta(seconds=10))
+    async_fire_time_changed(hass, dt_util.now() + timedelta(seconds=20))
     await asyncio.sleep(0)
-    async_fire_time_changed(hass, dt_util.now() + timedelta(seconds=10))
+    async_fire_time_changed(hass, dt_util.now() + timedelta(seconds=30))
     wait_till_event.set()
 
     # Finish processing update
@@ -724,6 +725,36 @@ async def test_updating_manually(
     assert called
 
 
+async def test_polling_aligned(hass: HomeAssistant) -> None:
+    """Test the switches poll on the ticks shared per scan interval."""
+    await setup.async_setup_component(
+        hass,
+        DOMAIN,
+        {
+            "command_line": [
+                {
+                    "switch": {
+                        "command_state": "echo 1",
+                        "name": f"Test {idx}",
+                        "scan_interval": 10,
+                    }
+                }
+                for idx in range(3)
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert [
+        (stats["interval"], stats["listeners"])
+        for stats in async_get_aligned_interval_stats(hass)
+    ] == [(10.0, 3)]
+
+    async_fire_time_changed(hass, dt_util.now() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert [stats["ticks"] for stats in async_get_aligned_interval_stats(hass)] == [1]
+
+
 @pytest.mark.parametrize(
     "get_config",
     [
@@ -2,6 +2,7 @@
 
 import asyncio
 from datetime import timedelta
+from typing import Any
 from unittest.mock import ANY, patch
 
 from freezegun import freeze_time
@@ -10,6 +11,7 @@ import pytest
 from homeassistant.components import history
 from homeassistant.components.history import websocket_api
 from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.history import get_significant_states
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_state_change_event
@@ -173,6 +175,366 @@ async def test_history_during_period(
     assert sensor_test_history[2]["a"] == {"any": "attr"}
 
 
+@pytest.mark.parametrize("minimal_response", [True, False])
+@pytest.mark.parametrize("no_attributes", [True, False])
+async def test_history_during_period_columnar(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> None:
+    """Test history_during_period with the columnar response path."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    hass.states.async_set("climate.test", "heat", attributes={"temperature": 20})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "off", attributes={"any": "attr"})
+    hass.states.async_set("climate.test", "heat", attributes={"temperature": 21})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "off", attributes={"any": "changed"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    responses = []
+    for msg_id, columnar in enumerate((False, True), start=1):
+        await client.send_json(
+            {
+                "id": msg_id,
+                "type": "history/history_during_period",
+                "start_time": now.isoformat(),
+                "entity_ids": ["sensor.test", "climate.test", "sensor.not_recorded"],
+                "significant_changes_only": False,
+                "minimal_response": minimal_response,
+                "no_attributes": no_attributes,
+                "columnar": columnar,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        assert response["id"] == msg_id
+        responses.append(response["result"])
+
+    assert list(responses[1]) == ["sensor.test", "climate.test"]
+    assert responses[1] == responses[0]
+
+
+async def test_history_during_period_max_points(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test history_during_period passes max_points to the recorder."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "1")
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "2")
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    with patch(
+        "homeassistant.components.history.websocket_api.history.get_significant_states",
+        wraps=get_significant_states,
+    ) as get_significant_states_mock:
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/history_during_period",
+                "start_time": now.isoformat(),
+                "entity_ids": ["sensor.test"],
+                "minimal_response": True,
+                "no_attributes": True,
+                "max_points": 100,
+            }
+        )
+        response = await client.receive_json()
+    assert response["success"]
+    # Without compiled tiers the states are read from the states table
+    assert [state["s"] for state in response["result"]["sensor.test"]] == ["1", "2"]
+    assert get_significant_states_mock.call_args.args[-1] == 100
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.test"],
+            "max_points": 0,
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
+@pytest.mark.parametrize("minimal_response", [True, False])
+async def test_stream_during_period(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    minimal_response: bool,
+) -> None:
+    """Test stream_during_period sends the history in chunks."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    for state in ("on", "off", "off", "on", "off"):
+        hass.states.async_set("sensor.test", state, attributes={"any": state})
+        hass.states.async_set("climate.test", "heat", attributes={"temperature": 20})
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    request = {
+        "start_time": now.isoformat(),
+        "end_time": end_time.isoformat(),
+        "entity_ids": ["sensor.test", "climate.test", "sensor.not_recorded"],
+        "significant_changes_only": False,
+        "minimal_response": minimal_response,
+    }
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 1, "type": "history/history_during_period", **request}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    expected = response["result"]
+
+    with patch.object(websocket_api, "MAX_STREAM_MESSAGE_STATES", 2):
+        await client.send_json(
+            {"id": 2, "type": "history/stream_during_period", **request}
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        assert response["id"] == 2
+        assert response["result"] is None
+
+        streamed: dict[str, list[dict[str, Any]]] = {}
+        messages = 0
+        while True:
+            response = await client.receive_json()
+            assert response["id"] == 2
+            assert response["type"] == "event"
+            event = response["event"]
+            assert event["start_time"] == now.timestamp()
+            assert event["end_time"] == end_time.timestamp()
+            assert sum(len(states) for states in event["states"].values()) <= 2
+            for entity_id, states in event["states"].items():
+                streamed.setdefault(entity_id, []).extend(states)
+            messages += 1
+            if event["complete"]:
+                break
+
+    assert messages > 1
+    assert streamed == expected
+
+    # The subscription is removed once the stream is complete
+    await client.send_json({"id": 3, "type": "unsubscribe_events", "subscription": 2})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+
+async def test_stream_during_period_drain_timeout(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test stream_during_period ends when the client does not receive messages."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    for state in ("on", "off", "on"):
+        hass.states.async_set("sensor.test", state)
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    async def _never_drained(self) -> None:
+        await asyncio.Event().wait()
+
+    stream_ended = asyncio.Event()
+    stream_historical_states = websocket_api._stream_historical_states
+
+    def _stream_historical_states(*args: Any) -> None:
+        stream_historical_states(*args)
+        hass.loop.call_soon_threadsafe(stream_ended.set)
+
+    client = await hass_ws_client()
+    with (
+        patch.object(websocket_api, "MAX_STREAM_MESSAGE_STATES", 1),
+        patch.object(websocket_api, "STREAM_DRAIN_TIMEOUT", 0),
+        patch(
+            "homeassistant.components.websocket_api.connection.ActiveConnection"
+            ".async_wait_drained",
+            _never_drained,
+        ),
+        patch.object(
+            websocket_api, "_stream_historical_states", _stream_historical_states
+        ),
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream_during_period",
+                "start_time": now.isoformat(),
+                "entity_ids": ["sensor.test"],
+                "significant_changes_only": False,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        async with asyncio.timeout(10):
+            await stream_ended.wait()
+
+    response = await client.receive_json()
+    assert response["id"] == 1
+    assert not response["success"]
+    assert response["error"]["code"] == "timeout"
+
+    await client.send_json({"id": 2, "type": "ping"})
+    response = await client.receive_json()
+    assert response == {"id": 2, "type": "pong"}
+
+    await client.send_json({"id": 3, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["error"]["code"] == "not_found"
+
+
+async def test_stream_during_period_unsubscribe(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test unsubscribing ends a stream waiting for the client."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    for state in ("on", "off", "on"):
+        hass.states.async_set("sensor.test", state)
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    async def _never_drained(self) -> None:
+        await asyncio.Event().wait()
+
+    waiting = asyncio.Event()
+    stream_ended = asyncio.Event()
+    stream_historical_states = websocket_api._stream_historical_states
+
+    def _stream_historical_states(hass: HomeAssistant, send_chunk, *args) -> None:
+        def _send_chunk(payload: bytes, complete: bool) -> bool:
+            hass.loop.call_soon_threadsafe(waiting.set)
+            return send_chunk(payload, complete)
+
+        stream_historical_states(hass, _send_chunk, *args)
+        hass.loop.call_soon_threadsafe(stream_ended.set)
+
+    client = await hass_ws_client()
+    with (
+        patch.object(websocket_api, "MAX_STREAM_MESSAGE_STATES", 1),
+        patch(
+            "homeassistant.components.websocket_api.connection.ActiveConnection"
+            ".async_wait_drained",
+            _never_drained,
+        ),
+        patch.object(
+            websocket_api, "_stream_historical_states", _stream_historical_states
+        ),
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream_during_period",
+                "start_time": now.isoformat(),
+                "entity_ids": ["sensor.test"],
+                "significant_changes_only": False,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        async with asyncio.timeout(10):
+            await waiting.wait()
+
+        await client.send_json(
+            {"id": 2, "type": "unsubscribe_events", "subscription": 1}
+        )
+        response = await client.receive_json()
+        assert response["id"] == 2
+        assert response["success"]
+        async with asyncio.timeout(10):
+            await stream_ended.wait()
+
+
+async def test_stream_during_period_impossible_conditions(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test stream_during_period completes when condition cannot be true."""
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    await async_wait_recording_done(hass)
+
+    after = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream_during_period",
+            "start_time": after.isoformat(),
+            "end_time": after.isoformat(),
+            "entity_ids": ["sensor.test"],
+            "include_start_time_state": False,
+            "significant_changes_only": False,
+            "no_attributes": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    assert response == {
+        "event": {
+            "complete": True,
+            "end_time": after.timestamp(),
+            "start_time": after.timestamp(),
+            "states": {},
+        },
+        "id": 1,
+        "type": "event",
+    }
+
+
+async def test_stream_during_period_bad_start_time(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test stream_during_period bad start time."""
+    await async_setup_component(hass, "history", {})
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream_during_period",
+            "entity_ids": ["sensor.test"],
+            "start_time": "cats",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
 async def test_history_during_period_impossible_conditions(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -1,11 +1,13 @@
 """Test the Profiler config flow."""
 
+import asyncio
 from datetime import timedelta
 from functools import lru_cache
+import json
 import logging
 import os
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 from freezegun.api import FrozenDateTimeFactory
 from lru import LRU
@@ -17,12 +19,14 @@ from homeassistant.components.profiler import (
     _SQLALCHEMY_LRU_OBJECT,
     CONF_ENABLED,
     CONF_SECONDS,
+    DISPATCH_PROFILER,
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_CURRENT_TASKS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LRU_STATS,
     SERVICE_MEMORY,
+    SERVICE_PROFILE_DISPATCH,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_START,
     SERVICE_START_LOG_OBJECT_SOURCES,
@@ -32,11 +36,18 @@ from homeassistant.components.profiler import (
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    async_track_template_result,
+    async_track_time_interval,
+)
+from homeassistant.helpers.template import Template
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.typing import WebSocketGenerator
 
 
 async def test_basic_usage(hass: HomeAssistant, tmp_path: Path) -> None:
@@ -101,6 +112,194 @@ async def test_memory_usage(hass: HomeAssistant, tmp_path: Path) -> None:
     await hass.async_block_till_done()
 
 
+async def _async_wait_dispatch_profiler(hass: HomeAssistant) -> None:
+    """Wait for the dispatch profiler to start."""
+    while DISPATCH_PROFILER not in hass.data[DOMAIN]:
+        await asyncio.sleep(0)
+
+
+async def test_profile_dispatch(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test we can profile the event listeners and write the stats."""
+    test_dir = tmp_path / "profiles"
+    test_dir.mkdir()
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_PROFILE_DISPATCH)
+
+    @callback
+    def _event_filter(event_data: dict) -> bool:
+        return event_data["match"]
+
+    @callback
+    def _listener(event: Event) -> None:
+        pass
+
+    hass.bus.async_listen("test_event", _listener, event_filter=_event_filter)
+
+    last_filename = None
+
+    def _mock_path(filename: str) -> str:
+        nonlocal last_filename
+        last_filename = str(test_dir / filename)
+        return last_filename
+
+    with patch.object(hass.config, "path", _mock_path):
+        service_call = hass.async_create_task(
+            hass.services.async_call(
+                DOMAIN, SERVICE_PROFILE_DISPATCH, {CONF_SECONDS: 0.01}, blocking=True
+            )
+        )
+        await _async_wait_dispatch_profiler(hass)
+        with pytest.raises(
+            HomeAssistantError, match="Dispatch profiling already running"
+        ):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_PROFILE_DISPATCH, {CONF_SECONDS: 0.01}, blocking=True
+            )
+        hass.bus.async_fire("test_event", {"match": True})
+        hass.bus.async_fire("test_event", {"match": False})
+        await service_call
+
+    assert DISPATCH_PROFILER not in hass.data[DOMAIN]
+    report = json.loads(
+        await hass.async_add_executor_job(Path(last_filename).read_text)
+    )
+    stats = next(item for item in report if item["target"].endswith("._listener"))
+    assert stats["integration"] == "homeassistant"
+    assert stats["calls"] == 1
+    assert stats["filter_calls"] == 2
+    assert stats["p99_time"] >= 0
+
+    # The listeners are no longer profiled once the profile is done
+    hass.bus.async_fire("test_event", {"match": True})
+    await hass.async_block_till_done()
+    assert "async_run_hass_job" not in hass.__dict__
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_websocket_profile_dispatch(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test we can profile the event listeners with the websocket api."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    @callback
+    def _listener(event: Event) -> None:
+        pass
+
+    hass.bus.async_listen("test_event", _listener)
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": "profiler/profile_dispatch", CONF_SECONDS: 0.01}
+    )
+    await _async_wait_dispatch_profiler(hass)
+    hass.bus.async_fire("test_event")
+    response = await client.receive_json()
+    assert response["success"]
+    stats = next(
+        item
+        for item in response["result"]["jobs"]
+        if item["target"].endswith("._listener")
+    )
+    assert stats["calls"] == 1
+    assert stats["filter_calls"] == 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await client.send_json_auto_id({"type": "profiler/profile_dispatch"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+
+async def test_websocket_template_render_stats(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test we can get the render stats of the tracked templates."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    template_str = "{{ states('sensor.test') }}"
+    for _ in range(2):
+        async_track_template_result(
+            hass,
+            [TrackTemplate(Template(template_str, hass), None)],
+            lambda event, updates: None,
+        )
+    hass.states.async_set("sensor.test", "on")
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/template_render_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["templates"] == [
+        {
+            "template": template_str,
+            "renders": 3,
+            "shared_renders": 1,
+            "total_time": ANY,
+        }
+    ]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_websocket_aligned_interval_stats(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test we can get the load of the aligned interval ticks."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    unsubs = [
+        async_track_time_interval(
+            hass, callback(lambda now: None), timedelta(seconds=30), aligned=True
+        )
+        for _ in range(2)
+    ]
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/aligned_interval_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["ticks"] == [
+        {
+            "interval": 30.0,
+            "offset": 0.0,
+            "listeners": 2,
+            "ticks": 0,
+            "total_time": 0.0,
+            "max_time": 0.0,
+        }
+    ]
+
+    for unsub in unsubs:
+        unsub()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
 async def test_object_growth_logging(
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
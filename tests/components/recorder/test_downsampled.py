@@ -0,0 +1,173 @@
+"""The tests for the downsampled states of the recorder."""
+
+from datetime import datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.recorder import Recorder, history
+from homeassistant.components.recorder.db_schema import (
+    StatesDownsampled1m,
+    StatesDownsampled15m,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from .common import async_wait_recording_done, do_adhoc_statistics
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+async def _async_record_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> datetime:
+    """Record numeric and non numeric states and compile the tiers.
+
+    Returns the start of the quarter hour with the states.
+    """
+    zero = (dt_util.utcnow() + timedelta(hours=1)).replace(
+        minute=0, second=0, microsecond=0
+    )
+    for offset, entity_id, state in (
+        (timedelta(minutes=-2), "sensor.temperature", "8"),
+        (timedelta(minutes=-2), "sensor.mode", "heat"),
+        (timedelta(seconds=10), "sensor.temperature", "10"),
+        (timedelta(seconds=40), "sensor.temperature", "20.5"),
+        (timedelta(seconds=90), "sensor.temperature", "5"),
+        (timedelta(minutes=7), "sensor.temperature", "unavailable"),
+        (timedelta(minutes=7), "sensor.mode", "cool"),
+        (timedelta(minutes=14), "sensor.temperature", "30"),
+        (timedelta(minutes=15, seconds=10), "sensor.temperature", "40"),
+    ):
+        freezer.move_to(zero + offset)
+        hass.states.async_set(entity_id, state)
+    await async_wait_recording_done(hass)
+
+    freezer.move_to(zero + timedelta(minutes=20))
+    for minutes in range(-5, 15, 5):
+        do_adhoc_statistics(hass, start=zero + timedelta(minutes=minutes))
+    await async_wait_recording_done(hass)
+    return zero
+
+
+def _buckets(
+    hass: HomeAssistant, tier: type[StatesDownsampled1m | StatesDownsampled15m]
+) -> list[tuple[float, float, float, float]]:
+    """Return the buckets of a tier."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return [
+            (row.start_ts, row.min, row.max, row.last)
+            for row in session.query(tier).order_by(tier.start_ts)
+        ]
+
+
+@pytest.mark.parametrize("recorder_config", [{"downsample_states": True}])
+async def test_compile_downsampled_states(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test numeric states are compiled into the tiers."""
+    zero = await _async_record_states(hass, freezer)
+    zero_ts = zero.timestamp()
+
+    assert _buckets(hass, StatesDownsampled1m) == [
+        (zero_ts - 120, 8.0, 8.0, 8.0),
+        (zero_ts, 10.0, 20.5, 20.5),
+        (zero_ts + 60, 5.0, 5.0, 5.0),
+        (zero_ts + 840, 30.0, 30.0, 30.0),
+    ]
+    assert _buckets(hass, StatesDownsampled15m) == [
+        (zero_ts - 900, 8.0, 8.0, 8.0),
+        (zero_ts, 5.0, 30.0, 30.0),
+    ]
+
+    # Compiling a period again is a no-op
+    do_adhoc_statistics(hass, start=zero)
+    await async_wait_recording_done(hass)
+    assert len(_buckets(hass, StatesDownsampled1m)) == 4
+
+    # The tiers are purged with the states
+    purge_old_data(recorder_mock, zero + timedelta(minutes=5), repack=False)
+    assert _buckets(hass, StatesDownsampled1m) == [(zero_ts + 840, 30.0, 30.0, 30.0)]
+    assert _buckets(hass, StatesDownsampled15m) == [(zero_ts, 5.0, 30.0, 30.0)]
+
+
+async def test_compile_downsampled_states_disabled(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the tiers are not compiled unless enabled."""
+    await _async_record_states(hass, freezer)
+
+    assert _buckets(hass, StatesDownsampled1m) == []
+    assert _buckets(hass, StatesDownsampled15m) == []
+
+
+@pytest.mark.parametrize("recorder_config", [{"downsample_states": True}])
+async def test_get_significant_states_max_points(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test long periods are read from the tier matching max_points."""
+    zero = await _async_record_states(hass, freezer)
+    zero_ts = zero.timestamp()
+    entity_ids = ["sensor.temperature", "sensor.mode"]
+
+    def _get_states(
+        start_time: datetime, end_time: datetime, max_points: int | None
+    ) -> dict[str, list[tuple[str, float, float | None, float | None]]]:
+        states = history.get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            minimal_response=True,
+            no_attributes=True,
+            compressed_state_format=True,
+            max_points=max_points,
+        )
+        return {
+            entity_id: [
+                (state["s"], state["lu"], state.get("min"), state.get("max"))
+                for state in entity_states
+            ]
+            for entity_id, entity_states in states.items()
+        }
+
+    start_time = zero - timedelta(seconds=30)
+    end_time = zero + timedelta(minutes=15, seconds=30)
+    raw_states = _get_states(start_time, end_time, None)
+    assert len(raw_states["sensor.temperature"]) == 7
+
+    # The 1-minute tier between the raw head and tail
+    assert _get_states(start_time, end_time, 16) == {
+        "sensor.temperature": [
+            ("8", start_time.timestamp(), None, None),
+            ("20.5", zero_ts, 10.0, 20.5),
+            ("5", zero_ts + 60, 5.0, 5.0),
+            ("30", zero_ts + 840, 30.0, 30.0),
+            ("40", zero_ts + 910, None, None),
+        ],
+        "sensor.mode": raw_states["sensor.mode"],
+    }
+
+    # The 15-minute tier
+    assert _get_states(zero, zero + timedelta(minutes=30), 2)["sensor.temperature"] == [
+        ("8", zero_ts, None, None),
+        ("30", zero_ts, 5.0, 30.0),
+        ("40", zero_ts + 910, None, None),
+    ]
+
+    # No tier is fine enough
+    assert _get_states(start_time, end_time, 1000) == raw_states
+
+    # The tiers do not cover the start of the period
+    assert _get_states(zero - timedelta(hours=1), end_time, 16) == _get_states(
+        zero - timedelta(hours=1), end_time, None
+    )
@@ -5,6 +5,7 @@ from __future__ import annotations
 from copy import copy
 from datetime import datetime, timedelta
 import json
+from typing import Any
 from unittest.mock import patch, sentinel
 
 from freezegun import freeze_time
@@ -30,7 +31,7 @@ from homeassistant.components.recorder.models.legacy import (
 from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.core import HomeAssistant, State
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_bytes
 import homeassistant.util.dt as dt_util
 
 from .common import (
@@ -806,6 +807,89 @@ async def test_get_significant_states_only_minimal_response(
     assert len(hist["sensor.test"]) == 3
 
 
+@pytest.mark.parametrize("minimal_response", [True, False])
+@pytest.mark.parametrize("significant_changes_only", [True, False])
+@pytest.mark.parametrize("no_attributes", [True, False])
+@pytest.mark.parametrize("start_offset", [timedelta(0), timedelta(seconds=2)])
+async def test_get_significant_states_compressed_json_matches_compressed_states(
+    hass: HomeAssistant,
+    minimal_response: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+    start_offset: timedelta,
+) -> None:
+    """Test the columnar JSON encoding matches the compressed state format."""
+    zero, four, states = record_states(hass)
+    await async_wait_recording_done(hass)
+
+    entity_ids = list(states)
+    kwargs = {
+        "entity_ids": entity_ids,
+        "minimal_response": minimal_response,
+        "significant_changes_only": significant_changes_only,
+        "no_attributes": no_attributes,
+    }
+    compressed_states = history.get_significant_states(
+        hass, zero + start_offset, four, compressed_state_format=True, **kwargs
+    )
+    assert compressed_states
+    assert history.get_significant_states_compressed_json(
+        hass, zero + start_offset, four, **kwargs
+    ) == json_bytes(compressed_states)
+
+
+async def test_get_significant_states_compressed_json_no_matches(
+    hass: HomeAssistant,
+) -> None:
+    """Test the columnar JSON encoding without any recorded states."""
+    now = dt_util.utcnow()
+    assert (
+        history.get_significant_states_compressed_json(
+            hass, now, entity_ids=["sensor.not_recorded"]
+        )
+        == b"{}"
+    )
+
+
+@pytest.mark.parametrize("minimal_response", [True, False])
+@pytest.mark.parametrize("significant_changes_only", [True, False])
+@pytest.mark.parametrize("states_per_chunk", [1, 3, 1000])
+async def test_stream_significant_states_with_session(
+    hass: HomeAssistant,
+    minimal_response: bool,
+    significant_changes_only: bool,
+    states_per_chunk: int,
+) -> None:
+    """Test streaming the significant states in chunks."""
+    zero, four, states = record_states(hass)
+    await async_wait_recording_done(hass)
+
+    entity_ids = list(states)
+    kwargs = {
+        "entity_ids": entity_ids,
+        "minimal_response": minimal_response,
+        "significant_changes_only": significant_changes_only,
+        "compressed_state_format": True,
+    }
+    expected = history.get_significant_states(hass, zero, four, **kwargs)
+    with session_scope(hass=hass, read_only=True) as session:
+        chunks = list(
+            history.stream_significant_states_with_session(
+                hass, session, zero, four, states_per_chunk=states_per_chunk, **kwargs
+            )
+        )
+
+    assert all(
+        sum(len(entity_states) for entity_states in chunk.values()) <= states_per_chunk
+        for chunk in chunks
+    )
+    streamed: dict[str, list[dict[str, Any]]] = {}
+    for chunk in chunks:
+        for entity_id, entity_states in chunk.items():
+            streamed.setdefault(entity_id, []).extend(entity_states)
+    assert streamed == expected
+
+
 def record_states(
     hass: HomeAssistant,
 ) -> tuple[datetime, datetime, dict[str, list[State]]]:
@@ -1220,6 +1304,70 @@ async def test_get_full_significant_states_past_year_2038(
     assert sensor_one_states[0].last_updated == past_2038_time
 
 
+async def test_get_numeric_states_aggregates_with_session(
+    hass: HomeAssistant,
+) -> None:
+    """Test the database aggregates the numeric states of a period."""
+    start = dt_util.utcnow().replace(microsecond=0) + timedelta(hours=1)
+    end = start + timedelta(minutes=5)
+    watts = {"unit_of_measurement": "W"}
+    for seconds, entity_id, state, attributes in (
+        (-60, "sensor.power", "10", watts),
+        (-60, "sensor.text", "on", {}),
+        (60, "sensor.power", "unavailable", {}),
+        (60, "sensor.temperature", "20", {"unit_of_measurement": "°C"}),
+        (60, "sensor.not_finite", "nan", {}),
+        (120, "sensor.power", "20", watts),
+        (180, "sensor.temperature", "23", {"unit_of_measurement": "°F"}),
+        (360, "sensor.power", "100", watts),
+    ):
+        with freeze_time(start + timedelta(seconds=seconds)):
+            hass.states.async_set(entity_id, state, attributes)
+            await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    def _get_aggregates(
+        start: datetime,
+    ) -> dict[str, history.NumericStatesAggregate]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return history.get_numeric_states_aggregates_with_session(
+                hass,
+                session,
+                start,
+                end,
+                [
+                    "sensor.power",
+                    "sensor.text",
+                    "sensor.temperature",
+                    "sensor.not_finite",
+                    "sensor.unknown",
+                ],
+            )
+
+    instance = recorder.get_instance(hass)
+    assert await instance.async_add_executor_job(_get_aggregates, start) == {
+        # The state before start counts from start on, unavailable is skipped
+        "sensor.power": history.NumericStatesAggregate(
+            min=10.0, max=20.0, mean=pytest.approx(16.0), attributes=watts
+        ),
+        # The mean starts at the first state, the attributes changed
+        "sensor.temperature": history.NumericStatesAggregate(
+            min=20.0, max=23.0, mean=pytest.approx(21.5), attributes=None
+        ),
+    }
+    # A state at start which is not numeric is skipped
+    assert await instance.async_add_executor_job(
+        _get_aggregates, start + timedelta(minutes=2)
+    ) == {
+        "sensor.power": history.NumericStatesAggregate(
+            min=20.0, max=20.0, mean=pytest.approx(20.0), attributes=watts
+        ),
+        "sensor.temperature": history.NumericStatesAggregate(
+            min=20.0, max=23.0, mean=pytest.approx(22.0), attributes=None
+        ),
+    }
+
+
 async def test_get_significant_states_without_entity_ids_raises(
     hass: HomeAssistant,
 ) -> None:
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import sqlite3
 import sys
 import threading
+import time
 from typing import Any, cast
 from unittest.mock import MagicMock, Mock, patch
 
@@ -20,6 +21,7 @@ from homeassistant.components import recorder
 from homeassistant.components.recorder import (
     CONF_AUTO_PURGE,
     CONF_AUTO_REPACK,
+    CONF_BULK_WRITE,
     CONF_COMMIT_INTERVAL,
     CONF_DB_MAX_RETRIES,
     CONF_DB_RETRY_WAIT,
@@ -136,6 +138,11 @@ def _default_recorder(hass):
         db_retry_wait=3,
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_event_types=set(),
+        bulk_write=False,
+        downsample_states=False,
+        partition_interval=None,
+        read_uri=None,
+        read_max_lag=10,
     )
 
 
@@ -2184,6 +2191,63 @@ async def test_deduplication_state_attributes_inside_commit_interval(
         assert first_attributes_id == last_attributes_id
 
 
+@pytest.mark.parametrize("recorder_config", [{CONF_BULK_WRITE: True}])
+async def test_bulk_write_states_and_events(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test bulk writes link old states and deduplicate shared rows."""
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+    for entity_id in ("test.one", "test.two"):
+        for state in ("s1", "s2", "s3"):
+            hass.states.async_set(entity_id, f"{entity_id}_{state}", attributes)
+    for _ in range(5):
+        hass.bus.async_fire("this_event", {"de": "dupe"})
+    hass.bus.async_fire("this_event")
+    await async_wait_recording_done(hass)
+    # The next state must be linked to the state written in the previous commit
+    hass.states.async_set("test.one", "test.one_s4", attributes)
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.state,
+                States.attributes_id,
+            ).outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        )
+        assert len(states) == 7
+        states_by_state = {state.state: state for state in states}
+        for entity_id in ("test.one", "test.two"):
+            assert states_by_state[f"{entity_id}_s1"].entity_id == entity_id
+            assert states_by_state[f"{entity_id}_s1"].old_state_id is None
+            assert (
+                states_by_state[f"{entity_id}_s2"].old_state_id
+                == states_by_state[f"{entity_id}_s1"].state_id
+            )
+            assert (
+                states_by_state[f"{entity_id}_s3"].old_state_id
+                == states_by_state[f"{entity_id}_s2"].state_id
+            )
+        assert (
+            states_by_state["test.one_s4"].old_state_id
+            == states_by_state["test.one_s3"].state_id
+        )
+        assert len({state.attributes_id for state in states}) == 1
+        assert session.query(StateAttributes).count() == 1
+
+        events = list(
+            session.query(Events.data_id).filter(
+                Events.event_type_id.in_(select_event_type_ids(("this_event",)))
+            )
+        )
+        assert len(events) == 6
+        assert len({event.data_id for event in events if event.data_id}) == 1
+        assert sum(1 for event in events if event.data_id is None) == 1
+
+
 async def test_async_block_till_done(
     hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
 ) -> None:
@@ -2747,3 +2811,71 @@ async def test_empty_entity_id(
     hass.bus.async_fire("hello", {"entity_id": ""})
     await async_wait_recording_done(hass)
     assert "Invalid entity ID" not in caplog.text
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_read_database(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    recorder_db_url: str,
+) -> None:
+    """Test read database sessions use the read database while it is current."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_DB_READ_URL: recorder_db_url}
+    )
+    assert instance.read_engine is not None
+    assert isinstance(instance.read_engine.pool, QueuePool)
+
+    hass.states.async_set("sensor.test", "1")
+    await async_wait_recording_done(hass)
+
+    def _read_state(read_database: bool = True) -> tuple[bool, str | None]:
+        with session_scope(
+            hass=hass, read_only=True, read_database=read_database
+        ) as session:
+            return (
+                session.get_bind() is instance.read_engine,
+                session.query(States.state).scalar(),
+            )
+
+    instance._read_database_checked_at = 0
+    assert await instance.async_add_executor_job(_read_state) == (True, "1")
+    # Other read only sessions read from the database
+    assert await instance.async_add_executor_job(_read_state, False) == (False, "1")
+
+    def _write_read_database() -> None:
+        with session_scope(session=instance.get_read_session()) as session:
+            session.add(StatesMeta(entity_id="sensor.other"))
+
+    with pytest.raises(OperationalError, match="readonly database"):
+        await instance.async_add_executor_job(_write_read_database)
+
+    # The read database is behind the committed states
+    instance._committed_states_ts = dt_util.utcnow().timestamp() + 3600
+    instance._read_database_checked_at = 0
+    assert await instance.async_add_executor_job(_read_state) == (False, "1")
+
+    # The read database is behind the committed short term statistics
+    instance._committed_states_ts = None
+    future_ts = dt_util.utcnow().timestamp() + 3600
+    instance._committed_statistics = (future_ts, time.monotonic())
+    instance._read_database_checked_at = 0
+    assert await instance.async_add_executor_job(_read_state) == (True, "1")
+    instance._committed_statistics = (future_ts, time.monotonic() - 60)
+    instance._read_database_checked_at = 0
+    assert await instance.async_add_executor_job(_read_state) == (False, "1")
+
+
+async def test_read_database_in_memory(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test an in memory read database is not used."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_DB_READ_URL: "sqlite://"}
+    )
+    assert instance.read_engine is None
+    assert "An in memory database can not be used as db_read_url" in caplog.text
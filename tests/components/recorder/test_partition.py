@@ -0,0 +1,194 @@
+"""The tests for the partitions of the recorder tables."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.db_schema import States
+from homeassistant.components.recorder.partition import (
+    Partition,
+    drop_partition_statement,
+    find_expired_partitions,
+    mysql_partition_table_statements,
+    mysql_partitions,
+    mysql_split_future_partition_statements,
+    partition_name,
+    postgresql_partition_table_statements,
+    postgresql_partitions,
+    postgresql_split_future_partition_statements,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def test_partition_name_and_end() -> None:
+    """Test the end of a partition is parsed from its name."""
+    end = datetime(2024, 5, 6, 4, 13, tzinfo=dt_util.UTC)
+    assert partition_name(end) == "p202405060413"
+    assert Partition("p202405060413", None, 100).end == end
+    assert Partition("p_future", 100, None).end is None
+
+
+def test_mysql_partitions() -> None:
+    """Test the bounds of MySQL partitions are chained."""
+    assert mysql_partitions(
+        [("p202405060413", "100"), ("p202405070412", "250"), ("p_future", "MAXVALUE")]
+    ) == [
+        Partition("p202405060413", None, 100),
+        Partition("p202405070412", 100, 250),
+        Partition("p_future", 250, None),
+    ]
+
+
+def test_postgresql_partitions(caplog: pytest.LogCaptureFixture) -> None:
+    """Test the bounds of PostgreSQL partitions are parsed and ordered."""
+    assert postgresql_partitions(
+        "states",
+        [
+            ("states_p_future", "FOR VALUES FROM ('250') TO (MAXVALUE)"),
+            ("states_p202405070412", "FOR VALUES FROM ('100') TO ('250')"),
+            ("states_p202405060413", "FOR VALUES FROM (MINVALUE) TO ('100')"),
+            ("other", "FOR VALUES FROM ('1') TO ('2')"),
+        ],
+    ) == [
+        Partition("p202405060413", None, 100),
+        Partition("p202405070412", 100, 250),
+        Partition("p_future", 250, None),
+    ]
+    assert "Ignoring unknown partition other of states" in caplog.text
+
+
+def test_find_expired_partitions() -> None:
+    """Test only partitions written before the cutoff are expired."""
+    partitions = [
+        Partition("p202405060413", None, 100),
+        Partition("p202405070412", 100, 250),
+        Partition("p_future", 250, None),
+    ]
+    assert (
+        find_expired_partitions(
+            partitions, datetime(2024, 5, 6, 4, 12, tzinfo=dt_util.UTC)
+        )
+        == []
+    )
+    assert find_expired_partitions(
+        partitions, datetime(2024, 5, 7, 0, 0, tzinfo=dt_util.UTC)
+    ) == [partitions[0]]
+    assert (
+        find_expired_partitions(
+            partitions, datetime(2024, 5, 9, 0, 0, tzinfo=dt_util.UTC)
+        )
+        == partitions[:2]
+    )
+
+
+def test_mysql_statements() -> None:
+    """Test the statements to maintain the MySQL partitions."""
+    assert mysql_partition_table_statements(
+        "states", "state_id", "p202405060413", 100
+    ) == [
+        "ALTER TABLE states PARTITION BY RANGE (state_id) ("
+        "PARTITION p202405060413 VALUES LESS THAN (100), "
+        "PARTITION p_future VALUES LESS THAN MAXVALUE)"
+    ]
+    assert mysql_split_future_partition_statements("states", "p202405070412", 250) == [
+        "ALTER TABLE states REORGANIZE PARTITION p_future INTO ("
+        "PARTITION p202405070412 VALUES LESS THAN (250), "
+        "PARTITION p_future VALUES LESS THAN MAXVALUE)"
+    ]
+    assert (
+        drop_partition_statement(
+            SupportedDialect.MYSQL, "states", Partition("p202405060413", None, 100)
+        )
+        == "ALTER TABLE states DROP PARTITION p202405060413"
+    )
+
+
+def test_postgresql_statements() -> None:
+    """Test the statements to maintain the PostgreSQL partitions."""
+    assert postgresql_partition_table_statements(
+        "events",
+        "event_id",
+        "p202405060413",
+        100,
+        "events_pkey",
+        ["ix_events_time_fired_ts"],
+    ) == [
+        "ALTER TABLE events RENAME TO events_p202405060413",
+        "ALTER TABLE events_p202405060413 RENAME CONSTRAINT events_pkey"
+        " TO events_p202405060413_pkey",
+        "ALTER INDEX ix_events_time_fired_ts"
+        " RENAME TO events_p202405060413_ix_events_time_fired_ts",
+        "ALTER TABLE events_p202405060413 ALTER COLUMN event_id"
+        " DROP IDENTITY IF EXISTS",
+        "ALTER TABLE events_p202405060413 ALTER COLUMN event_id DROP DEFAULT",
+        "CREATE TABLE events (LIKE events_p202405060413"
+        " INCLUDING DEFAULTS INCLUDING STORAGE) PARTITION BY RANGE (event_id)",
+        "CREATE SEQUENCE events_event_id_partitioned_seq START WITH 100"
+        " OWNED BY events.event_id",
+        "ALTER TABLE events ALTER COLUMN event_id"
+        " SET DEFAULT nextval('events_event_id_partitioned_seq')",
+        "ALTER TABLE events ATTACH PARTITION events_p202405060413"
+        " FOR VALUES FROM (MINVALUE) TO (100)",
+        "CREATE TABLE events_p_future PARTITION OF events"
+        " FOR VALUES FROM (100) TO (MAXVALUE)",
+        "ALTER TABLE events ADD PRIMARY KEY (event_id)",
+    ]
+    assert postgresql_split_future_partition_statements(
+        "events", "p202405070412", 100, 250
+    ) == [
+        "ALTER TABLE events DETACH PARTITION events_p_future",
+        "ALTER TABLE events_p_future RENAME TO events_p202405070412",
+        "ALTER TABLE events ATTACH PARTITION events_p202405070412"
+        " FOR VALUES FROM (100) TO (250)",
+        "CREATE TABLE events_p_future PARTITION OF events"
+        " FOR VALUES FROM (250) TO (MAXVALUE)",
+    ]
+    assert (
+        drop_partition_statement(
+            SupportedDialect.POSTGRESQL,
+            "events",
+            Partition("p202405060413", None, 100),
+        )
+        == "DROP TABLE events_p202405060413"
+    )
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_partition_interval_unsupported(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test SQLite keeps purging row by row when partitions are configured."""
+    instance = await async_setup_recorder_instance(hass, {"partition_interval": "day"})
+    await async_wait_recording_done(hass)
+    assert instance.partition_interval == "day"
+    assert (
+        "Partitioning the states and events tables is not supported with sqlite"
+        in caplog.text
+    )
+
+    hass.states.async_set("sensor.test", "1")
+    await async_wait_recording_done(hass)
+
+    assert purge_old_data(
+        instance, dt_util.utcnow() + timedelta(minutes=1), repack=False
+    )
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.query(States).count() == 0
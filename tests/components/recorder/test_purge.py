@@ -12,9 +12,15 @@ from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 from voluptuous.error import MultipleInvalid
 
-from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder
+from homeassistant.components.recorder import (
+    DOMAIN as RECORDER_DOMAIN,
+    Recorder,
+    migration,
+)
 from homeassistant.components.recorder.const import SupportedDialect
 from homeassistant.components.recorder.db_schema import (
+    SCHEMA_VERSION,
+    EventData,
     Events,
     EventTypes,
     RecorderRuns,
@@ -26,13 +32,19 @@ from homeassistant.components.recorder.db_schema import (
 )
 from homeassistant.components.recorder.history import get_significant_states
 from homeassistant.components.recorder.purge import purge_old_data
-from homeassistant.components.recorder.queries import select_event_type_ids
+from homeassistant.components.recorder.queries import (
+    get_migration_changes,
+    select_event_type_ids,
+)
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
 )
 from homeassistant.components.recorder.tasks import PurgeTask
-from homeassistant.components.recorder.util import session_scope
+from homeassistant.components.recorder.util import (
+    execute_stmt_lambda_element,
+    session_scope,
+)
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_THEMES_UPDATED, STATE_ON
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
@@ -2063,3 +2075,152 @@ async def test_purge_entities_keep_days(
     )
     assert len(states["sensor.keep"]) == 2
     assert "sensor.purge" not in states
+
+
+def _get_ref_counts(
+    hass: HomeAssistant,
+) -> tuple[dict[str, int | None], dict[str, int | None]]:
+    """Return the ref_count of the state attributes and test event data rows."""
+    with session_scope(hass=hass) as session:
+        return (
+            {
+                row.shared_attrs: row.ref_count
+                for row in session.query(StateAttributes).all()
+            },
+            {
+                row.shared_data: row.ref_count
+                for row in session.query(EventData)
+                .filter(EventData.shared_data.contains("test_attr_10"))
+                .all()
+            },
+        )
+
+
+async def test_purge_with_ref_counts(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the ref counts are used to find the unused shared rows."""
+    await _add_test_states(hass)
+    await _add_test_events(hass)
+
+    state_ref_counts, event_ref_counts = _get_ref_counts(hass)
+    assert sorted(state_ref_counts.values()) == [2, 2, 2]
+    assert list(event_ref_counts.values()) == [6]
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with (
+        patch(
+            "homeassistant.components.recorder.purge.attributes_ids_exist_in_states_with_fast_in_distinct",
+            side_effect=AssertionError,
+        ),
+        patch(
+            "homeassistant.components.recorder.purge.data_ids_exist_in_events_with_fast_in_distinct",
+            side_effect=AssertionError,
+        ),
+    ):
+        assert purge_old_data(recorder_mock, purge_before, repack=False)
+
+    state_ref_counts, event_ref_counts = _get_ref_counts(hass)
+    assert list(state_ref_counts.values()) == [2]
+    assert "dontpurgeme" in next(iter(state_ref_counts))
+    assert list(event_ref_counts.values()) == [2]
+
+    # New references to existing rows are counted
+    await _add_test_events(hass)
+    assert list(_get_ref_counts(hass)[1].values()) == [8]
+
+
+async def test_purge_uncounted_shared_rows(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test shared rows that have not been counted yet are still purged."""
+    await _add_test_states(hass)
+    with session_scope(hass=hass) as session:
+        session.query(StateAttributes).update({StateAttributes.ref_count: None})
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    assert purge_old_data(recorder_mock, purge_before, repack=False)
+
+    state_ref_counts, _ = _get_ref_counts(hass)
+    assert list(state_ref_counts.values()) == [None]
+    assert "dontpurgeme" in next(iter(state_ref_counts))
+
+
+async def test_ref_count_migration(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the ref counts of existing rows are counted by the run time migration."""
+    await _add_test_states(hass)
+    await _add_test_events(hass)
+    with session_scope(hass=hass) as session:
+        session.query(StateAttributes).update({StateAttributes.ref_count: None})
+        session.query(EventData).update({EventData.ref_count: None})
+    assert sorted(_get_ref_counts(hass)[0].values(), key=str) == [None] * 3
+
+    for migrator_cls in (
+        migration.StateAttributesRefCountMigration,
+        migration.EventDataRefCountMigration,
+    ):
+        migrator = migrator_cls(SCHEMA_VERSION, {})
+        with patch.object(recorder_mock, "max_bind_vars", 2):
+            while not await recorder_mock.async_add_executor_job(
+                migrator.migrate_data, recorder_mock
+            ):
+                pass
+
+    state_ref_counts, event_ref_counts = _get_ref_counts(hass)
+    assert sorted(state_ref_counts.values()) == [2, 2, 2]
+    assert list(event_ref_counts.values()) == [6]
+
+    with session_scope(hass=hass) as session:
+        migration_changes = dict(
+            execute_stmt_lambda_element(session, get_migration_changes())
+        )
+    assert migration_changes[migration.StateAttributesRefCountMigration.migration_id]
+    assert migration_changes[migration.EventDataRefCountMigration.migration_id]
+
+
+async def test_purge_time_budget(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test purging in time budgeted slices and the purge progress."""
+    for _ in range(12):
+        await _add_test_states(hass, wait_recording_done=False)
+    await async_wait_recording_done(hass)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+
+    with (
+        patch.object(recorder_mock, "max_bind_vars", 6),
+        patch.object(recorder_mock.database_engine, "max_bind_vars", 6),
+    ):
+        # Only one batch is purged when the budget is used up
+        assert not purge_old_data(
+            recorder_mock, purge_before, repack=False, time_budget=0
+        )
+        with session_scope(hass=hass) as session:
+            assert session.query(States).count() == 66
+
+        progress = recorder_mock.purge_progress
+        assert progress.purge_before == purge_before
+        assert progress.rows == 6
+        assert not progress.done
+        assert 0 <= progress.fraction < 1
+        assert progress.rows_per_second > 0
+
+        slices = 1
+        while not purge_old_data(
+            recorder_mock, purge_before, repack=False, time_budget=0
+        ):
+            slices += 1
+
+    assert slices >= 8
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 24
+        assert session.query(StateAttributes).count() == 1
+    assert recorder_mock.purge_progress is progress
+    assert progress.rows == 48
+    assert progress.done
+    assert progress.fraction == 1.0
+
+    # A new purge starts a new progress
+    purge_old_data(recorder_mock, dt_util.utcnow(), repack=False)
+    assert recorder_mock.purge_progress is not progress
+    assert recorder_mock.purge_progress.purge_before > purge_before
@@ -1,6 +1,7 @@
 """The tests for sensor recorder platform."""
 
-from datetime import timedelta
+from datetime import datetime, timedelta
+import threading
 from typing import Any
 from unittest.mock import ANY, Mock, patch
 
@@ -9,7 +10,16 @@ from sqlalchemy import select
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder.db_schema import (
+    SCHEMA_VERSION,
+    StatisticsDay,
+    StatisticsMonth,
+    StatisticsShortTerm,
+)
+from homeassistant.components.recorder.migration import (
+    MigrationTask,
+    StatisticsRollupMigration,
+)
 from homeassistant.components.recorder.models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
@@ -30,8 +40,10 @@ from homeassistant.components.recorder.statistics import (
     get_metadata_with_session,
     get_short_term_statistics_run_cache,
     list_statistic_ids,
+    statistic_during_period,
     validate_statistics,
 )
+from homeassistant.components.recorder.statistics_cache import StatisticsResultCache
 from homeassistant.components.recorder.table_managers.statistics_meta import (
     _generate_get_metadata_stmt,
 )
@@ -2554,6 +2566,69 @@ async def test_recorder_platform_with_statistics(
     recorder_platform.validate_statistics.assert_called_once_with(hass)
 
 
+async def test_recorder_platform_compiles_in_executor(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test platforms compile off the recorder thread and the rows are inserted."""
+    instance = recorder.get_instance(hass)
+    compile_thread_ids: list[int] = []
+    compile_binds: list[Any] = []
+
+    def _mock_compile_statistics(
+        hass: HomeAssistant, session: Any, start: datetime, end: datetime
+    ) -> PlatformCompiledStatistics:
+        compile_thread_ids.append(threading.get_ident())
+        compile_binds.append(session.get_bind())
+        return PlatformCompiledStatistics(
+            [
+                {
+                    "meta": {
+                        "has_mean": True,
+                        "has_sum": False,
+                        "name": None,
+                        "source": "recorder",
+                        "statistic_id": "sensor.test1",
+                        "unit_of_measurement": "°C",
+                    },
+                    "stat": {"start": start, "mean": 1.0, "min": 0.5, "max": 2.0},
+                }
+            ],
+            {},
+        )
+
+    await _setup_mock_domain(
+        hass,
+        Mock(compile_statistics=_mock_compile_statistics, spec=["compile_statistics"]),
+    )
+    await async_recorder_block_till_done(hass)
+
+    zero = get_start_time(dt_util.utcnow())
+    # The platforms read the primary database, the read database may lag
+    with patch.object(instance, "get_read_session", side_effect=AssertionError):
+        do_adhoc_statistics(hass, start=zero)
+        await async_wait_recording_done(hass)
+
+    assert len(compile_thread_ids) == 1
+    assert compile_thread_ids[0] != instance.thread_id
+    assert compile_binds == [instance.engine]
+    stats = statistics_during_period(hass, zero, period="5minute")
+    assert stats == {
+        "sensor.test1": [
+            {
+                "start": zero.timestamp(),
+                "end": (zero + timedelta(minutes=5)).timestamp(),
+                "mean": 1.0,
+                "min": 0.5,
+                "max": 2.0,
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            }
+        ]
+    }
+
+
 async def test_recorder_platform_without_statistics(
     hass: HomeAssistant,
     setup_recorder: None,
@@ -2636,3 +2711,368 @@ async def test_recorder_platform_with_partial_statistics_support(
 
     for meth in supported_methods:
         getattr(recorder_platform, meth).assert_called_once()
+
+
+@pytest.mark.parametrize("timezone", ["Europe/Vienna", "UTC"])
+@pytest.mark.freeze_time("2021-11-05 12:00:00+00:00")
+async def test_statistics_rollups(
+    hass: HomeAssistant,
+    setup_recorder: None,
+    timezone: str,
+) -> None:
+    """Test daily, weekly and monthly statistics are read from the rollups."""
+    await hass.config.async_set_time_zone(timezone)
+    instance = recorder.get_instance(hass)
+    await async_wait_recording_done(hass)
+    assert instance.statistics_rollups_ready
+
+    zero = dt_util.as_utc(dt_util.parse_datetime("2021-09-29 00:00:00"))
+    external_statistics = [
+        {
+            "start": zero + timedelta(hours=hours),
+            "last_reset": None,
+            "mean": hours % 7,
+            "min": hours % 7 - 1,
+            "max": hours % 7 + 1,
+            "state": hours,
+            "sum": hours * 2,
+        }
+        # Every 5 hours from September into the incomplete November
+        for hours in range(0, 38 * 24, 5)
+    ]
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+
+    def _rollup_rows() -> dict[str, list[tuple[float, float, float]]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return {
+                table.__tablename__: [
+                    (row.start_ts, row.mean, row.sum)
+                    for row in session.query(table).order_by(table.start_ts)
+                ]
+                for table in (StatisticsDay, StatisticsMonth)
+            }
+
+    rollup_rows = _rollup_rows()
+    # The days until November 5 and the months until November are complete
+    assert len(rollup_rows["statistics_day"]) == 37
+    assert len(rollup_rows["statistics_month"]) == 2
+
+    def _assert_rollups_match_hourly_statistics() -> None:
+        for period, types in (
+            ("day", {"last_reset", "max", "mean", "min", "state", "sum"}),
+            ("week", {"change", "max", "min", "state", "sum"}),
+            ("month", {"change", "max", "mean", "min", "state", "sum"}),
+        ):
+            stats = statistics_during_period(
+                hass,
+                zero + timedelta(days=1),
+                dt_util.utcnow(),
+                period=period,
+                statistic_ids={"test:total_energy_import"},
+                types=types,
+            )
+            instance.statistics_rollups_ready = False
+            assert stats == statistics_during_period(
+                hass,
+                zero + timedelta(days=1),
+                dt_util.utcnow(),
+                period=period,
+                statistic_ids={"test:total_energy_import"},
+                types=types,
+            )
+            instance.statistics_rollups_ready = True
+
+    _assert_rollups_match_hourly_statistics()
+
+    # Adjusting the sum shifts the rollups after the adjusted hour
+    instance.async_adjust_statistics(
+        "test:total_energy_import",
+        dt_util.as_utc(dt_util.parse_datetime("2021-10-10 12:00:00")),
+        1000,
+        "kWh",
+    )
+    await async_wait_recording_done(hass)
+    assert _rollup_rows() != rollup_rows
+    _assert_rollups_match_hourly_statistics()
+
+    # The rollups are backfilled from the hourly statistics
+    rollup_rows = _rollup_rows()
+    with session_scope(hass=hass) as session:
+        session.query(StatisticsDay).delete()
+        session.query(StatisticsMonth).delete()
+    instance.statistics_rollups_ready = False
+    instance.queue_task(MigrationTask(StatisticsRollupMigration(SCHEMA_VERSION, {})))
+    # One month is rolled up per task
+    for _ in range(4):
+        await async_wait_recording_done(hass)
+    assert instance.statistics_rollups_ready
+    assert _rollup_rows() == rollup_rows
+
+
+@pytest.mark.parametrize("timezone", ["Europe/Vienna", "UTC"])
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [
+        ("2021-10-03 13:00:00", "2021-10-20 07:00:00"),
+        ("2021-09-15 05:00:00", "2021-10-20 07:00:00"),
+        ("2021-09-15 05:00:00", None),
+        ("2021-10-01 00:00:00", "2021-10-20 07:00:00"),
+        ("2021-10-03 13:00:00", "2021-10-04 00:00:00"),
+        ("2021-10-03 13:00:00", "2021-10-03 18:00:00"),
+    ],
+)
+@pytest.mark.freeze_time("2021-11-05 12:00:00+00:00")
+async def test_statistics_rollups_unaligned_period(
+    hass: HomeAssistant,
+    setup_recorder: None,
+    timezone: str,
+    start: str,
+    end: str | None,
+) -> None:
+    """Test the rollups are only read for periods within the requested period."""
+    await hass.config.async_set_time_zone(timezone)
+    instance = recorder.get_instance(hass)
+    await async_wait_recording_done(hass)
+    assert instance.statistics_rollups_ready
+
+    zero = dt_util.as_utc(dt_util.parse_datetime("2021-09-29 00:00:00"))
+    external_statistics = [
+        {
+            "start": zero + timedelta(hours=hours),
+            "last_reset": None,
+            "mean": hours % 7,
+            "min": hours % 7 - 1,
+            "max": hours % 7 + 1,
+            "state": hours,
+            "sum": hours * 2,
+        }
+        for hours in range(-20 * 24, 38 * 24, 5)
+    ]
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+
+    start_time = dt_util.as_utc(dt_util.parse_datetime(start))
+    end_time = dt_util.as_utc(dt_util.parse_datetime(end)) if end else None
+    statistic_ids = {"test:total_energy_import"}
+
+    def _query(
+        period: str, types: set[str], rollups: bool
+    ) -> dict[str, list[dict[str, Any]]]:
+        instance.statistics_rollups_ready = rollups
+        with session_scope(hass=hass, read_only=True) as session:
+            metadata = instance.statistics_meta_manager.get_many(
+                session, statistic_ids=statistic_ids
+            )
+            return statistics._query_statistics_during_period(
+                hass,
+                session,
+                start_time,
+                end_time,
+                statistic_ids,
+                metadata,
+                [metadata_id for metadata_id, _ in metadata.values()],
+                period,
+                None,
+                types,
+                types,
+            )
+
+    for period, types in (
+        ("day", {"last_reset", "max", "mean", "min", "state", "sum"}),
+        ("week", {"max", "min", "state", "sum"}),
+        ("month", {"max", "mean", "min", "state", "sum"}),
+    ):
+        stats = await instance.async_add_executor_job(_query, period, types, True)
+        assert stats
+        assert stats == await instance.async_add_executor_job(
+            _query, period, types, False
+        )
+    instance.statistics_rollups_ready = True
+
+
+@pytest.mark.freeze_time("2021-11-05 12:00:00+00:00")
+async def test_statistics_result_cache(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test the results of compiled periods are cached until they change."""
+    instance = recorder.get_instance(hass)
+    cache = instance.statistics_result_cache
+    await async_wait_recording_done(hass)
+
+    zero = dt_util.as_utc(dt_util.parse_datetime("2021-10-01 00:00:00"))
+    external_statistics = [
+        {
+            "start": zero + timedelta(hours=hours),
+            "last_reset": None,
+            "state": hours,
+            "sum": hours,
+        }
+        for hours in range(6)
+    ]
+    external_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+
+    def _sums(end_time: datetime | None = zero + timedelta(hours=6)) -> list[float]:
+        stats = statistics_during_period(
+            hass,
+            zero,
+            end_time,
+            statistic_ids={"test:total_energy_import"},
+            period="hour",
+            types={"sum"},
+        )
+        return [row["sum"] for row in stats["test:total_energy_import"]]
+
+    def _change() -> float:
+        return statistic_during_period(
+            hass,
+            zero,
+            zero + timedelta(hours=6),
+            "test:total_energy_import",
+            {"change"},
+            None,
+        )["change"]
+
+    assert _sums() == [0, 1, 2, 3, 4, 5]
+    assert _change() == 5
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    # Modifying a result does not modify the cache
+    stats = statistics_during_period(
+        hass,
+        zero,
+        zero + timedelta(hours=6),
+        statistic_ids={"test:total_energy_import"},
+        period="hour",
+        types={"sum"},
+    )
+    stats["test:total_energy_import"][0]["sum"] = 100
+    assert _sums() == [0, 1, 2, 3, 4, 5]
+    assert _change() == 5
+    assert (cache.hits, cache.misses) == (3, 2)
+
+    # Periods which are not compiled are not cached
+    assert _sums(None) == [0, 1, 2, 3, 4, 5]
+    assert (cache.hits, cache.misses) == (3, 2)
+
+    # Importing invalidates the results from the imported hour
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [{"start": zero + timedelta(hours=4), "state": 4, "sum": 14}],
+    )
+    await async_wait_recording_done(hass)
+    assert _sums() == [0, 1, 2, 3, 14, 5]
+    assert _change() == 5
+    assert (cache.hits, cache.misses) == (3, 4)
+
+    # Adjusting invalidates the results from the adjusted hour
+    instance.async_adjust_statistics(
+        "test:total_energy_import", zero + timedelta(hours=5), 10, "kWh"
+    )
+    await async_wait_recording_done(hass)
+    assert _sums() == [0, 1, 2, 3, 14, 15]
+    assert _change() == 15
+    assert (cache.hits, cache.misses) == (3, 6)
+
+    # Clearing the statistics drops their results
+    assert cache.size > 0
+    instance.async_clear_statistics(["test:total_energy_import"])
+    await async_wait_recording_done(hass)
+    assert cache.size == 0
+
+
+def test_statistics_result_cache_generation() -> None:
+    """Test results are not cached if invalidated while they are read."""
+    cache = StatisticsResultCache(1024)
+
+    generation = cache.generation
+    cache.invalidate([1], 0)
+    cache.set("invalidated", (1, 2), 0, {}, 1, generation)
+    cache.set("other", (2,), 0, {}, 1, generation)
+    assert cache.get("invalidated") is None
+    assert cache.get("other") == {}
+
+    generation = cache.generation
+    cache.set("current", (1, 2), 0, {}, 1, generation)
+    assert cache.get("current") == {}
+
+    cache.invalidate(None, 0)
+    cache.set("all_invalidated", (3,), 0, {}, 1, generation)
+    assert cache.get("all_invalidated") is None
+
+
+@pytest.mark.freeze_time("2021-11-05 12:00:00+00:00")
+async def test_statistics_result_cache_read_database(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test results read from the read database are not cached."""
+    instance = recorder.get_instance(hass)
+    cache = instance.statistics_result_cache
+    await async_wait_recording_done(hass)
+
+    zero = dt_util.as_utc(dt_util.parse_datetime("2021-10-01 00:00:00"))
+    external_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [
+            {"start": zero + timedelta(hours=hours), "state": hours, "sum": hours}
+            for hours in range(6)
+        ],
+    )
+    await async_wait_recording_done(hass)
+
+    def _query() -> None:
+        with session_scope(hass=hass, read_only=True) as session:
+            statistics._statistics_during_period_with_session(
+                hass,
+                session,
+                zero,
+                zero + timedelta(hours=6),
+                {"test:total_energy_import"},
+                "hour",
+                None,
+                {"sum"},
+            )
+
+    with patch.object(instance, "read_engine", instance.engine):
+        await instance.async_add_executor_job(_query)
+    assert cache.size == 0
+
+    await instance.async_add_executor_job(_query)
+    assert cache.size > 0
@@ -1,13 +1,16 @@
 """Test recorder system health."""
 
+from datetime import timedelta
 from unittest.mock import ANY, Mock, patch
 
 import pytest
 
 from homeassistant.components.recorder import Recorder, get_instance
 from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.purge import PurgeProgress
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 
 from .common import async_wait_recording_done
 
@@ -38,6 +41,54 @@ async def test_recorder_system_health(
     }
 
 
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_recorder_system_health_purge_progress(
+    recorder_mock: Recorder, hass: HomeAssistant, recorder_db_url: str
+) -> None:
+    """Test recorder system health includes the progress of the last purge."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    purge_before = dt_util.utcnow() - timedelta(days=1)
+    instance = get_instance(hass)
+    instance.purge_progress = PurgeProgress(
+        purge_before,
+        purge_before.timestamp() - 400,
+        purge_before.timestamp() - 100,
+        rows=500,
+        duration=2.0,
+    )
+
+    info = await get_system_health_info(hass, "recorder")
+    assert info == {
+        "current_recorder_run": instance.recorder_runs_manager.current.start,
+        "oldest_recorder_run": instance.recorder_runs_manager.first.start,
+        "estimated_db_size": ANY,
+        "database_engine": SupportedDialect.SQLITE.value,
+        "database_version": ANY,
+        "purge_progress": "75%",
+        "purge_rows_per_second": "250",
+    }
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_recorder_system_health_statistics_cache(
+    recorder_mock: Recorder, hass: HomeAssistant, recorder_db_url: str
+) -> None:
+    """Test recorder system health includes the statistics cache hit rate."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    cache = get_instance(hass).statistics_result_cache
+    cache.set("cached", (1,), 0, {}, 1024 * 1024, cache.generation)
+    assert cache.get("cached") == {}
+    assert cache.get("not_cached") is None
+
+    info = await get_system_health_info(hass, "recorder")
+    assert info["statistics_cache_hit_rate"] == "50%"
+    assert info["statistics_cache_size"] == "1.00 MiB"
+
+
 @pytest.mark.parametrize(
     "db_engine", [SupportedDialect.MYSQL, SupportedDialect.POSTGRESQL]
 )
@@ -2344,6 +2344,65 @@ async def test_compile_hourly_statistics_unavailable(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+async def test_compile_hourly_statistics_aggregated(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the database aggregates the sensors which kept their attributes.
+
+    sensor.test1 is compiled from the aggregates of the database
+    sensor.test2 changed its attributes and is compiled from its states
+    """
+    zero = get_start_time(dt_util.utcnow())
+    await async_setup_component(hass, "sensor", {})
+    # Wait for the sensor recorder platform to be added
+    await async_recorder_block_till_done(hass)
+    attributes = {
+        "device_class": "power",
+        "state_class": "measurement",
+        "unit_of_measurement": "W",
+    }
+    with freeze_time(zero) as freezer:
+        four, _ = await async_record_states(
+            hass, freezer, zero, "sensor.test1", attributes
+        )
+        await async_record_states(hass, freezer, zero, "sensor.test2", attributes)
+        freezer.move_to(four - timedelta(seconds=1))
+        hass.states.async_set(
+            "sensor.test2", "30", {**attributes, ATTR_FRIENDLY_NAME: "Test 2"}
+        )
+    await async_wait_recording_done(hass)
+
+    with patch(
+        "homeassistant.components.recorder.history.get_full_significant_states_with_session",
+        wraps=history.get_full_significant_states_with_session,
+    ) as get_states_mock:
+        do_adhoc_statistics(hass, start=zero)
+        await async_wait_recording_done(hass)
+    fetched_entity_ids = {
+        entity_id
+        for call in get_states_mock.mock_calls
+        for entity_id in call.kwargs["entity_ids"]
+    }
+    assert fetched_entity_ids == {"sensor.test2"}
+
+    stats = statistics_during_period(hass, zero, period="5minute")
+    expected_stats = [
+        {
+            "start": process_timestamp(zero).timestamp(),
+            "end": process_timestamp(zero + timedelta(minutes=5)).timestamp(),
+            "mean": pytest.approx(13.050847),
+            "min": pytest.approx(-10.0),
+            "max": pytest.approx(30.0),
+            "last_reset": None,
+            "state": None,
+            "sum": None,
+        }
+    ]
+    assert stats == {"sensor.test1": expected_stats, "sensor.test2": expected_stats}
+    assert "Error while processing event StatisticsTask" not in caplog.text
+
+
 async def test_compile_hourly_statistics_fails(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
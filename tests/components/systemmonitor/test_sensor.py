@@ -17,6 +17,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.loop_monitor import DATA_LOOP_MONITOR, LoopMonitor
 
 from tests.common import MockConfigEntry, async_fire_time_changed
 
@@ -504,3 +505,40 @@ async def test_remove_obsolete_entities(
         entity_registry.async_get("sensor.systemmonitor_network_out_veth54321")
         is not None
     )
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_loop_lag_sensors(
+    hass: HomeAssistant,
+    mock_psutil: Mock,
+    mock_os: Mock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the event loop lag sensors."""
+    monitor = LoopMonitor(hass)
+    monitor.lags.extend(idx / 1000 for idx in range(1, 101))
+    hass.data[DATA_LOOP_MONITOR] = monitor
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    lag_sensor = hass.states.get("sensor.system_monitor_event_loop_lag_median")
+    assert lag_sensor.state == "50.0"
+    assert lag_sensor.attributes["unit_of_measurement"] == "ms"
+    assert (
+        hass.states.get("sensor.system_monitor_event_loop_lag_95th_percentile").state
+        == "95.0"
+    )
+    assert (
+        hass.states.get("sensor.system_monitor_event_loop_lag_99th_percentile").state
+        == "99.0"
+    )
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_loop_lag_sensors_not_loaded_without_monitor(
+    hass: HomeAssistant,
+    mock_added_config_entry: ConfigEntry,
+) -> None:
+    """Test the event loop lag sensors are not loaded if the loop is not monitored."""
+    assert hass.states.get("sensor.system_monitor_event_loop_lag_median") is None
@@ -2,6 +2,7 @@
 
 import asyncio
 from copy import deepcopy
+from datetime import timedelta
 import logging
 from typing import Any
 from unittest.mock import ANY, AsyncMock, Mock, patch
@@ -10,6 +11,7 @@ import pytest
 import voluptuous as vol
 
 from homeassistant import loader
+from homeassistant.auth.permissions import PermissionLookup, PolicyPermissions
 from homeassistant.components.device_automation import toggle_entity
 from homeassistant.components.websocket_api import const
 from homeassistant.components.websocket_api.auth import (
@@ -17,16 +19,21 @@ from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH_OK,
     TYPE_AUTH_REQUIRED,
 )
-from homeassistant.components.websocket_api.const import FEATURE_COALESCE_MESSAGES, URL
+from homeassistant.components.websocket_api.const import (
+    FEATURE_COALESCE_MESSAGES,
+    FEATURE_ENTITY_UPDATE_INTERVAL,
+    URL,
+)
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
+from homeassistant.const import EVENT_STATE_CHANGED, SIGNAL_BOOTSTRAP_INTEGRATIONS
 from homeassistant.core import Context, HomeAssistant, State, SupportsResponse, callback
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 from homeassistant.util.json import json_loads
 
 from tests.common import (
@@ -34,6 +41,7 @@ from tests.common import (
     MockEntity,
     MockEntityPlatform,
     MockUser,
+    async_fire_time_changed,
     async_mock_service,
     mock_platform,
 )
@@ -1262,6 +1270,271 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_shared_listener(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test subscribe entities shares one listener between the connections."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hallway", "off")
+    listeners_before = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    all_client = await hass_ws_client(hass)
+    kitchen_client = await hass_ws_client(hass)
+    await all_client.send_json_auto_id({"type": "subscribe_entities"})
+    await kitchen_client.send_json_auto_id(
+        {"type": "subscribe_entities", "entity_ids": ["light.kitchen"]}
+    )
+    for client in (all_client, kitchen_client):
+        msg = await client.receive_json()
+        assert msg["success"]
+        msg = await client.receive_json()
+        assert msg["type"] == "event"
+
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners_before + 1
+
+    hass.states.async_set("light.hallway", "on")
+    hass.states.async_set("light.kitchen", "on")
+    msg = await all_client.receive_json()
+    assert list(msg["event"]["c"]) == ["light.hallway"]
+    msg = await all_client.receive_json()
+    assert list(msg["event"]["c"]) == ["light.kitchen"]
+    msg = await kitchen_client.receive_json()
+    assert list(msg["event"]["c"]) == ["light.kitchen"]
+
+    # The permissions are checked again when they change
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.hallway": True}}})
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hallway", "off")
+    msg = await all_client.receive_json()
+    assert list(msg["event"]["c"]) == ["light.hallway"]
+
+    # The listener is kept to record the changes for resuming clients
+    await all_client.close()
+    await kitchen_client.close()
+    await hass.async_block_till_done()
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners_before + 1
+
+
+async def test_subscribe_entities_device_permissions(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    hass_admin_user: MockUser,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test the permissions by device follow the entity to another device."""
+    config_entry = MockConfigEntry(domain="test")
+    config_entry.add_to_hass(hass)
+    allowed_device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        connections={(dr.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+    )
+    other_device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        connections={(dr.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:00")},
+    )
+    entity_entry = entity_registry.async_get_or_create(
+        "light", "test", "kitchen", device_id=allowed_device.id
+    )
+    hass_admin_user.groups = []
+    hass_admin_user.permissions = PolicyPermissions(
+        {"entities": {"device_ids": {allowed_device.id: True}}},
+        PermissionLookup(entity_registry, device_registry),
+    )
+    hass.states.async_set(entity_entry.entity_id, "off")
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "subscribe_entities"})
+    msg = await client.receive_json()
+    assert msg["success"]
+    msg = await client.receive_json()
+    assert list(msg["event"]["a"]) == [entity_entry.entity_id]
+
+    hass.states.async_set(entity_entry.entity_id, "on")
+    msg = await client.receive_json()
+    assert list(msg["event"]["c"]) == [entity_entry.entity_id]
+
+    # Moving the entity to another device drops the cached permission
+    entity_registry.async_update_entity(
+        entity_entry.entity_id, device_id=other_device.id
+    )
+    await hass.async_block_till_done()
+    hass.states.async_set(entity_entry.entity_id, "off")
+    await client.send_json_auto_id({"type": "ping"})
+    msg = await client.receive_json()
+    assert msg["type"] == "pong"
+
+
+async def test_subscribe_entities_batch(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test a batch of state changes is sent as one message per subscription."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hallway", "off")
+
+    all_client = await hass_ws_client(hass)
+    kitchen_client = await hass_ws_client(hass)
+    await all_client.send_json_auto_id({"type": "subscribe_entities"})
+    await kitchen_client.send_json_auto_id(
+        {"type": "subscribe_entities", "entity_ids": ["light.kitchen"]}
+    )
+    for client in (all_client, kitchen_client):
+        msg = await client.receive_json()
+        assert msg["success"]
+        msg = await client.receive_json()
+        assert msg["type"] == "event"
+
+    with hass.states.async_batch_set():
+        hass.states.async_set("light.kitchen", "on")
+        hass.states.async_set("light.hallway", "on", {"color": "red"})
+        hass.states.async_set("light.kitchen", "off")
+        hass.states.async_set("light.porch", "on")
+        # The writes are applied when the batch ends
+        assert hass.states.get("light.porch") is None
+
+    msg = await all_client.receive_json()
+    assert msg["event"]["a"] == {
+        "light.porch": {
+            "s": "on",
+            "a": {},
+            "c": ANY,
+            "lc": ANY,
+        }
+    }
+    assert msg["event"]["c"] == {
+        "light.kitchen": {"+": {"c": ANY, "lc": ANY}},
+        "light.hallway": {"+": {"s": "on", "a": {"color": "red"}, "c": ANY, "lc": ANY}},
+    }
+    msg = await kitchen_client.receive_json()
+    assert msg["event"] == {"c": {"light.kitchen": {"+": {"c": ANY, "lc": ANY}}}}
+
+
+async def test_subscribe_entities_update_interval(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test the state changes are merged within the negotiated update interval."""
+    hass.states.async_set("light.kitchen", "off", {"color": "red"})
+    hass.states.async_set("light.hallway", "off")
+    await websocket_client.send_json_auto_id(
+        {
+            "type": "supported_features",
+            "features": {FEATURE_ENTITY_UPDATE_INTERVAL: 1000},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    await websocket_client.send_json_auto_id({"type": "subscribe_entities"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    subscription_id = msg["id"]
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.hallway"}
+
+    # The first change is sent right away
+    hass.states.async_set("light.kitchen", "on", {"color": "red"})
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {"light.kitchen": {"+": {"s": "on", "c": ANY, "lc": ANY}}}
+    }
+
+    # The changes during the interval are merged
+    hass.states.async_set("light.kitchen", "off", {"color": "blue"})
+    hass.states.async_set("light.kitchen", "on", {"color": "blue", "effect": "x"})
+    hass.states.async_set("light.hallway", "on")
+    hass.states.async_remove("light.hallway")
+    hass.states.async_set("light.new", "on")
+    hass.states.async_set("light.added_and_removed", "on")
+    hass.states.async_remove("light.added_and_removed")
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == subscription_id
+    assert msg["event"] == {
+        "a": {"light.new": {"s": "on", "a": {}, "c": ANY, "lc": ANY}},
+        "c": {
+            "light.kitchen": {
+                "+": {"a": {"color": "blue", "effect": "x"}, "c": ANY, "lc": ANY}
+            }
+        },
+        "r": ["light.hallway"],
+    }
+
+    # Nothing is sent when nothing changed during the interval
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    hass.states.async_set("light.kitchen", "off")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["light.kitchen"]["+"]["s"] == "off"
+
+
+async def test_subscribe_entities_resume(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test resuming subscribe entities from the last received change."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hallway", "off")
+    websocket_client = await hass_ws_client(hass)
+    await websocket_client.send_json_auto_id({"type": "subscribe_entities", "since": 0})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.hallway"}
+    snapshot_seq = msg["seq"]
+
+    hass.states.async_set("light.kitchen", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["light.kitchen"]["+"]["s"] == "on"
+    assert msg["seq"] == snapshot_seq + 1
+    last_seq = msg["seq"]
+    await websocket_client.close()
+    await hass.async_block_till_done()
+
+    # Changes while the client is disconnected
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_remove("light.hallway")
+    hass.states.async_set("light.new", "on")
+
+    websocket_client = await hass_ws_client(hass)
+    await websocket_client.send_json_auto_id(
+        {"type": "subscribe_entities", "since": last_seq}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "a": {"light.new": {"s": "on", "a": {}, "c": ANY, "lc": ANY}},
+        "c": {"light.kitchen": {"+": {"a": {"brightness": 100}, "c": ANY, "lc": ANY}}},
+        "r": ["light.hallway"],
+    }
+    assert msg["seq"] == last_seq + 4
+
+    # Nothing was missed
+    await websocket_client.send_json_auto_id(
+        {"type": "subscribe_entities", "since": last_seq + 4}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {}
+    assert msg["seq"] == last_seq + 4
+
+    # The changes before the subscriptions were created are not kept,
+    # all states are sent
+    await websocket_client.send_json_auto_id(
+        {"type": "subscribe_entities", "since": snapshot_seq - 1}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.new"}
+    assert msg["seq"] == last_seq + 4
+
+
 async def test_render_template_renders_template(
     hass: HomeAssistant, websocket_client
 ) -> None:
@@ -2515,6 +2788,50 @@ async def test_integration_setup_info(
     ]
 
 
+async def test_integration_setup_critical_path(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+) -> None:
+    """Test the integrations which gated the startup and their setup timeline."""
+    with (
+        patch(
+            "homeassistant.components.websocket_api.commands.async_get_setup_timings",
+            return_value={"august": 12.5, "isy994": 12.8, "http": 0.5},
+        ),
+        patch(
+            "homeassistant.components.websocket_api.commands.async_get_setup_timeline",
+            return_value={
+                "august": (0.5, 13.0),
+                "isy994": (0.0, 12.8),
+                "http": (0.0, 0.5),
+            },
+        ),
+        patch(
+            "homeassistant.components.websocket_api.commands.async_get_setup_critical_path",
+            return_value=["http", "august"],
+        ),
+    ):
+        await websocket_client.send_json(
+            {"id": 7, "type": "integration/setup_critical_path"}
+        )
+        msg = await websocket_client.receive_json()
+        await websocket_client.send_json({"id": 8, "type": "integration/setup_info"})
+        info_msg = await websocket_client.receive_json()
+
+    assert msg["id"] == 7
+    assert msg["success"]
+    assert msg["result"] == [
+        {"domain": "http", "seconds": 0.5, "start": 0.0, "end": 0.5},
+        {"domain": "august", "seconds": 12.5, "start": 0.5, "end": 13.0},
+    ]
+    assert info_msg["result"][1] == {
+        "domain": "isy994",
+        "seconds": 12.8,
+        "start": 0.0,
+        "end": 12.8,
+    }
+
+
 @pytest.mark.parametrize(
     ("key", "config"),
     [
@@ -4,19 +4,23 @@ import asyncio
 from datetime import timedelta
 from typing import Any, cast
 from unittest.mock import patch
+import zlib
 
 from aiohttp import WSMsgType, WSServerHandshakeError, web
 import pytest
 
+from homeassistant.components import websocket_api
 from homeassistant.components.websocket_api import (
     async_register_command,
     const,
     http,
     websocket_command,
 )
+from homeassistant.components.websocket_api.compression import COMPRESSION_DICTIONARIES
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.util.dt import utcnow
+from homeassistant.util.json import json_loads
 
 from tests.common import async_fire_time_changed
 from tests.typing import MockHAClientWebSocket, WebSocketGenerator
@@ -185,6 +189,35 @@ async def test_delayed_response_handler(
     assert "on closed connection" in caplog.text
 
 
+async def test_wait_drained(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test waiting for the queued messages to be written."""
+    drained = False
+
+    @websocket_command({"type": "drain_sender"})
+    @websocket_api.async_response
+    async def async_drain_sender(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        nonlocal drained
+        for number in range(10):
+            connection.send_event(msg["id"], {"number": number})
+        await connection.async_wait_drained()
+        drained = True
+        connection.send_result(msg["id"])
+
+    async_register_command(hass, async_drain_sender)
+
+    await websocket_client.send_json({"id": 1, "type": "drain_sender"})
+    for number in range(10):
+        msg = await websocket_client.receive_json()
+        assert msg["event"] == {"number": number}
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "result"
+    assert drained
+
+
 async def test_ensure_disconnect_invalid_json(
     hass: HomeAssistant,
     websocket_client: MockHAClientWebSocket,
@@ -381,6 +414,62 @@ async def test_prepare_fail(
     assert "Timeout preparing request" in caplog.text
 
 
+async def test_enable_compression(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test enabling compressed messages."""
+    websocket_client = await hass_ws_client(hass)
+    hass.states.async_set("sensor.temperature", "20", {"unit_of_measurement": "°C"})
+
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {const.FEATURE_COMPRESSED_MESSAGES: 1},
+        }
+    )
+    decompressobj = zlib.decompressobj(
+        -zlib.MAX_WBITS, zdict=COMPRESSION_DICTIONARIES[1]
+    )
+
+    async def _receive_compressed_json() -> Any:
+        msg = await websocket_client.receive()
+        assert msg.type is WSMsgType.BINARY
+        return json_loads(decompressobj.decompress(msg.data + b"\x00\x00\xff\xff"))
+
+    msg = await _receive_compressed_json()
+    assert msg["id"] == 1
+    assert msg["success"] is True
+
+    await websocket_client.send_json({"id": 2, "type": "subscribe_entities"})
+    msg = await _receive_compressed_json()
+    assert msg["success"] is True
+    msg = await _receive_compressed_json()
+    assert msg["event"]["a"]["sensor.temperature"]["s"] == "20"
+
+    hass.states.async_set("sensor.temperature", "21", {"unit_of_measurement": "°C"})
+    msg = await _receive_compressed_json()
+    assert msg["event"]["c"]["sensor.temperature"]["+"]["s"] == "21"
+
+
+async def test_unknown_compression_dictionary(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test messages are not compressed with an unknown dictionary."""
+    websocket_client = await hass_ws_client(hass)
+
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {const.FEATURE_COMPRESSED_MESSAGES: 999},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 1
+    assert msg["success"] is True
+
+
 async def test_enable_coalesce(
     hass: HomeAssistant,
     hass_ws_client: WebSocketGenerator,
@@ -1483,6 +1483,7 @@ async def async_test_recorder(
         session: Session | None = None,
         exception_filter: Callable[[Exception], bool] | None = None,
         read_only: bool = False,
+        read_database: bool = False,
     ) -> Generator[Session]:
         """Wrap session_scope to bark if we create nested sessions."""
         if thread_session.has_session:
@@ -1497,6 +1498,7 @@ async def async_test_recorder(
                 session=session,
                 exception_filter=exception_filter,
                 read_only=read_only,
+                read_database=read_database,
             ) as ses:
                 yield ses
         finally:
@@ -4,7 +4,8 @@ import asyncio
 from collections.abc import Callable
 import contextlib
 from datetime import date, datetime, timedelta
-from unittest.mock import patch
+from typing import Any
+from unittest.mock import ANY, patch
 
 from astral import LocationInfo
 import astral.sun
@@ -29,7 +30,12 @@ from homeassistant.helpers.event import (
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
+    _async_get_time_pattern_scheduler,
+    _TimePatternGroup,
     async_call_later,
+    async_get_aligned_interval_stats,
+    async_get_template_render_stats,
+    async_set_aligned_interval_spread,
     async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
@@ -52,6 +58,7 @@ from homeassistant.helpers.event import (
 )
 from homeassistant.helpers.template import Template, result_as_boolean
 from homeassistant.setup import async_setup_component
+from homeassistant.util.async_ import get_scheduled_timer_handles
 import homeassistant.util.dt as dt_util
 
 from tests.common import async_fire_time_changed, async_fire_time_changed_exact
@@ -1959,6 +1966,80 @@ async def test_track_template_result_with_wildcard(hass: HomeAssistant) -> None:
     assert "cover.office_skylight=open" in specific_runs[0]
 
 
+async def test_track_template_result_shares_renders(hass: HomeAssistant) -> None:
+    """Test trackers of the same template share the render of a state change."""
+    template_str = "{{ states('sensor.test') }}-{{ name }}"
+    runs: dict[str, list[str]] = {"a": [], "b": [], "c": [], "d": []}
+
+    def _track(key: str, variables: dict[str, Any]) -> None:
+        def _run(
+            event: Event[EventStateChangedData] | None,
+            updates: list[TrackTemplateResult],
+        ) -> None:
+            runs[key].append(updates.pop().result)
+
+        async_track_template_result(
+            hass, [TrackTemplate(Template(template_str, hass), variables)], _run
+        )
+
+    # The unreferenced variable does not prevent sharing the render
+    _track("a", {"name": "x", "this": "a"})
+    _track("b", {"name": "x", "this": "b"})
+    _track("c", {"name": "x", "this": "c"})
+    # The referenced variable differs, so the render is not shared
+    _track("d", {"name": "y"})
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.test", "on")
+    await hass.async_block_till_done()
+
+    assert runs == {"a": ["on-x"], "b": ["on-x"], "c": ["on-x"], "d": ["on-y"]}
+    assert async_get_template_render_stats(hass) == [
+        {
+            "template": template_str,
+            "renders": 6,
+            "shared_renders": 2,
+            "total_time": ANY,
+        }
+    ]
+
+
+async def test_track_template_result_shared_render_after_state_write(
+    hass: HomeAssistant,
+) -> None:
+    """Test a render is not shared once the states were written."""
+    template_str = "{{ states('sensor.a') }}-{{ states('sensor.b') }}"
+    results = []
+
+    @callback
+    def _set_b(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        hass.states.async_set("sensor.b", updates.pop().result.split("-")[0])
+
+    @callback
+    def _run(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        results.append(updates.pop().result)
+
+    async_track_template_result(
+        hass, [TrackTemplate(Template(template_str, hass), None)], _set_b
+    )
+    async_track_template_result(
+        hass, [TrackTemplate(Template(template_str, hass), None)], _run
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.a", "1")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.b").state == "1"
+    assert results[-1] == "1-1"
+
+
 async def test_track_template_result_with_group(hass: HomeAssistant) -> None:
     """Test tracking template with a group."""
     hass.states.async_set("sensor.power_1", 0)
@@ -3611,6 +3692,102 @@ async def test_track_time_interval_name(hass: HomeAssistant) -> None:
     await hass.async_block_till_done()
 
 
+async def test_track_time_interval_aligned(hass: HomeAssistant) -> None:
+    """Test aligned time interval listeners share the ticks of their interval."""
+    runs: dict[str, list[datetime]] = {"a": [], "b": []}
+
+    def _listener(key: str) -> Callable[[datetime], None]:
+        @callback
+        def _run(now: datetime) -> None:
+            runs[key].append(now)
+
+        return _run
+
+    utc_now = dt_util.utcnow()
+    unsub_a = async_track_time_interval(
+        hass, _listener("a"), timedelta(seconds=10), aligned=True
+    )
+    unsub_b = async_track_time_interval(
+        hass, _listener("b"), timedelta(seconds=10), aligned=True
+    )
+    unsub_c = async_track_time_interval(
+        hass, callback(lambda now: None), timedelta(seconds=20), aligned=True
+    )
+    assert async_get_aligned_interval_stats(hass) == [
+        {
+            "interval": 10.0,
+            "offset": 0.0,
+            "listeners": 2,
+            "ticks": 0,
+            "total_time": 0.0,
+            "max_time": 0.0,
+        },
+        {
+            "interval": 20.0,
+            "offset": 0.0,
+            "listeners": 1,
+            "ticks": 0,
+            "total_time": 0.0,
+            "max_time": 0.0,
+        },
+    ]
+    unsub_c()
+
+    # The first tick is within one interval
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=10.5))
+    await hass.async_block_till_done()
+    assert [len(runs[key]) for key in "ab"] == [1, 1]
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=20.5))
+    await hass.async_block_till_done()
+    assert [len(runs[key]) for key in "ab"] == [2, 2]
+    assert [stats["ticks"] for stats in async_get_aligned_interval_stats(hass)] == [2]
+
+    unsub_a()
+    unsub_a()
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=30.5))
+    await hass.async_block_till_done()
+    assert [len(runs[key]) for key in "ab"] == [2, 3]
+
+    unsub_b()
+    assert async_get_aligned_interval_stats(hass) == []
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=60))
+    await hass.async_block_till_done()
+    assert [len(runs[key]) for key in "ab"] == [2, 3]
+
+
+async def test_track_time_interval_aligned_spread(hass: HomeAssistant) -> None:
+    """Test aligned time interval listeners are spread over the ticks."""
+    async_set_aligned_interval_spread(hass, timedelta(seconds=2))
+    unsubs = [
+        async_track_time_interval(
+            hass, callback(lambda now: None), timedelta(seconds=10), aligned=True
+        )
+        for _ in range(4)
+    ]
+    unsubs.append(
+        async_track_time_interval(
+            hass, callback(lambda now: None), timedelta(seconds=1), aligned=True
+        )
+    )
+    assert [
+        (stats["interval"], stats["offset"], stats["listeners"])
+        for stats in async_get_aligned_interval_stats(hass)
+    ] == [(1.0, 0.0, 1), (10.0, 0.0, 2), (10.0, 1.0, 1), (10.0, 2.0, 1)]
+
+    ticks = {
+        round(handle.when() % 10, 6)
+        for handle in get_scheduled_timer_handles(hass.loop)
+        if "_AlignedIntervalScheduler" in str(handle)
+    }
+    assert {0.0, 1.0, 2.0} <= ticks
+
+    for unsub in unsubs:
+        unsub()
+    assert async_get_aligned_interval_stats(hass) == []
+
+
 async def test_track_sunrise(hass: HomeAssistant) -> None:
     """Test track the sunrise."""
     latitude = 32.87336
@@ -4378,6 +4555,124 @@ async def test_periodic_task_leaving_dst_2(
     unsub()
 
 
+async def test_periodic_tasks_share_timer(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the listeners of the same time pattern share a few timers."""
+    runs: dict[str, list[datetime]] = {key: [] for key in "abcdefg"}
+
+    def _listener(key: str) -> Callable[[datetime], None]:
+        @callback
+        def _run(now: datetime) -> None:
+            runs[key].append(now)
+
+        return _run
+
+    def _run_counts() -> list[int]:
+        return [len(runs[key]) for key in "abcdefg"]
+
+    now = dt_util.utcnow()
+    freezer.move_to(datetime(now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC))
+    scheduler = _async_get_time_pattern_scheduler(hass)
+
+    with patch("homeassistant.helpers.event.randint", side_effect=range(50000, 60000)):
+        unsubs = {
+            key: async_track_utc_time_change(
+                hass, _listener(key), minute="/5", second=0
+            )
+            for key in "abcdef"
+        }
+        unsubs["g"] = async_track_utc_time_change(
+            hass, _listener("g"), minute="/10", second=0
+        )
+    # The six listeners of the same pattern are spread over four timers
+    assert scheduler.timer_count == 5
+    scheduled = getattr(hass.loop, "_scheduled")
+    for name in (
+        "track time change None:/5:0 local=False",
+        "track time change None:/10:0 local=False",
+    ):
+        assert any(handle for handle in scheduled if name in str(handle))
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert _run_counts() == [1, 1, 1, 1, 1, 1, 1]
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 5, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert _run_counts() == [2, 2, 2, 2, 2, 2, 1]
+
+    # Removing a listener of a group with other listeners keeps its timer
+    unsubs["a"]()
+    unsubs["a"]()
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 10, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert _run_counts() == [2, 3, 3, 3, 3, 3, 2]
+    assert scheduler.timer_count == 5
+
+    for key in "bcdefg":
+        unsubs[key]()
+    assert scheduler.timer_count == 0
+
+
+@pytest.mark.parametrize(
+    "time_zone",
+    ["UTC", "America/New_York", "Asia/Kolkata", "Australia/Lord_Howe"],
+)
+@pytest.mark.parametrize(
+    ("second", "minute", "hour"),
+    [
+        ("/10", None, None),
+        (0, "/1", None),
+        (30, "/5", None),
+        (0, 0, None),
+        (0, 0, "/2"),
+        (15, 45, 3),
+    ],
+)
+@pytest.mark.parametrize("local", [True, False])
+async def test_time_pattern_schedule(
+    hass: HomeAssistant,
+    time_zone: str,
+    second: Any,
+    minute: Any,
+    hour: Any,
+    local: bool,
+) -> None:
+    """Test the next fire time matches the time expression across DST changes."""
+    await hass.config.async_set_time_zone(time_zone)
+    time_match_expression = (
+        dt_util.parse_time_expression(second, 0, 59),
+        dt_util.parse_time_expression(minute, 0, 59),
+        dt_util.parse_time_expression(hour, 0, 23),
+    )
+    group = _TimePatternGroup((), "test", time_match_expression, local)
+
+    for start in (
+        datetime(2024, 3, 10, 5, 0, tzinfo=dt_util.UTC),
+        datetime(2024, 4, 6, 13, 0, tzinfo=dt_util.UTC),
+        datetime(2024, 11, 3, 4, 0, tzinfo=dt_util.UTC),
+    ):
+        for step in range(60):
+            utc_now = start + timedelta(seconds=step * 437, microseconds=step)
+            localized_now = dt_util.as_local(utc_now) if local else utc_now
+            # Compare the timestamps, ambiguous local times never compare equal
+            assert group.calculate_next(utc_now).timestamp() == (
+                dt_util.find_next_time_expression_time(
+                    localized_now, *time_match_expression
+                )
+                .replace(microsecond=group.microsecond)
+                .timestamp()
+            ), utc_now
+
+
 async def test_call_later(hass: HomeAssistant) -> None:
     """Test calling an action later."""
     future = asyncio.get_running_loop().create_future()
@@ -0,0 +1,110 @@
+"""Test the event loop monitor."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import loop_monitor
+from homeassistant.helpers.frame import IntegrationFrame
+
+
+def _block_event_loop(seconds: float) -> None:
+    """Keep the event loop busy without yielding."""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+async def _wait_for_samples(monitor: loop_monitor.LoopMonitor, samples: int) -> None:
+    """Wait for the monitor to sample the lag."""
+    while len(monitor.lags) < samples:
+        await asyncio.sleep(0.01)
+
+
+async def test_slow_callback_blamed_on_integration(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a callback blocking the event loop is blamed on its integration."""
+    monitor = loop_monitor.LoopMonitor(
+        hass, sample_interval=0.01, slow_callback_threshold=0.1
+    )
+
+    def _integration_frame(frame):
+        return IntegrationFrame(
+            custom_integration=False,
+            integration="hue",
+            module="homeassistant.components.hue.light",
+            relative_filename="homeassistant/components/hue/light.py",
+            frame=frame,
+        )
+
+    with patch.object(
+        loop_monitor, "get_integration_frame", side_effect=_integration_frame
+    ):
+        monitor.async_start()
+        await _wait_for_samples(monitor, 2)
+        _block_event_loop(0.3)
+        await _wait_for_samples(monitor, len(monitor.lags) + 2)
+    await monitor.async_stop()
+
+    assert len(monitor.slow_callbacks) == 1
+    slow_callback = monitor.slow_callbacks[0]
+    assert slow_callback.integration == "hue"
+    assert slow_callback.duration >= 0.2
+    assert slow_callback.filename == __file__
+    assert any("_block_event_loop" in line for line in slow_callback.stack)
+    assert "Detected a callback blocking the event loop" in caplog.text
+    assert "from integration hue" in caplog.text
+    assert max(monitor.lags) == slow_callback.duration
+
+
+async def test_slow_callback_reported_once(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a slow callback outside of integrations is only logged once."""
+    monitor = loop_monitor.LoopMonitor(
+        hass, sample_interval=0.01, slow_callback_threshold=0.1
+    )
+    monitor.async_start()
+    for _ in range(2):
+        await _wait_for_samples(monitor, len(monitor.lags) + 2)
+        _block_event_loop(0.3)
+    await _wait_for_samples(monitor, len(monitor.lags) + 2)
+    await monitor.async_stop()
+
+    assert len(monitor.slow_callbacks) == 2
+    assert monitor.slow_callbacks[0].integration is None
+    assert caplog.text.count("from Home Assistant core") == 1
+
+
+async def test_lag_percentiles(hass: HomeAssistant) -> None:
+    """Test the percentiles of the lag."""
+    monitor = loop_monitor.LoopMonitor(hass)
+    assert monitor.lag_percentiles() == {}
+
+    monitor.lags.extend(idx / 1000 for idx in range(200, 0, -1))
+    assert monitor.lag_percentiles() == {
+        "p50": 0.1,
+        "p95": 0.19,
+        "p99": 0.198,
+        "max": 0.2,
+    }
+
+
+async def test_setup_stops_on_close(hass: HomeAssistant) -> None:
+    """Test the monitor runs until Home Assistant closes."""
+    assert loop_monitor.async_get_loop_monitor(hass) is None
+
+    loop_monitor.async_setup(hass)
+    monitor = loop_monitor.async_get_loop_monitor(hass)
+    assert monitor is not None
+    assert monitor._watchdog.is_alive()
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert monitor._watchdog is None
+    assert monitor._timer is None
@@ -7,12 +7,14 @@ from datetime import datetime, timedelta
 import json
 import logging
 import math
+from pathlib import Path
 import random
 from types import MappingProxyType
 from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
+import jinja2
 import orjson
 import pytest
 import voluptuous as vol
@@ -5604,6 +5606,223 @@ async def test_render_to_info_with_exception(hass: HomeAssistant) -> None:
     assert info.entities == {"test_domain.object"}
 
 
+async def test_async_render_key(hass: HomeAssistant) -> None:
+    """Test the key identifying renders which can be shared."""
+    tpl_str = "{{ states('sensor.test') }} {{ name }}"
+    key = template.Template(tpl_str, hass).async_render_key({"name": "a", "x": 1})
+
+    assert key == template.Template(tpl_str, hass).async_render_key(
+        {"name": "a", "x": 2}
+    )
+    assert key != template.Template(tpl_str, hass).async_render_key({"name": "b"})
+    assert template.Template(tpl_str, hass).async_render_key({"name": []}) is None
+    assert template.Template("static", hass).async_render_key() is None
+    assert template.Template("{{ [1, 2] | random }}", hass).async_render_key() is None
+    assert template.Template("{{ invalid", hass).async_render_key() is None
+
+    # Equal values of different types render differently
+    keys = {
+        template.Template(tpl_str, hass).async_render_key({"name": name})
+        for name in (1, 1.0, True)
+    }
+    assert len(keys) == 3
+
+    # Included and imported templates can reference any variable
+    for tpl_str in (
+        "{% include 'macros.jinja' %}",
+        "{% import 'macros.jinja' as macros %}{{ macros.hello() }}",
+        "{% from 'macros.jinja' import hello %}{{ hello() }}",
+    ):
+        assert template.Template(tpl_str, hass).async_render_key() is None
+
+
+async def test_bytecode_cache(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test the compiled templates are cached across restarts."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "custom_templates").mkdir()
+    (tmp_path / "custom_templates" / "macros.jinja").write_text(
+        "{% macro hello() %}hello{% endmacro %}"
+    )
+    await template.async_load_custom_templates(hass)
+    await template.async_load_template_bytecode(hass)
+    cache = template.get_bytecode_cache(hass)
+
+    tpl_str = "{% from 'macros.jinja' import hello %}{{ hello() }} {{ 1 + 1 }}"
+    assert template.Template(tpl_str, hass).async_render() == "hello 2"
+    assert cache.misses == 1
+    assert cache.hits == 0
+    await cache.async_save()
+
+    async def _async_restart() -> template.TemplateBytecodeCache:
+        """Load the cache like after a restart."""
+        restarted = template.TemplateBytecodeCache(hass)
+        await restarted.async_load()
+        env = template.TemplateEnvironment(hass)
+        env.bytecode_cache = restarted
+        code = env.compile(tpl_str)
+        assert jinja2.Template.from_code(env, code, env.globals, None).render() == (
+            "hello 2"
+        )
+        return restarted
+
+    restarted = await _async_restart()
+    # The template and the imported custom template are loaded from the cache
+    assert restarted.hits == 2
+    assert restarted.misses == 0
+    assert restarted.saved_time == cache.compile_time
+
+    with patch.object(
+        template.TemplateBytecodeCache, "_version", return_value=("0", "0")
+    ):
+        restarted = await _async_restart()
+    assert restarted.hits == 0
+    assert restarted.misses == 1
+
+
+async def test_bytecode_cache_not_loaded(hass: HomeAssistant) -> None:
+    """Test the bytecode cache is not used until it is loaded."""
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    cache = template.get_bytecode_cache(hass)
+    assert cache.misses == 0
+    assert cache.hits == 0
+
+
+FAST_PATH_TEMPLATES = [
+    "{{ states('sensor.power') }}",
+    "{{ states('sensor.power') | float(0) * 2 }}",
+    "{{ states('sensor.power') | float * 2 }}",
+    "{{ states('sensor.text') | float }}",
+    "{{ states('sensor.text') | float(0) + 1 }}",
+    "{{ states('sensor.power') | int(0) + 1 }}",
+    "{{ states('sensor.text') | int }}",
+    "{{ (states('sensor.power') | float(0) / 3) | round(2) }}",
+    "{{ states('sensor.power') | round(1, 'floor') }}",
+    "{{ states('sensor.power') | round(default=0) }}",
+    "{{ states('sensor.text') | round }}",
+    "{{ states('sensor.negative') | float | abs }}",
+    "{{ states('sensor.text') | abs }}",
+    "{{ -states('sensor.power') | float(0) }}",
+    "{{ not has_value('sensor.missing') }}",
+    "{{ states('sensor.missing') }}",
+    "{{ states('sensor.power', rounded=True, with_unit=True) }}",
+    "{{ state_attr('climate.living_room', 'temperature') }}",
+    "{{ state_attr('climate.living_room', 'temperature') | float(0) - 0.5 }}",
+    "{{ state_attr('climate.living_room', 'modes') }}",
+    "{{ state_attr('climate.living_room', 'missing') }}",
+    "{{ state_attr('climate.missing', 'temperature') }}",
+    "{{ is_state('light.kitchen', 'on') }}",
+    "{{ is_state('light.kitchen', ['off', 'on']) }}",
+    "{{ is_state_attr('climate.living_room', 'hvac_action', 'heating') }}",
+    "{{ is_state('light.kitchen', 'on') and states('sensor.power') | float(0) > 2 }}",
+    "{{ is_state('light.kitchen', 'off') or states('sensor.power') }}",
+    "{{ 1 < states('sensor.power') | float(0) <= 10 }}",
+    "{{ 10 < states('sensor.power') | float(0) <= 20 }}",
+    "{{ states('sensor.power') == '12.34' }}",
+    "{{ states('sensor.power') != 'on' }}",
+    "{{ states('sensor.power') | float(0) >= 12.34 }}",
+    "{{ 7 // 2 }} {{ 7 % 3 }} {{ 7 / 2 }}",
+    "{{ 1 / 0 }}",
+    "{{ 0.1 + 0.2 }}",
+    "{{ 1e20 * 10 }}",
+    "{{ 2.0 }}",
+    "{{ -0.0 }}",
+    "{{ 'abc' }}",
+    "{{ '  padded  ' }}",
+    "{{ '[1, 2]' }}",
+    "{{ [1, states('sensor.power')] }}",
+    "{{ '0123' }}",
+    "{{ none }}",
+    "{{ true }}",
+    "{{ states('sensor.power') + 1 }}",
+    "Power: {{ states('sensor.power') }} W",
+    "{{ states('sensor.power') }}{{ states('sensor.text') }}",
+]
+
+
+@pytest.mark.parametrize("tpl_str", FAST_PATH_TEMPLATES)
+@pytest.mark.parametrize("parse_result", [True, False])
+async def test_fast_path_parity(
+    hass: HomeAssistant, tpl_str: str, parse_result: bool
+) -> None:
+    """Test the fast path renders the same as Jinja."""
+    hass.states.async_set(
+        "sensor.power", "12.34", {"unit_of_measurement": "W", "device_class": "power"}
+    )
+    hass.states.async_set("sensor.negative", "-5")
+    hass.states.async_set("sensor.text", "abc")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set(
+        "climate.living_room",
+        "heat",
+        {"temperature": 21.5, "modes": ["heat", "off"], "hvac_action": "heating"},
+    )
+
+    def _render() -> tuple[Any, template.RenderInfo]:
+        """Render the template and return the result or the error."""
+        tpl = template.Template(tpl_str, hass)
+        info = tpl.async_render_to_info(parse_result=parse_result)
+        try:
+            result = info.result()
+        except TemplateError as err:
+            result = str(err)
+        return result, info
+
+    fast_result, fast_info = _render()
+    assert template._compile_fast_path(tpl_str) is not None
+    with patch.object(template, "_compile_fast_path", return_value=None):
+        jinja_result, jinja_info = _render()
+
+    assert type(fast_result) is type(jinja_result)
+    assert fast_result == jinja_result
+    for attr in (
+        "entities",
+        "domains",
+        "domains_lifecycle",
+        "all_states",
+        "all_states_lifecycle",
+        "has_time",
+        "rate_limit",
+    ):
+        assert getattr(fast_info, attr) == getattr(jinja_info, attr)
+
+
+@pytest.mark.parametrize(
+    "tpl_str",
+    [
+        "{{ states.sensor.power.state }}",
+        "{{ states('sensor.power') | multiply(2) }}",
+        "{{ now() }}",
+        "{{ value }}",
+        "{{ states('sensor.power') ~ 'W' }}",
+        "{{ 2 ** 3 }}",
+        "{{ {'a': 1} }}",
+        "{% if is_state('light.kitchen', 'on') %}on{% endif %}",
+        "{{ states(*['sensor.power']) }}",
+    ],
+)
+async def test_fast_path_not_supported(hass: HomeAssistant, tpl_str: str) -> None:
+    """Test templates outside of the fast path are rendered by Jinja."""
+    assert template._compile_fast_path(tpl_str) is None
+
+
+async def test_fast_path_shadowed_by_variables(hass: HomeAssistant) -> None:
+    """Test Jinja renders templates calling a function shadowed by a variable."""
+    hass.states.async_set("sensor.power", "12")
+    tpl = template.Template("{{ states('sensor.power') }}", hass)
+
+    assert tpl.async_render({"states": lambda entity_id: "shadowed"}) == "shadowed"
+    assert tpl.async_render({"other": 1}) == 12
+
+
+async def test_fast_path_limited(hass: HomeAssistant) -> None:
+    """Test limited templates are not rendered by the fast path."""
+    hass.states.async_set("sensor.power", "12")
+    tpl = template.Template("{{ states('sensor.power') }}", hass)
+
+    with pytest.raises(TemplateError, match="Use of 'states' is not supported"):
+        tpl.async_render(limited=True)
+
+
 async def test_lru_increases_with_many_entities(hass: HomeAssistant) -> None:
     """Test that the template internal LRU cache increases with many entities."""
     # We do not actually want to record 4096 entities so we mock the entity count
@@ -1,5 +1,6 @@
 """Tests for the update coordinator."""
 
+from collections.abc import Callable
 from datetime import datetime, timedelta
 import logging
 from unittest.mock import AsyncMock, Mock, patch
@@ -11,8 +12,14 @@ import pytest
 import requests
 
 from homeassistant import config_entries
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CoreState,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.exceptions import (
     ConfigEntryAuthFailed,
     ConfigEntryError,
@@ -492,6 +499,46 @@ async def test_async_set_updated_data(
     remove_callbacks()
 
 
+async def test_update_listeners_batch_state_writes(
+    hass: HomeAssistant, crd: update_coordinator.DataUpdateCoordinator[int]
+) -> None:
+    """Test the states written by the listeners are batched if enabled."""
+    batches: list[list[str]] = []
+
+    @callback
+    def _listener(event: Event[EventStateChangedData]) -> None:
+        pass
+
+    @callback
+    def _batch_listener(events: list[Event[EventStateChangedData]]) -> None:
+        batches.append([event.data["entity_id"] for event in events])
+
+    hass.bus.async_listen_batch(EVENT_STATE_CHANGED, _listener, _batch_listener)
+
+    def _update_callback(entity_id: str) -> Callable[[], None]:
+        def update_callback() -> None:
+            hass.states.async_set(entity_id, str(crd.data))
+
+        return update_callback
+
+    remove_callbacks = [
+        crd.async_add_listener(_update_callback(entity_id))
+        for entity_id in ("sensor.one", "sensor.two")
+    ]
+    # The listeners read their own writes by default
+    crd.async_set_updated_data(100)
+    assert not batches
+    assert hass.states.get("sensor.two").state == "100"
+
+    crd.batch_state_writes = True
+    crd.async_set_updated_data(200)
+    assert batches == [["sensor.one", "sensor.two"]]
+    assert hass.states.get("sensor.two").state == "200"
+
+    for remove_callback in remove_callbacks:
+        remove_callback()
+
+
 async def test_stop_refresh_on_ha_stop(
     hass: HomeAssistant, crd: update_coordinator.DataUpdateCoordinator[int]
 ) -> None:
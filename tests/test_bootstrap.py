@@ -299,6 +299,39 @@ async def test_setup_after_deps_in_stage_1_ignored(hass: HomeAssistant) -> None:
     assert order == ["cloud", "an_after_dep", "normal_integration"]
 
 
+async def test_setup_stage_2_does_not_wait_for_stage_1(hass: HomeAssistant) -> None:
+    """Test stage 2 is set up without waiting for stage 1 to finish."""
+    # This test relies on this
+    assert "cloud" in bootstrap.STAGE_1_INTEGRATIONS
+    normal_integration_set_up = asyncio.Event()
+    order = []
+
+    async def async_setup_cloud(hass, config):
+        await normal_integration_set_up.wait()
+        order.append("cloud")
+        return True
+
+    async def async_setup_normal_integration(hass, config):
+        order.append("normal_integration")
+        normal_integration_set_up.set()
+        return True
+
+    mock_integration(hass, MockModule(domain="cloud", async_setup=async_setup_cloud))
+    mock_integration(
+        hass,
+        MockModule(
+            domain="normal_integration", async_setup=async_setup_normal_integration
+        ),
+    )
+
+    async with asyncio.timeout(5):
+        await bootstrap._async_set_up_integrations(
+            hass, {"cloud": {}, "normal_integration": {}}
+        )
+
+    assert order == ["normal_integration", "cloud"]
+
+
 @pytest.mark.parametrize("load_registries", [False])
 async def test_setup_after_deps_manifests_are_loaded_even_if_not_setup(
     hass: HomeAssistant,
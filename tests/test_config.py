@@ -5,6 +5,7 @@ from collections import OrderedDict
 from collections.abc import Generator
 import contextlib
 import copy
+from datetime import timedelta
 import logging
 import os
 from pathlib import Path
@@ -36,6 +37,7 @@ from homeassistant.core import (
     DOMAIN as HOMEASSISTANT_DOMAIN,
     ConfigSource,
     HomeAssistant,
+    callback,
 )
 from homeassistant.exceptions import ConfigValidationError, HomeAssistantError
 from homeassistant.helpers import (
@@ -44,6 +46,10 @@ from homeassistant.helpers import (
     issue_registry as ir,
 )
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import (
+    async_get_aligned_interval_stats,
+    async_track_time_interval,
+)
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import Integration, async_get_integration
 from homeassistant.setup import async_setup_component
@@ -892,6 +898,25 @@ async def test_loading_configuration(hass: HomeAssistant) -> None:
     assert hass.config.radius == 150
 
 
+async def test_loading_configuration_polling_spread(hass: HomeAssistant) -> None:
+    """Test the polling spread spreads the aligned interval listeners."""
+    await config_util.async_process_ha_core_config(hass, {"polling_spread": 2})
+
+    unsubs = [
+        async_track_time_interval(
+            hass, callback(lambda now: None), timedelta(seconds=10), aligned=True
+        )
+        for _ in range(6)
+    ]
+    assert [
+        (stats["offset"], stats["listeners"])
+        for stats in async_get_aligned_interval_stats(hass)
+    ] == [(0.0, 2), (1.0, 2), (2.0, 2)]
+
+    for unsub in unsubs:
+        unsub()
+
+
 @pytest.mark.parametrize(
     ("minor_version", "users", "user_data", "default_language"),
     [
@@ -15,7 +15,7 @@ from tempfile import TemporaryDirectory
 import threading
 import time
 from typing import Any
-from unittest.mock import MagicMock, Mock, PropertyMock, patch
+from unittest.mock import ANY, MagicMock, Mock, PropertyMock, patch
 
 from freezegun import freeze_time
 import pytest
@@ -64,6 +64,7 @@ from homeassistant.helpers.json import json_dumps
 from homeassistant.setup import async_setup_component
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
+from homeassistant.util.job_profiler import JobProfiler
 from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -1169,6 +1170,55 @@ async def test_eventbus_filtered_listener(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_job_profiler(hass: HomeAssistant) -> None:
+    """Test the listeners and their filters are profiled while enabled."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def mock_filter(event_data):
+        """Mock filter."""
+        return not event_data["filtered"]
+
+    @ha.callback
+    def broken_filter(event_data):
+        """Mock filter which raises."""
+        raise ValueError
+
+    unsub = hass.bus.async_listen("test", listener, event_filter=mock_filter)
+    unsub_broken = hass.bus.async_listen("test", listener, event_filter=broken_filter)
+
+    profiler = JobProfiler()
+    hass.async_set_job_profiler(profiler)
+    hass.bus.async_fire("test", {"filtered": True})
+    hass.bus.async_fire("test", {"filtered": False})
+    hass.async_run_hass_job(ha.HassJob(listener), None)
+    hass.async_set_job_profiler(None)
+    hass.bus.async_fire("test", {"filtered": False})
+
+    assert len(calls) == 3
+    assert "async_run_hass_job" not in hass.__dict__
+    [stats] = profiler.report()
+    assert stats["target"] == f"{__name__}.{listener.__qualname__}"
+    assert stats["integration"] == "homeassistant"
+    assert stats["calls"] == 2
+    assert stats["filter_calls"] == 4
+    assert stats["total_time"] >= stats["p99_time"] > 0
+
+    # The listeners are removed while and after profiling their filters
+    hass.async_set_job_profiler(profiler)
+    unsub_profiled = hass.bus.async_listen("test", listener, event_filter=mock_filter)
+    unsub()
+    hass.async_set_job_profiler(None)
+    unsub_profiled()
+    unsub_broken()
+    assert "test" not in hass.bus.async_listeners()
+
+
 async def test_eventbus_run_immediately_callback(hass: HomeAssistant) -> None:
     """Test we can call events immediately with a callback."""
     calls = []
@@ -1564,6 +1614,139 @@ async def test_statemachine_avoids_updating_attributes(hass: HomeAssistant) -> N
     assert isinstance(new_state.attributes, ReadOnlyDict)
 
 
+async def test_statemachine_shares_state_with_previous_state(
+    hass: HomeAssistant,
+) -> None:
+    """Test async_set shares the state string of the previous state."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    state = hass.states.get("light.bowl")
+
+    # A state string which is equal but not the same object
+    new_value = "o" + state.state[1:]
+    assert new_value is not state.state
+    hass.states.async_set("light.bowl", new_value, {"brightness": 200})
+    new_state = hass.states.get("light.bowl")
+    assert new_state.state is state.state
+    assert new_state.last_changed is state.last_changed
+
+
+async def test_statemachine_releases_serializations_of_old_states(
+    hass: HomeAssistant,
+) -> None:
+    """Test the serializations of a replaced state are released after dispatch."""
+    serialized = []
+
+    @ha.callback
+    def listener(event: ha.Event[ha.EventStateChangedData]) -> None:
+        old_state = event.data["old_state"]
+        serialized.append(old_state.as_dict_json if old_state else None)
+
+    hass.states.async_set("light.bowl", "on")
+    state = hass.states.get("light.bowl")
+    as_dict_json = state.as_dict_json
+    state.as_compressed_state_json  # noqa: B018
+    assert not hasattr(state, "__weakref__")
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    hass.states.async_set("light.bowl", "off")
+    # The listeners still get the cached serializations
+    assert serialized == [as_dict_json]
+    assert serialized[0] is as_dict_json
+    assert set(state.__dict__) <= {"last_changed_timestamp", "last_reported_timestamp"}
+    assert state.as_dict_json == as_dict_json
+
+    new_state = hass.states.get("light.bowl")
+    new_state.as_dict_json  # noqa: B018
+    hass.states.async_remove("light.bowl")
+    assert "as_dict_json" not in new_state.__dict__
+
+
+async def test_statemachine_snapshot(hass: HomeAssistant) -> None:
+    """Test snapshots of the state machine."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("switch.ac", "off")
+
+    snapshot = hass.states.snapshot()
+    assert len(snapshot) == 3
+    assert sorted(snapshot) == ["light.bowl", "light.kitchen", "switch.ac"]
+    assert snapshot.get("light.bowl") is hass.states.get("light.bowl")
+    assert snapshot.get("Light.Bowl") is hass.states.get("light.bowl")
+    assert snapshot.get("light.unknown") is None
+    assert "switch.ac" in snapshot
+    assert "switch.unknown" not in snapshot
+    assert snapshot.entity_ids("light") == ["light.bowl", "light.kitchen"]
+    assert [state.entity_id for state in snapshot.all(["switch"])] == ["switch.ac"]
+
+    hass.states.async_set("light.bowl", "off")
+    hass.states.async_remove("switch.ac")
+    hass.states.async_set("sensor.power", "10")
+
+    # The snapshot does not change with the state machine
+    assert snapshot.get("light.bowl").state == "on"
+    assert "switch.ac" in snapshot
+    assert "sensor.power" not in snapshot
+
+    new_snapshot = hass.states.snapshot()
+    assert new_snapshot.version > snapshot.version
+    assert new_snapshot.get("light.bowl").state == "off"
+    assert sorted(new_snapshot) == ["light.bowl", "light.kitchen", "sensor.power"]
+
+
+async def test_statemachine_snapshot_shares_unchanged_domains(
+    hass: HomeAssistant,
+) -> None:
+    """Test snapshots only copy the domains which changed."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.ac", "off")
+
+    snapshot = hass.states.snapshot()
+    assert hass.states.snapshot()._domains == snapshot._domains
+    hass.states.async_set("light.bowl", "off")
+    new_snapshot = hass.states.snapshot()
+    assert new_snapshot._domains["switch"] is snapshot._domains["switch"]
+    assert new_snapshot._domains["light"] is not snapshot._domains["light"]
+    assert new_snapshot.version == snapshot.version + 1
+
+
+async def test_statemachine_snapshot_from_executor(hass: HomeAssistant) -> None:
+    """Test taking a snapshot outside of the event loop."""
+    for idx in range(10):
+        hass.states.async_set(f"light.bowl_{idx}", "on")
+
+    snapshot = await hass.async_add_executor_job(hass.states.snapshot)
+    assert len(snapshot) == 10
+    assert await hass.async_add_executor_job(hass.states.entity_ids, "light") == [
+        f"light.bowl_{idx}" for idx in range(10)
+    ]
+    states = await hass.async_add_executor_job(hass.states.all)
+    assert [state.state for state in states] == ["on"] * 10
+
+
+def test_statemachine_snapshot_retries_on_concurrent_writes() -> None:
+    """Test a snapshot taken while the states are written is taken again."""
+    loop = Mock()
+    state_machine = ha.StateMachine(Mock(), loop)
+    states = state_machine._states
+    states["light.bowl"] = ha.State("light.bowl", "on")
+    real_copy = dict.copy
+    writes = 0
+
+    class _VersionsWrittenOnce(dict):
+        def copy(self) -> dict:
+            nonlocal writes
+            versions = real_copy(self)
+            if writes == 0:
+                writes += 1
+                states["light.kitchen"] = ha.State("light.kitchen", "off")
+            return versions
+
+    states._domain_versions = _VersionsWrittenOnce(states._domain_versions)
+    snapshot = state_machine.snapshot()
+    assert sorted(snapshot) == ["light.bowl", "light.kitchen"]
+    assert snapshot.version == 2
+
+
 def test_service_call_repr() -> None:
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -3415,6 +3598,227 @@ async def test_statemachine_report_state(hass: HomeAssistant) -> None:
     assert len(state_reported_events) == 1
 
 
+async def test_statemachine_batch_set(hass: HomeAssistant) -> None:
+    """Test the state writes of a batch are applied and fired together."""
+
+    @ha.callback
+    def reported_filter(event_data):
+        """Mock filter."""
+        return True
+
+    @ha.callback
+    def batch_filter(event_data):
+        """Mock filter."""
+        return event_data["entity_id"] != "light.hallway"
+
+    @ha.callback
+    def batch_listener(events: list[ha.Event]) -> None:
+        batches.append(events)
+
+    @ha.callback
+    def listener(event: ha.Event) -> None:
+        pass
+
+    @ha.callback
+    def reported_listener(event: ha.Event) -> None:
+        state_reported_events.append(event)
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.hallway", "on")
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    state_reported_events: list[ha.Event] = []
+    batches: list[list[ha.Event]] = []
+    hass.bus.async_listen(
+        EVENT_STATE_REPORTED, reported_listener, event_filter=reported_filter
+    )
+    unsub = hass.bus.async_listen_batch(
+        EVENT_STATE_CHANGED, listener, batch_listener, event_filter=batch_filter
+    )
+
+    with hass.states.async_batch_set():
+        hass.states.async_set("light.bowl", "off")
+        with hass.states.async_batch_set():
+            hass.states.async_set("light.hallway", "off")
+        hass.states.async_set("light.bowl", "on")
+        hass.states.async_set("light.bowl", "on")
+        hass.states.async_set("light.kitchen", "on")
+        assert hass.states.get("light.bowl").state == "on"
+        assert hass.states.get("light.hallway").state == "on"
+        assert hass.states.get("light.kitchen") is None
+        assert not state_changed_events
+
+    assert hass.states.get("light.bowl").state == "on"
+    assert hass.states.get("light.hallway").state == "off"
+    assert hass.states.get("light.kitchen").state == "on"
+    assert [
+        (event.data["entity_id"], event.data["new_state"].state)
+        for event in state_changed_events
+    ] == [
+        ("light.bowl", "off"),
+        ("light.hallway", "off"),
+        ("light.bowl", "on"),
+        ("light.kitchen", "on"),
+    ]
+    assert len(state_reported_events) == 1
+    assert [
+        [(event.data["entity_id"], event.data["new_state"].state) for event in batch]
+        for batch in batches
+    ] == [[("light.bowl", "off"), ("light.bowl", "on"), ("light.kitchen", "on")]]
+
+    # Removing a state applies the pending writes first
+    state_changed_events.clear()
+    with hass.states.async_batch_set():
+        hass.states.async_set("light.kitchen", "off")
+        hass.states.async_remove("light.kitchen")
+    assert hass.states.get("light.kitchen") is None
+    assert [
+        (event.data["entity_id"], event.data["new_state"])
+        for event in state_changed_events
+    ] == [("light.kitchen", ANY), ("light.kitchen", None)]
+    assert len(batches) == 2
+
+    unsub()
+    with hass.states.async_batch_set():
+        hass.states.async_set("light.bowl", "off")
+    assert len(batches) == 2
+
+
+async def test_state_batch_set_invalid_write(hass: HomeAssistant) -> None:
+    """Test an invalid write in a batch raises where it is written."""
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with hass.states.async_batch_set():
+        hass.states.async_set("light.bowl", "on")
+        with pytest.raises(InvalidStateError):
+            hass.states.async_set("light.hallway", "x" * 256)
+        with pytest.raises(InvalidEntityFormatError):
+            hass.states.async_set("invalid_entity_id", "on")
+        hass.states.async_set("light.kitchen", "on")
+
+    assert hass.states.get("light.hallway") is None
+    assert hass.states.get("invalid_entity_id") is None
+    assert [event.data["entity_id"] for event in state_changed_events] == [
+        "light.bowl",
+        "light.kitchen",
+    ]
+
+    def _write_batch() -> None:
+        with hass.states.async_batch_set():
+            hass.states.async_set("light.bowl", "off")
+            hass.states.async_set("light.hallway", "x" * 256)
+
+    # The writes before an unhandled error are still applied
+    with pytest.raises(InvalidStateError):
+        _write_batch()
+    assert hass.states.get("light.bowl").state == "off"
+    assert len(state_changed_events) == 3
+
+
+async def test_fire_batch_listeners_per_event(hass: HomeAssistant) -> None:
+    """Test listeners added or removed in a batch get or miss the next events."""
+    received: list[tuple[str, str]] = []
+    batches: list[list[str]] = []
+
+    @ha.callback
+    def added_listener(event: ha.Event) -> None:
+        received.append(("added", event.data["entity_id"]))
+
+    @ha.callback
+    def removed_listener(event: ha.Event) -> None:
+        received.append(("removed", event.data["entity_id"]))
+
+    @ha.callback
+    def listener(event: ha.Event) -> None:
+        received.append(("listener", event.data["entity_id"]))
+        if len(received) == 1:
+            unsub_removed()
+            unsub_batch()
+            hass.bus.async_listen(EVENT_STATE_CHANGED, added_listener)
+
+    @ha.callback
+    def batch_listener(events: list[ha.Event]) -> None:
+        batches.append([event.data["entity_id"] for event in events])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    unsub_removed = hass.bus.async_listen(EVENT_STATE_CHANGED, removed_listener)
+    unsub_batch = hass.bus.async_listen_batch(
+        EVENT_STATE_CHANGED, listener, batch_listener
+    )
+
+    with hass.states.async_batch_set():
+        hass.states.async_set("light.bowl", "on")
+        hass.states.async_set("light.kitchen", "on")
+
+    assert received == [
+        ("listener", "light.bowl"),
+        ("removed", "light.bowl"),
+        ("listener", "light.kitchen"),
+        ("added", "light.kitchen"),
+    ]
+    # The batch listener got the whole batch before it was removed
+    assert batches == [["light.bowl", "light.kitchen"]]
+
+
+async def test_fire_batch_write_back(hass: HomeAssistant) -> None:
+    """Test the batch listeners get the batch before the writes it causes."""
+    hass.states.async_set("light.bowl", "off")
+    hass.states.async_set("light.kitchen", "on")
+    batch_received: list[tuple[str, str]] = []
+    received: list[tuple[str, str, str]] = []
+
+    @ha.callback
+    def batch_event_listener(event: ha.Event) -> None:
+        batch_received.append((event.data["entity_id"], event.data["new_state"].state))
+
+    @ha.callback
+    def batch_listener(events: list[ha.Event]) -> None:
+        for event in events:
+            batch_event_listener(event)
+
+    @ha.callback
+    def write_back_listener(event: ha.Event) -> None:
+        received.append(
+            (event.event_type, event.data["entity_id"], event.data["new_state"].state)
+        )
+        if (
+            event.event_type == EVENT_STATE_CHANGED
+            and event.data["new_state"].state == "on"
+        ):
+            hass.states.async_set(event.data["entity_id"], "locked")
+
+    @ha.callback
+    def reported_filter(event_data: ha.EventStateReportedData) -> bool:
+        return True
+
+    hass.bus.async_listen_batch(
+        EVENT_STATE_CHANGED, batch_event_listener, batch_listener
+    )
+    hass.bus.async_listen(EVENT_STATE_CHANGED, write_back_listener)
+    hass.bus.async_listen(
+        EVENT_STATE_REPORTED, write_back_listener, event_filter=reported_filter
+    )
+
+    with hass.states.async_batch_set():
+        hass.states.async_set("light.bowl", "on")
+        hass.states.async_set("light.kitchen", "on")
+        hass.states.async_set("light.bowl", "dim")
+
+    # The state written back comes after the batch which caused it
+    assert batch_received == [
+        ("light.bowl", "on"),
+        ("light.bowl", "dim"),
+        ("light.bowl", "locked"),
+    ]
+    assert hass.states.get("light.bowl").state == "locked"
+    # The changed and reported events are fired in write order
+    assert received == [
+        (EVENT_STATE_CHANGED, "light.bowl", "on"),
+        (EVENT_STATE_CHANGED, "light.bowl", "locked"),
+        (EVENT_STATE_REPORTED, "light.kitchen", "on"),
+        (EVENT_STATE_CHANGED, "light.bowl", "dim"),
+    ]
+
+
 async def test_report_state_listener_restrictions(hass: HomeAssistant) -> None:
     """Test we enforce requirements for EVENT_STATE_REPORTED listeners."""
 
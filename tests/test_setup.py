@@ -1130,6 +1130,44 @@ async def test_async_get_setup_timings(hass: HomeAssistant) -> None:
     }
 
 
+async def test_async_get_setup_critical_path(hass: HomeAssistant) -> None:
+    """Test the setup timeline and the setups which gated the startup."""
+    hass.set_state(CoreState.not_running)
+
+    async def async_setup_slow(hass, config):
+        await asyncio.sleep(0.01)
+        return True
+
+    mock_integration(hass, MockModule("base"))
+    mock_integration(
+        hass, MockModule("slow", dependencies=["base"], async_setup=async_setup_slow)
+    )
+    mock_integration(
+        hass,
+        MockModule("leaf", partial_manifest={"after_dependencies": ["slow"]}),
+    )
+    mock_integration(hass, MockModule("unrelated"))
+    setup.async_set_domains_to_be_loaded(hass, {"base", "slow", "leaf", "unrelated"})
+
+    await asyncio.gather(
+        *(
+            setup.async_setup_component(hass, domain, {})
+            for domain in ("leaf", "unrelated", "slow")
+        )
+    )
+
+    timeline = setup.async_get_setup_timeline(hass)
+    assert timeline.keys() == {"base", "slow", "leaf", "unrelated"}
+    assert min(start for start, _ in timeline.values()) == 0
+    assert timeline["leaf"][1] >= timeline["slow"][1] > 0.01
+    assert setup.async_get_setup_critical_path(hass) == ["base", "slow", "leaf"]
+
+    hass.set_state(CoreState.running)
+    mock_integration(hass, MockModule("after_startup"))
+    assert await setup.async_setup_component(hass, "after_startup", {})
+    assert "after_startup" not in setup.async_get_setup_timeline(hass)
+
+
 async def test_setup_config_entry_from_yaml(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None: